@@ -5,7 +5,8 @@ import numpy as np
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from app.models import Score, User
+from app.models import Score, User, owner_filter
+from app.utils.timestamps import to_epoch
 from sqlalchemy import func
 
 logger = logging.getLogger(__name__)
@@ -172,9 +173,9 @@ class OutlierDetector:
                                  method: str = "ensemble") -> Dict:
         """User-level outlier detection."""
         try:
-            scores_query = session.query(Score).filter(
-                Score.username == username
-            ).order_by(Score.timestamp).all()
+            scores_query = session.query(Score).filter_by(
+                **owner_filter(session, username)
+            ).order_by(Score.timestamp_epoch).all()
             
             if not scores_query:
                 logger.warning(f"No scores found for user: {username}")
@@ -348,10 +349,11 @@ class OutlierDetector:
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=time_window_days)
             
-            scores_query = session.query(Score).filter(
-                Score.username == username,
-                Score.timestamp >= cutoff_date.isoformat()
-            ).order_by(Score.timestamp).all()
+            scores_query = session.query(Score).filter_by(
+                **owner_filter(session, username)
+            ).filter(
+                Score.timestamp_epoch >= to_epoch(cutoff_date)
+            ).order_by(Score.timestamp_epoch).all()
             
             if len(scores_query) < 2:
                 return {
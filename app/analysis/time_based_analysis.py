@@ -19,12 +19,22 @@ from statistics import mean, stdev
 from typing import Dict, List, Tuple, Optional
 
 from sqlalchemy import func
-from app.db import safe_db_context
-from app.models import User, Score, Response, JournalEntry
+from app.db_archive import history_entity
+from app.db_replica import analytics_session
+from app.models import User, Score, AnswerRow, JournalEntry, owner_filter
+from app.utils.timestamps import to_epoch, from_epoch
 
 logger = logging.getLogger(__name__)
 
 
+def _row_epoch(row) -> Optional[int]:
+    """Epoch seconds for a Score/answer row; parses only rows not yet backfilled."""
+    epoch = getattr(row, "timestamp_epoch", None)
+    if isinstance(epoch, int):
+        return epoch
+    return to_epoch(row.timestamp)
+
+
 class TimeBasedAnalyzer:
     """Analyzer for temporal patterns in user responses and emotional intelligence scores."""
 
@@ -32,26 +42,34 @@ class TimeBasedAnalyzer:
         """Initialize the time-based analyzer."""
         self.logger = logging.getLogger(__name__)
 
-    def get_user_timeline(self, username: str) -> Dict:
+    def get_user_timeline(self, username: str, include_archive: bool = True) -> Dict:
         """
         Get complete timeline of user activity including all scores and responses.
         
         Args:
             username: Username to analyze
+            include_archive: Also read responses and journal entries moved to the archive files
             
         Returns:
             Dictionary containing timeline data sorted by timestamp
         """
         try:
-            with safe_db_context() as session:
+            with analytics_session() as session:
+                owner = owner_filter(session, username)
+
                 # Get all scores for the user
-                scores = session.query(Score).filter_by(username=username).order_by(Score.timestamp).all()
+                scores = session.query(Score).filter_by(**owner).order_by(Score.timestamp_epoch).all()
                 
+                ResponseHistory = history_entity(session, AnswerRow) if include_archive else AnswerRow
+                JournalHistory = history_entity(session, JournalEntry) if include_archive else JournalEntry
+
                 # Get all responses for the user
-                responses = session.query(Response).filter_by(username=username).order_by(Response.timestamp).all()
+                responses = session.query(ResponseHistory).filter_by(**owner)\
+                    .order_by(ResponseHistory.timestamp_epoch).all()
                 
                 # Get all journal entries
-                journals = session.query(JournalEntry).filter_by(username=username).order_by(JournalEntry.entry_date).all()
+                journals = session.query(JournalHistory).filter_by(**owner)\
+                    .order_by(JournalHistory.entry_date_epoch).all()
                 
                 timeline_data = {
                     "username": username,
@@ -101,8 +119,8 @@ class TimeBasedAnalyzer:
             Dictionary containing trend analysis
         """
         try:
-            with safe_db_context() as session:
-                scores = session.query(Score).filter_by(username=username).order_by(Score.timestamp).all()
+            with analytics_session() as session:
+                scores = session.query(Score).filter_by(**owner_filter(session, username)).order_by(Score.timestamp_epoch).all()
                 
                 if not scores:
                     return {"error": "No score data available"}
@@ -177,8 +195,8 @@ class TimeBasedAnalyzer:
             Dictionary containing response pattern analysis
         """
         try:
-            with safe_db_context() as session:
-                responses = session.query(Response).filter_by(username=username).order_by(Response.timestamp).all()
+            with analytics_session() as session:
+                responses = session.query(AnswerRow).filter_by(**owner_filter(session, username)).order_by(AnswerRow.timestamp_epoch).all()
                 
                 if not responses:
                     return {"error": "No response data available"}
@@ -237,8 +255,8 @@ class TimeBasedAnalyzer:
             Dictionary containing statistics grouped by time period
         """
         try:
-            with safe_db_context() as session:
-                scores = session.query(Score).filter_by(username=username).order_by(Score.timestamp).all()
+            with analytics_session() as session:
+                scores = session.query(Score).filter_by(**owner_filter(session, username)).order_by(Score.timestamp_epoch).all()
                 
                 if not scores:
                     return {"error": "No score data available"}
@@ -247,14 +265,10 @@ class TimeBasedAnalyzer:
                 period_stats = defaultdict(list)
                 
                 for score in scores:
-                    try:
-                        score_time = datetime.fromisoformat(score.timestamp)
-                    except (ValueError, TypeError):
-                        # Try alternative parsing
-                        try:
-                            score_time = datetime.strptime(score.timestamp, "%Y-%m-%d %H:%M:%S")
-                        except:
-                            continue
+                    epoch = _row_epoch(score)
+                    if epoch is None:
+                        continue
+                    score_time = from_epoch(epoch)
                     
                     if period == "daily":
                         period_key = score_time.strftime("%Y-%m-%d")
@@ -300,7 +314,7 @@ class TimeBasedAnalyzer:
             List of returning users with their activity summaries
         """
         try:
-            with safe_db_context() as session:
+            with analytics_session() as session:
                 # Get users with multiple scores
                 user_scores = session.query(
                     Score.username,
@@ -340,28 +354,24 @@ class TimeBasedAnalyzer:
             Dictionary containing comparative analysis
         """
         try:
-            with safe_db_context() as session:
-                all_scores = session.query(Score).filter_by(username=username).order_by(Score.timestamp).all()
+            with analytics_session() as session:
+                all_scores = session.query(Score).filter_by(**owner_filter(session, username)).order_by(Score.timestamp_epoch).all()
                 
                 if not all_scores:
                     return {"error": "No score data available"}
                 
                 # Separate historical and recent scores
-                cutoff_date = datetime.utcnow() - timedelta(days=lookback_days)
+                cutoff_epoch = to_epoch(datetime.utcnow() - timedelta(days=lookback_days))
                 
                 historical_scores = []
                 recent_scores = []
                 
                 for score in all_scores:
-                    try:
-                        score_time = datetime.fromisoformat(score.timestamp)
-                    except (ValueError, TypeError):
-                        try:
-                            score_time = datetime.strptime(score.timestamp, "%Y-%m-%d %H:%M:%S")
-                        except:
-                            continue
+                    epoch = _row_epoch(score)
+                    if epoch is None:
+                        continue
                     
-                    if score_time < cutoff_date:
+                    if epoch < cutoff_epoch:
                         historical_scores.append(score.total_score)
                     else:
                         recent_scores.append(score.total_score)
@@ -410,15 +420,15 @@ class TimeBasedAnalyzer:
             Dictionary containing comprehensive activity summary
         """
         try:
-            with safe_db_context() as session:
+            with analytics_session() as session:
                 user = session.query(User).filter_by(username=username).first()
                 
                 if not user:
                     return {"error": "User not found"}
                 
-                scores_count = session.query(func.count(Score.id)).filter_by(username=username).scalar()
-                responses_count = session.query(func.count(Response.id)).filter_by(username=username).scalar()
-                journal_count = session.query(func.count(JournalEntry.id)).filter_by(username=username).scalar()
+                scores_count = session.query(func.count(Score.id)).filter_by(user_id=user.id).scalar()
+                responses_count = session.query(func.count(AnswerRow.id)).filter_by(user_id=user.id).scalar()
+                journal_count = session.query(func.count(JournalEntry.id)).filter_by(user_id=user.id).scalar()
                 
                 summary = {
                     "username": username,
@@ -21,11 +21,18 @@ class AuthManager:
             logging.error(f"Password verification failed: {e}")
             return False
     
-    def register_user(self, username, password):
+    def validate_registration(self, username, password):
+        """Return the reason the credentials cannot be registered, or None if they are valid."""
         if len(username) < 3:
-            return False, "Username must be at least 3 characters"
+            return "Username must be at least 3 characters"
         if len(password) < 4:
-            return False, "Password must be at least 4 characters"
+            return "Password must be at least 4 characters"
+        return None
+
+    def register_user(self, username, password):
+        error = self.validate_registration(username, password)
+        if error:
+            return False, error
         
         session = get_session()
         try:
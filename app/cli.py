@@ -24,8 +24,9 @@ except ImportError:
     pass
 
 from app.services.exam_service import ExamSession
-from app.questions import load_questions, get_random_questions_by_age
+from app.questions import load_questions, get_random_questions_by_age, flush_access_stats
 from app.utils import compute_age_group
+from app.models import owner_sql
 # from app.logger import setup_logging # Not used in snippet, but good practice
 
 # ANSI Color Codes
@@ -75,6 +76,7 @@ class SoulSenseCLI:
         dependency injection supported for testing.
         """
         self.username = ""
+        self.user_id: Optional[int] = None
         self.age = 0
         self.age_group = ""
         self.session: Optional[ExamSession] = None
@@ -176,6 +178,8 @@ class SoulSenseCLI:
                     print("User profile found.")
                 
                 user_id = int(user.id)
+            # History queries filter on the id resolved here
+            self.user_id = user_id
             
             # Load User Settings
             if user_id:
@@ -314,11 +318,12 @@ class SoulSenseCLI:
             from app.db import get_connection
             conn = get_connection()
             cursor = conn.cursor()
+            owner, params = owner_sql(self.user_id, self.username)
             
             # Get last score (excluding current)
             cursor.execute(
-                "SELECT total_score FROM scores WHERE username = ? ORDER BY timestamp DESC LIMIT 2",
-                (self.username,)
+                f"SELECT total_score FROM scores WHERE {owner} ORDER BY timestamp DESC LIMIT 2",
+                params
             )
             rows = cursor.fetchall()
             last_score = rows[1][0] if len(rows) > 1 else None
@@ -426,12 +431,13 @@ class SoulSenseCLI:
             from app.db import get_connection
             conn = get_connection()
             cursor = conn.cursor()
+            owner, params = owner_sql(self.user_id, self.username)
             
             cursor.execute(
-                """SELECT timestamp, total_score, sentiment_score, is_rushed, is_inconsistent 
-                   FROM scores WHERE username = ? 
+                f"""SELECT timestamp, total_score, sentiment_score, is_rushed, is_inconsistent 
+                   FROM scores WHERE {owner} 
                    ORDER BY timestamp DESC LIMIT 10""",
-                (self.username,)
+                params
             )
             rows = cursor.fetchall()
             
@@ -500,9 +506,10 @@ class SoulSenseCLI:
             from app.db import get_connection
             conn = get_connection()
             cursor = conn.cursor()
+            owner, params = owner_sql(self.user_id, self.username)
             
             # Basic stats
-            cursor.execute("SELECT COUNT(*) FROM scores WHERE username = ?", (self.username,))
+            cursor.execute(f"SELECT COUNT(*) FROM scores WHERE {owner}", params)
             total = cursor.fetchone()[0] or 0
             
             if total == 0:
@@ -510,33 +517,33 @@ class SoulSenseCLI:
                 self.get_input("\nPress Enter to continue...")
                 return
             
-            cursor.execute("SELECT AVG(total_score) FROM scores WHERE username = ?", (self.username,))
+            cursor.execute(f"SELECT AVG(total_score) FROM scores WHERE {owner}", params)
             avg = cursor.fetchone()[0] or 0
             
-            cursor.execute("SELECT MAX(total_score) FROM scores WHERE username = ?", (self.username,))
+            cursor.execute(f"SELECT MAX(total_score) FROM scores WHERE {owner}", params)
             best = cursor.fetchone()[0] or 0
             
-            cursor.execute("SELECT MIN(total_score) FROM scores WHERE username = ?", (self.username,))
+            cursor.execute(f"SELECT MIN(total_score) FROM scores WHERE {owner}", params)
             worst = cursor.fetchone()[0] or 0
             
             # Consistency rate (non-rushed exams)
-            cursor.execute("SELECT COUNT(*) FROM scores WHERE username = ? AND is_rushed = 0", (self.username,))
+            cursor.execute(f"SELECT COUNT(*) FROM scores WHERE {owner} AND is_rushed = 0", params)
             consistent = cursor.fetchone()[0] or 0
             consistency_rate = (consistent / total * 100) if total > 0 else 0
             
             # First vs Last score (improvement)
-            cursor.execute("SELECT total_score FROM scores WHERE username = ? ORDER BY timestamp ASC LIMIT 1", (self.username,))
+            cursor.execute(f"SELECT total_score FROM scores WHERE {owner} ORDER BY timestamp ASC LIMIT 1", params)
             first_score = cursor.fetchone()
             first_score = first_score[0] if first_score else 0
             
-            cursor.execute("SELECT total_score FROM scores WHERE username = ? ORDER BY timestamp DESC LIMIT 1", (self.username,))
+            cursor.execute(f"SELECT total_score FROM scores WHERE {owner} ORDER BY timestamp DESC LIMIT 1", params)
             last_score = cursor.fetchone()
             last_score = last_score[0] if last_score else 0
             
             improvement = last_score - first_score
             
             # Average sentiment
-            cursor.execute("SELECT AVG(sentiment_score) FROM scores WHERE username = ?", (self.username,))
+            cursor.execute(f"SELECT AVG(sentiment_score) FROM scores WHERE {owner}", params)
             avg_sentiment = cursor.fetchone()[0] or 0
             
             # Display stats with colors
@@ -581,38 +588,32 @@ class SoulSenseCLI:
         print("      E X P O R T   R E S U L T S")
         print("="*60 + "\n")
         
-        print("  1. Export as JSON")
-        print("  2. Export as CSV")
-        print("  3. Back to Menu")
+        print("  1. Export all data as JSON")
+        print("  2. Export exam results as CSV")
+        print("  3. Export all data as ZIP archive (CSV per dataset)")
+        print("  4. Back to Menu")
         print("")
         
-        choice = self.get_input("Select format (1-3): ")
+        choice = self.get_input("Select format (1-4): ")
         
-        if choice == '3' or choice not in ('1', '2'):
+        if choice not in ('1', '2', '3'):
             return
             
         try:
-            from app.db import get_connection
-            import json
             from datetime import datetime
+            from app.services.export_service import ExportService
             
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                """SELECT timestamp, total_score, sentiment_score, reflection_text, is_rushed, is_inconsistent 
-                   FROM scores WHERE username = ? ORDER BY timestamp DESC""",
-                (self.username,)
-            )
-            rows = cursor.fetchall()
+            ext = {'1': "json", '2': "csv", '3': "zip"}[choice]
+            datasets = ["scores"] if ext == "csv" else None
+            counts = ExportService.count_rows(self.username, datasets)
             
-            if not rows:
+            if not any(counts.values()):
                 print("No data to export.")
                 self.get_input("\nPress Enter to continue...")
                 return
             
             # Ask for directory
-            print(f"\nFound {len(rows)} exam(s) to export.")
+            print(f"\nFound {counts.get('scores', 0)} exam(s) and {sum(counts.values())} record(s) in total to export.")
             default_dir = os.path.abspath("exports")
             print(f"\nDefault directory: {default_dir}")
             custom_dir = self.get_input("Enter directory path (or press Enter for default): ").strip()
@@ -637,7 +638,6 @@ class SoulSenseCLI:
                 return
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            ext = "json" if choice == '1' else "csv"
             
             # Sanitize username for filename
             safe_username = sanitize_filename(self.username)
@@ -654,36 +654,12 @@ class SoulSenseCLI:
                 self.get_input("\nPress Enter to continue...")
                 return
             
-            # Import atomic_write
-            from app.utils.atomic import atomic_write
-            
-            if choice == '1':
-                # JSON Export
-                data = {
-                    "username": self.username,
-                    "exported_at": datetime.now().isoformat(),
-                    "total_exams": len(rows),
-                    "results": [
-                        {
-                            "timestamp": r[0],
-                            "score": r[1],
-                            "sentiment": r[2],
-                            "reflection": r[3],
-                            "is_rushed": bool(r[4]),
-                            "is_inconsistent": bool(r[5])
-                        } for r in rows
-                    ]
-                }
-                with atomic_write(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                    
-            elif choice == '2':
-                # CSV Export
-                with atomic_write(filepath, 'w', encoding='utf-8') as f:
-                    f.write("timestamp,score,sentiment,reflection,is_rushed,is_inconsistent\n")
-                    for r in rows:
-                        reflection = (r[3] or "").replace('"', '""').replace('\n', ' ')
-                        f.write(f'"{r[0]}",{r[1]},{r[2]},"{reflection}",{r[4]},{r[5]}\n')
+            def show_progress(dataset: str, rows: int) -> None:
+                print(f"\r  Exporting {dataset}: {rows} row(s)   ", end="", flush=True)
+
+            ExportService.export_user_data(self.username, filepath, fmt=ext, datasets=datasets,
+                                           progress=show_progress)
+            print()
             
             print(f"\n{colorize('✅ Export successful!', Colors.GREEN)}")
             print(f"\nFile saved to:")
@@ -735,11 +711,12 @@ class SoulSenseCLI:
             from app.db import get_connection
             conn = get_connection()
             cursor = conn.cursor()
+            owner, params = owner_sql(self.user_id, self.username)
             
             cursor.execute(
-                """SELECT timestamp, total_score FROM scores 
-                   WHERE username = ? ORDER BY timestamp ASC LIMIT 20""",
-                (self.username,)
+                f"""SELECT timestamp, total_score FROM scores 
+                   WHERE {owner} ORDER BY timestamp ASC LIMIT 20""",
+                params
             )
             rows = cursor.fetchall()
             
@@ -784,12 +761,13 @@ class SoulSenseCLI:
             
             conn = get_connection()
             cursor = conn.cursor()
+            owner, params = owner_sql(self.user_id, self.username)
             
             # Get all scores with timestamps
             cursor.execute(
-                """SELECT timestamp, total_score FROM scores 
-                   WHERE username = ? ORDER BY timestamp DESC""",
-                (self.username,)
+                f"""SELECT timestamp, total_score FROM scores 
+                   WHERE {owner} ORDER BY timestamp DESC""",
+                params
             )
             rows = cursor.fetchall()
             
@@ -841,12 +819,13 @@ class SoulSenseCLI:
             from app.db import get_connection
             conn = get_connection()
             cursor = conn.cursor()
+            owner, params = owner_sql(self.user_id, self.username)
             
             # Get average score and sentiment
             cursor.execute(
-                """SELECT AVG(total_score), AVG(sentiment_score), COUNT(*) 
-                   FROM scores WHERE username = ?""",
-                (self.username,)
+                f"""SELECT AVG(total_score), AVG(sentiment_score), COUNT(*) 
+                   FROM scores WHERE {owner}""",
+                params
             )
             row = cursor.fetchone()
             
@@ -902,12 +881,13 @@ class SoulSenseCLI:
             from app.db import get_connection
             conn = get_connection()
             cursor = conn.cursor()
+            owner, params = owner_sql(self.user_id, self.username)
             
             # Get user data
             cursor.execute(
-                """SELECT total_score, sentiment_score, is_rushed, is_inconsistent 
-                   FROM scores WHERE username = ? ORDER BY timestamp DESC LIMIT 5""",
-                (self.username,)
+                f"""SELECT total_score, sentiment_score, is_rushed, is_inconsistent 
+                   FROM scores WHERE {owner} ORDER BY timestamp DESC LIMIT 5""",
+                params
             )
             rows = cursor.fetchall()
             
@@ -1030,6 +1010,14 @@ class SoulSenseCLI:
 
     def run(self):
         """Main execution flow with menu"""
+        from app.services.exam_service import ExamService
+        from app.feature_flags import feature_flags
+        from app.db_profiler import enable_sql_profiling, get_sql_profiler
+        from app.db_maintenance import get_maintenance_scheduler
+        if feature_flags.is_enabled("sql_profiling"):
+            enable_sql_profiling()
+        ExamService.recover_pending_responses()
+
         try:
             # Initial authentication
             if not self.username:
@@ -1061,6 +1049,13 @@ class SoulSenseCLI:
         except Exception as e:
             print(f"\nFatal Error: {e}")
             sys.exit(1)
+        finally:
+            # Persist answers from an exam quit midway
+            ExamService.flush_pending_responses()
+            flush_access_stats()
+            get_maintenance_scheduler().tick()
+            if get_sql_profiler():
+                get_sql_profiler().dump()
 
 if __name__ == "__main__":
     if '--help' in sys.argv:
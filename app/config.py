@@ -178,6 +178,9 @@ else:
         except OSError:
             pass # Handle race condition or permission error
 
+# SQLite tuning profile applied to every connection ('desktop', 'server', 'bulk_load')
+DB_PROFILE: str = get_env_var("DB_PROFILE", _config["database"].get("profile", "desktop"))
+
 # UI Settings
 THEME: str = _config["ui"]["theme"]
 
@@ -2,23 +2,90 @@
 import os
 import sqlite3
 import logging
+import threading
 from contextlib import contextmanager
-from typing import Iterator, Dict, Any, Optional, Generator
-from sqlalchemy import create_engine, inspect, text
+from typing import Iterator, Dict, Any, List, Optional, Generator, Tuple, Union
+from sqlalchemy import create_engine, delete, inspect, or_, select, text, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.config import DATABASE_URL, DB_PATH, BASE_DIR
-from app.exceptions import DatabaseError
+from app.config import DATABASE_URL, DB_PATH, BASE_DIR, DB_PROFILE
+from app.exceptions import DatabaseError, ConfigurationError
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# ==================== CONNECTION TUNING PROFILES ====================
+# PRAGMAs applied to every new SQLite connection (ORM and raw sqlite3).
+# Order matters: journal_mode must be set before the other settings.
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Interactive Tk app: WAL for concurrent readers, modest cache
+    "desktop": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -2000,        # 2MB
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,     # 256MB
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,       # ms to wait for another process's write lock
+    },
+    # FastAPI backend: larger cache and mmap window for many short requests
+    "server": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,       # 16MB
+        "temp_store": "MEMORY",
+        "mmap_size": 536870912,     # 512MB
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+    },
+    # Seeding / migration scripts: trade durability for insert throughput
+    "bulk_load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,       # 64MB
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,
+        "foreign_keys": "OFF",
+        "busy_timeout": 30000,      # Long batches; wait out the app's short writes
+    },
+}
+
+
+def get_profile(name: Optional[str] = None) -> Dict[str, Any]:
+    """Return the PRAGMA settings for a tuning profile (defaults to DB_PROFILE)."""
+    profile_name = name or DB_PROFILE
+    if profile_name not in SQLITE_PROFILES:
+        raise ConfigurationError(
+            f"Unknown database profile '{profile_name}'. "
+            f"Expected one of: {', '.join(SQLITE_PROFILES)}"
+        )
+    return SQLITE_PROFILES[profile_name]
+
+
+def apply_sqlite_pragmas(dbapi_connection: Any, profile: Optional[str] = None) -> None:
+    """Apply a tuning profile's PRAGMAs to a DB-API (sqlite3) connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in get_profile(profile).items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+    finally:
+        cursor.close()
+
+
 # Create engine and session
 engine = create_engine(DATABASE_URL, echo=False)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _on_engine_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    """Tune every pooled connection as it is opened, not only at create_all time."""
+    apply_sqlite_pragmas(dbapi_connection)
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _on_engine_connect)
+
 def get_engine() -> Engine:
     return engine
 
@@ -26,6 +93,17 @@ def get_session() -> Session:
     """Get a new database session"""
     return SessionLocal()
 
+def dialect_insert(session: Session, model: Any) -> Any:
+    """
+    INSERT for the session's dialect, supporting on_conflict_do_nothing /
+    on_conflict_do_update on both SQLite and PostgreSQL.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+        return postgresql_insert(model)
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+    return sqlite_insert(model)
+
 @contextmanager
 def safe_db_context() -> Generator[Session, None, None]:
     """Context manager for safe database operations"""
@@ -96,6 +174,7 @@ def create_tables_directly() -> None:
                 is_rushed BOOLEAN DEFAULT 0,
                 is_inconsistent BOOLEAN DEFAULT 0,
                 timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+                timestamp_epoch INTEGER,
                 detailed_age_group TEXT,
                 user_id INTEGER
             )
@@ -106,7 +185,9 @@ def create_tables_directly() -> None:
             CREATE TABLE IF NOT EXISTS journal_entries (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 username TEXT,
+                user_id INTEGER,
                 entry_date TEXT DEFAULT CURRENT_TIMESTAMP,
+                entry_date_epoch INTEGER,
                 content TEXT,
                 sentiment_score REAL,
                 emotional_patterns TEXT,
@@ -144,55 +225,198 @@ def create_tables_directly() -> None:
 # Initialize database
 # check_db_state()  # DISABLED to prevent side-effects on import
 
+class PooledConnection:
+    """
+    A sqlite3 connection checked out of the engine pool.
+
+    Attribute reads and writes (``row_factory``, ``text_factory``...) go to
+    the underlying sqlite3.Connection; close() resets those factories and
+    returns the connection to the pool instead of closing it. As with
+    sqlite3, ``with conn:`` commits (or rolls back on error) but does not close.
+    """
+
+    def __init__(self, pool_proxy: Any) -> None:
+        object.__setattr__(self, "_proxy", pool_proxy)
+        object.__setattr__(self, "_conn", pool_proxy.driver_connection)
+
+    def close(self) -> None:
+        self._conn.row_factory = None
+        self._conn.text_factory = str
+        self._proxy.close()
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        # Dunder lookups skip __getattr__; sqlite3 commits or rolls back here
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._conn, name, value)
+
+
 # Backward compatibility
-def get_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
+def get_connection(db_path: Optional[str] = None,
+                   profile: Optional[str] = None) -> Union[sqlite3.Connection, PooledConnection]:
+    """
+    Get a raw sqlite3-style connection with the tuning profile applied.
+
+    Connections to the main database are checked out of the shared engine
+    pool, so callers' ``conn.close()`` returns them to the pool instead of
+    re-opening the file (and re-running the PRAGMAs) on every query.
+    Other database files, or a non-default profile, get a dedicated
+    sqlite3.Connection.
+
+    Args:
+        db_path: Optional path to a different SQLite file
+        profile: Optional tuning profile name (see SQLITE_PROFILES)
+    """
     try:
-        return sqlite3.connect(db_path or DB_PATH)
-    except sqlite3.Error as e:
+        target = db_path or DB_PATH
+        use_pool = (
+            engine.dialect.name == "sqlite"
+            and os.path.abspath(target) == os.path.abspath(DB_PATH)
+            and (profile is None or profile == DB_PROFILE)
+        )
+        if use_pool:
+            return PooledConnection(engine.raw_connection())
+
+        conn = sqlite3.connect(target)
+        apply_sqlite_pragmas(conn, profile)
+        return conn
+    except (sqlite3.Error, SQLAlchemyError) as e:
         logger.error(f"Failed to connect to raw database: {e}", exc_info=True)
         raise DatabaseError("Failed to connect to raw database.", original_exception=e)
 
+# PRAGMA keyword values -> the integers SQLite reports back
+_PRAGMA_CODES: Dict[str, Dict[str, int]] = {
+    "synchronous": {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3},
+    "temp_store": {"DEFAULT": 0, "FILE": 1, "MEMORY": 2},
+    "foreign_keys": {"OFF": 0, "ON": 1},
+}
+
+
+def _pragma_matches(pragma: str, configured: Any, actual: Any) -> bool:
+    if pragma in _PRAGMA_CODES:
+        return _PRAGMA_CODES[pragma].get(str(configured).upper()) == actual
+    if isinstance(configured, str):
+        return str(actual).lower() == configured.lower()
+    return actual == configured
+
+
+def get_connection_settings(conn: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Report the PRAGMA settings actually in effect on a connection.
+
+    Args:
+        conn: Optional DB-API connection to inspect; defaults to a pooled one
+
+    Returns:
+        Dict with the value of each tuned PRAGMA, and under "profile" the
+        name of the profile those values match (None if they match none)
+    """
+    owns_conn = conn is None
+    if conn is None:
+        conn = get_connection()
+
+    report: Dict[str, Any] = {}
+    try:
+        cursor = conn.cursor()
+        for pragma in dict.fromkeys(p for settings in SQLITE_PROFILES.values() for p in settings):
+            cursor.execute(f"PRAGMA {pragma}")
+            row = cursor.fetchone()
+            report[pragma] = row[0] if row else None
+        cursor.close()
+    finally:
+        if owns_conn:
+            conn.close()
+
+    report["profile"] = next(
+        (name for name, settings in SQLITE_PROFILES.items()
+         if all(_pragma_matches(p, value, report[p]) for p, value in settings.items())),
+        None
+    )
+    return report
+
+# ==================== USER SETTINGS CACHE ====================
+# Settings are read on login, theme switches, exam start and language loads.
+# Each user's settings are loaded once and then served from memory; writes go
+# to the database first and then to the cached copy (write-through). Writes
+# that bypass update_user_settings() must call invalidate_user_settings();
+# ORM updates and deletes of UserSettings rows do so automatically.
+
+DEFAULT_USER_SETTINGS: Dict[str, Any] = {
+    "theme": "light",
+    "question_count": 10,
+    "sound_enabled": True,
+    "notifications_enabled": True,
+    "language": "en",
+}
+
+_settings_cache: Dict[int, Dict[str, Any]] = {}
+_settings_lock = threading.Lock()
+# Bumped under the lock by every write and invalidation; a read only caches
+# what it loaded if no write landed while it was reading
+_settings_generation = 0
+
+
+def invalidate_user_settings(user_id: Optional[int] = None) -> None:
+    """Drop one user's cached settings (or everyone's); the next read reloads them."""
+    global _settings_generation
+    with _settings_lock:
+        _settings_generation += 1
+        if user_id is None:
+            _settings_cache.clear()
+        else:
+            _settings_cache.pop(user_id, None)
+
+
 def get_user_settings(user_id: int) -> Dict[str, Any]:
     """
     Fetch settings for a user.
-    Returns a dictionary of settings. Creates defaults if not found.
+    Returns a dictionary of settings (a copy; served from the cache after the
+    first call). Creates the default row if not found.
     """
     from app.models import UserSettings
-    from datetime import datetime
-    
-    with safe_db_context() as session:
-        settings = session.query(UserSettings).filter_by(user_id=user_id).first()
-        
-        if not settings:
-            # Create default settings for this user
-            try:
-                settings = UserSettings(user_id=user_id)
-                session.add(settings)
-                session.commit()
-                # Refresh to get defaults
-                session.refresh(settings)
-            except Exception as e:
-                logger.error(f"Failed to create default settings for user {user_id}: {e}")
-                # Return generic defaults on failure (fallback)
-                return {
-                    "theme": "light", 
-                    "question_count": 10, 
-                    "sound_enabled": True,
-                    "notifications_enabled": True,
-                    "language": "en"
-                }
-
-        return {
-            "theme": settings.theme,
-            "question_count": settings.question_count,
-            "sound_enabled": settings.sound_enabled,
-            "notifications_enabled": settings.notifications_enabled,
-            "language": settings.language
-        }
+
+    with _settings_lock:
+        cached = _settings_cache.get(user_id)
+        generation = _settings_generation
+    if cached is not None:
+        return dict(cached)
+
+    columns = [getattr(UserSettings, key) for key in DEFAULT_USER_SETTINGS]
+    try:
+        with safe_db_context() as session:
+            row = session.execute(select(*columns).where(UserSettings.user_id == user_id)).first()
+            if row is None:
+                # Create default settings for this user (a concurrent first read may win)
+                session.execute(
+                    dialect_insert(session, UserSettings)
+                    .values(user_id=user_id, **DEFAULT_USER_SETTINGS)
+                    .on_conflict_do_nothing(index_elements=[UserSettings.user_id])
+                )
+                row = session.execute(select(*columns).where(UserSettings.user_id == user_id)).one()
+            settings = dict(row._mapping)
+    except DatabaseError as e:
+        logger.error(f"Failed to load settings for user {user_id}: {e}")
+        # Generic defaults on failure, not cached so the next read retries
+        return dict(DEFAULT_USER_SETTINGS)
+
+    with _settings_lock:
+        if generation == _settings_generation:
+            _settings_cache[user_id] = settings
+    return dict(settings)
+
 
 def update_user_settings(user_id: int, **kwargs: Any) -> bool:
     """
     Update settings for a user.
+    All keys are written in one upsert statement, then applied to the cache.
+    Unknown keys are ignored.
     Args:
         user_id: ID of the user
         **kwargs: Key-value pairs of settings to update
@@ -200,27 +424,82 @@ def update_user_settings(user_id: int, **kwargs: Any) -> bool:
     from app.models import UserSettings
     from datetime import datetime
 
+    values = {key: value for key, value in kwargs.items() if key in DEFAULT_USER_SETTINGS}
+    values["updated_at"] = datetime.utcnow().isoformat()
+
+    global _settings_generation
     with safe_db_context() as session:
-        settings = session.query(UserSettings).filter_by(user_id=user_id).first()
+        session.execute(
+            dialect_insert(session, UserSettings)
+            .values(user_id=user_id, **values)
+            .on_conflict_do_update(index_elements=[UserSettings.user_id], set_=values)
+        )
 
-        if not settings:
-            settings = UserSettings(user_id=user_id)
-            session.add(settings)
+    del values["updated_at"]
+    with _settings_lock:
+        _settings_generation += 1
+        cached = _settings_cache.get(user_id)
+        if cached is not None:
+            cached.update(values)
+    return True
 
-        # dynamic update
-        for key, value in kwargs.items():
-            if hasattr(settings, key):
-                setattr(settings, key, value) # type: ignore
+# Tables holding a user's rows, children before parents so foreign keys hold
+# inside the transaction. Rows match on user_id, or on username where the
+# table also keeps rows written before user_id was backfilled.
+USER_DATA_TABLES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("assessment_results", ("user_id",)),          # -> journal_entries
+    ("journal_tags", ("user_id", "username")),     # -> journal_entries
+    ("journal_entries", ("user_id", "username")),
+    ("satisfaction_records", ("user_id", "username")),  # -> scores
+    ("satisfaction_history", ("user_id",)),
+    ("attempt_answers", ("user_id", "username")),  # -> scores
+    ("responses", ("user_id", "username")),
+    ("scores", ("user_id", "username")),
+    ("user_emotional_patterns", ("user_id",)),
+    ("user_strengths", ("user_id",)),
+    ("personal_profiles", ("user_id",)),
+    ("medical_profiles", ("user_id",)),
+    ("user_settings", ("user_id",)),
+]
+
+
+def delete_user_rows(session: Session, user_id: int, username: str) -> Dict[str, int]:
+    """
+    Delete every row a user owns with one DELETE per table, then the user row.
+
+    Runs in the caller's transaction. ORM cascades and listeners are bypassed,
+    so the cost is one indexed statement per table rather than a load and
+    flush per row. Returns the deleted row count per table.
+    """
+    from app.models import Base
+
+    tables = Base.metadata.tables
+    deleted: Dict[str, int] = {}
+    for name, columns in USER_DATA_TABLES:
+        table = tables[name]
+        owner = [table.c.user_id == user_id]
+        if "username" in columns:
+            owner.append(table.c.username == username)
+        deleted[name] = session.execute(delete(table).where(or_(*owner))).rowcount
+    deleted["users"] = session.execute(delete(tables["users"]).where(tables["users"].c.id == user_id)).rowcount
+    return deleted
+
+
+def _remove_file(path: str, kind: str) -> None:
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+            logger.info(f"Deleted {kind} file: {path}")
+    except OSError as e:
+        logger.warning(f"Failed to delete {kind} file {path}: {e}")
 
-        settings.updated_at = datetime.utcnow().isoformat() # type: ignore
-        session.commit()
-        return True
 
 def delete_user_data(user_id: int) -> bool:
     """
     Permanently delete all user data from the database and local storage.
-    This includes the user record and all related data due to cascade delete relationships,
-    as well as local files like avatar images and exported data.
+    Rows are removed with set-based deletes in a single transaction (see
+    delete_user_rows); local files (avatar, exports listed in the user's
+    export manifest, archived rows) are removed once that has committed.
 
     Args:
         user_id: ID of the user to delete
@@ -228,50 +507,51 @@ def delete_user_data(user_id: int) -> bool:
     Returns:
         bool: True if deletion was successful, False otherwise
     """
-    import os
-    import shutil
-    from app.models import User
+    from app.models import PersonalProfile, User
+    from app.services import export_service
 
     try:
         with safe_db_context() as session:
-            user = session.query(User).filter_by(id=user_id).first()
-
-            if not user:
+            username = session.execute(select(User.username).where(User.id == user_id)).scalar()
+            if username is None:
                 logger.warning(f"User with ID {user_id} not found for deletion")
                 return False
 
-            username = user.username
-
-            # Delete local files before DB deletion
-            # 1. Delete avatar file
-            avatar_path = None
-            if user.personal_profile and user.personal_profile.avatar_path:
-                avatar_path = user.personal_profile.avatar_path
-                if os.path.exists(avatar_path):
-                    try:
-                        os.remove(avatar_path)
-                        logger.info(f"Deleted avatar file: {avatar_path}")
-                    except Exception as e:
-                        logger.warning(f"Failed to delete avatar file {avatar_path}: {e}")
-
-            # 2. Delete exported files
-            exports_dir = os.path.join(BASE_DIR, "exports")
-            if os.path.exists(exports_dir):
-                for filename in os.listdir(exports_dir):
-                    if filename.startswith(f"{username}_"):
-                        file_path = os.path.join(exports_dir, filename)
-                        try:
-                            os.remove(file_path)
-                            logger.info(f"Deleted exported file: {file_path}")
-                        except Exception as e:
-                            logger.warning(f"Failed to delete exported file {file_path}: {e}")
-
-            # Delete the user - cascade delete will handle all related records
-            session.delete(user)
+            avatar_path = session.execute(
+                select(PersonalProfile.avatar_path).where(PersonalProfile.user_id == user_id)
+            ).scalar()
+            deleted = delete_user_rows(session, user_id, username)
             session.commit()
+        invalidate_user_settings(user_id)
+
+        # Files go only after the rows are gone, so a failed delete leaves the account intact
+        if avatar_path:
+            _remove_file(avatar_path, "avatar")
+
+        exports = export_service.exported_files(user_id)
+        if exports is None:
+            # Exports written before manifests existed: CLI default directory naming
+            exports_dir = os.path.join(BASE_DIR, "exports")
+            if os.path.isdir(exports_dir):
+                exports = [os.path.join(exports_dir, f) for f in os.listdir(exports_dir)
+                           if f.startswith(f"{username}_")]
+        for path in exports or []:
+            _remove_file(path, "exported")
+        export_service.forget_exports(user_id)
+
+        from app.db_archive import purge_user_rows
+        purge_user_rows(user_id, username)
+
+        # Bulk deletes skip the Score listeners that keep cached statistics current
+        from app.services.stats_service import StatisticsService
+        StatisticsService.invalidate()
 
-            logger.info(f"Successfully deleted all data for user ID {user_id}")
-            return True
+        # Reclaim the freed pages on the next maintenance tick
+        from app.db_maintenance import get_maintenance_scheduler
+        get_maintenance_scheduler().request("vacuum")
+
+        logger.info(f"Successfully deleted all data for user ID {user_id} ({sum(deleted.values())} rows)")
+        return True
 
     except Exception as e:
         logger.error(f"Failed to delete user data for user ID {user_id}: {e}")
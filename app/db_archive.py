@@ -0,0 +1,434 @@
+"""
+Cold-storage archival of old history rows.
+
+``attempt_answers``, ``responses`` and ``journal_entries`` only ever grow, and every user-scoped
+scan pays for rows nobody looks at day to day. ``archive_old_rows`` moves
+rows older than a retention window out of the main database into one SQLite
+file per calendar year under ``ARCHIVE_DIR``, keeping the hot file small
+enough to stay in the page cache and mmap window. At most
+``MAX_ATTACHED_ARCHIVES`` files are kept: beyond that, the oldest file also
+holds every earlier year, so readers can always attach all of them.
+
+Readers that want the full history (timeline, EDA export, user exports)
+ATTACH the archive files and read through a TEMP view per table that
+unions the main table with every archive: ``history_views`` for raw
+connections, ``history_entity`` for ORM sessions. ``answer_rows`` gets an
+``answer_rows_history`` view built over those per-table views. Pooled
+connections are handed back with the archives detached again
+(``detach_archives``), so no other checkout reads or locks the files.
+"""
+
+import os
+import re
+import time
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+from sqlalchemy import column, event, table
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.pool import Pool
+
+from app.config import DATA_DIR, get_env_var
+from app.exceptions import DatabaseError
+from app.models import CHANGE_LOG_TABLES, answer_rows_sql
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR: str = os.path.join(DATA_DIR, "archive")
+
+# Days of history kept in the main database (env overrides: SOULSENSE_ARCHIVE_RETENTION_DAYS,
+# SOULSENSE_JOURNAL_ARCHIVE_RETENTION_DAYS)
+ARCHIVE_RETENTION_DAYS: int = get_env_var("ARCHIVE_RETENTION_DAYS", 365, int)
+JOURNAL_ARCHIVE_RETENTION_DAYS: int = get_env_var("JOURNAL_ARCHIVE_RETENTION_DAYS", 730, int)
+
+# Archived table -> (epoch column, retention days, extra WHERE excluding rows that must stay)
+ARCHIVE_TABLES: Dict[str, Tuple[str, int, str]] = {
+    "responses": ("timestamp_epoch", ARCHIVE_RETENTION_DAYS, ""),
+    "attempt_answers": ("timestamp_epoch", ARCHIVE_RETENTION_DAYS, ""),
+    # Entries linked from an assessment result stay, the foreign key points into main
+    "journal_entries": ("entry_date_epoch", JOURNAL_ARCHIVE_RETENTION_DAYS,
+                        " AND id NOT IN (SELECT journal_entry_id FROM main.assessment_results"
+                        " WHERE journal_entry_id IS NOT NULL)"),
+}
+
+# SQLite allows 10 attached databases by default; keep room for callers' own.
+# Also the most archive files kept, so readers can attach every one.
+MAX_ATTACHED_ARCHIVES = 8
+
+_ARCHIVE_FILE = re.compile(r"^archive_(\d{4})\.db$")
+
+# Pool connection record info key: archives attached by history_entity(), detached at checkin
+_ARCHIVES_ATTACHED = "archives_attached"
+
+
+def archive_path(year: int) -> str:
+    """Archive file holding rows dated in the given year."""
+    return os.path.join(ARCHIVE_DIR, f"archive_{year}.db")
+
+
+def list_archives() -> List[Tuple[int, str]]:
+    """(year, path) of every archive file, newest first."""
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    archives = []
+    for filename in os.listdir(ARCHIVE_DIR):
+        match = _ARCHIVE_FILE.match(filename)
+        if match:
+            archives.append((int(match.group(1)), os.path.join(ARCHIVE_DIR, filename)))
+    return sorted(archives, reverse=True)
+
+
+def _attached(cursor: Any) -> Dict[str, str]:
+    return {row[1]: row[2] for row in cursor.execute("PRAGMA database_list").fetchall()}
+
+
+def _attach(cursor: Any, year: int, path: str) -> str:
+    alias = f"archive_{year}"
+    if alias not in _attached(cursor):
+        cursor.execute(f"ATTACH DATABASE ? AS {alias}", (path,))
+    return alias
+
+
+def _columns(cursor: Any, schema: str, table_name: str) -> List[Tuple[str, str]]:
+    """(name, declared type) of a table's columns, [] when it does not exist."""
+    return [(row[1], row[2]) for row in cursor.execute(f'PRAGMA {schema}.table_info("{table_name}")').fetchall()]
+
+
+def _ensure_archive_table(cursor: Any, alias: str, table_name: str) -> None:
+    """Create (or add newly introduced columns to) the archive copy of a table."""
+    epoch_column = ARCHIVE_TABLES[table_name][0]
+    main_columns = _columns(cursor, "main", table_name)
+    archive_columns = {name for name, _ in _columns(cursor, alias, table_name)}
+
+    if not archive_columns:
+        # Same columns, no foreign keys: the referenced rows live in the main database
+        definitions = ", ".join(
+            f'"{name}" INTEGER PRIMARY KEY' if name == "id" else f'"{name}" {col_type}'
+            for name, col_type in main_columns
+        )
+        cursor.execute(f'CREATE TABLE {alias}."{table_name}" ({definitions})')
+        for owner_column in ("user_id", "username"):
+            cursor.execute(
+                f'CREATE INDEX {alias}."idx_{table_name}_{owner_column}_epoch" '
+                f'ON "{table_name}" ({owner_column}, {epoch_column})'
+            )
+        return
+
+    for name, col_type in main_columns:
+        if name not in archive_columns:
+            cursor.execute(f'ALTER TABLE {alias}."{table_name}" ADD COLUMN "{name}" {col_type}')
+
+
+def _year_bounds(year: int) -> Tuple[int, int]:
+    start = datetime(year, 1, 1, tzinfo=timezone.utc)
+    end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def _merge_archive(conn: Any, source_year: int, target_year: int) -> None:
+    """Fold an archive file into another one (an older year into the oldest kept file)."""
+    cursor = conn.cursor()
+    source = _attach(cursor, source_year, archive_path(source_year))
+    target = _attach(cursor, target_year, archive_path(target_year))
+    for table_name in ARCHIVE_TABLES:
+        names = ", ".join(f'"{name}"' for name, _ in _columns(cursor, source, table_name))
+        if not names:
+            continue
+        _ensure_archive_table(cursor, target, table_name)
+        cursor.execute(
+            f'INSERT OR REPLACE INTO {target}."{table_name}" ({names}) '
+            f'SELECT {names} FROM {source}."{table_name}"'
+        )
+        # Emptied in the same transaction, so no row is ever read from both files
+        cursor.execute(f'DROP TABLE {source}."{table_name}"')
+    conn.commit()
+    detach_archives(conn, [source])
+    try:
+        os.remove(archive_path(source_year))
+    except OSError as e:
+        logger.warning(f"Could not remove merged archive {archive_path(source_year)}: {e}")
+
+
+def archive_old_rows(dbapi_conn: Optional[Any] = None, now: Optional[float] = None) -> Dict[str, int]:
+    """
+    Move rows past their table's retention window into per-year archive files.
+
+    Each row is copied into its year's archive (INSERT OR REPLACE on the
+    original id, so re-running after an interrupted run is harmless) and
+    then deleted from the main database. Years are processed in batches of
+    at most MAX_ATTACHED_ARCHIVES attached files, one transaction per batch.
+    When more years than that are archived, the oldest kept file also takes
+    the earlier years, and older existing files are merged into it.
+
+    Args:
+        dbapi_conn: Optional DB-API connection to the main database; defaults to a pooled one
+        now: Optional current time (epoch seconds) the retention windows count back from
+
+    Returns:
+        Number of rows moved per table
+    """
+    from app import db
+
+    owns_conn = dbapi_conn is None
+    conn = dbapi_conn or db.engine.raw_connection()
+    now = time.time() if now is None else now
+    moved = {table_name: 0 for table_name in ARCHIVE_TABLES}
+    cursor = conn.cursor()
+    attached_before = set(_attached(cursor))
+    try:
+        # Work out which archive years are needed before writing anything
+        plan: List[Tuple[str, int, int]] = []
+        for table_name, (epoch_column, retention_days, keep) in ARCHIVE_TABLES.items():
+            cutoff = int(now - retention_days * 86400)
+            years = cursor.execute(
+                f"SELECT DISTINCT CAST(strftime('%Y', {epoch_column}, 'unixepoch') AS INTEGER) "
+                f"FROM main.{table_name} WHERE {epoch_column} < ?{keep}",
+                (cutoff,)
+            ).fetchall()
+            plan.extend((table_name, year, cutoff) for (year,) in years)
+
+        existing = [year for year, _ in list_archives()]
+        years = sorted(set(existing) | {year for _, year, _ in plan}, reverse=True)
+        # Oldest year that keeps a file of its own; earlier years go into its file
+        floor = years[MAX_ATTACHED_ARCHIVES - 1] if len(years) > MAX_ATTACHED_ARCHIVES else None
+
+        if not plan and floor is None:
+            return moved
+
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        if floor is not None:
+            for year in existing:
+                if year < floor:
+                    _merge_archive(conn, year, floor)
+
+        def target_year(year: int) -> int:
+            return year if floor is None else max(year, floor)
+
+        targets = sorted({target_year(year) for _, year, _ in plan}, reverse=True)
+        has_change_log = bool(_columns(cursor, "main", "change_log"))
+        for i in range(0, len(targets), MAX_ATTACHED_ARCHIVES):
+            batch = set(targets[i:i + MAX_ATTACHED_ARCHIVES])
+            for table_name, year, cutoff in plan:
+                if target_year(year) in batch:
+                    moved[table_name] += _archive_year(cursor, table_name, year, target_year(year),
+                                                       cutoff, has_change_log)
+            conn.commit()
+            # DETACH needs no open transaction; frees the slots for the next batch
+            detach_archives(conn, [alias for alias in _attached(cursor) if alias not in attached_before])
+
+        logger.info(f"Archived old rows: {moved}")
+        return moved
+
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Archival failed: {e}", exc_info=True)
+        raise DatabaseError("Failed to archive old rows", original_exception=e)
+    finally:
+        detach_archives(conn, [alias for alias in _attached(cursor) if alias not in attached_before])
+        if owns_conn:
+            conn.close()
+
+
+def _archive_year(cursor: Any, table_name: str, year: int, target: int,
+                  cutoff: int, has_change_log: bool) -> int:
+    """Move one table's rows dated in ``year`` (and before ``cutoff``) into the ``target`` archive."""
+    alias = _attach(cursor, target, archive_path(target))
+    _ensure_archive_table(cursor, alias, table_name)
+
+    epoch_column, _, keep = ARCHIVE_TABLES[table_name]
+    start, end = _year_bounds(year)
+    where = f"{epoch_column} >= ? AND {epoch_column} < ?{keep}"
+    params = (start, min(end, cutoff))
+    names = ", ".join(f'"{name}"' for name, _ in _columns(cursor, "main", table_name))
+
+    cursor.execute(
+        f'INSERT OR REPLACE INTO {alias}."{table_name}" ({names}) '
+        f"SELECT {names} FROM main.{table_name} WHERE {where}",
+        params
+    )
+    if table_name == "journal_entries":
+        # The JSON tags column travels with the entry; the tag index rows go
+        cursor.execute(
+            f"DELETE FROM main.journal_tags WHERE entry_id IN "
+            f"(SELECT id FROM main.journal_entries WHERE {where})",
+            params
+        )
+    logged = has_change_log and table_name in CHANGE_LOG_TABLES
+    if logged:
+        head = cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM main.change_log").fetchone()[0]
+    cursor.execute(f"DELETE FROM main.{table_name} WHERE {where}", params)
+    moved: int = cursor.rowcount
+    if logged:
+        # Moving a row to the archive is not a deletion for change consumers
+        cursor.execute(
+            f"DELETE FROM main.change_log WHERE seq > ? AND table_name = ? AND op = 'D' "
+            f'AND row_id IN (SELECT id FROM {alias}."{table_name}" WHERE {where})',
+            (head, table_name, *params)
+        )
+    return moved
+
+
+def attach_archives(dbapi_conn: Any) -> List[str]:
+    """
+    ATTACH every archive file to a connection (already attached ones are kept).
+
+    Returns the schema aliases of the attached archives, newest first.
+
+    Raises:
+        DatabaseError: More archive files than can be attached; history read
+            from a subset would silently miss years. archive_old_rows()
+            merges the oldest files back under the limit.
+    """
+    cursor = dbapi_conn.cursor()
+    archives = list_archives()
+    if len(archives) > MAX_ATTACHED_ARCHIVES:
+        raise DatabaseError(
+            f"{len(archives)} archive files found but only {MAX_ATTACHED_ARCHIVES} can be attached; "
+            f"run scripts/archive_rows.py to merge the oldest ones"
+        )
+    return [_attach(cursor, year, path) for year, path in archives]
+
+
+def history_views(dbapi_conn: Any) -> Dict[str, str]:
+    """
+    (Re)create a TEMP view per archived table over main plus all archives.
+
+    Views are named ``<table>_history`` and select the main table's columns;
+    columns an older archive lacks read as NULL. ``answer_rows_history``
+    unpacks answers from the responses and attempt_answers history views.
+
+    Returns:
+        Table (or view) name -> history view name
+    """
+    aliases = attach_archives(dbapi_conn)
+    cursor = dbapi_conn.cursor()
+    with _temp_writes(cursor):
+        return _create_history_views(cursor, aliases)
+
+
+def detach_archives(dbapi_conn: Any, aliases: Optional[List[str]] = None) -> None:
+    """
+    DETACH archive files from a connection and drop the history views over them.
+
+    Must run outside a transaction (after commit or rollback).
+
+    Args:
+        dbapi_conn: DB-API connection the archives were attached to
+        aliases: Optional schema aliases to detach; defaults to every attached archive
+    """
+    cursor = dbapi_conn.cursor()
+    if aliases is None:
+        aliases = [alias for alias in _attached(cursor) if _ARCHIVE_FILE.match(f"{alias}.db")]
+    if not aliases:
+        return
+    with _temp_writes(cursor):
+        for view in [f"{table_name}_history" for table_name in ARCHIVE_TABLES] + ["answer_rows_history"]:
+            cursor.execute(f"DROP VIEW IF EXISTS temp.{view}")
+    for alias in aliases:
+        cursor.execute(f"DETACH DATABASE {alias}")
+
+
+@contextmanager
+def _temp_writes(cursor: Any) -> Generator[None, None, None]:
+    """
+    Allow TEMP schema changes on a query_only connection (such as the
+    analytics replica); they only change this connection.
+    """
+    query_only = cursor.execute("PRAGMA query_only").fetchone()[0]
+    if query_only:
+        cursor.execute("PRAGMA query_only = OFF")
+    try:
+        yield
+    finally:
+        if query_only:
+            cursor.execute("PRAGMA query_only = ON")
+
+
+def _create_history_views(cursor: Any, aliases: List[str]) -> Dict[str, str]:
+    views = {}
+    for table_name in ARCHIVE_TABLES:
+        names = [name for name, _ in _columns(cursor, "main", table_name)]
+        if not names:
+            continue
+        selects = [f"SELECT {', '.join(names)} FROM main.{table_name}"]
+        for alias in aliases:
+            present = {name for name, _ in _columns(cursor, alias, table_name)}
+            if present:
+                selects.append("SELECT " + ", ".join(
+                    name if name in present else f"NULL AS {name}" for name in names
+                ) + f" FROM {alias}.{table_name}")
+
+        view = f"{table_name}_history"
+        cursor.execute(f"DROP VIEW IF EXISTS temp.{view}")
+        cursor.execute(f"CREATE TEMP VIEW {view} AS " + " UNION ALL ".join(selects))
+        views[table_name] = view
+
+    if "responses" in views and "attempt_answers" in views:
+        cursor.execute("DROP VIEW IF EXISTS temp.answer_rows_history")
+        cursor.execute("CREATE TEMP VIEW answer_rows_history AS "
+                       + answer_rows_sql(views["responses"], views["attempt_answers"]))
+        views["answer_rows"] = "answer_rows_history"
+    return views
+
+
+def history_entity(session: Session, model: Any) -> Any:
+    """
+    ORM entity reading a model's full history (main table plus archives).
+
+    Returns the model itself when there are no archives, otherwise an alias
+    of it over the ``<table>_history`` view, usable in session.query() and
+    select() like the model.
+    """
+    table_name = model.__table__.name
+    if (table_name not in ARCHIVE_TABLES and table_name != "answer_rows") or not list_archives():
+        return model
+
+    pooled = session.connection().connection
+    views = history_views(pooled.dbapi_connection)
+    pooled.info[_ARCHIVES_ATTACHED] = True
+    view = table(views[table_name], *[column(c.name, c.type) for c in model.__table__.columns])
+    return aliased(model, view, adapt_on_names=True)
+
+
+@event.listens_for(Pool, "checkin")
+def _detach_on_checkin(dbapi_conn: Any, connection_record: Any) -> None:
+    """Hand pooled connections back without the archives history_entity() attached."""
+    if dbapi_conn is None or not connection_record.info.pop(_ARCHIVES_ATTACHED, False):
+        return
+    try:
+        detach_archives(dbapi_conn)
+    except Exception as e:
+        logger.warning(f"Could not detach archives, discarding connection: {e}")
+        connection_record.invalidate(e)
+
+
+def purge_user_rows(user_id: int, username: str) -> int:
+    """
+    Delete a user's rows from every archive file (account deletion).
+
+    Archive tables have no foreign keys, so the main database's cascades
+    never reach them.
+
+    Returns:
+        Number of archived rows deleted
+    """
+    import sqlite3
+
+    deleted = 0
+    for _, path in list_archives():
+        conn = sqlite3.connect(path)
+        try:
+            for table_name in ARCHIVE_TABLES:
+                if not _columns(conn.cursor(), "main", table_name):
+                    continue
+                cursor = conn.execute(
+                    f'DELETE FROM "{table_name}" WHERE user_id = ? OR username = ?',
+                    (user_id, username)
+                )
+                deleted += cursor.rowcount
+            conn.commit()
+        finally:
+            conn.close()
+    return deleted
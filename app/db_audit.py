@@ -0,0 +1,524 @@
+"""
+Query plan auditor and index advisor.
+
+Runs ``EXPLAIN QUERY PLAN`` over a registry of the queries the services
+actually issue (plus, optionally, statements captured by the SQL profiler)
+and reports:
+
+- full table scans and temporary B-trees used for ORDER BY / DISTINCT,
+- a suggested index for each flagged query (equality columns first, then
+  one range or ordering column, then selected columns for a covering index),
+- indexes no audited query uses, and indexes made redundant by a longer
+  index with the same leading columns. Every extra index on a table is
+  maintained on each INSERT, so these are write cost with no read benefit.
+
+Run ``python scripts/audit_queries.py`` for a report.
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import desc, func
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models import User, Score, AnswerRow, Question, JournalEntry, owner_key, owner_sql
+from app.services import answer_store
+from app.services.exam_service import ExamService
+from app.services.export_service import DATASETS
+from app.services.journal_service import JournalService
+from app.utils.pagination import seek_query
+
+logger = logging.getLogger(__name__)
+
+# Placeholder values used when building registry queries
+SAMPLE_USER_ID = 1
+SAMPLE_USERNAME = "sample_user"
+SAMPLE_EPOCH = 0
+SAMPLE_SESSION_KEY = "sample_session"
+SAMPLE_CURSOR = (SAMPLE_EPOCH, 1)
+
+# owner_filter() results a per-owner query is audited with, by name suffix:
+# the user_id of an account, and the username fallback for guests
+SAMPLE_OWNERS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ("", owner_key(SAMPLE_USER_ID, SAMPLE_USERNAME)),
+    (".guest", owner_key(None, SAMPLE_USERNAME)),
+)
+
+# A builder takes a session and an owner_filter() result and returns an
+# ORM query / Core select, or raw SQL with its parameters
+QueryBuilder = Callable[[Session, Dict[str, Any]], Union[Any, Tuple[str, Sequence[Any]]]]
+
+
+@dataclass
+class RegisteredQuery:
+    """
+    A service query to audit, with the code location that issues it.
+    per_owner queries are audited once per SAMPLE_OWNERS entry.
+    """
+    name: str
+    source: str
+    build: QueryBuilder
+    per_owner: bool = True
+
+
+def _raw_owner(owner: Dict[str, Any]) -> Tuple[str, Tuple[Any, ...]]:
+    return owner_sql(owner.get("user_id"), SAMPLE_USERNAME)
+
+
+# Service queries come from the builders the services run themselves
+QUERY_REGISTRY: List[RegisteredQuery] = [
+    RegisteredQuery(
+        "exam.recent_scores", "app/services/exam_service.py (ExamService.get_recent_scores)",
+        lambda s, owner: ExamService.recent_scores_query(s, owner)
+    ),
+    RegisteredQuery(
+        "exam.score_history_page", "app/services/exam_service.py (ExamService.get_score_history_page)",
+        lambda s, owner: seek_query(
+            ExamService.score_history_query(s, owner), Score.timestamp_epoch, Score.id, SAMPLE_CURSOR
+        )
+    ),
+    RegisteredQuery(
+        "exam.score_edge", "app/services/exam_service.py (ExamService.get_score_summary)",
+        lambda s, owner: ExamService.score_edge_query(s, owner, desc)
+    ),
+    RegisteredQuery(
+        "exam.assessment_results", "app/services/exam_service.py (ExamService.get_assessment_results)",
+        lambda s, owner: ExamService.assessment_results_query(SAMPLE_USER_ID, None, SAMPLE_EPOCH),
+        per_owner=False
+    ),
+    RegisteredQuery(
+        "journal.entries", "app/services/journal_service.py (JournalService.get_entries)",
+        lambda s, owner: JournalService.entries_query(owner)
+    ),
+    RegisteredQuery(
+        "journal.history_page", "app/services/journal_service.py (JournalService.get_history_page)",
+        lambda s, owner: seek_query(
+            JournalService.history_query(s, owner), JournalEntry.entry_date_epoch, JournalEntry.id, SAMPLE_CURSOR
+        )
+    ),
+    RegisteredQuery(
+        "journal.recent_entries", "app/services/journal_service.py (JournalService.get_recent_entries)",
+        lambda s, owner: JournalService.recent_entries_query(owner, SAMPLE_EPOCH)
+    ),
+    RegisteredQuery(
+        "journal.search", "app/services/journal_service.py (JournalService.search)",
+        lambda s, owner: JournalService.search_query(s, owner, "sample", start_date="2024-01-01").limit(100)
+    ),
+    RegisteredQuery(
+        "journal.entries_by_tags", "app/services/journal_service.py (JournalService.get_entries_by_tags)",
+        lambda s, owner: JournalService.entries_by_tags_query(s, owner, ["stress", "work"], match_all=True)
+    ),
+    RegisteredQuery(
+        "journal.tag_counts", "app/services/journal_service.py (JournalService.get_tag_counts)",
+        lambda s, owner: JournalService.tag_counts_query(s, owner).limit(10)
+    ),
+    *(
+        RegisteredQuery(
+            f"export.{name}", f"app/services/export_service.py (DATASETS[{name!r}])",
+            lambda s, owner, build=build: build(owner, SAMPLE_USERNAME, lambda entity: entity),
+            # Guests have no rows in user_id-only tables; their assessments export is WHERE false
+            per_owner=name != "assessments"
+        )
+        for name, build in DATASETS.items() if name != "profile"
+    ),
+    RegisteredQuery(
+        "answer_store.attempts", "app/services/answer_store.py (write_answers, link_score)",
+        lambda s, owner: answer_store.attempts_query(s, [SAMPLE_SESSION_KEY]),
+        per_owner=False
+    ),
+    RegisteredQuery(
+        "answer_store.legacy_rows", "app/services/answer_store.py (migrate_legacy_responses)",
+        lambda s, owner: answer_store.legacy_rows_query(SAMPLE_USERNAME),
+        per_owner=False
+    ),
+    RegisteredQuery(
+        "bias_checker.question_fairness", "app/ml/bias_checker.py (BiasChecker.check_question_fairness)",
+        lambda s, owner: ("SELECT question_id, AVG(response_value) FROM answer_rows r "
+                          "JOIN scores s ON r.attempt_id = s.attempt_id WHERE age IS NOT NULL "
+                          "GROUP BY question_id ORDER BY question_id", ()),
+        per_owner=False
+    ),
+    RegisteredQuery(
+        "daily_view.weekly_history", "app/ui/daily_view.py (DailyHistoryView.fetch_weekly_history)",
+        lambda s, owner: s.query(JournalEntry).filter_by(**owner)
+        .filter(JournalEntry.entry_date_epoch >= SAMPLE_EPOCH, JournalEntry.entry_date_epoch < SAMPLE_EPOCH + 7 * 86400)
+    ),
+    RegisteredQuery(
+        "models.resolve_user_id", "app/models.py (resolve_user_id)",
+        lambda s, owner: s.query(User.id).filter_by(username=SAMPLE_USERNAME),
+        per_owner=False
+    ),
+    RegisteredQuery(
+        "questions.active", "app/questions.py (initialize_questions)",
+        lambda s, owner: s.query(
+            Question.id, Question.question_text, Question.tooltip, Question.min_age, Question.max_age
+        ).filter(Question.is_active == 1).order_by(Question.id),
+        per_owner=False
+    ),
+    RegisteredQuery(
+        "analysis.user_scores", "app/analysis/time_based_analysis.py, app/ml/clustering.py",
+        lambda s, owner: s.query(Score).filter_by(**owner).order_by(Score.timestamp_epoch)
+    ),
+    RegisteredQuery(
+        "analysis.user_responses", "app/analysis/time_based_analysis.py, app/ml/clustering.py",
+        lambda s, owner: s.query(AnswerRow).filter_by(**owner).order_by(AnswerRow.timestamp_epoch)
+    ),
+    RegisteredQuery(
+        "analysis.returning_users", "app/analysis/time_based_analysis.py (identify_returning_users)",
+        lambda s, owner: s.query(Score.username, func.count(Score.id)).group_by(Score.username),
+        per_owner=False
+    ),
+    RegisteredQuery(
+        "clustering.usernames", "app/ml/clustering.py (extract_all_users_features)",
+        lambda s, owner: s.query(Score.username).distinct(),
+        per_owner=False
+    ),
+    RegisteredQuery(
+        "score_analyzer.age_group", "app/ml/score_analyzer.py (ScoreAnalyzer.get_age_group_statistics)",
+        lambda s, owner: s.query(Score).filter(Score.detailed_age_group == "18-25"),
+        per_owner=False
+    ),
+    RegisteredQuery(
+        "results.latest_score", "app/ui/results.py (ResultsManager.show_satisfaction_survey)",
+        lambda s, owner: s.query(Score).filter_by(**owner).order_by(Score.id.desc()).limit(1)
+    ),
+    RegisteredQuery(
+        "dashboard.eq_trends", "app/ui/dashboard.py (AnalyticsDashboard.show_eq_trends)",
+        lambda s, owner: (f"SELECT total_score, timestamp, id, sentiment_score FROM scores "
+                          f"WHERE {_raw_owner(owner)[0]} ORDER BY id", _raw_owner(owner)[1])
+    ),
+    RegisteredQuery(
+        "dashboard.journal_analytics", "app/ui/dashboard.py (AnalyticsDashboard.show_journal_analytics)",
+        lambda s, owner: (f"SELECT sentiment_score, emotional_patterns FROM journal_entries "
+                          f"WHERE {_raw_owner(owner)[0]} ORDER BY id", _raw_owner(owner)[1])
+    ),
+]
+
+
+@dataclass
+class QueryAudit:
+    """Plan and findings for one audited statement."""
+    name: str
+    source: str
+    sql: str
+    plan: List[str] = field(default_factory=list)
+    full_scans: List[str] = field(default_factory=list)
+    temp_btrees: List[str] = field(default_factory=list)
+    indexes_used: List[str] = field(default_factory=list)
+    suggestion: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def flagged(self) -> bool:
+        return bool(self.full_scans or self.temp_btrees)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "source": self.source,
+            "sql": self.sql,
+            "plan": self.plan,
+            "full_scans": self.full_scans,
+            "temp_btrees": self.temp_btrees,
+            "indexes_used": self.indexes_used,
+            "suggestion": self.suggestion,
+            "error": self.error,
+        }
+
+
+# ==================== PLAN ANALYSIS ====================
+
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?( USING (?:COVERING )?INDEX \w+)?$")
+# Views and subqueries evaluated into a co-routine / temp table; scanning those is not a table scan
+_SUBQUERY = re.compile(r"^(?:CO-ROUTINE|MATERIALIZE) (\w+)")
+_INDEX_USED = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+_FROM = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+_WHERE = re.compile(r"\bWHERE\s+(.*?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|$)", re.IGNORECASE | re.DOTALL)
+_ORDER = re.compile(r"\b(?:ORDER|GROUP) BY\s+(.*?)(?:\bLIMIT\b|$)", re.IGNORECASE | re.DOTALL)
+_SELECT = re.compile(r"^\s*SELECT\s+(?:DISTINCT\s+)?(.*?)\s+FROM\b", re.IGNORECASE | re.DOTALL)
+_EQ = re.compile(r"(?:\w+\.)?(\w+)\s*(?:=|\bIS\b|\bIN\b)\s*(?!\s*\w+\.)", re.IGNORECASE)
+_RANGE = re.compile(r"(?:\w+\.)?(\w+)\s*(?:>=|<=|>|<|\bBETWEEN\b|\bLIKE\b)", re.IGNORECASE)
+_COLUMN = re.compile(r"^(?:\w+\.)?(\w+)(?:\s+AS\s+\w+)?$", re.IGNORECASE)
+_ORDER_COLUMN = re.compile(r"^(?:\w+\.)?(\w+)(?:\s+(?:ASC|DESC))?$", re.IGNORECASE)
+
+# Beyond this many columns a covering index costs more than it saves
+MAX_COVERING_COLUMNS = 5
+
+
+def compile_query(query: Any) -> str:
+    """SQLite SQL text for an ORM query or Core select, with literal values inlined."""
+    from sqlalchemy.dialects import sqlite
+
+    statement = getattr(query, "statement", query)
+    return str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def explain(conn: Any, sql: str, params: Sequence[Any] = ()) -> List[str]:
+    """Detail column of EXPLAIN QUERY PLAN for a statement."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params)).fetchall()
+    return [row[-1] for row in rows]
+
+
+def suggest_index(sql: str, column_types: Optional[Dict[str, str]] = None,
+                  table: Optional[str] = None) -> Optional[str]:
+    """
+    Derive a CREATE INDEX for a single-table statement: equality columns,
+    then one range or ordering column, then the selected columns when that
+    makes the index covering. Free-form TEXT columns (per column_types)
+    are never copied into an index just to cover a select.
+
+    With table set, the statement reads a view over that table: the index
+    goes on the table and only uses columns it has (per column_types).
+    """
+    tables = _FROM.findall(sql)
+    if len(set(tables)) != 1 or re.search(r"\bJOIN\b", sql, re.IGNORECASE):
+        return None
+    present = (lambda c: c in (column_types or {})) if table else (lambda c: True)
+    table = table or tables[0]
+
+    where = _WHERE.search(sql)
+    where_text = where.group(1) if where else ""
+    eq_cols = [c for c in dict.fromkeys(_EQ.findall(where_text)) if present(c)]
+    range_cols = [c for c in dict.fromkeys(_RANGE.findall(where_text)) if c not in eq_cols and present(c)]
+
+    order_cols: List[str] = []
+    order = _ORDER.search(sql)
+    if order:
+        for part in order.group(1).split(","):
+            match = _ORDER_COLUMN.match(part.strip())
+            if match and present(match.group(1)):
+                order_cols.append(match.group(1))
+
+    columns = list(eq_cols)
+    if range_cols:
+        columns.append(range_cols[0])
+    else:
+        columns.extend(c for c in order_cols if c not in columns)
+    if not columns:
+        return None
+
+    select = _SELECT.search(sql)
+    if select:
+        parts = select.group(1).split(",")
+        selected = [m.group(1) for m in map(_COLUMN.match, (part.strip() for part in parts)) if m]
+        if len(selected) == len(parts) and all(map(present, selected)):
+            extra = [c for c in selected if c not in columns and c != "id"]
+            wide = any((column_types or {}).get(c, "").upper() == "TEXT" for c in extra)
+            if not wide and len(columns) + len(extra) <= MAX_COVERING_COLUMNS:
+                columns.extend(extra)
+
+    return f"CREATE INDEX idx_{table}_{'_'.join(columns)} ON {table}({', '.join(columns)})"
+
+
+def audit_statement(conn: Any, name: str, source: str, sql: str, params: Sequence[Any] = ()) -> QueryAudit:
+    """Explain one statement and classify its plan."""
+    audit = QueryAudit(name=name, source=source, sql=" ".join(sql.split()))
+    try:
+        audit.plan = explain(conn, sql, params)
+    except Exception as e:
+        audit.error = str(e)
+        return audit
+
+    filtered = _WHERE.search(audit.sql) is not None
+    subqueries = {m.group(1) for m in map(_SUBQUERY.match, audit.plan) if m}
+    for detail in audit.plan:
+        scan = _SCAN.match(detail)
+        # Walking a whole index is only a problem when a WHERE clause could have seeked into one
+        if scan and scan.group(1) not in subqueries and (not scan.group(2) or filtered):
+            audit.full_scans.append(scan.group(1))
+        if "USE TEMP B-TREE" in detail:
+            audit.temp_btrees.append(detail)
+        audit.indexes_used.extend(_INDEX_USED.findall(detail))
+
+    if audit.flagged:
+        audit.suggestion = _suggest(conn, audit)
+    return audit
+
+
+def _suggest(conn: Any, audit: QueryAudit) -> Optional[str]:
+    """
+    suggest_index() for a flagged statement. A statement over a view (such
+    as answer_rows) gets one index per base table its plan scanned, since
+    a view cannot be indexed.
+    """
+    tables = _FROM.findall(audit.sql)
+    if not tables:
+        return None
+    sources = _view_sources(conn, tables[0])
+    if not sources:
+        return suggest_index(audit.sql, _column_types(conn, tables[0]))
+
+    suggestions = []
+    for base in dict.fromkeys(sources[name] for name in audit.full_scans if name in sources):
+        suggestion = suggest_index(audit.sql, _column_types(conn, base), table=base)
+        if suggestion:
+            suggestions.append(suggestion)
+    return "; ".join(suggestions) or None
+
+
+# FROM/JOIN source in a view's SELECT, with its alias
+_VIEW_SOURCE = re.compile(
+    r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:ON|WHERE|JOIN|UNION|GROUP|ORDER|LIMIT)\b)(\w+))?",
+    re.IGNORECASE
+)
+
+
+def _view_sources(conn: Any, name: str) -> Dict[str, str]:
+    """Table (and alias) -> base table read by a view; empty when name is not a view."""
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'view' AND name = ?", (name,)).fetchone()
+    if not row:
+        return {}
+    sources = {}
+    for base, alias in _VIEW_SOURCE.findall(row[0]):
+        sources[base] = base
+        if alias:
+            sources[alias] = base
+    return sources
+
+
+def _column_types(conn: Any, table: str) -> Dict[str, str]:
+    return {r[1]: r[2] for r in conn.execute(f'PRAGMA table_info("{table}")').fetchall()}
+
+
+def audit_registry(conn: Any, session: Session,
+                   registry: Optional[List[RegisteredQuery]] = None) -> List[QueryAudit]:
+    """Audit every registered service query, per owner form where it applies."""
+    results = []
+    for entry in registry or QUERY_REGISTRY:
+        for suffix, owner in SAMPLE_OWNERS if entry.per_owner else SAMPLE_OWNERS[:1]:
+            built = entry.build(session, owner)
+            if isinstance(built, tuple):
+                sql, params = built
+            else:
+                sql, params = compile_query(built), ()
+            results.append(audit_statement(conn, entry.name + suffix, entry.source, sql, params))
+    return results
+
+
+def audit_profile_statements(conn: Any, profile: Dict[str, Any]) -> List[QueryAudit]:
+    """
+    Audit SELECTs captured by the SQL profiler (app.db_profiler).
+    Literals were normalized to '?', so each placeholder is bound to NULL;
+    the plan does not depend on the bound values.
+    """
+    results = []
+    for stats in profile.get("statements", []):
+        sql = stats["statement"].replace("IN (?...)", "IN (?)")
+        if not sql.upper().startswith("SELECT"):
+            continue
+        results.append(audit_statement(
+            conn, f"profile x{stats['count']}", stats["call_site"], sql, [None] * sql.count("?")
+        ))
+    return results
+
+
+# ==================== INDEX USAGE ====================
+
+def list_indexes(conn: Any, tables: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """User-created indexes: name -> {table, columns, unique}."""
+    rows = conn.execute(
+        "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+    ).fetchall()
+    indexes = {}
+    for name, table in rows:
+        if tables is not None and table not in tables:
+            continue
+        columns = [r[2] for r in conn.execute(f'PRAGMA index_info("{name}")').fetchall()]
+        unique = any(r[1] == name and r[2] for r in conn.execute(f'PRAGMA index_list("{table}")').fetchall())
+        indexes[name] = {"table": table, "columns": columns, "unique": unique}
+    return indexes
+
+
+def find_unused_indexes(conn: Any, audits: List[QueryAudit]) -> List[Dict[str, Any]]:
+    """
+    Non-unique indexes on audited tables that no audited plan uses,
+    and indexes whose columns are a leading prefix of another index.
+    """
+    audited_tables = set()
+    for audit in audits:
+        for table in _FROM.findall(audit.sql):
+            # A query on a view reads (and can use the indexes of) its base tables
+            audited_tables.add(table)
+            audited_tables.update(_view_sources(conn, table).values())
+    used = {name for audit in audits for name in audit.indexes_used}
+    indexes = list_indexes(conn, sorted(audited_tables))
+
+    findings = []
+    for name, info in sorted(indexes.items(), key=lambda kv: (kv[1]["table"], kv[0])):
+        if info["unique"] or name in used:
+            continue
+        covered_by = next(
+            (other for other, o in indexes.items()
+             if other != name and o["table"] == info["table"]
+             and len(o["columns"]) > len(info["columns"])
+             and o["columns"][:len(info["columns"])] == info["columns"]),
+            None
+        )
+        findings.append({
+            "index": name,
+            "table": info["table"],
+            "columns": info["columns"],
+            "redundant_with": covered_by,
+            "indexes_on_table": sum(1 for o in indexes.values() if o["table"] == info["table"]),
+        })
+    return findings
+
+
+def run_audit(engine: Optional[Engine] = None, profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Audit the registry (and optional profiler capture) against a database."""
+    from app import db
+
+    engine = engine or db.engine
+    raw = engine.raw_connection()
+    session = Session(bind=engine)
+    try:
+        audits = audit_registry(raw, session)
+        if profile:
+            audits.extend(audit_profile_statements(raw, profile))
+        unused = find_unused_indexes(raw, audits)
+    finally:
+        session.close()
+        raw.close()
+
+    return {
+        "queries": [a.to_dict() for a in audits],
+        "flagged": [a.name for a in audits if a.flagged],
+        "suggestions": sorted({a.suggestion for a in audits if a.suggestion}),
+        "unused_indexes": unused,
+    }
+
+
+def format_audit(report: Dict[str, Any], verbose: bool = False) -> str:
+    """Plain-text view of run_audit() output."""
+    lines = []
+    for q in report["queries"]:
+        if q["error"]:
+            status = "ERROR"
+        elif q["full_scans"] or q["temp_btrees"]:
+            status = "WARN "
+        else:
+            status = "ok   "
+        lines.append(f"[{status}] {q['name']:<28} {q['source']}")
+        if q["error"]:
+            lines.append(f"          {q['error']}")
+        if verbose or status == "WARN ":
+            for detail in q["plan"]:
+                lines.append(f"          {detail}")
+        if q["suggestion"]:
+            lines.append(f"          suggest: {q['suggestion']}")
+
+    lines.append("")
+    if report["unused_indexes"]:
+        lines.append("Indexes not used by any audited query (maintained on every insert):")
+        for ix in report["unused_indexes"]:
+            note = f" - redundant with {ix['redundant_with']}" if ix["redundant_with"] else ""
+            lines.append(
+                f"  {ix['table']}.{ix['index']} ({', '.join(ix['columns'])})"
+                f" [{ix['indexes_on_table']} indexes on table]{note}"
+            )
+    else:
+        lines.append("Every index is used by at least one audited query.")
+    return "\n".join(lines)
@@ -0,0 +1,152 @@
+"""
+Change data capture.
+
+Triggers on the tables in ``app.models.CHANGE_LOG_TABLES`` append one
+``change_log`` row per inserted, updated or deleted row: ``(seq, table_name,
+op, row_id, user_id, ts)``. Consumers (caches, rollups, sync) keep a durable
+cursor in ``change_consumers`` and read the log incrementally instead of
+rescanning tables:
+
+    register_consumer("score_rollup")
+    changes = read_changes("score_rollup")
+    ... apply them ...
+    acknowledge("score_rollup", changes[-1].seq)
+
+Delivery is at-least-once: a consumer that fails before acknowledging sees
+the same changes again. Rows every consumer has acknowledged are removed by
+``prune_change_log``, run by the maintenance scheduler. Rows moved to the
+archive files (app.db_archive) are not logged as deletes.
+"""
+
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from app.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Changes returned per read_changes() call by default
+CHANGE_BATCH_SIZE = 500
+
+
+class Change(NamedTuple):
+    seq: int
+    table: str
+    op: str  # 'I', 'U' or 'D'
+    row_id: int
+    user_id: Optional[int]
+    ts: int
+
+
+@contextmanager
+def _connection(dbapi_conn: Optional[Any]) -> Iterator[Any]:
+    """The given DB-API connection (committed on success), or a pooled one to the main database."""
+    from app import db
+
+    owns_conn = dbapi_conn is None
+    conn = dbapi_conn or db.engine.raw_connection()
+    try:
+        yield conn
+        conn.commit()
+    except ValueError:
+        conn.rollback()
+        raise
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Change log operation failed: {e}", exc_info=True)
+        raise DatabaseError("Change log operation failed", original_exception=e)
+    finally:
+        if owns_conn:
+            conn.close()
+
+
+def _head(cursor: Any) -> int:
+    # sqlite_sequence keeps the high-water mark even when the log is empty
+    row = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return row[0] if row else 0
+
+
+def head(dbapi_conn: Optional[Any] = None) -> int:
+    """seq of the latest logged change (0 before the first)."""
+    with _connection(dbapi_conn) as conn:
+        return _head(conn.cursor())
+
+
+def register_consumer(name: str, from_start: bool = False, dbapi_conn: Optional[Any] = None) -> int:
+    """
+    Create a consumer cursor if it does not exist yet and return its position.
+
+    New consumers start at the current head (only later changes are
+    delivered), or with from_start at the oldest change still logged.
+    """
+    with _connection(dbapi_conn) as conn:
+        cursor = conn.cursor()
+        start = 0 if from_start else _head(cursor)
+        cursor.execute(
+            "INSERT OR IGNORE INTO change_consumers (name, last_seq, updated_at) VALUES (?, ?, ?)",
+            (name, start, datetime.utcnow().isoformat())
+        )
+        return cursor.execute("SELECT last_seq FROM change_consumers WHERE name = ?", (name,)).fetchone()[0]
+
+
+def unregister_consumer(name: str, dbapi_conn: Optional[Any] = None) -> None:
+    """Drop a consumer so it no longer holds back pruning."""
+    with _connection(dbapi_conn) as conn:
+        conn.cursor().execute("DELETE FROM change_consumers WHERE name = ?", (name,))
+
+
+def read_changes(name: str, limit: int = CHANGE_BATCH_SIZE, tables: Optional[Sequence[str]] = None,
+                 dbapi_conn: Optional[Any] = None) -> List[Change]:
+    """
+    Up to limit changes after the consumer's cursor, oldest first.
+
+    Does not move the cursor; call acknowledge() once they are applied.
+    tables restricts the result to some tables (the cursor still covers all).
+    """
+    with _connection(dbapi_conn) as conn:
+        cursor = conn.cursor()
+        row = cursor.execute("SELECT last_seq FROM change_consumers WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown change consumer: {name!r}")
+
+        sql = "SELECT seq, table_name, op, row_id, user_id, ts FROM change_log WHERE seq > ?"
+        params: List[Any] = [row[0]]
+        if tables:
+            sql += f" AND table_name IN ({', '.join('?' * len(tables))})"
+            params.extend(tables)
+        sql += " ORDER BY seq LIMIT ?"
+        params.append(limit)
+        return [Change(*r) for r in cursor.execute(sql, params).fetchall()]
+
+
+def acknowledge(name: str, seq: int, dbapi_conn: Optional[Any] = None) -> None:
+    """Move a consumer's cursor forward to seq (never backwards)."""
+    with _connection(dbapi_conn) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE change_consumers SET last_seq = MAX(last_seq, ?), updated_at = ? WHERE name = ?",
+            (seq, datetime.utcnow().isoformat(), name)
+        )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Unknown change consumer: {name!r}")
+
+
+def prune_change_log(dbapi_conn: Any) -> Dict[str, Any]:
+    """
+    Delete changes every consumer has acknowledged (all of them when there
+    are no consumers: new ones start at the head). Maintenance task.
+    """
+    cursor = dbapi_conn.cursor()
+    if not cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_log'").fetchone():
+        return {"pruned": 0, "skipped": "no change_log table"}
+
+    cursor.execute(
+        "DELETE FROM change_log WHERE seq <= "
+        "COALESCE((SELECT MIN(last_seq) FROM change_consumers), (SELECT MAX(seq) FROM change_log))"
+    )
+    pruned = cursor.rowcount
+    dbapi_conn.commit()
+    remaining = cursor.execute("SELECT COUNT(*) FROM change_log").fetchone()[0]
+    return {"pruned": pruned, "remaining": remaining}
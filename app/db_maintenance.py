@@ -0,0 +1,248 @@
+"""
+Scheduled SQLite maintenance.
+
+Without upkeep the planner works from stale (or missing) statistics, the
+WAL file grows until something checkpoints it, and pages freed by deletes
+stay in the file forever. ``MaintenanceScheduler`` runs four tasks, each
+on its own interval, whenever ``tick()`` is called:
+
+- ``optimize``: ``ANALYZE`` on first run, then ``PRAGMA optimize``
+- ``checkpoint``: ``PRAGMA wal_checkpoint(TRUNCATE)``
+- ``vacuum``: a bounded ``PRAGMA incremental_vacuum`` (needs auto_vacuum=INCREMENTAL)
+- ``prune_changes``: drop change_log rows all consumers have acknowledged (app.db_changes)
+
+The Tk app ticks it from its idle loop, the CLI on exit and the FastAPI
+backend from a background task; ``scripts/db_maintenance.py`` runs it on
+demand. ``database_stats`` reports page counts and fragmentation.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.config import get_env_var
+from app.db_changes import prune_change_log
+from app.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Task intervals (env overrides: SOULSENSE_MAINTENANCE_OPTIMIZE_SECONDS,
+# SOULSENSE_MAINTENANCE_CHECKPOINT_SECONDS, SOULSENSE_MAINTENANCE_VACUUM_SECONDS,
+# SOULSENSE_MAINTENANCE_PRUNE_CHANGES_SECONDS)
+MAINTENANCE_INTERVALS: Dict[str, float] = {
+    "optimize": get_env_var("MAINTENANCE_OPTIMIZE_SECONDS", 3600.0, float),
+    "checkpoint": get_env_var("MAINTENANCE_CHECKPOINT_SECONDS", 300.0, float),
+    "vacuum": get_env_var("MAINTENANCE_VACUUM_SECONDS", 86400.0, float),
+    "prune_changes": get_env_var("MAINTENANCE_PRUNE_CHANGES_SECONDS", 3600.0, float),
+}
+
+# Free pages released per incremental_vacuum run, so a tick never blocks for long
+VACUUM_PAGES_PER_RUN: int = 2000
+# Rows sampled per index by PRAGMA optimize's ANALYZE
+ANALYSIS_LIMIT: int = 400
+
+_AUTO_VACUUM_MODES = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+
+
+def _pragma(cursor: Any, statement: str) -> Any:
+    row = cursor.execute(f"PRAGMA {statement}").fetchone()
+    return row[0] if row else None
+
+
+def database_stats(dbapi_conn: Any) -> Dict[str, Any]:
+    """
+    Page counts, fragmentation and file sizes of a connection's main database.
+
+    ``fragmentation`` is the share of pages on the freelist: space the file
+    holds but no table or index uses.
+    """
+    cursor = dbapi_conn.cursor()
+    page_size = _pragma(cursor, "page_size")
+    page_count = _pragma(cursor, "page_count")
+    freelist_count = _pragma(cursor, "freelist_count")
+
+    path = next((row[2] for row in cursor.execute("PRAGMA database_list").fetchall() if row[1] == "main"), "")
+    wal_path = f"{path}-wal"
+
+    return {
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist_count,
+        "fragmentation": round(freelist_count / page_count, 4) if page_count else 0.0,
+        "file_bytes": page_size * page_count,
+        "wal_bytes": os.path.getsize(wal_path) if path and os.path.exists(wal_path) else 0,
+        "journal_mode": _pragma(cursor, "journal_mode"),
+        "auto_vacuum": _AUTO_VACUUM_MODES.get(_pragma(cursor, "auto_vacuum"), "UNKNOWN"),
+    }
+
+
+def optimize(dbapi_conn: Any) -> Dict[str, Any]:
+    """Refresh planner statistics: full ANALYZE when there are none yet, else PRAGMA optimize."""
+    cursor = dbapi_conn.cursor()
+    has_stats = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone() is not None
+
+    cursor.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    if has_stats:
+        cursor.execute("PRAGMA optimize")
+    else:
+        cursor.execute("ANALYZE")
+    dbapi_conn.commit()
+    return {"analyzed": not has_stats}
+
+
+def checkpoint_wal(dbapi_conn: Any, mode: str = "TRUNCATE") -> Dict[str, Any]:
+    """
+    Copy WAL frames back into the database file and (TRUNCATE) reset the WAL.
+
+    ``busy`` is 1 when a reader or writer blocked the checkpoint from finishing.
+    """
+    busy, log_frames, checkpointed = dbapi_conn.cursor().execute(
+        f"PRAGMA wal_checkpoint({mode})"
+    ).fetchone()
+    if busy:
+        logger.debug("WAL checkpoint could not complete, database busy")
+    return {"busy": busy, "log_frames": log_frames, "checkpointed_frames": checkpointed}
+
+
+def incremental_vacuum(dbapi_conn: Any, pages: int = VACUUM_PAGES_PER_RUN) -> Dict[str, Any]:
+    """Release up to ``pages`` free pages back to the filesystem."""
+    cursor = dbapi_conn.cursor()
+    if _pragma(cursor, "auto_vacuum") != 2:
+        return {"freed_pages": 0, "skipped": "auto_vacuum is not INCREMENTAL"}
+
+    before = _pragma(cursor, "freelist_count")
+    # execute() only steps the pragma once (one page); executescript runs it to completion
+    dbapi_conn.commit()
+    cursor.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+    return {"freed_pages": before - _pragma(cursor, "freelist_count")}
+
+
+def enable_incremental_vacuum(dbapi_conn: Any) -> bool:
+    """
+    Switch an existing database to auto_vacuum=INCREMENTAL.
+
+    Takes a full VACUUM (rewrites the file), so it is an explicit one-off
+    step. New databases get the setting in ``receive_before_create``.
+    Returns False when the database was already incremental.
+    """
+    cursor = dbapi_conn.cursor()
+    if _pragma(cursor, "auto_vacuum") == 2:
+        return False
+    dbapi_conn.commit()
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    cursor.execute("VACUUM")
+    logger.info("Database converted to auto_vacuum=INCREMENTAL")
+    return True
+
+
+# Task name -> task; each takes a DB-API connection and returns its report
+_TASKS: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    "optimize": optimize,
+    "checkpoint": checkpoint_wal,
+    "vacuum": incremental_vacuum,
+    "prune_changes": prune_change_log,
+}
+
+MAINTENANCE_TASKS = tuple(_TASKS)
+
+
+class MaintenanceScheduler:
+    """Runs each maintenance task once its interval has elapsed."""
+
+    def __init__(self, db_path: Optional[str] = None, intervals: Optional[Dict[str, float]] = None) -> None:
+        self.db_path = db_path
+        self.intervals = dict(MAINTENANCE_INTERVALS, **(intervals or {}))
+        # Every task is due on the first tick
+        self._last_run: Dict[str, float] = {name: 0.0 for name in MAINTENANCE_TASKS}
+        self._lock = threading.Lock()
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Tasks whose interval has elapsed."""
+        now = time.monotonic() if now is None else now
+        return [
+            name for name in MAINTENANCE_TASKS
+            if self._last_run[name] == 0.0 or now - self._last_run[name] >= self.intervals[name]
+        ]
+
+    def request(self, *tasks: str) -> None:
+        """Make tasks due on the next tick (e.g. vacuum after a large delete)."""
+        for name in tasks:
+            self._last_run[name] = 0.0
+
+    def run(self, tasks: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Run tasks (default: all) now and return a report with the results
+        and database stats before and after.
+        """
+        from app.db import get_connection
+
+        names = list(tasks or MAINTENANCE_TASKS)
+        unknown = set(names) - set(_TASKS)
+        if unknown:
+            raise ValueError(f"Unknown maintenance task(s): {', '.join(sorted(unknown))}")
+
+        with self._lock:
+            conn = get_connection(self.db_path)
+            try:
+                report: Dict[str, Any] = {"before": database_stats(conn), "tasks": {}}
+                for name in names:
+                    started = time.perf_counter()
+                    result = _TASKS[name](conn)
+                    result["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                    report["tasks"][name] = result
+                    self._last_run[name] = time.monotonic()
+                report["after"] = database_stats(conn)
+            except Exception as e:
+                logger.error(f"Database maintenance failed: {e}", exc_info=True)
+                raise DatabaseError("Database maintenance failed.", original_exception=e)
+            finally:
+                conn.close()
+
+        self.last_report = report
+        logger.info(f"Database maintenance ran {', '.join(names)}: {report['after']}")
+        return report
+
+    def tick(self) -> Optional[Dict[str, Any]]:
+        """Run whatever is due; never raises. Returns the report, or None."""
+        names = self.due()
+        if not names:
+            return None
+        try:
+            return self.run(names)
+        except Exception as e:
+            logger.warning(f"Scheduled maintenance skipped: {e}")
+            return None
+
+
+_scheduler: Optional[MaintenanceScheduler] = None
+
+
+def get_maintenance_scheduler(db_path: Optional[str] = None) -> MaintenanceScheduler:
+    """Process-wide scheduler for the main database (or db_path on first call)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = MaintenanceScheduler(db_path)
+    return _scheduler
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human readable maintenance report."""
+    before, after = report["before"], report["after"]
+    lines = [
+        "Database maintenance",
+        f"  pages: {before['page_count']} -> {after['page_count']} "
+        f"({after['page_size']} bytes each, {after['file_bytes'] / 1048576:.1f} MB)",
+        f"  free pages: {before['freelist_count']} -> {after['freelist_count']} "
+        f"(fragmentation {after['fragmentation']:.1%})",
+        f"  WAL: {before['wal_bytes']} -> {after['wal_bytes']} bytes",
+        f"  auto_vacuum: {after['auto_vacuum']}",
+    ]
+    for name, result in report["tasks"].items():
+        details = ", ".join(f"{key}={value}" for key, value in result.items())
+        lines.append(f"  {name}: {details}")
+    return "\n".join(lines)
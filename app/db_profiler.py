@@ -0,0 +1,321 @@
+"""
+SQL statement instrumentation (opt-in).
+
+When enabled (``sql_profiling`` feature flag, or ``enable_sql_profiling()``),
+every statement executed on the shared engine is timed through SQLAlchemy's
+``before_cursor_execute`` / ``after_cursor_execute`` events and aggregated
+by normalized statement text and application call site: count, rows,
+total/max latency and a latency histogram.
+
+Statements issued repeatedly from the same call site in a tight burst are
+flagged as N+1 suspects (e.g. a per-user query inside a loop over users).
+Results can be dumped to JSON and viewed with ``scripts/sql_profile.py``.
+"""
+
+import os
+import re
+import sys
+import time
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import BASE_DIR, DATA_DIR, get_env_var
+from app.utils.atomic import atomic_write
+
+logger = logging.getLogger(__name__)
+
+SQL_PROFILE_PATH: str = os.path.join(DATA_DIR, "sql_profile.json")
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0, 500.0)
+
+# Same statement from the same call site this many times, each within the
+# window of the previous one, is reported as an N+1 pattern
+N_PLUS_ONE_THRESHOLD: int = get_env_var("SQL_PROFILE_NPLUS1_THRESHOLD", 10, int)
+N_PLUS_ONE_WINDOW_SECONDS: float = 0.5
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)+\s*\?\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_THIS_FILE = os.path.abspath(__file__)
+_SITE_MARKERS = (os.sep + "site-packages" + os.sep, os.sep + "dist-packages" + os.sep)
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse literals, IN-lists and whitespace so equivalent statements group together."""
+    text = _STRING_LITERAL.sub("?", statement)
+    text = _NUMBER_LITERAL.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _IN_LIST.sub("IN (?...)", text)
+
+
+def _find_call_site() -> Tuple[str, Optional[str]]:
+    """
+    Return ("path:line (function)") for the innermost application frame
+    that issued the statement, plus the next enclosing application function.
+    """
+    frame: Optional[FrameType] = sys._getframe(1)
+    site: Optional[str] = None
+    site_func: Optional[str] = None
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename != _THIS_FILE and filename.startswith(BASE_DIR) \
+                and not any(marker in filename for marker in _SITE_MARKERS):
+            location = f"{os.path.relpath(filename, BASE_DIR)}:{frame.f_lineno} ({frame.f_code.co_name})"
+            if site is None:
+                site, site_func = location, frame.f_code.co_name
+            elif frame.f_code.co_name != site_func:
+                return site, location
+        frame = frame.f_back
+    return site or "<unknown>", None
+
+
+@dataclass
+class StatementStats:
+    """Aggregated timings for one (normalized statement, call site) pair."""
+    statement: str
+    call_site: str
+    caller: Optional[str] = None
+    count: int = 0
+    rows: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    max_burst: int = 0
+    _burst: int = field(default=0, repr=False)
+    _last_at: float = field(default=0.0, repr=False)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def record(self, elapsed_ms: float, rowcount: int, now: float, window: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if rowcount > 0:
+            self.rows += rowcount
+
+        bucket = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                bucket = i
+                break
+        self.histogram[bucket] += 1
+
+        self._burst = self._burst + 1 if now - self._last_at <= window else 1
+        self._last_at = now
+        self.max_burst = max(self.max_burst, self._burst)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "call_site": self.call_site,
+            "caller": self.caller,
+            "count": self.count,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.mean_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "histogram": dict(zip([f"<={b}ms" for b in LATENCY_BUCKETS_MS] + ["slower"], self.histogram)),
+            "max_burst": self.max_burst,
+        }
+
+
+class _RowCountingCursor:
+    """
+    DBAPI cursor proxy that adds rows to a statement's stats as they are fetched.
+    sqlite3 reports rowcount -1 for SELECT, so reads are counted here instead.
+    """
+
+    def __init__(self, cursor: Any, stats: StatementStats, lock: threading.Lock) -> None:
+        self._cursor = cursor
+        self._stats = stats
+        self._lock = lock
+
+    def _count(self, rows: int) -> None:
+        if rows:
+            with self._lock:
+                self._stats.rows += rows
+
+    def fetchone(self) -> Any:
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._count(1)
+        return row
+
+    def fetchmany(self, *args: Any, **kwargs: Any) -> List[Any]:
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        rows = self._cursor.fetchall()
+        self._count(len(rows))
+        return rows
+
+    def __iter__(self) -> Any:
+        for row in self._cursor:
+            self._count(1)
+            yield row
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+
+class SQLProfiler:
+    """Collects per-statement, per-call-site timings from attached engines."""
+
+    def __init__(
+        self,
+        n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
+        n_plus_one_window: float = N_PLUS_ONE_WINDOW_SECONDS
+    ) -> None:
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.n_plus_one_window = n_plus_one_window
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], StatementStats] = {}
+        self._engines: List[Engine] = []
+        self.started_at = datetime.utcnow().isoformat()
+
+    # ------------------------------------------------------------------
+    # Engine hooks
+    # ------------------------------------------------------------------
+
+    def attach(self, engine: Engine) -> None:
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        self._engines.append(engine)
+
+    def detach(self) -> None:
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before_execute)
+            event.remove(engine, "after_cursor_execute", self._after_execute)
+        self._engines = []
+
+    def _before_execute(self, conn: Any, cursor: Any, statement: str,
+                        parameters: Any, context: Any, executemany: bool) -> None:
+        conn.info["sql_profiler_start"] = time.perf_counter()
+
+    def _after_execute(self, conn: Any, cursor: Any, statement: str,
+                       parameters: Any, context: Any, executemany: bool) -> None:
+        start = conn.info.pop("sql_profiler_start", None)
+        if start is None:
+            return
+        now = time.perf_counter()
+        call_site, caller = _find_call_site()
+        key = (normalize_statement(statement), call_site)
+        returns_rows = getattr(cursor, "description", None) is not None
+        # rowcount is only meaningful for writes; reads are counted as they are fetched
+        rowcount = -1 if returns_rows else getattr(cursor, "rowcount", -1)
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = StatementStats(key[0], call_site, caller)
+            stats.record((now - start) * 1000.0, rowcount, now, self.n_plus_one_window)
+
+        # The result is built from context.cursor after this event, so its fetches go through the proxy
+        if returns_rows and context is not None:
+            context.cursor = _RowCountingCursor(cursor, stats, self._lock)
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+        self.started_at = datetime.utcnow().isoformat()
+
+    def statements(self, sort_by: str = "total_ms") -> List[StatementStats]:
+        """Aggregated statements, most expensive first."""
+        with self._lock:
+            stats = list(self._stats.values())
+        return sorted(stats, key=lambda s: getattr(s, sort_by), reverse=True)
+
+    def n_plus_one_suspects(self) -> List[StatementStats]:
+        """Statements issued in bursts from one call site (query-per-item loops)."""
+        return [s for s in self.statements("max_burst") if s.max_burst >= self.n_plus_one_threshold]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "generated_at": datetime.utcnow().isoformat(),
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "statements": [s.to_dict() for s in self.statements()],
+            "n_plus_one": [s.to_dict() for s in self.n_plus_one_suspects()],
+        }
+
+    def dump(self, path: Optional[str] = None) -> str:
+        """Write the current results as JSON; returns the path written."""
+        path = path or SQL_PROFILE_PATH
+        with atomic_write(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+def format_report(data: Dict[str, Any], top: int = 20) -> str:
+    """Plain-text view of a profile produced by SQLProfiler.to_dict()."""
+    lines = [f"SQL profile {data.get('started_at')} -> {data.get('generated_at')}", ""]
+    statements = data.get("statements", [])[:top]
+    lines.append(f"{'count':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'rows':>7}  call site / statement")
+    for s in statements:
+        lines.append(
+            f"{s['count']:>7} {s['total_ms']:>10.2f} {s['mean_ms']:>9.3f} {s['max_ms']:>9.2f} {s['rows']:>7}  {s['call_site']}"
+        )
+        lines.append(f"{'':>47}{s['statement'][:110]}")
+
+    suspects = data.get("n_plus_one", [])
+    lines.append("")
+    if suspects:
+        lines.append(f"Possible N+1 patterns (>= {data.get('n_plus_one_threshold')} repeats in a burst):")
+        for s in suspects:
+            lines.append(f"  {s['max_burst']}x {s['call_site']}")
+            if s.get("caller"):
+                lines.append(f"      looped from {s['caller']}")
+            lines.append(f"      {s['statement'][:110]}")
+    else:
+        lines.append("No N+1 patterns detected.")
+    return "\n".join(lines)
+
+
+# ==================== GLOBAL PROFILER ====================
+
+_profiler: Optional[SQLProfiler] = None
+
+
+def enable_sql_profiling(engine: Optional[Engine] = None, **kwargs: Any) -> SQLProfiler:
+    """Attach a profiler to the shared engine (or the given one)."""
+    global _profiler
+    from app import db
+
+    if _profiler is None:
+        _profiler = SQLProfiler(**kwargs)
+    _profiler.attach(engine or db.engine)
+    logger.info("SQL profiling enabled")
+    return _profiler
+
+
+def disable_sql_profiling() -> None:
+    """Detach the profiler from every engine; collected results are discarded."""
+    global _profiler
+    if _profiler is not None:
+        _profiler.detach()
+        _profiler = None
+
+
+def get_sql_profiler() -> Optional[SQLProfiler]:
+    return _profiler
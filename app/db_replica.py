@@ -0,0 +1,366 @@
+"""
+In-memory analytics replica (read path for heavy scans).
+
+Dashboards and analysis modules run full-table reads against the same file
+the exam writers commit to. When enabled (``analytics_replica`` feature
+flag), those reads are served from an in-memory snapshot copied with
+SQLite's backup API. The snapshot is marked ``query_only`` and refreshed
+when the source has changed (``PRAGMA data_version``), checked once the
+refresh interval has passed or after a number of commits that wrote through
+the main session factory.
+
+``read_scope()`` pins one session for a whole screen render: every
+``analytics_session()`` and ``get_analytics_connection()`` inside it shares
+that session and its connection, in a single read-only transaction, so all
+panels see the same snapshot.
+"""
+
+import sqlite3
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Generator, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.config import DB_PATH, get_env_var
+from app.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+# Refresh policy (env overrides: SOULSENSE_REPLICA_REFRESH_SECONDS, SOULSENSE_REPLICA_REFRESH_WRITES)
+REFRESH_INTERVAL_SECONDS: float = get_env_var("REPLICA_REFRESH_SECONDS", 300.0, float)
+REFRESH_AFTER_WRITES: int = get_env_var("REPLICA_REFRESH_WRITES", 25, int)
+# Pages copied per backup step; the source lock is released between steps
+BACKUP_PAGES_PER_STEP: int = 256
+
+
+class _SnapshotConnection:
+    """
+    Raw-connection handle onto a shared connection (the replica snapshot or
+    a read scope's connection). close() is a no-op so legacy
+    ``conn = ...; conn.close()`` callers do not tear it down.
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    def close(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+
+class AnalyticsReplica:
+    """Read-only in-memory copy of the main database for analytical queries."""
+
+    def __init__(
+        self,
+        source_path: Optional[str] = None,
+        refresh_interval: float = REFRESH_INTERVAL_SECONDS,
+        refresh_after_writes: int = REFRESH_AFTER_WRITES,
+        pages_per_step: int = BACKUP_PAGES_PER_STEP
+    ) -> None:
+        self.source_path = source_path or DB_PATH
+        self.refresh_interval = refresh_interval
+        self.refresh_after_writes = refresh_after_writes
+        self.pages_per_step = pages_per_step
+
+        self._lock = threading.Lock()
+        self._probe: Optional[sqlite3.Connection] = None
+        self._snapshot: Optional[sqlite3.Connection] = None
+        self._engine: Optional[Engine] = None
+        self._data_version: Optional[int] = None
+        self._last_refresh = 0.0
+        self._writes_since_refresh = 0
+        self._stop_event: Optional[threading.Event] = None
+        self.refresh_count = 0
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Re-copy the source into a new snapshot if it changed.
+        Returns True when a new snapshot was installed.
+        """
+        with self._lock:
+            try:
+                if self._probe is None:
+                    self._probe = sqlite3.connect(self.source_path, check_same_thread=False)
+
+                version = self._probe.execute("PRAGMA data_version").fetchone()[0]
+                if not force and self._snapshot is not None and version == self._data_version:
+                    self._last_refresh = time.monotonic()
+                    self._writes_since_refresh = 0
+                    return False
+
+                snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+                self._probe.backup(snapshot, pages=self.pages_per_step)
+                snapshot.execute("PRAGMA query_only = ON")
+            except sqlite3.Error as e:
+                logger.error(f"Analytics replica refresh failed: {e}")
+                if self._snapshot is None:
+                    raise DatabaseError("Failed to build analytics replica.", original_exception=e)
+                return False
+
+            # Swap rather than overwrite: readers holding the previous
+            # snapshot keep a consistent view until they release it.
+            self._snapshot = snapshot
+            self._engine = create_engine(
+                "sqlite://",
+                creator=lambda: snapshot,
+                poolclass=StaticPool,
+            )
+            self._data_version = version
+            self._last_refresh = time.monotonic()
+            self._writes_since_refresh = 0
+            self.refresh_count += 1
+
+        logger.debug("Analytics replica refreshed")
+        return True
+
+    def refresh_if_stale(self) -> bool:
+        """Check the source for changes when past the interval or after enough writes."""
+        if self._snapshot is None:
+            return self.refresh(force=True)
+        if self._writes_since_refresh >= self.refresh_after_writes:
+            return self.refresh()
+        if time.monotonic() - self._last_refresh >= self.refresh_interval:
+            return self.refresh()
+        return False
+
+    def note_write(self, count: int = 1) -> None:
+        """Record commits on the write path; after N the next read checks the source for changes."""
+        self._writes_since_refresh += count
+
+    def start_scheduler(self) -> None:
+        """Refresh in a daemon thread every refresh_interval seconds."""
+        if self._stop_event is not None:
+            return
+        self._stop_event = threading.Event()
+        stop = self._stop_event
+
+        def loop() -> None:
+            while not stop.wait(self.refresh_interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Scheduled replica refresh failed: {e}")
+
+        threading.Thread(target=loop, name="analytics-replica", daemon=True).start()
+
+    def close(self) -> None:
+        """Stop the scheduler and release the probe connection."""
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._stop_event = None
+        with self._lock:
+            if self._probe is not None:
+                self._probe.close()
+                self._probe = None
+            self._snapshot = None
+            self._engine = None
+
+    # ------------------------------------------------------------------
+    # Read access
+    # ------------------------------------------------------------------
+
+    def get_connection(self) -> _SnapshotConnection:
+        """Raw sqlite3-style connection onto the current snapshot."""
+        self.refresh_if_stale()
+        assert self._snapshot is not None
+        return _SnapshotConnection(self._snapshot)
+
+    @contextmanager
+    def session(self) -> Generator[Session, None, None]:
+        """ORM session bound to the current snapshot."""
+        self.refresh_if_stale()
+        session = Session(bind=self._engine, autoflush=False)
+        try:
+            yield session
+        finally:
+            session.rollback()
+            session.close()
+
+
+# ==================== ROUTING ====================
+
+_replica: Optional[AnalyticsReplica] = None
+
+
+# session.info key set when a flush in the current transaction changed rows
+_FLUSHED_WRITES = "analytics_replica_flushed_writes"
+
+
+def _on_main_flush(session: Session, flush_context: Any) -> None:
+    # new/dirty/deleted still hold the pre-flush state here
+    if session.new or session.deleted or any(session.is_modified(obj) for obj in session.dirty):
+        session.info[_FLUSHED_WRITES] = True
+
+
+def _on_main_commit(session: Session) -> None:
+    # Read-only commits (safe_db_context always commits) are not writes
+    if session.info.pop(_FLUSHED_WRITES, False) and _replica is not None:
+        _replica.note_write()
+
+
+def _on_main_rollback(session: Session) -> None:
+    session.info.pop(_FLUSHED_WRITES, None)
+
+
+_MAIN_SESSION_EVENTS: Tuple[Tuple[str, Callable[..., None]], ...] = (
+    ("after_flush", _on_main_flush),
+    ("after_commit", _on_main_commit),
+    ("after_rollback", _on_main_rollback),
+)
+
+
+def enable_analytics_replica(**kwargs: Any) -> AnalyticsReplica:
+    """Build the replica and route analytics reads to it."""
+    global _replica
+    from app import db
+
+    if _replica is not None:
+        return _replica
+
+    replica = AnalyticsReplica(**kwargs)
+    replica.refresh(force=True)
+    _replica = replica
+
+    for name, listener in _MAIN_SESSION_EVENTS:
+        if not event.contains(db.SessionLocal, name, listener):
+            event.listen(db.SessionLocal, name, listener)
+
+    logger.info("Analytics replica enabled")
+    return replica
+
+
+def disable_analytics_replica() -> None:
+    """Route analytics reads back to the main database."""
+    global _replica
+    from app import db
+
+    for name, listener in _MAIN_SESSION_EVENTS:
+        if event.contains(db.SessionLocal, name, listener):
+            event.remove(db.SessionLocal, name, listener)
+    if _replica is not None:
+        _replica.close()
+        _replica = None
+
+
+def get_analytics_replica() -> Optional[AnalyticsReplica]:
+    return _replica
+
+
+def get_analytics_connection() -> Any:
+    """
+    Raw connection for read-only analytics queries.
+    Inside read_scope() it is the scope's connection; otherwise served from
+    the replica when enabled, else a pooled main connection.
+    """
+    from app import db
+
+    scope = _read_scope.get()
+    if scope is not None:
+        return _SnapshotConnection(_dbapi_connection(scope))
+    if _replica is not None:
+        try:
+            return _replica.get_connection()
+        except Exception as e:
+            logger.warning(f"Analytics replica unavailable, using main database: {e}")
+    return db.get_connection()
+
+
+@contextmanager
+def analytics_session() -> Generator[Session, None, None]:
+    """
+    Read-only ORM session for analytics.
+    Inside read_scope() it is the scope's session; otherwise served from the
+    replica when enabled, else from the main database.
+    """
+    scope = _read_scope.get()
+    if scope is not None:
+        yield scope
+        return
+    if _replica is not None:
+        with _replica.session() as session:
+            yield session
+        return
+
+    with _main_session() as session:
+        yield session
+
+
+@contextmanager
+def _main_session() -> Generator[Session, None, None]:
+    from app import db
+
+    session = db.get_session()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+# ==================== READ SCOPES ====================
+
+_read_scope: ContextVar[Optional[Session]] = ContextVar("analytics_read_scope", default=None)
+
+
+def _dbapi_connection(session: Session) -> Any:
+    return session.connection().connection.dbapi_connection
+
+
+@contextmanager
+def read_scope(main: bool = False) -> Generator[Session, None, None]:
+    """
+    One read-only session shared by every analytics read until exit.
+
+    On the main database this opens an explicit read transaction with
+    query_only set, so every query in the scope sees one WAL snapshot and
+    cannot write; the replica is a snapshot already. Archive files are
+    attached up front, since SQLite cannot ATTACH inside a transaction.
+    Nested scopes reuse the outer one.
+
+    Args:
+        main: Read the main database even when the replica is enabled
+              (screens showing data the user may have just saved)
+    """
+    if _read_scope.get() is not None:
+        yield _read_scope.get()
+        return
+
+    with (_main_session() if main else analytics_session()) as session:
+        dbapi_conn = _dbapi_connection(session)
+        on_main = (main or _replica is None) and session.get_bind().dialect.name == "sqlite"
+        attached: List[str] = []
+        if on_main:
+            from app.db_archive import attach_archives, list_archives
+            if list_archives():
+                attached = attach_archives(dbapi_conn)
+            dbapi_conn.execute("BEGIN")
+            # The snapshot is taken at the first read, not at BEGIN
+            dbapi_conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            dbapi_conn.execute("PRAGMA query_only = ON")
+
+        token = _read_scope.set(session)
+        try:
+            yield session
+        finally:
+            _read_scope.reset(token)
+            if on_main:
+                dbapi_conn.rollback()
+                # Pooled connection: hand it back writable and without the archives
+                dbapi_conn.execute("PRAGMA query_only = OFF")
+                if attached:
+                    from app.db_archive import detach_archives
+                    detach_archives(dbapi_conn, attached)
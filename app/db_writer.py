@@ -0,0 +1,220 @@
+"""
+Serialized writes to a SQLite file shared by several processes.
+
+The Tk app, the CLI, the admin scripts and the FastAPI backend all write to
+the same database, and SQLite admits one writer at a time. Two layers keep
+contention from surfacing as "database is locked":
+
+- Across processes, every connection waits up to ``busy_timeout`` (see
+  ``SQLITE_PROFILES``) for the lock, and ``run_write`` re-runs a whole unit
+  of work with jittered exponential backoff when SQLite still reports it
+  busy (a transaction that read before writing cannot simply wait).
+- Within a process, ``WriteQueue`` lets one thread at a time write: the
+  thread that gets the writer lock commits every unit of work queued so far
+  in a single transaction (group commit) while the others wait for it.
+
+A unit of work is a callable taking a Session. It may run more than once
+(after a rollback) and on another thread's connection, so it should only
+touch the session it is given and return plain values.
+
+``lock_metrics()`` reports how much time was lost to lock waits.
+"""
+
+import time
+import random
+import logging
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import get_env_var
+from app.exceptions import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Work = Callable[[Session], Any]
+
+# Attempts per unit of work while SQLite reports the database locked
+# (env override: SOULSENSE_DB_WRITE_ATTEMPTS)
+WRITE_ATTEMPTS: int = get_env_var("DB_WRITE_ATTEMPTS", 6, int)
+# Backoff before retry n is uniform in [0, min(MAX, BASE * 2**n)] seconds
+RETRY_BASE_DELAY: float = 0.05
+RETRY_MAX_DELAY: float = 2.0
+# Units of work committed together at most
+GROUP_COMMIT_MAX_JOBS: int = 64
+
+_LOCK_MESSAGES = ("database is locked", "database table is locked", "database is busy")
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    """True for SQLITE_BUSY / SQLITE_LOCKED, however deeply it is wrapped."""
+    seen = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, sqlite3.OperationalError) and any(m in str(current) for m in _LOCK_MESSAGES):
+            return True
+        current = getattr(current, "orig", None) or getattr(current, "original_exception", None) or current.__cause__
+    return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff, so retrying processes spread out."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+class LockMetrics:
+    """Thread-safe counters of lock contention."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = {"lock_errors": 0, "retries": 0, "gave_up": 0,
+                            "batches": 0, "jobs": 0, "largest_batch": 0}
+            self._waits = {"retry_wait": [0.0, 0.0], "queue_wait": [0.0, 0.0]}  # [total, max] seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += n
+
+    def batch(self, size: int) -> None:
+        with self._lock:
+            self._counts["batches"] += 1
+            self._counts["jobs"] += size
+            self._counts["largest_batch"] = max(self._counts["largest_batch"], size)
+
+    def wait(self, name: str, seconds: float) -> None:
+        with self._lock:
+            total_max = self._waits[name]
+            total_max[0] += seconds
+            total_max[1] = max(total_max[1], seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            report: Dict[str, Any] = dict(self._counts)
+            for name, (total, longest) in self._waits.items():
+                report[f"{name}_ms_total"] = round(total * 1000, 1)
+                report[f"{name}_ms_max"] = round(longest * 1000, 1)
+            return report
+
+
+_metrics = LockMetrics()
+
+
+def lock_metrics() -> Dict[str, Any]:
+    """Process-wide lock contention counters and wait times."""
+    return _metrics.snapshot()
+
+
+def run_write(work: Callable[[Session], T], attempts: int = WRITE_ATTEMPTS) -> T:
+    """
+    Run work on a fresh session and commit, retrying the whole unit with
+    backoff while the database is locked by another connection.
+
+    Raises DatabaseError for database failures (including a lock that
+    outlasts every attempt); other exceptions from work propagate as-is.
+    """
+    from app import db
+
+    attempts = max(attempts, 1)
+    for attempt in range(attempts):
+        session = db.SessionLocal()
+        try:
+            result = work(session)
+            session.commit()
+            return result
+        except Exception as e:
+            session.rollback()
+            if is_lock_error(e):
+                _metrics.count("lock_errors")
+                if attempt + 1 < attempts:
+                    delay = backoff_delay(attempt)
+                    _metrics.count("retries")
+                    _metrics.wait("retry_wait", delay)
+                    logger.debug(f"Database locked, retrying write in {delay * 1000:.0f} ms")
+                    time.sleep(delay)
+                    continue
+                _metrics.count("gave_up")
+                logger.error(f"Database still locked after {attempts} attempts")
+            if isinstance(e, SQLAlchemyError):
+                raise DatabaseError("A database error occurred.", original_exception=e)
+            raise
+        finally:
+            session.close()
+    raise AssertionError("unreachable")
+
+
+class WriteQueue:
+    """
+    In-process single writer with group commit.
+
+    ``write(work)`` queues a unit of work and blocks until it is committed.
+    Whichever caller holds the writer lock commits all queued units in one
+    transaction; if one of them fails, the rest are committed one by one so
+    only the failing unit sees the error.
+    """
+
+    def __init__(self, max_batch: int = GROUP_COMMIT_MAX_JOBS) -> None:
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Work, Future]] = []
+        self._mutex = threading.Lock()   # Guards _pending
+        self._writer = threading.Lock()  # Held while committing
+
+    def write(self, work: Callable[[Session], T]) -> T:
+        """Commit work (alone or with concurrently queued work) and return its result."""
+        future: Future = Future()
+        queued = time.perf_counter()
+        with self._mutex:
+            self._pending.append((work, future))
+
+        while not future.done():
+            with self._writer:
+                if future.done():
+                    break
+                _metrics.wait("queue_wait", time.perf_counter() - queued)
+                with self._mutex:
+                    batch = self._pending[:self.max_batch]
+                    del self._pending[:self.max_batch]
+                self._commit(batch)
+        return future.result()
+
+    def _commit(self, batch: List[Tuple[Work, Future]]) -> None:
+        if not batch:
+            return
+        _metrics.batch(len(batch))
+        if len(batch) > 1:
+            try:
+                results = run_write(lambda session: [work(session) for work, _ in batch])
+            except Exception as e:
+                logger.debug(f"Group commit of {len(batch)} writes failed ({e}), committing them one by one")
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+                return
+
+        for work, future in batch:
+            try:
+                future.set_result(run_write(work))
+            except Exception as e:
+                future.set_exception(e)
+
+
+_queue: Optional[WriteQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> WriteQueue:
+    """Process-wide write queue for the main database."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = WriteQueue()
+        return _queue
@@ -82,6 +82,20 @@ EXPERIMENTAL_FLAGS: Dict[str, FeatureFlag] = {
         experimental=True,
         category="data"
     ),
+    "analytics_replica": FeatureFlag(
+        name="analytics_replica",
+        default=False,
+        description="Serve dashboard and analysis reads from an in-memory database replica",
+        experimental=True,
+        category="data"
+    ),
+    "sql_profiling": FeatureFlag(
+        name="sql_profiling",
+        default=False,
+        description="Record per-statement SQL timings and N+1 patterns to data/sql_profile.json",
+        experimental=True,
+        category="data"
+    ),
 }
 
 
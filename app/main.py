@@ -24,6 +24,12 @@ from app.error_handler import (
 )
 from typing import Optional, Dict, Any, List
 from app.db import get_session
+from app.db_maintenance import get_maintenance_scheduler
+
+# How often the idle loop checks for due database maintenance
+MAINTENANCE_TICK_MS = 60000
+# How often buffered exam answers past their age limit are written
+RESPONSE_FLUSH_TICK_MS = 10000
 
 class SoulSenseApp:
     def __init__(self, root: tk.Tk) -> None:
@@ -91,6 +97,26 @@ class SoulSenseApp:
         # Start Login Flow
         self.root.after(100, self.show_login_screen)
 
+        # Database maintenance runs from the idle loop
+        self.root.after(MAINTENANCE_TICK_MS, self._run_maintenance)
+        # Answers of an exam left idle are written once they age out
+        self.root.after(RESPONSE_FLUSH_TICK_MS, self._flush_expired_responses)
+
+    def _run_maintenance(self) -> None:
+        """Run due database maintenance once the UI is idle, then reschedule."""
+        def run() -> None:
+            get_maintenance_scheduler().tick()
+            self.root.after(MAINTENANCE_TICK_MS, self._run_maintenance)
+        self.root.after_idle(run)
+
+    def _flush_expired_responses(self) -> None:
+        """Write buffered answers past the age limit once the UI is idle, then reschedule."""
+        def run() -> None:
+            from app.services.exam_service import ExamService
+            ExamService.flush_expired_responses()
+            self.root.after(RESPONSE_FLUSH_TICK_MS, self._flush_expired_responses)
+        self.root.after_idle(run)
+
     def show_login_screen(self) -> None:
         """Show login popup on startup"""
         login_win = tk.Toplevel(self.root)
@@ -438,7 +464,8 @@ class SoulSenseApp:
         # Open Dashboard (Embedded)
         try:
             self.clear_screen()
-            dashboard = AnalyticsDashboard(self.content_area, self.username, theme="dark", colors=self.colors)
+            dashboard = AnalyticsDashboard(self.content_area, self.username, theme="dark", colors=self.colors,
+                                           user_id=self.current_user_id)
             dashboard.render_dashboard()
         except Exception as e:
             self.logger.error(f"Dashboard error: {e}")
@@ -481,6 +508,41 @@ class SoulSenseApp:
         """Perform graceful shutdown operations"""
         self.logger.info("Initiating graceful application shutdown...")
 
+        try:
+            # Write any answers still held in the response buffer
+            from app.services.exam_service import ExamService
+            flushed = ExamService.flush_pending_responses()
+            if flushed:
+                self.logger.info(f"Flushed {flushed} buffered responses")
+        except Exception as e:
+            self.logger.error(f"Error flushing buffered responses: {e}")
+
+        try:
+            # Persist question access counters batched in memory
+            from app.questions import flush_access_stats
+            flush_access_stats()
+        except Exception as e:
+            self.logger.error(f"Error flushing question access stats: {e}")
+
+        try:
+            from app.db_profiler import get_sql_profiler
+            profiler = get_sql_profiler()
+            if profiler:
+                self.logger.info(f"SQL profile written to {profiler.dump()}")
+        except Exception as e:
+            self.logger.error(f"Error writing SQL profile: {e}")
+
+        try:
+            # Leave the WAL folded into the database file
+            get_maintenance_scheduler().run(["checkpoint"])
+        except Exception as e:
+            self.logger.error(f"Error checkpointing database: {e}")
+
+        from app.db_writer import lock_metrics
+        metrics = lock_metrics()
+        if metrics["lock_errors"]:
+            self.logger.info(f"Database lock contention this session: {metrics}")
+
         try:
             # Commit any pending database operations
             # Commit any pending database operations
@@ -565,12 +627,30 @@ if __name__ == "__main__":
         
         # All checks passed, start the application
         
+        # Opt-in SQL instrumentation; attached first so startup queries are captured
+        from app.feature_flags import feature_flags
+        if feature_flags.is_enabled("sql_profiling"):
+            from app.db_profiler import enable_sql_profiling
+            enable_sql_profiling()
+
         # Initialize Questions Cache (Preload)
         from app.questions import initialize_questions
         logger.info("Preloading questions into memory...")
         if not initialize_questions():
             logger.warning("Initial question preload failed. Application will attempt lazy-loading.")
 
+        # Replay answers spooled by a previous run that exited before flushing
+        from app.services.exam_service import ExamService
+        ExamService.recover_pending_responses()
+
+        # Optional in-memory replica for dashboard/analysis reads
+        if feature_flags.is_enabled("analytics_replica"):
+            try:
+                from app.db_replica import enable_analytics_replica
+                enable_analytics_replica().start_scheduler()
+            except Exception as e:
+                logger.warning(f"Analytics replica disabled: {e}")
+
         root = tk.Tk()
         
         # Register tkinter-specific exception handler
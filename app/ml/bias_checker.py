@@ -3,11 +3,12 @@ Simple Bias Checker for SOUL_SENSE_EXAM
 Checks for age bias in test scores
 """
 
-import sqlite3
 import json
 import os
 from datetime import datetime
 
+from app.db import get_connection
+
 class SimpleBiasChecker:
     def __init__(self, db_path=None):
         from app.config import DB_PATH
@@ -16,7 +17,7 @@ class SimpleBiasChecker:
     def check_age_bias(self):
         """Simple check: Are scores different across age groups?"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
             
             # Get average scores by age group
@@ -85,7 +86,7 @@ class SimpleBiasChecker:
     def check_question_fairness(self):
         """Check if questions have similar average responses across ages"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = get_connection(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -98,9 +99,8 @@ class SimpleBiasChecker:
                     END as age_category,
                     AVG(response_value) as avg_response,
                     COUNT(*) as count
-                FROM responses r
-                JOIN scores s ON r.username = s.username 
-                    AND DATE(r.timestamp) = DATE(s.timestamp)
+                FROM answer_rows r
+                JOIN scores s ON r.attempt_id = s.attempt_id
                 WHERE age IS NOT NULL 
                     AND age_category IN ('Younger', 'Older')
                 GROUP BY question_id, age_category
@@ -24,7 +24,7 @@ except ImportError:
 
 # Database imports
 from app.db import get_session, safe_db_context
-from app.models import Score, Response, User
+from app.models import Score, AnswerRow, User, owner_filter
 
 logger = logging.getLogger(__name__)
 
@@ -133,14 +133,16 @@ class EmotionalFeatureExtractor:
         """Extract emotional features for a single user."""
         try:
             with safe_db_context() as session:
+                owner = owner_filter(session, username)
+
                 # Get all scores for the user
-                scores = session.query(Score).filter_by(username=username).order_by(Score.timestamp).all()
+                scores = session.query(Score).filter_by(**owner).order_by(Score.timestamp_epoch).all()
                 
                 if not scores or len(scores) < 1:
                     return None
                 
                 # Get all responses for the user
-                responses = session.query(Response).filter_by(username=username).all()
+                responses = session.query(AnswerRow).filter_by(**owner).all()
                 
                 # Extract score-based features
                 score_values = [s.total_score for s in scores if s.total_score is not None]
@@ -208,7 +210,7 @@ class EmotionalFeatureExtractor:
         correlation = np.corrcoef(x, scores)[0, 1]
         return correlation if not np.isnan(correlation) else 0.0
     
-    def _calculate_consistency(self, responses: List[Response]) -> float:
+    def _calculate_consistency(self, responses: List[AnswerRow]) -> float:
         """Calculate response consistency across questions."""
         if not responses:
             return 0.0
@@ -223,7 +225,7 @@ class EmotionalFeatureExtractor:
         consistency = 1 - (variance / max_variance)
         return max(0, min(1, consistency))
     
-    def _avg_response_value(self, responses: List[Response]) -> float:
+    def _avg_response_value(self, responses: List[AnswerRow]) -> float:
         """Calculate average response value."""
         if not responses:
             return 2.5  # Neutral default
@@ -231,7 +233,7 @@ class EmotionalFeatureExtractor:
         values = [r.response_value for r in responses if r.response_value is not None]
         return np.mean(values) if values else 2.5
     
-    def _response_variance(self, responses: List[Response]) -> float:
+    def _response_variance(self, responses: List[AnswerRow]) -> float:
         """Calculate response variance."""
         if not responses:
             return 0.0
@@ -3,8 +3,10 @@
 import logging
 from typing import Dict, List, Optional
 from app.db import get_session
-from app.models import Score, User
+from app.db_replica import analytics_session
+from app.models import Score, User, owner_filter
 from app.analysis.outlier_detection import OutlierDetector
+from app.services.stats_service import get_stat
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +23,8 @@ class ScoreAnalyzer:
         session = get_session()
         try:
             # Get user's historical scores
-            historical_scores = session.query(Score).filter(
-                Score.username == username
+            historical_scores = session.query(Score).filter_by(
+                **owner_filter(session, username)
             ).all()
             
             if not historical_scores:
@@ -77,8 +79,8 @@ class ScoreAnalyzer:
         """Get comprehensive score analytics with outlier analysis."""
         session = get_session()
         try:
-            scores = session.query(Score).filter(
-                Score.username == username
+            scores = session.query(Score).filter_by(
+                **owner_filter(session, username)
             ).order_by(Score.timestamp).all()
             
             if not scores:
@@ -122,8 +124,7 @@ class ScoreAnalyzer:
     
     def get_cohort_analytics(self, age_group: str) -> Dict:
         """Get analytics for an age group cohort."""
-        session = get_session()
-        try:
+        with analytics_session() as session:
             scores = session.query(Score).filter(
                 Score.detailed_age_group == age_group
             ).all()
@@ -154,18 +155,13 @@ class ScoreAnalyzer:
                 },
                 "outlier_details": outlier_result.get("outlier_details", [])
             }
-        
-        finally:
-            session.close()
     
     def generate_quality_report(self) -> Dict:
         """Generate overall data quality report."""
-        session = get_session()
-        try:
-            all_scores = session.query(Score).all()
-            score_values = [s.total_score for s in all_scores]
+        with analytics_session() as session:
+            total_scores = get_stat("score.count", default=0)
             
-            if not score_values:
+            if not total_scores:
                 return {"error": "No scores in database"}
             
             outlier_result = self.detector.detect_outliers_global(
@@ -176,19 +172,16 @@ class ScoreAnalyzer:
             
             return {
                 "report_type": "data_quality",
-                "total_scores": len(score_values),
-                "global_outlier_percentage": (outlier_result.get("outlier_count", 0) / len(score_values)) * 100,
+                "total_scores": total_scores,
+                "global_outlier_percentage": (outlier_result.get("outlier_count", 0) / total_scores) * 100,
                 "quality_assessment": self._assess_global_quality(
-                    outlier_result, score_values
+                    outlier_result, total_scores
                 ),
                 "cohort_summary": [
                     self.get_cohort_analytics(ag[0]) 
                     for ag in age_groups if ag[0]
                 ]
             }
-        
-        finally:
-            session.close()
     
     # Helper methods
     
@@ -242,10 +235,10 @@ class ScoreAnalyzer:
         }
     
     def _assess_global_quality(self, outlier_result: Dict, 
-                               scores: List[int]) -> str:
+                               total_scores: int) -> str:
         """Assess global data quality"""
         
-        outlier_percentage = (outlier_result.get("outlier_count", 0) / len(scores)) * 100
+        outlier_percentage = (outlier_result.get("outlier_count", 0) / total_scores) * 100
         
         if outlier_percentage < 5:
             return "Excellent"
@@ -4,12 +4,19 @@ Compatibility layer for tests and legacy imports.
 Core models have been refactored elsewhere.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, Text, create_engine, event, Index, text
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, Text, LargeBinary, MetaData, Table, create_engine, event, Index, text, select, inspect
 from sqlalchemy.orm import relationship, declarative_base, Session
 from sqlalchemy.engine import Engine, Connection
 from typing import List, Optional, Any, Dict, Tuple, Union
 from datetime import datetime, timedelta
+import json
 import logging
+import warnings
+
+from app.utils.timestamps import to_epoch
+from app.utils.answer_packing import (
+    Answer, LATENCY_TYPECODE, QUESTION_ID_TYPECODE, VALUE_TYPECODE, pack_answers, sql_unpack, unpack_answers
+)
 
 # Define Base
 Base = declarative_base()
@@ -34,6 +41,7 @@ class User(Base):
 
     scores = relationship("Score", back_populates="user", cascade="all, delete-orphan")
     responses = relationship("Response", back_populates="user", cascade="all, delete-orphan")
+    attempt_answers = relationship("AttemptAnswers", back_populates="user", cascade="all, delete-orphan")
     settings = relationship("UserSettings", uselist=False, back_populates="user", cascade="all, delete-orphan")
     medical_profile = relationship("MedicalProfile", uselist=False, back_populates="user", cascade="all, delete-orphan")
     personal_profile = relationship("PersonalProfile", uselist=False, back_populates="user", cascade="all, delete-orphan")
@@ -174,6 +182,8 @@ class Score(Base):
     detailed_age_group = Column(String, index=True)  # Added index
     user_id = Column(Integer, ForeignKey('users.id'), nullable=True, index=True)  # Added index
     timestamp = Column(String, default=lambda: datetime.utcnow().isoformat(), index=True)  # Added timestamp and index
+    timestamp_epoch = Column(Integer, nullable=True)  # Seconds since epoch (UTC), mirrors timestamp
+    attempt_id = Column(String, nullable=True)  # ExamSession.session_key; joins attempt_answers.session_key
 
     user = relationship("User", back_populates="scores")
 
@@ -183,6 +193,9 @@ class Score(Base):
         Index('idx_score_user_timestamp', 'user_id', 'timestamp'),
         Index('idx_score_age_score', 'age', 'total_score'),
         Index('idx_score_agegroup_score', 'detailed_age_group', 'total_score'),
+        Index('idx_score_username_epoch', 'username', 'timestamp_epoch'),
+        Index('idx_score_user_epoch', 'user_id', 'timestamp_epoch'),
+        Index('idx_score_attempt', 'attempt_id', unique=True),
     )
 
 class Response(Base):
@@ -195,7 +208,9 @@ class Response(Base):
     age_group = Column(String, index=True)  # Added index
     detailed_age_group = Column(String, index=True)  # Added index
     timestamp = Column(String, default=lambda: datetime.utcnow().isoformat(), index=True)  # Added index
+    timestamp_epoch = Column(Integer, nullable=True)  # Seconds since epoch (UTC), mirrors timestamp
     user_id = Column(Integer, ForeignKey('users.id'), nullable=True, index=True)  # Added index
+    attempt_id = Column(String, nullable=True)  # ExamSession.session_key; NULL for rows saved before attempts had ids
 
     user = relationship("User", back_populates="responses")
 
@@ -206,6 +221,79 @@ class Response(Base):
         Index('idx_response_question_timestamp', 'question_id', 'timestamp'),
         Index('idx_response_user_timestamp', 'user_id', 'timestamp'),
         Index('idx_response_agegroup_timestamp', 'detailed_age_group', 'timestamp'),
+        # Legacy rows are packed per username in answer order (migrate_legacy_responses)
+        Index('idx_response_username_epoch', 'username', 'timestamp_epoch'),
+    )
+
+# Answers one attempt can hold; bounds the answer_positions helper table
+MAX_ANSWERS_PER_ATTEMPT = 1024
+
+class AttemptAnswers(Base):
+    """All answers of one exam attempt, packed into parallel arrays (app.utils.answer_packing)"""
+    __tablename__ = 'attempt_answers'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_key = Column(String, unique=True, nullable=False)  # ExamSession.session_key
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=True)
+    username = Column(String)
+    score_id = Column(Integer, ForeignKey('scores.id'), nullable=True)  # Set when the exam is finished
+    age_group = Column(String)
+    detailed_age_group = Column(String)
+    timestamp = Column(String, default=lambda: datetime.utcnow().isoformat())  # First answer
+    timestamp_epoch = Column(Integer, nullable=True)  # Seconds since epoch (UTC), mirrors timestamp
+    answer_count = Column(Integer, nullable=False, default=0)
+    question_ids = Column(LargeBinary, nullable=False, default=b"")     # uint16 per answer
+    response_values = Column(LargeBinary, nullable=False, default=b"")  # uint8 per answer
+    latencies_ms = Column(LargeBinary, nullable=False, default=b"")     # uint32 per answer
+
+    user = relationship("User", back_populates="attempt_answers")
+    score = relationship("Score")
+
+    __table_args__ = (
+        Index('idx_attempt_answers_user_epoch', 'user_id', 'timestamp_epoch'),
+        Index('idx_attempt_answers_username_epoch', 'username', 'timestamp_epoch'),
+    )
+
+    @property
+    def answers(self) -> List[Answer]:
+        """(question_id, response_value, latency_ms) in answer order"""
+        return unpack_answers(self.question_ids, self.response_values, self.latencies_ms)
+
+    def set_answers(self, answers: List[Answer]) -> None:
+        if len(answers) > MAX_ANSWERS_PER_ATTEMPT:
+            raise ValueError(f"An attempt holds at most {MAX_ANSWERS_PER_ATTEMPT} answers")
+        self.question_ids, self.response_values, self.latencies_ms = pack_answers(answers)
+        self.answer_count = len(answers)
+
+# 0 .. MAX_ANSWERS_PER_ATTEMPT - 1, joined against attempt_answers to unpack one row per answer
+answer_positions = Table(
+    'answer_positions', Base.metadata,
+    Column('pos', Integer, primary_key=True),
+)
+
+# Views are created by DDL below, never by create_all
+view_metadata = MetaData()
+
+class AnswerRow(Base):
+    """
+    Read-only, one row per answer: legacy responses rows plus unpacked
+    attempt_answers (the answer_rows view). Same columns as Response, so
+    readers can query it in place of Response. Packed answers have negative
+    ids and share their attempt's timestamp.
+    """
+    __table__ = Table(
+        'answer_rows', view_metadata,
+        Column('id', Integer, primary_key=True),
+        Column('username', String),
+        Column('question_id', Integer),
+        Column('response_value', Integer),
+        Column('age_group', String),
+        Column('detailed_age_group', String),
+        Column('timestamp', String),
+        Column('timestamp_epoch', Integer),
+        Column('user_id', Integer),
+        Column('attempt_id', String),    # Score.attempt_id; NULL for legacy rows without one
+        Column('latency_ms', Integer),   # NULL for legacy rows
     )
 
 class Question(Base):
@@ -231,7 +319,9 @@ class JournalEntry(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     username = Column(String)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=True, index=True)
     entry_date = Column(String, default=lambda: datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"))
+    entry_date_epoch = Column(Integer, nullable=True)  # Seconds since epoch (UTC), mirrors entry_date
     content = Column(Text)
     sentiment_score = Column(Float)
     emotional_patterns = Column(Text)
@@ -251,6 +341,25 @@ class JournalEntry(Base):
     # Enhanced Journal Extensions: Tagging system
     tags = Column(Text, nullable=True)  # JSON list of tags like ["stress", "gratitude", "relationships"]
 
+    __table_args__ = (
+        Index('idx_journal_username_epoch', 'username', 'entry_date_epoch'),
+        Index('idx_journal_user_epoch', 'user_id', 'entry_date_epoch'),
+    )
+
+class JournalTag(Base):
+    """One row per (journal entry, tag); normalized index over JournalEntry.tags"""
+    __tablename__ = 'journal_tags'
+
+    entry_id = Column(Integer, ForeignKey('journal_entries.id', ondelete='CASCADE'), primary_key=True)
+    tag = Column(String, primary_key=True)  # Lower-cased, trimmed
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=True)
+    username = Column(String)
+
+    __table_args__ = (
+        Index('idx_journal_tags_tag_entry', 'tag', 'entry_id'),
+        Index('idx_journal_tags_user_tag', 'user_id', 'tag', 'entry_id'),
+    )
+
 class SatisfactionRecord(Base):
     __tablename__ = 'satisfaction_records'
     
@@ -258,6 +367,7 @@ class SatisfactionRecord(Base):
     user_id = Column(Integer, ForeignKey('users.id'), index=True, nullable=True)
     username = Column(String, index=True)
     timestamp = Column(String, default=lambda: datetime.utcnow().isoformat(), index=True)
+    timestamp_epoch = Column(Integer, nullable=True)  # Seconds since epoch (UTC), mirrors timestamp
     
     # Core satisfaction metrics
     satisfaction_score = Column(Integer, index=True)  # 1-10 scale
@@ -280,6 +390,7 @@ class SatisfactionRecord(Base):
         Index('idx_satisfaction_user_time', 'user_id', 'timestamp'),
         Index('idx_satisfaction_category_score', 'satisfaction_category', 'satisfaction_score'),
         Index('idx_satisfaction_context', 'context', 'satisfaction_score'),
+        Index('idx_satisfaction_user_epoch', 'user_id', 'timestamp_epoch'),
     )
 
 class SatisfactionHistory(Base):
@@ -309,6 +420,7 @@ class AssessmentResult(Base):
     
     assessment_type = Column(String, nullable=False, index=True) # e.g. 'career_clarity'
     timestamp = Column(String, default=lambda: datetime.utcnow().isoformat(), index=True)
+    timestamp_epoch = Column(Integer, nullable=True)  # Seconds since epoch (UTC), mirrors timestamp
     
     total_score = Column(Integer, nullable=False) # 0-100 or similar scale
     details = Column(Text, nullable=False) # JSON string: {"q1": "yes", "q2": 5, "raw_score": 85}
@@ -320,6 +432,7 @@ class AssessmentResult(Base):
     
     __table_args__ = (
         Index('idx_assessment_user_type', 'user_id', 'assessment_type'),
+        Index('idx_assessment_user_epoch', 'user_id', 'timestamp_epoch'),
     )
     
 # Simple function to get session (from upstream)
@@ -336,14 +449,175 @@ def receive_before_create(target: Any, connection: Connection, **kw: Any) -> Non
     """Optimize database settings before tables are created"""
     logger.info("Optimizing database settings...")
     
-    # SQLite specific optimizations
+    # SQLite specific optimizations (same profile the app engine applies on connect)
     if connection.engine.name == 'sqlite':
-        connection.execute(text('PRAGMA journal_mode = WAL'))  # Write-Ahead Logging for better concurrency
-        connection.execute(text('PRAGMA synchronous = NORMAL'))  # Good balance of safety and performance
-        connection.execute(text('PRAGMA cache_size = -2000'))  # 2MB cache
-        connection.execute(text('PRAGMA temp_store = MEMORY'))  # Store temp tables in memory
-        connection.execute(text('PRAGMA mmap_size = 268435456'))  # 256MB memory map
-        connection.execute(text('PRAGMA foreign_keys = ON'))  # Enable foreign key constraints
+        from app.db import apply_sqlite_pragmas
+        dbapi_connection = connection.connection.dbapi_connection
+        # Only takes effect before the first table exists; lets maintenance reclaim free pages
+        dbapi_connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        apply_sqlite_pragmas(dbapi_connection)
+
+def answer_rows_sql(responses: str = "responses", attempts: str = "attempt_answers") -> str:
+    """SELECT behind the answer_rows view, over the given responses / attempt_answers sources."""
+    position = "p.pos"
+    return f"""
+        SELECT id, username, question_id, response_value, age_group, detailed_age_group,
+               timestamp, timestamp_epoch, user_id, attempt_id, NULL AS latency_ms
+        FROM {responses}
+        UNION ALL
+        SELECT -(a.id * {MAX_ANSWERS_PER_ATTEMPT} + {position} + 1), a.username,
+               {sql_unpack('a.question_ids', position, QUESTION_ID_TYPECODE)},
+               {sql_unpack('a.response_values', position, VALUE_TYPECODE)},
+               a.age_group, a.detailed_age_group, a.timestamp, a.timestamp_epoch, a.user_id, a.session_key,
+               {sql_unpack('a.latencies_ms', position, LATENCY_TYPECODE)}
+        FROM {attempts} a JOIN answer_positions p ON p.pos < a.answer_count
+    """
+
+@event.listens_for(Base.metadata, 'after_create')
+def receive_after_create(target: Any, connection: Connection, **kw: Any) -> None:
+    """Fill answer_positions, (re)create the answer_rows view, the change_log and epoch triggers"""
+    if connection.engine.name != 'sqlite':
+        return
+    connection.execute(text(f"""
+        WITH RECURSIVE n(pos) AS (SELECT 0 UNION ALL SELECT pos + 1 FROM n WHERE pos < {MAX_ANSWERS_PER_ATTEMPT - 1})
+        INSERT OR IGNORE INTO answer_positions (pos) SELECT pos FROM n
+    """))
+    connection.execute(text("DROP VIEW IF EXISTS answer_rows"))
+    connection.execute(text(f"CREATE VIEW answer_rows AS {answer_rows_sql()}"))
+    # SQLite fires the newest trigger first: creating the epoch triggers before the
+    # change_log ones logs a raw insert ahead of the mirror update it causes
+    for model, (source, mirror) in EPOCH_COLUMNS.items():
+        for statement in epoch_sync_ddl(model.__tablename__, source, mirror):
+            connection.execute(text(statement))
+    for table_name in CHANGE_LOG_TABLES:
+        for statement in change_log_ddl(table_name):
+            connection.execute(text(statement))
+
+# String timestamp column -> integer epoch mirror, kept in sync on every ORM write
+# (and by epoch_sync_ddl() triggers for raw SQL and Core writes)
+EPOCH_COLUMNS: Dict[Any, Tuple[str, str]] = {
+    Score: ('timestamp', 'timestamp_epoch'),
+    Response: ('timestamp', 'timestamp_epoch'),
+    AttemptAnswers: ('timestamp', 'timestamp_epoch'),
+    JournalEntry: ('entry_date', 'entry_date_epoch'),
+    SatisfactionRecord: ('timestamp', 'timestamp_epoch'),
+    AssessmentResult: ('timestamp', 'timestamp_epoch'),
+}
+
+def _sync_epoch_column(mapper: Any, connection: Connection, target: Any) -> None:
+    """Fill the epoch mirror from the string timestamp before INSERT/UPDATE."""
+    source, mirror = EPOCH_COLUMNS[mapper.class_]
+    value = getattr(target, source)
+    if value is None:
+        # Column defaults run after this hook; resolve it now so both columns agree
+        default = mapper.columns[source].default
+        if default is None or not default.is_callable:
+            return
+        value = default.arg(None)
+        setattr(target, source, value)
+    setattr(target, mirror, to_epoch(value))
+
+for _model in EPOCH_COLUMNS:
+    event.listen(_model, 'before_insert', _sync_epoch_column)
+    event.listen(_model, 'before_update', _sync_epoch_column)
+
+def epoch_sync_ddl(table_name: str, source: str, mirror: str) -> List[str]:
+    """
+    CREATE TRIGGER statements filling an epoch mirror for writes that skip the
+    ORM hooks: inserts that leave it NULL, and updates of the timestamp that
+    leave it unchanged. strftime('%s') agrees with to_epoch().
+    """
+    value = f"CAST(strftime('%s', new.{source}) AS INTEGER)"
+    statements = []
+    for suffix, event_name, when in (
+        ('ai', 'INSERT', f"new.{mirror} IS NULL AND new.{source} IS NOT NULL"),
+        ('au', f'UPDATE OF {source}', f"new.{source} IS NOT old.{source} AND new.{mirror} IS old.{mirror}"),
+    ):
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS epoch_sync_{table_name}_{suffix} AFTER {event_name} ON {table_name}
+            WHEN {when} BEGIN
+                UPDATE {table_name} SET {mirror} = {value} WHERE rowid = new.rowid;
+            END
+        """)
+    return statements
+
+# Username-stamped models that also carry a user_id foreign key
+USER_OWNED_MODELS = (Score, Response, AttemptAnswers, JournalEntry, JournalTag, SatisfactionRecord)
+
+def _fill_user_id(mapper: Any, connection: Connection, target: Any) -> None:
+    """Resolve user_id from username on insert when the caller did not set it."""
+    if target.user_id is None and target.username:
+        target.user_id = connection.execute(
+            select(User.id).where(User.username == target.username)
+        ).scalar()
+
+for _model in USER_OWNED_MODELS:
+    event.listen(_model, 'before_insert', _fill_user_id)
+
+# statistics_cache upkeep lives in the stats service, which imports this module
+@event.listens_for(Score, 'after_insert')
+def _fold_score_into_stats(mapper: Any, connection: Connection, target: Score) -> None:
+    from app.services.stats_service import on_score_insert
+    on_score_insert(mapper, connection, target)
+
+@event.listens_for(Score, 'after_update')
+@event.listens_for(Score, 'after_delete')
+def _expire_score_stats(mapper: Any, connection: Connection, target: Score) -> None:
+    from app.services.stats_service import on_score_change
+    on_score_change(mapper, connection, target)
+
+@event.listens_for(User, 'after_insert')
+def _claim_user_rows(mapper: Any, connection: Connection, target: User) -> None:
+    """Give a new account the rows written under its username before it existed."""
+    for model in USER_OWNED_MODELS:
+        owned = model.__table__
+        connection.execute(
+            owned.update()
+            .where(owned.c.user_id.is_(None), owned.c.username == target.username)
+            .values(user_id=target.id)
+        )
+
+def normalize_tags(value: Any) -> List[str]:
+    """
+    Tag list from a stored tags value: a JSON list or a comma-separated string.
+    Tags are trimmed, lower-cased and de-duplicated, keeping first-seen order.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            items = json.loads(value)
+        except ValueError:
+            items = value.split(',')
+        if isinstance(items, str):
+            items = [items]
+    else:
+        items = value
+    return list(dict.fromkeys(str(t).strip().lower() for t in items if str(t).strip()))
+
+def _sync_journal_tags(mapper: Any, connection: Connection, target: "JournalEntry") -> None:
+    """Rewrite the entry's journal_tags rows when its tags change."""
+    if not inspect(target).attrs.tags.history.has_changes():
+        return
+    table = JournalTag.__table__
+    connection.execute(table.delete().where(table.c.entry_id == target.id))
+    rows = [
+        {"entry_id": target.id, "tag": tag, "user_id": target.user_id, "username": target.username}
+        for tag in normalize_tags(target.tags)
+    ]
+    if rows:
+        connection.execute(table.insert(), rows)
+
+event.listen(JournalEntry, 'after_insert', _sync_journal_tags)
+event.listen(JournalEntry, 'after_update', _sync_journal_tags)
+
+def _invalidate_cached_settings(mapper: Any, connection: Connection, target: "UserSettings") -> None:
+    """Drop the in-process settings cache entry when the row is changed through the ORM."""
+    from app.db import invalidate_user_settings
+    invalidate_user_settings(target.user_id)
+
+event.listen(UserSettings, 'after_update', _invalidate_cached_settings)
+event.listen(UserSettings, 'after_delete', _invalidate_cached_settings)
 
 @event.listens_for(Question.__table__, 'after_create')
 def receive_after_create_question(target: Any, connection: Connection, **kw: Any) -> None:
@@ -384,6 +658,41 @@ def receive_after_create_question(target: Any, connection: Connection, **kw: Any
     except:
         logger.warning("FTS5 not available, skipping full-text search optimization")
 
+# External-content FTS5 index over journal text; rows are the journal_entries ids.
+# Triggers keep it in step with inserts, deletes and edits of the indexed columns.
+JOURNAL_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS journal_search
+    USING fts5(content, tags, content='journal_entries', content_rowid='id', tokenize='porter unicode61')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_search_ai AFTER INSERT ON journal_entries BEGIN
+        INSERT INTO journal_search(rowid, content, tags) VALUES (new.id, new.content, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_search_ad AFTER DELETE ON journal_entries BEGIN
+        INSERT INTO journal_search(journal_search, rowid, content, tags) VALUES ('delete', old.id, old.content, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_search_au AFTER UPDATE OF content, tags ON journal_entries BEGIN
+        INSERT INTO journal_search(journal_search, rowid, content, tags) VALUES ('delete', old.id, old.content, old.tags);
+        INSERT INTO journal_search(rowid, content, tags) VALUES (new.id, new.content, new.tags);
+    END
+    """,
+]
+
+@event.listens_for(JournalEntry.__table__, 'after_create')
+def receive_after_create_journal(target: Any, connection: Connection, **kw: Any) -> None:
+    """Create the journal full-text index after journal table creation"""
+    try:
+        for statement in JOURNAL_SEARCH_DDL:
+            connection.execute(text(statement))
+        logger.info("Full-text search index created for journal entries")
+    except Exception as e:
+        logger.warning(f"FTS5 not available, journal search will use LIKE: {e}")
+
 # ==================== CACHE AND PERFORMANCE TABLES ====================
 
 class QuestionCache(Base):
@@ -423,6 +732,48 @@ class StatisticsCache(Base):
         Index('idx_stats_name_valid', 'stat_name', 'valid_until'),
     )
 
+# ==================== CHANGE DATA CAPTURE ====================
+
+class ChangeLog(Base):
+    """
+    One row per insert/update/delete on the CHANGE_LOG_TABLES, appended by
+    triggers (see app.db_changes). seq never repeats, even after pruning.
+    """
+    __tablename__ = 'change_log'
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    table_name = Column(String, nullable=False)
+    op = Column(String(1), nullable=False)  # 'I', 'U' or 'D'
+    row_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=True)  # Owner at the time of the change; no FK, the user may be gone
+    ts = Column(Integer, nullable=False)  # Seconds since epoch (UTC)
+
+    __table_args__ = {'sqlite_autoincrement': True}
+
+class ChangeConsumer(Base):
+    """Durable read cursor of one change_log consumer"""
+    __tablename__ = 'change_consumers'
+
+    name = Column(String, primary_key=True)
+    last_seq = Column(Integer, nullable=False, default=0)  # Highest acknowledged seq
+    updated_at = Column(String, default=lambda: datetime.utcnow().isoformat())
+
+# Tables whose writes are logged to change_log (answers live in attempt_answers, legacy ones in responses)
+CHANGE_LOG_TABLES = ('scores', 'responses', 'attempt_answers', 'journal_entries', 'satisfaction_records',
+                     'assessment_results')
+
+def change_log_ddl(table_name: str) -> List[str]:
+    """CREATE TRIGGER statements logging inserts, updates and deletes on a table."""
+    statements = []
+    for suffix, event_name, op, row in (('ai', 'INSERT', 'I', 'new'), ('au', 'UPDATE', 'U', 'new'), ('ad', 'DELETE', 'D', 'old')):
+        statements.append(f"""
+            CREATE TRIGGER IF NOT EXISTS change_log_{table_name}_{suffix} AFTER {event_name} ON {table_name} BEGIN
+                INSERT INTO change_log (table_name, op, row_id, user_id, ts)
+                VALUES ('{table_name}', '{op}', {row}.id, {row}.user_id, CAST(strftime('%s', 'now') AS INTEGER));
+            END
+        """)
+    return statements
+
 # ==================== PERFORMANCE HELPER FUNCTIONS ====================
 
 def create_performance_indexes(engine: Engine) -> None:
@@ -453,45 +804,35 @@ def create_performance_indexes(engine: Engine) -> None:
 def preload_frequent_data(session: Session) -> None:
     """Preload frequently accessed data into cache"""
     try:
-        # Cache active questions
+        # Snapshot active questions for warm starts (keeps accumulated access_count)
         active_questions = session.query(Question).filter(
             Question.is_active == 1
         ).order_by(Question.id).all()
+        existing = {c.question_id: c for c in session.query(QuestionCache).all()}
         
         for question in active_questions:
-            cache_entry = QuestionCache(
-                question_id=question.id,
-                question_text=question.question_text,
-                category_id=question.category_id,
-                difficulty=question.difficulty,
-                is_active=question.is_active
-            )
-            session.merge(cache_entry)
+            cache_entry = existing.pop(question.id, None)
+            if cache_entry is None:
+                cache_entry = QuestionCache(question_id=question.id, access_count=0)
+                session.add(cache_entry)
+            cache_entry.question_text = question.question_text
+            cache_entry.category_id = question.category_id
+            cache_entry.difficulty = question.difficulty
+            cache_entry.is_active = question.is_active
+            cache_entry.min_age = question.min_age
+            cache_entry.max_age = question.max_age
+            cache_entry.tooltip = question.tooltip
+            cache_entry.cached_at = datetime.utcnow().isoformat()
         
-        # Cache global statistics
-        from sqlalchemy import func
-        avg_score = session.query(func.avg(Score.total_score)).scalar() or 0
-        question_count = session.query(func.count(Question.id)).filter(
-            Question.is_active == 1
-        ).scalar() or 0
-        
-        stats = [
-            ('avg_score_global', avg_score, datetime.utcnow().isoformat()),
-            ('question_count', question_count, datetime.utcnow().isoformat()),
-            ('active_users', session.query(func.count(User.id)).scalar() or 0, 
-             datetime.utcnow().isoformat())
-        ]
-        
-        for stat_name, stat_value, calculated_at in stats:
-            cache_entry = StatisticsCache(
-                stat_name=stat_name,
-                stat_value=stat_value,
-                calculated_at=calculated_at,
-                valid_until=(datetime.utcnow() + timedelta(hours=24)).isoformat()
-            )
-            session.merge(cache_entry)
+        # Questions deactivated since the last snapshot
+        for stale in existing.values():
+            stale.is_active = 0
         
         session.commit()
+
+        # Global statistics live in StatisticsCache, maintained by the stats service
+        from app.services.stats_service import StatisticsService
+        StatisticsService.refresh()
         logger.info("Frequent data preloaded into cache")
         
     except Exception as e:
@@ -500,46 +841,63 @@ def preload_frequent_data(session: Session) -> None:
 
 # ==================== QUERY OPTIMIZATION FUNCTIONS ====================
 
-def get_active_questions_optimized(session: Session, limit: Optional[int] = None, offset: int = 0) -> List[Any]:
-    """Optimized query for loading active questions"""
-    # Try cache first
-    cached = session.query(QuestionCache).filter(
-        QuestionCache.is_active == 1
-    ).order_by(QuestionCache.question_id)
-    
-    if limit:
-        cached = cached.limit(limit)
-    if offset:
-        cached = cached.offset(offset)
-    
-    cached_results = cached.all()
-    
-    if cached_results:
-        # Update access count
-        for cache_entry in cached_results:
-            cache_entry.access_count += 1
-        session.commit()
-        
-        return [(c.question_id, c.question_text) for c in cached_results]
-    
-    # Fallback to direct query if cache misses
-    query = session.query(Question.id, Question.question_text).filter(
-        Question.is_active == 1
-    ).order_by(Question.id)
-    
-    if limit:
-        query = query.limit(limit)
-    if offset:
-        query = query.offset(offset)
-    
-    return query.all()
+def get_active_questions_optimized(session: Optional[Session] = None, limit: Optional[int] = None,
+                                   offset: int = 0) -> List[Any]:
+    """
+    Active (id, question_text) pairs from the in-process question cache.
+    Reads never write: access statistics are counted in memory and flushed
+    to question_cache in batches (see app.questions.flush_access_stats).
+
+    ``session`` is deprecated and ignored: questions come from the shared
+    in-memory list, which loads itself on first use.
+    """
+    if session is not None:
+        warnings.warn(
+            "get_active_questions_optimized() no longer uses its session argument",
+            DeprecationWarning, stacklevel=2
+        )
+    from app.questions import get_active_questions
+    return get_active_questions(limit=limit, offset=offset)
+
+def resolve_user_id(session: Session, username: str) -> Optional[int]:
+    """
+    Look up a user's primary key by username (None if no account exists).
+    Found ids are remembered in session.info, so a session resolves each name once.
+    """
+    known = session.info.setdefault("user_ids", {})
+    if username not in known:
+        user_id = session.query(User.id).filter_by(username=username).scalar()
+        if user_id is None:
+            return None
+        known[username] = user_id
+    return known[username]
+
+def owner_key(user_id: Optional[int], username: str) -> Dict[str, Any]:
+    """
+    filter_by() arguments selecting a user's rows, for callers that hold the id.
+    Uses the integer user_id FK when the account exists, so history follows
+    the account rather than the name; falls back to username otherwise.
+    """
+    if user_id is None:
+        return {"username": username}
+    return {"user_id": user_id}
+
+def owner_sql(user_id: Optional[int], username: str) -> Tuple[str, Tuple[Any, ...]]:
+    """Raw-SQL form of owner_key(): a WHERE condition and its parameters."""
+    if user_id is None:
+        return "username = ?", (username,)
+    return "user_id = ?", (user_id,)
+
+def owner_filter(session: Session, username: str) -> Dict[str, Any]:
+    """owner_key() for a username, resolving its user_id in the session."""
+    return owner_key(resolve_user_id(session, username), username)
 
 def get_user_scores_optimized(session: Session, username: str, limit: int = 50) -> List["Score"]:
     """Optimized query for user scores with pagination"""
-    return session.query(Score).filter(
-        Score.username == username
+    return session.query(Score).filter_by(
+        **owner_filter(session, username)
     ).order_by(
-        Score.timestamp.desc()
+        Score.timestamp_epoch.desc()
     ).limit(limit).all()
 
 # Initialize logger
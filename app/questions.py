@@ -3,9 +3,11 @@ import json
 import os
 import time
 from datetime import datetime, timedelta
+from collections import Counter
 from functools import lru_cache
 import threading
-from typing import List, Tuple, Optional, Dict, Any, Union, Callable
+from typing import List, Tuple, Optional, Dict, Any, Union, Callable, Iterable
+from sqlalchemy import bindparam, update
 from sqlalchemy.orm import Session
 
 from app.db import safe_db_context
@@ -23,12 +25,19 @@ _ALL_QUESTIONS: List[Tuple[int, str, Optional[str], int, int]] = []
 _INIT_LOCK = threading.Lock()
 
 
-def initialize_questions() -> bool:
+def initialize_questions(warm_start: bool = False) -> bool:
     """
     Load all active questions from DB into memory.
     Safe to call multiple times (reloads data).
+
+    With warm_start=True the persisted question_cache snapshot is served
+    first (if populated) and question_bank is reloaded in the background.
     """
     global _ALL_QUESTIONS
+
+    if warm_start and _load_snapshot():
+        safe_thread_run(initialize_questions)
+        return True
     
     with _INIT_LOCK:
         try:
@@ -56,6 +65,92 @@ def initialize_questions() -> bool:
             logger.error(f"Failed to initialize questions: {e}")
             return False
 
+def _load_snapshot() -> bool:
+    """Fill the in-memory list from the question_cache table. Returns False if it is empty."""
+    global _ALL_QUESTIONS
+
+    with _INIT_LOCK:
+        try:
+            with safe_db_context() as session:
+                rows = session.query(
+                    QuestionCache.question_id,
+                    QuestionCache.question_text,
+                    QuestionCache.tooltip,
+                    QuestionCache.min_age,
+                    QuestionCache.max_age
+                ).filter(
+                    QuestionCache.is_active == 1
+                ).order_by(QuestionCache.question_id).all()
+        except Exception as e:
+            logger.warning(f"Question cache snapshot unavailable: {e}")
+            return False
+
+        if not rows:
+            return False
+        _ALL_QUESTIONS = [(r.question_id, r.question_text, r.tooltip, r.min_age, r.max_age) for r in rows]
+        logger.info(f"Warm-started {len(_ALL_QUESTIONS)} questions from cache snapshot.")
+        return True
+
+def get_active_questions(limit: Optional[int] = None, offset: int = 0) -> List[Tuple[int, str]]:
+    """(id, question_text) for active questions, served from memory."""
+    if not _ALL_QUESTIONS:
+        initialize_questions(warm_start=True)
+
+    end = offset + limit if limit else None
+    page = [(q[0], q[1]) for q in _ALL_QUESTIONS[offset:end]]
+    record_question_access(q[0] for q in page)
+    return page
+
+# ------------------ ACCESS STATISTICS ------------------
+# Reads only bump in-process counters; flush_access_stats() writes them to
+# question_cache.access_count in one executemany, at most once per interval.
+ACCESS_FLUSH_INTERVAL_SECONDS = 60
+_ACCESS_COUNTS: Counter = Counter()
+_ACCESS_LOCK = threading.Lock()
+_last_access_flush = time.monotonic()
+
+
+def record_question_access(question_ids: Iterable[int]) -> None:
+    """Count reads of questions; schedules a background flush when one is due."""
+    global _last_access_flush
+
+    with _ACCESS_LOCK:
+        _ACCESS_COUNTS.update(question_ids)
+        due = bool(_ACCESS_COUNTS) and time.monotonic() - _last_access_flush >= ACCESS_FLUSH_INTERVAL_SECONDS
+        if due:
+            _last_access_flush = time.monotonic()
+
+    if due:
+        safe_thread_run(flush_access_stats)
+
+def flush_access_stats() -> int:
+    """
+    Add the pending access counters to question_cache.access_count.
+    Questions without a snapshot row are ignored. Returns the number of
+    questions whose counters were flushed.
+    """
+    with _ACCESS_LOCK:
+        pending = dict(_ACCESS_COUNTS)
+        _ACCESS_COUNTS.clear()
+    if not pending:
+        return 0
+
+    table = QuestionCache.__table__
+    stmt = update(table).where(
+        table.c.question_id == bindparam("qid")
+    ).values(access_count=table.c.access_count + bindparam("hits"))
+
+    try:
+        with safe_db_context() as session:
+            session.execute(stmt, [{"qid": qid, "hits": hits} for qid, hits in pending.items()])
+    except Exception as e:
+        logger.error(f"Failed to flush question access stats: {e}")
+        # Keep the counts for the next attempt
+        with _ACCESS_LOCK:
+            _ACCESS_COUNTS.update(pending)
+        return 0
+    return len(pending)
+
 def safe_thread_run(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
     """Wrapper to run a function safely in a thread with exception logging."""
     def wrapper() -> None:
@@ -90,10 +185,13 @@ def load_questions(
     # Return filter result
     if age is None:
         # Return a copy to prevent modification of global list
-        return list(_ALL_QUESTIONS)
-        
-    # In-memory filter is extremely fast
-    return [q for q in _ALL_QUESTIONS if q[3] <= age <= q[4]]
+        questions = list(_ALL_QUESTIONS)
+    else:
+        # In-memory filter is extremely fast
+        questions = [q for q in _ALL_QUESTIONS if q[3] <= age <= q[4]]
+
+    record_question_access(q[0] for q in questions)
+    return questions
 
 
 SATISFACTION_QUESTIONS = {
@@ -0,0 +1,74 @@
+"""
+Read models for read-only query paths.
+
+List views and analytics loops only read rows, so they get plain named
+tuples built straight from Core ``select()`` rows instead of ORM instances:
+no identity map, no instance state, nothing to expire or detach. Field
+names match the ORM attributes, so ``row.content`` works the same on both.
+Writes keep going through the ORM models in app.models.
+
+    stmt = select_rows(JournalEntryRow).where(...)
+    rows = fetch_rows(session, stmt, JournalEntryRow)
+"""
+
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Type, TypeVar, cast
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.models import AssessmentResult, JournalEntry
+
+R = TypeVar("R", bound=tuple)
+
+
+class JournalEntryRow(NamedTuple):
+    id: int
+    username: Optional[str]
+    user_id: Optional[int]
+    entry_date: Optional[str]
+    entry_date_epoch: Optional[int]
+    content: Optional[str]
+    sentiment_score: Optional[float]
+    emotional_patterns: Optional[str]
+    sleep_hours: Optional[float]
+    sleep_quality: Optional[int]
+    energy_level: Optional[int]
+    work_hours: Optional[float]
+    screen_time_mins: Optional[int]
+    stress_level: Optional[int]
+    stress_triggers: Optional[str]
+    daily_schedule: Optional[str]
+    tags: Optional[str]  # JSON list, as stored
+
+
+class AssessmentResultRow(NamedTuple):
+    id: int
+    user_id: int
+    assessment_type: str
+    timestamp: Optional[str]
+    timestamp_epoch: Optional[int]
+    total_score: int
+    details: str  # JSON, as stored
+    journal_entry_id: Optional[int]
+
+
+# Read model -> ORM model its fields are selected from
+SOURCES = {
+    JournalEntryRow: JournalEntry,
+    AssessmentResultRow: AssessmentResult,
+}
+
+
+def select_rows(row_type: Type[tuple]) -> Select:
+    """SELECT of the read model's columns, in field order."""
+    model = SOURCES[row_type]
+    # NamedTuple class attributes typing.Type[tuple] does not declare
+    fields: Tuple[str, ...] = cast(Any, row_type)._fields
+    return select(*(getattr(model, name) for name in fields))
+
+
+def fetch_rows(session: Session, statement: Any, row_type: Type[R]) -> List[R]:
+    """Execute a select_rows() statement and build read models from its rows."""
+    make: Callable[[Any], R] = cast(Any, row_type)._make
+    return [make(row) for row in session.execute(statement)]
@@ -0,0 +1,183 @@
+"""
+Packed answer storage.
+
+Answers are stored one row per exam attempt in ``attempt_answers`` (question
+ids, values and latencies as packed arrays) instead of one ``responses`` row
+per answer. Readers that want one row per answer query ``AnswerRow`` (the
+``answer_rows`` view), which also includes legacy ``responses`` rows until
+``migrate_legacy_responses`` has packed them.
+"""
+
+import uuid
+import logging
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, update
+
+from app.models import AttemptAnswers, Response, Score, User
+from app.utils.answer_packing import merge_answers
+from app.utils.timestamps import to_epoch
+
+logger = logging.getLogger(__name__)
+
+# Legacy rows further apart than this (or repeating a question) start a new attempt
+ATTEMPT_GAP_SECONDS = 3600
+
+
+def attempts_query(session: Any, session_keys: Iterable[str]) -> Any:
+    """Attempts by session key, as loaded by write_answers() and link_score()."""
+    return session.query(AttemptAnswers).filter(AttemptAnswers.session_key.in_(session_keys))
+
+
+def write_answers(session: Any, rows: List[Dict[str, Any]]) -> Dict[str, AttemptAnswers]:
+    """
+    Merge buffered answer rows into their attempts' packed rows.
+
+    Rows are grouped by session_key; each attempt is created on its first
+    answers and updated in place afterwards, a re-answered question keeping
+    its position with the latest value. Returns the touched attempts by key.
+    """
+    if not rows:
+        return {}
+    keys = {r["session_key"] for r in rows}
+    attempts = {a.session_key: a for a in attempts_query(session, keys)}
+
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for row in sorted(rows, key=lambda r: r.get("seq", 0)):
+        grouped.setdefault(row["session_key"], []).append(row)
+
+    # One lookup for the whole batch
+    usernames = {r["username"] for r in rows}
+    user_ids = dict(session.execute(
+        select(User.username, User.id).where(User.username.in_(usernames))
+    ).all())
+
+    for key, group in grouped.items():
+        attempt = attempts.get(key)
+        if attempt is None:
+            first = group[0]
+            attempt = AttemptAnswers(
+                session_key=key,
+                username=first["username"],
+                user_id=user_ids.get(first["username"]),
+                age_group=first["age_group"],
+                timestamp=first["timestamp"],
+            )
+            session.add(attempt)
+            attempts[key] = attempt
+        attempt.set_answers(merge_answers(attempt.answers, (
+            # Rows spooled before latencies were recorded have none
+            (r["question_id"], r["response_value"], r.get("latency_ms") or 0) for r in group
+        )))
+
+    return attempts
+
+
+def link_score(session: Any, session_key: str, score: Score,
+               attempts: Optional[Dict[str, AttemptAnswers]] = None) -> Optional[AttemptAnswers]:
+    """Point an attempt at the Score it produced, and the score at the attempt."""
+    score.attempt_id = session_key  # type: ignore[assignment]
+    attempt = (attempts or {}).get(session_key)
+    if attempt is None:
+        attempt = attempts_query(session, [session_key]).first()
+    if attempt is not None:
+        attempt.score = score
+    return attempt
+
+
+def migrate_legacy_responses(session: Any, gap_seconds: int = ATTEMPT_GAP_SECONDS) -> int:
+    """
+    Pack existing responses rows into attempt_answers and delete them.
+
+    Each user's rows are split into attempts in timestamp order: a new attempt
+    starts when a question repeats or after gap_seconds without an answer.
+    Latencies are the time since the previous answer of the attempt (0 for
+    the first). An attempt is linked to the user's first score recorded
+    within gap_seconds after its last answer (setting the score's attempt_id
+    if it has none). Commits once per user.
+
+    Returns the number of responses rows migrated.
+    """
+    usernames = [u for (u,) in session.execute(select(Response.username).distinct()).all()]
+    migrated = 0
+    for username in usernames:
+        owned = _legacy_owned(username)
+        rows = session.execute(legacy_rows_query(username)).all()
+        if not rows:
+            continue
+
+        scores = session.execute(
+            select(Score.timestamp_epoch, Score.id).where(Score.username == username)
+            .where(Score.timestamp_epoch.isnot(None)).order_by(Score.timestamp_epoch)
+        ).all()
+        score_epochs = [epoch for epoch, _ in scores]
+
+        for group in _split_attempts(rows, gap_seconds):
+            first, last = group[0], group[-1]
+            attempt = AttemptAnswers(
+                session_key=f"legacy-{first.id}-{uuid.uuid4().hex[:8]}",
+                username=username,
+                user_id=first.user_id,
+                age_group=first.age_group,
+                detailed_age_group=first.detailed_age_group,
+                timestamp=first.timestamp,
+            )
+            answers = []
+            previous: Optional[int] = None
+            for row in group:
+                epoch = _epoch(row)
+                latency = (epoch - previous) * 1000 if previous is not None and epoch is not None else 0
+                answers.append((row.question_id, row.response_value or 0, latency))
+                previous = epoch if epoch is not None else previous
+            attempt.set_answers(answers)
+
+            last_epoch = _epoch(last)
+            if last_epoch is not None:
+                i = bisect_left(score_epochs, last_epoch)
+                if i < len(scores) and score_epochs[i] - last_epoch <= gap_seconds:
+                    attempt.score_id = scores[i][1]
+                    session.execute(
+                        update(Score).where(Score.id == attempt.score_id).where(Score.attempt_id.is_(None))
+                        .values(attempt_id=attempt.session_key)
+                    )
+            session.add(attempt)
+
+        session.execute(Response.__table__.delete().where(owned).where(Response.id <= max(r.id for r in rows)))
+        session.commit()
+        migrated += len(rows)
+
+    logger.info(f"Packed {migrated} legacy responses into attempt_answers")
+    return migrated
+
+
+def legacy_rows_query(username: Optional[str]) -> Any:
+    """One user's responses rows in answer order, as packed by migrate_legacy_responses()."""
+    return select(
+        Response.id, Response.user_id, Response.question_id, Response.response_value,
+        Response.age_group, Response.detailed_age_group, Response.timestamp, Response.timestamp_epoch
+    ).where(_legacy_owned(username)).order_by(Response.timestamp_epoch, Response.id)
+
+
+def _legacy_owned(username: Optional[str]) -> Any:
+    return Response.username.is_(None) if username is None else Response.username == username
+
+
+def _epoch(row: Any) -> Optional[int]:
+    return row.timestamp_epoch if row.timestamp_epoch is not None else to_epoch(row.timestamp)
+
+
+def _split_attempts(rows: List[Any], gap_seconds: int) -> List[List[Any]]:
+    attempts: List[List[Any]] = []
+    seen: set = set()
+    previous = None
+    for row in rows:
+        epoch = _epoch(row)
+        gap = epoch is not None and previous is not None and epoch - previous > gap_seconds
+        if not attempts or row.question_id in seen or gap:
+            attempts.append([])
+            seen = set()
+        attempts[-1].append(row)
+        seen.add(row.question_id)
+        previous = epoch if epoch is not None else previous
+    return attempts
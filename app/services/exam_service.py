@@ -1,12 +1,18 @@
 import time
+import uuid
 import statistics
 import logging
 from datetime import datetime
-from typing import List, Tuple, Optional, Any
-from sqlalchemy import desc
+from typing import List, Tuple, Optional, Any, Callable, Dict
+from sqlalchemy import asc, desc, func
 from app.db import safe_db_context
-from app.models import Score, Response, User, AssessmentResult
+from app.db_writer import get_write_queue
+from app.models import Score, User, AssessmentResult, owner_filter
 from app.exceptions import DatabaseError
+from app.read_models import AssessmentResultRow, fetch_rows, select_rows
+from app.services.answer_store import link_score
+from app.services.response_buffer import response_buffer, write_rows
+from app.utils.pagination import Cursor, Page, seek_page
 
 # Try importing NLTK sentiment analyzer
 try:
@@ -27,9 +33,9 @@ class ExamService:
         user_id: int, 
         result_ids: Optional[List[int]] = None, 
         minutes_lookback: int = 15
-    ) -> List[AssessmentResult]:
+    ) -> List[AssessmentResultRow]:
         """
-        Fetches assessment results for deep dive insights.
+        Fetches assessment results for deep dive insights, as read models.
         Args:
             user_id: The ID of the user
             result_ids: Optional list of specific result IDs to fetch
@@ -37,25 +43,24 @@ class ExamService:
         """
         try:
             with safe_db_context() as session:
-                session.expire_on_commit = False
-                query = session.query(AssessmentResult).filter(AssessmentResult.user_id == user_id)
-                
-                if result_ids:
-                    query = query.filter(AssessmentResult.id.in_(result_ids))
-                else:
-                    # Fallback to recent results
-                    # Timestamp in model is String (ISO format), so we need strict string comparison or conversion
-                    # The UI used datetime.now().timestamp() - 900 (15 mins) and compared.
-                    # Model stores string.
-                    from datetime import timedelta
-                    cutoff = (datetime.utcnow() - timedelta(minutes=minutes_lookback)).isoformat()
-                    query = query.filter(AssessmentResult.timestamp >= cutoff)
-                
-                return query.order_by(desc(AssessmentResult.timestamp)).all()
+                cutoff = int(time.time()) - minutes_lookback * 60
+                stmt = ExamService.assessment_results_query(user_id, result_ids, cutoff)
+                return fetch_rows(session, stmt, AssessmentResultRow)
         except Exception as e:
             logger.error(f"Failed to fetch assessment results: {e}")
             return []
 
+    @staticmethod
+    def assessment_results_query(user_id: int, result_ids: Optional[List[int]], cutoff: int) -> Any:
+        """Statement behind get_assessment_results(); cutoff applies when no ids are given."""
+        stmt = select_rows(AssessmentResultRow).where(AssessmentResult.user_id == user_id)
+        if result_ids:
+            stmt = stmt.where(AssessmentResult.id.in_(result_ids))
+        else:
+            # Fallback to recent results: range scan on (user_id, timestamp_epoch)
+            stmt = stmt.where(AssessmentResult.timestamp_epoch >= cutoff)
+        return stmt.order_by(desc(AssessmentResult.timestamp_epoch))
+
     @staticmethod
     def save_score(
         username: str,
@@ -66,32 +71,44 @@ class ExamService:
         reflection_text: str,
         is_rushed: bool,
         is_inconsistent: bool,
-        detailed_age_group: str
+        detailed_age_group: str,
+        responses: Optional[List[Dict[str, Any]]] = None,
+        session_key: Optional[str] = None
     ) -> bool:
-        """Saves a completed exam score to the database."""
+        """
+        Saves a completed exam score to the database.
+        Buffered answer rows passed in `responses` are written in the same transaction,
+        and the attempt identified by `session_key` is linked to the new score
+        (stored as its attempt_id).
+        """
+        timestamp = datetime.utcnow().isoformat()
+
+        def save(session: Any) -> None:
+            # Resolve User ID
+            user = session.query(User).filter_by(username=username).first()
+            user_id = user.id if user else None
+
+            new_score = Score(
+                username=username,
+                user_id=user_id,
+                age=age,
+                total_score=score,
+                sentiment_score=sentiment_score,
+                reflection_text=reflection_text,
+                is_rushed=is_rushed,
+                is_inconsistent=is_inconsistent,
+                timestamp=timestamp,
+                detailed_age_group=detailed_age_group,
+                attempt_id=session_key
+            )
+            session.add(new_score)
+            attempts = write_rows(session, responses or [])
+            if session_key:
+                link_score(session, session_key, new_score, attempts)
+
         try:
-            timestamp = datetime.utcnow().isoformat()
-            
-            with safe_db_context() as session:
-                # Resolve User ID
-                user = session.query(User).filter_by(username=username).first()
-                user_id = user.id if user else None
-                
-                new_score = Score(
-                    username=username,
-                    user_id=user_id,
-                    age=age,
-                    total_score=score,
-                    sentiment_score=sentiment_score,
-                    reflection_text=reflection_text,
-                    is_rushed=is_rushed,
-                    is_inconsistent=is_inconsistent,
-                    timestamp=timestamp,
-                    detailed_age_group=detailed_age_group
-                )
-                session.add(new_score)
-                # Commit handled by context
-                
+            # Serialized with this process's other writes and retried while the database is locked
+            get_write_queue().write(save)
             logger.info(f"Exam saved. Score: {score}, User: {username}")
             return True
             
@@ -100,46 +117,120 @@ class ExamService:
             return False
 
     @staticmethod
-    def save_response(
+    def buffer_response(
+        session_key: str,
         username: str,
         question_id: int,
         value: int,
-        age_group: str
+        age_group: str,
+        latency_ms: int = 0
     ) -> None:
-        """Saves a single question response."""
+        """Queues a response in the write-behind buffer instead of committing it."""
+        response_buffer.add(session_key, username, question_id, value, age_group, latency_ms=latency_ms)
+
+    @staticmethod
+    def flush_pending_responses() -> int:
+        """Writes all buffered responses (called on shutdown)."""
         try:
-            with safe_db_context() as session:
-                # users = session.query(User).filter_by(username=username).first()
-                # user_id = users.id if users else None
-                # Response model technically has user_id but we might not query it every single click for performance.
-                # Just saving username/question info is usually sufficient for analytics unless linked.
-                
-                resp = Response(
-                    username=username,
-                    question_id=question_id,
-                    response_value=value,
-                    age_group=age_group,
-                    timestamp=datetime.utcnow().isoformat()
-                )
-                session.add(resp)
+            return response_buffer.flush_all()
+        except Exception as e:
+            logger.error(f"Failed to flush buffered responses: {e}")
+            return 0
+
+    @staticmethod
+    def flush_expired_responses() -> int:
+        """Writes buffered responses older than the age limit (called from a timer)."""
+        try:
+            return response_buffer.flush_expired()
+        except Exception as e:
+            logger.error(f"Failed to flush expired responses: {e}")
+            return 0
+
+    @staticmethod
+    def recover_pending_responses() -> int:
+        """Replays responses spooled by a previous run that did not flush."""
+        try:
+            return response_buffer.recover()
         except Exception as e:
-            logger.error(f"Failed to save response: {e}")
+            logger.error(f"Failed to recover spooled responses: {e}")
+            return 0
 
     @staticmethod
     def get_recent_scores(username: str, limit: int = 10) -> List[int]:
         """Fetches recent total scores for consistency checks."""
         try:
             with safe_db_context() as session:
-                scores = session.query(Score.total_score)\
-                    .filter_by(username=username)\
-                    .order_by(desc(Score.timestamp))\
-                    .limit(limit)\
-                    .all()
+                scores = ExamService.recent_scores_query(session, owner_filter(session, username), limit).all()
                 return [s[0] for s in scores]
         except Exception as e:
             logger.warning(f"Failed to fetch recent scores: {e}")
             return []
 
+    @staticmethod
+    def recent_scores_query(session: Any, owner: Dict[str, Any], limit: int = 10) -> Any:
+        """Query behind get_recent_scores(); owner comes from owner_filter()."""
+        return session.query(Score.total_score).filter_by(**owner)\
+            .order_by(desc(Score.timestamp_epoch)).limit(limit)
+
+    @staticmethod
+    def get_score_history_page(username: str, cursor: Optional[Cursor] = None, limit: int = 20) -> Page:
+        """
+        One page of a user's exam history, newest first.
+        Items are (id, total_score, age, timestamp, timestamp_epoch, sentiment_score)
+        rows; pass page.next_cursor back as cursor to load more.
+        """
+        try:
+            with safe_db_context() as session:
+                query = ExamService.score_history_query(session, owner_filter(session, username))
+                return seek_page(query, Score.timestamp_epoch, Score.id, cursor, limit)
+        except Exception as e:
+            logger.error(f"Failed to load score history for {username}: {e}")
+            return Page()
+
+    @staticmethod
+    def score_history_query(session: Any, owner: Dict[str, Any]) -> Any:
+        """Unpaged query behind get_score_history_page(), keyed on (timestamp_epoch, id)."""
+        return session.query(
+            Score.id, Score.total_score, Score.age, Score.timestamp,
+            Score.timestamp_epoch, Score.sentiment_score
+        ).filter_by(**owner)
+
+    @staticmethod
+    def get_score_summary(username: str) -> Dict[str, Any]:
+        """
+        Aggregates over a user's whole exam history without loading it:
+        count, first, latest, best, worst and average total score.
+        Returns {'count': 0} when there is no history.
+        """
+        try:
+            with safe_db_context() as session:
+                owner = owner_filter(session, username)
+                count, best, worst, average = session.query(
+                    func.count(Score.id), func.max(Score.total_score),
+                    func.min(Score.total_score), func.avg(Score.total_score)
+                ).filter_by(**owner).one()
+                if not count:
+                    return {"count": 0}
+
+                return {
+                    "count": count,
+                    "first": ExamService.score_edge_query(session, owner, asc).scalar(),
+                    "latest": ExamService.score_edge_query(session, owner, desc).scalar(),
+                    "best": best,
+                    "worst": worst,
+                    "average": average,
+                }
+        except Exception as e:
+            logger.error(f"Failed to summarize scores for {username}: {e}")
+            return {"count": 0}
+
+    @staticmethod
+    def score_edge_query(session: Any, owner: Dict[str, Any], order: Callable[[Any], Any]) -> Any:
+        """First (asc) or latest (desc) total score, as read by get_score_summary()."""
+        return session.query(Score.total_score).filter_by(**owner)\
+            .filter(Score.timestamp_epoch.isnot(None))\
+            .order_by(order(Score.timestamp_epoch), order(Score.id)).limit(1)
+
 
 class ExamSession:
     """
@@ -168,8 +259,17 @@ class ExamSession:
         self.is_rushed = False
         self.is_inconsistent = False
 
+        # Attempt id, new per start_exam: keys the buffered responses and is stored
+        # as attempt_answers.session_key and scores.attempt_id
+        self.session_key = uuid.uuid4().hex
+
     def start_exam(self) -> None:
         """Initialize or reset exam state"""
+        # Persist answers from an abandoned attempt before starting over
+        if response_buffer.pending(self.session_key):
+            response_buffer.flush(self.session_key)
+        self.session_key = uuid.uuid4().hex
+
         self.current_question_index = 0
         self.responses = []
         self.response_times = []
@@ -217,7 +317,7 @@ class ExamSession:
             self.response_times.append(duration)
             
         # Async/Fire-and-forget save to DB
-        self._save_response_to_db(value)
+        self._save_response_to_db(value, duration)
 
         # Advance
         self.current_question_index += 1
@@ -290,8 +390,10 @@ class ExamSession:
     def finish_exam(self) -> bool:
         """Finalize exam and save via Service."""
         self.calculate_metrics()
-        
-        return ExamService.save_score(
+
+        # Buffered answers are committed together with the score
+        pending = response_buffer.take(self.session_key)
+        saved = ExamService.save_score(
             username=self.username,
             age=self.age,
             age_group=self.age_group,
@@ -300,13 +402,23 @@ class ExamSession:
             reflection_text=self.reflection_text,
             is_rushed=self.is_rushed,
             is_inconsistent=self.is_inconsistent,
-            detailed_age_group=self.age_group
+            detailed_age_group=self.age_group,
+            responses=pending,
+            session_key=self.session_key
         )
 
-    def _save_response_to_db(self, answer_value: int):
-        """Helper to save single response via Service"""
+        if saved:
+            response_buffer.acknowledge(pending)
+        else:
+            response_buffer.restore(self.session_key, pending)
+        return saved
+
+    def _save_response_to_db(self, answer_value: int, duration: float = 0.0):
+        """Helper to buffer single response via Service"""
         # Map index to correct ID if possible
         q_data = self.questions[self.current_question_index]
         q_id = q_data[0] if (isinstance(q_data, tuple) and isinstance(q_data[0], int)) else (self.current_question_index + 1)
         
-        ExamService.save_response(self.username, q_id, answer_value, self.age_group)
+        ExamService.buffer_response(
+            self.session_key, self.username, q_id, answer_value, self.age_group, latency_ms=int(duration * 1000)
+        )
@@ -0,0 +1,312 @@
+import csv
+import io
+import json
+import logging
+import os
+import zipfile
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import false, func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import DATA_DIR
+from app.db import get_session, safe_db_context
+from app.db_archive import history_entity
+from app.exceptions import DatabaseError, ErrorCodes, ExportError
+from app.models import (
+    AnswerRow, AssessmentResult, JournalEntry, MedicalProfile, PersonalProfile, Score,
+    User, UserStrengths, owner_filter
+)
+from app.utils.atomic import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the cursor per round trip; memory use is bounded by this, not by history size
+EXPORT_CHUNK_SIZE = 500
+
+# progress(dataset, rows_written_so_far) after every chunk
+ProgressCallback = Callable[[str, int], None]
+Chunks = Iterator[List[Dict[str, Any]]]
+# (dataset name, column names, row chunks)
+Stream = Tuple[str, List[str], Chunks]
+
+
+def _owned(model: Any, owner: Dict[str, Any]) -> Any:
+    """WHERE clause for an owner_filter() result on tables that may lack a username column."""
+    if "user_id" in owner:
+        return model.user_id == owner["user_id"]
+    if hasattr(model, "username"):
+        return model.username == owner["username"]
+    return false()  # Guests have no rows in user_id-only tables
+
+
+# Dataset name -> select of the exported columns for an owner, oldest first.
+# source(model) is the entity to read: the model, or its history over the archives.
+DATASETS: Dict[str, Callable[[Dict[str, Any], str, Callable[[Any], Any]], Any]] = {
+    "profile": lambda owner, username, source: select(
+        User.username, User.created_at,
+        PersonalProfile.occupation, PersonalProfile.education, PersonalProfile.bio,
+        PersonalProfile.email, PersonalProfile.phone, PersonalProfile.date_of_birth,
+        PersonalProfile.gender, PersonalProfile.life_events,
+        MedicalProfile.blood_type, MedicalProfile.allergies, MedicalProfile.medications,
+        MedicalProfile.medical_conditions,
+        UserStrengths.top_strengths, UserStrengths.areas_for_improvement, UserStrengths.goals
+    ).outerjoin(PersonalProfile, PersonalProfile.user_id == User.id)
+     .outerjoin(MedicalProfile, MedicalProfile.user_id == User.id)
+     .outerjoin(UserStrengths, UserStrengths.user_id == User.id)
+     .where(User.username == username),
+    "scores": lambda owner, username, source: select(
+        Score.id, Score.timestamp, Score.total_score, Score.sentiment_score, Score.reflection_text,
+        Score.is_rushed, Score.is_inconsistent, Score.age, Score.detailed_age_group
+    ).where(_owned(Score, owner)).order_by(Score.timestamp_epoch, Score.id),
+    "responses": lambda owner, username, source: _responses(owner, source(AnswerRow)),
+    "journal": lambda owner, username, source: _journal(owner, source(JournalEntry)),
+    "assessments": lambda owner, username, source: select(
+        AssessmentResult.id, AssessmentResult.timestamp, AssessmentResult.assessment_type,
+        AssessmentResult.total_score, AssessmentResult.details, AssessmentResult.journal_entry_id
+    ).where(_owned(AssessmentResult, owner)).order_by(AssessmentResult.timestamp_epoch, AssessmentResult.id),
+}
+
+
+def _responses(owner: Dict[str, Any], entity: Any) -> Any:
+    return select(
+        entity.id, entity.timestamp, entity.question_id, entity.response_value,
+        entity.age_group, entity.detailed_age_group
+    ).where(_owned(entity, owner)).order_by(entity.timestamp_epoch, entity.id)
+
+
+def _journal(owner: Dict[str, Any], entity: Any) -> Any:
+    return select(
+        entity.id, entity.entry_date, entity.content, entity.sentiment_score,
+        entity.emotional_patterns, entity.tags, entity.sleep_hours,
+        entity.sleep_quality, entity.energy_level, entity.work_hours,
+        entity.screen_time_mins, entity.stress_level, entity.stress_triggers,
+        entity.daily_schedule
+    ).where(_owned(entity, owner)).order_by(entity.entry_date_epoch, entity.id)
+
+EXPORT_FORMATS = ("json", "jsonl", "csv", "zip")
+
+# One JSON list of written export paths per user, so account deletion removes
+# exactly the files that were produced instead of scanning directories
+EXPORT_MANIFEST_DIR = os.path.join(DATA_DIR, "export_manifests")
+
+
+def manifest_path(user_id: int) -> str:
+    return os.path.join(EXPORT_MANIFEST_DIR, f"user_{user_id}.json")
+
+
+def exported_files(user_id: int) -> Optional[List[str]]:
+    """Paths recorded for a user, or None if the user has no manifest."""
+    try:
+        with open(manifest_path(user_id), encoding="utf-8") as f:
+            return list(json.load(f))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Unreadable export manifest for user {user_id}: {e}")
+        return None
+
+
+def record_export(user_id: int, filepath: str) -> None:
+    """Add a written export to the user's manifest; failures are logged, not raised."""
+    path = os.path.abspath(filepath)
+    paths = exported_files(user_id) or []
+    if path in paths:
+        return
+    try:
+        with atomic_write(manifest_path(user_id), "w", encoding="utf-8") as f:
+            json.dump(paths + [path], f, indent=2)
+    except OSError as e:
+        logger.warning(f"Failed to record export {path} for user {user_id}: {e}")
+
+
+def forget_exports(user_id: int) -> None:
+    """Drop a user's manifest."""
+    try:
+        os.remove(manifest_path(user_id))
+    except FileNotFoundError:
+        pass
+
+
+def _dumps(row: Dict[str, Any]) -> str:
+    return json.dumps(row, ensure_ascii=False, default=str)
+
+
+def _write_json(f: Any, header: Dict[str, Any], streams: Iterable[Stream],
+                progress: Optional[ProgressCallback]) -> Dict[str, int]:
+    """One JSON document, {..header, "datasets": {name: [rows]}}, written row by row."""
+    counts = {}
+    f.write("{\n")
+    for key, value in header.items():
+        f.write(f"  {json.dumps(key)}: {_dumps(value)},\n")
+    f.write('  "datasets": {')
+    for i, (name, _columns, chunks) in enumerate(streams):
+        f.write(f'{"," if i else ""}\n    {json.dumps(name)}: [')
+        counts[name] = 0
+        for chunk in chunks:
+            for row in chunk:
+                f.write(f'{"," if counts[name] else ""}\n      {_dumps(row)}')
+                counts[name] += 1
+            _report(progress, name, counts[name])
+        f.write("\n    ]" if counts[name] else "]")
+    f.write("\n  }\n}\n")
+    return counts
+
+
+def _write_jsonl(f: Any, header: Dict[str, Any], streams: Iterable[Stream],
+                 progress: Optional[ProgressCallback]) -> Dict[str, int]:
+    """JSON Lines: one {"dataset": name, ...row} object per line."""
+    counts = {}
+    for name, _columns, chunks in streams:
+        counts[name] = 0
+        for chunk in chunks:
+            f.writelines(_dumps({"dataset": name, **row}) + "\n" for row in chunk)
+            counts[name] += len(chunk)
+            _report(progress, name, counts[name])
+    return counts
+
+
+def _write_csv(f: Any, stream: Stream, progress: Optional[ProgressCallback]) -> int:
+    """One dataset as CSV with a header row."""
+    name, columns, chunks = stream
+    writer = csv.DictWriter(f, fieldnames=columns)
+    writer.writeheader()
+    count = 0
+    for chunk in chunks:
+        writer.writerows(chunk)
+        count += len(chunk)
+        _report(progress, name, count)
+    return count
+
+
+def _write_zip(f: Any, header: Dict[str, Any], streams: Iterable[Stream],
+               progress: Optional[ProgressCallback]) -> Dict[str, int]:
+    """Deflated archive with <dataset>.csv members and a manifest.json of row counts."""
+    counts = {}
+    with zipfile.ZipFile(f, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for stream in streams:
+            name = stream[0]
+            with archive.open(f"{name}.csv", "w") as member:
+                text = io.TextIOWrapper(member, encoding="utf-8", newline="")
+                counts[name] = _write_csv(text, stream, progress)
+                text.flush()
+                text.detach()
+        archive.writestr("manifest.json", json.dumps({**header, "row_counts": counts}, indent=2))
+    return counts
+
+
+def _report(progress: Optional[ProgressCallback], name: str, count: int) -> None:
+    if progress:
+        progress(name, count)
+
+
+class ExportService:
+    """
+    Streaming export of a user's data.
+
+    Rows are read from the database cursor in EXPORT_CHUNK_SIZE chunks and
+    written straight to the output, so memory stays flat regardless of how
+    much history a user has. Files are finalized with atomic_write, so a
+    failed export never leaves a truncated file behind.
+    """
+
+    @staticmethod
+    def export_user_data(
+        username: str,
+        filepath: str,
+        fmt: Optional[str] = None,
+        datasets: Optional[Sequence[str]] = None,
+        progress: Optional[ProgressCallback] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        include_archive: bool = True
+    ) -> Dict[str, int]:
+        """
+        Export datasets (default: all of DATASETS) for a user to filepath.
+
+        fmt is one of EXPORT_FORMATS and defaults to the file extension.
+        "csv" takes exactly one dataset; "zip" holds one CSV per dataset.
+        With include_archive, responses and journal entries moved to the
+        archive files (see app.db_archive) are exported too.
+        Returns the number of rows written per dataset.
+        """
+        fmt = (fmt or os.path.splitext(filepath)[1].lstrip(".")).lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ExportError(f"Unsupported export format: {fmt!r}", error_code=ErrorCodes.EXPORT_FORMAT_ERROR)
+
+        names = list(datasets or DATASETS)
+        unknown = [n for n in names if n not in DATASETS]
+        if unknown:
+            raise ExportError(f"Unknown export datasets: {', '.join(unknown)}")
+        if fmt == "csv" and len(names) != 1:
+            raise ExportError("CSV export takes exactly one dataset; use zip for several",
+                              error_code=ErrorCodes.EXPORT_FORMAT_ERROR)
+
+        session = get_session()
+        try:
+            owner = owner_filter(session, username)
+            source = ExportService._source(session, include_archive)
+            streams = (
+                ExportService._stream(session, name, DATASETS[name](owner, username, source), chunk_size)
+                for name in names
+            )
+            header = {"username": username, "exported_at": datetime.now().isoformat()}
+
+            if fmt == "zip":
+                with atomic_write(filepath, "wb") as f:
+                    counts = _write_zip(f, header, streams, progress)
+            else:
+                with atomic_write(filepath, "w", encoding="utf-8", newline="") as f:
+                    if fmt == "csv":
+                        stream = next(streams)
+                        counts = {stream[0]: _write_csv(f, stream, progress)}
+                    elif fmt == "jsonl":
+                        counts = _write_jsonl(f, header, streams, progress)
+                    else:
+                        counts = _write_json(f, header, streams, progress)
+
+            if "user_id" in owner:
+                record_export(owner["user_id"], filepath)
+            logger.info(f"Exported {sum(counts.values())} rows for {username} to {filepath}")
+            return counts
+
+        except SQLAlchemyError as e:
+            logger.error(f"Export query failed for {username}: {e}")
+            raise DatabaseError("Failed to read data for export", original_exception=e)
+        except OSError as e:
+            logger.error(f"Failed to write export {filepath}: {e}")
+            raise ExportError(f"Failed to write export file: {e}", original_exception=e)
+        finally:
+            session.close()
+
+    @staticmethod
+    def count_rows(username: str, datasets: Optional[Sequence[str]] = None,
+                   include_archive: bool = True) -> Dict[str, int]:
+        """Rows each dataset would export, counted in SQL."""
+        with safe_db_context() as session:
+            owner = owner_filter(session, username)
+            source = ExportService._source(session, include_archive)
+            return {
+                name: session.execute(
+                    select(func.count()).select_from(
+                        DATASETS[name](owner, username, source).order_by(None).subquery()
+                    )
+                ).scalar()
+                for name in (datasets or DATASETS)
+            }
+
+    @staticmethod
+    def _source(session: Any, include_archive: bool) -> Callable[[Any], Any]:
+        if include_archive:
+            return lambda model: history_entity(session, model)
+        return lambda model: model
+
+    @staticmethod
+    def _stream(session: Any, name: str, statement: Any, chunk_size: int) -> Stream:
+        """Lazily executed dataset: rows are only fetched as the writer consumes chunks."""
+        def chunks() -> Chunks:
+            result = session.execute(statement.execution_options(yield_per=chunk_size))
+            for partition in result.mappings().partitions():
+                yield [dict(row) for row in partition]
+
+        return name, list(statement.selected_columns.keys()), chunks()
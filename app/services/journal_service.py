@@ -1,13 +1,52 @@
+import re
 import logging
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, Iterable, Tuple
 from datetime import datetime
-from sqlalchemy import desc
+from sqlalchemy import column, desc, func, literal_column, select, table, text
+from sqlalchemy.sql.expression import ColumnClause
 from app.db import safe_db_context
-from app.models import JournalEntry, User
+from app.models import JournalEntry, JournalTag, User, normalize_tags, owner_filter
 from app.exceptions import DatabaseError
+from app.read_models import JournalEntryRow, fetch_rows, select_rows
+from app.utils.pagination import Cursor, Page, seek_page
+from app.utils.timestamps import day_bounds
 
 logger = logging.getLogger(__name__)
 
+# Mood filter -> sentiment band predicate; sentiment runs -100..100 (missing = 0)
+SENTIMENT_BANDS = {
+    "Positive": lambda s: s > 30,
+    "Neutral": lambda s: s.between(-30, 30),
+    "Negative": lambda s: s < -30,
+}
+
+# "Type" filter of the history view -> predicate on the entry's metrics
+ENTRY_TYPES = {
+    "High Stress": lambda: func.coalesce(JournalEntry.stress_level, 0) > 7,
+    "Great Days": lambda: func.coalesce(JournalEntry.energy_level, 0) > 7,
+    "Bad Sleep": lambda: func.coalesce(JournalEntry.sleep_hours, 7) < 6,
+}
+
+# History pages carry this much of each entry's text; open the entry for the rest
+PREVIEW_CHARS = 200
+HISTORY_PAGE_SIZE = 20
+
+# FTS5 index maintained by triggers on journal_entries (see JOURNAL_SEARCH_DDL in app.models)
+journal_search = table("journal_search", column("rowid"), column("rank"))
+
+_FTS_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_terms(words: str) -> Optional[str]:
+    """
+    FTS5 MATCH operand for free text: every word must match, as a prefix.
+    Quoting each token keeps user input from being parsed as FTS syntax.
+    """
+    tokens = _FTS_TOKEN.findall(words or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{t}"*' for t in tokens)
+
 class JournalService:
     """
     Service layer for handling Journal Entry operations.
@@ -71,7 +110,7 @@ class JournalService:
         username: str, 
         month_filter: Optional[str] = None, 
         type_filter: Optional[str] = None
-    ) -> List[JournalEntry]:
+    ) -> List[JournalEntryRow]:
         """
         Retrieves journal entries for a user with optional filters.
         
@@ -81,56 +120,309 @@ class JournalService:
             type_filter: Optional filter string ("High Stress", "Great Days", etc.)
             
         Returns:
-            List of JournalEntry objects
+            List of JournalEntryRow read models, newest first
         """
         try:
             with safe_db_context() as session:
-                query = session.query(JournalEntry)\
-                    .filter_by(username=username)\
-                    .order_by(desc(JournalEntry.entry_date))
-                
-                session.expire_on_commit = False
+                stmt = JournalService.entries_query(owner_filter(session, username))
                 
-                # Basic fetching - Logic for complex filters (Month/Type) 
-                # is currently done in memory in the UI because of the 
-                # nature of SQLite date strings and complex business logic.
-                # Ideally, we would move that logic here.
-                
-                entries = query.all()
-                
-                # If we want to move filtering here later, we can.
-                # For now, return all and let UI filter or implement basic filtering here.
-                # Since the UI implementation was doing in-memory filtering, 
-                # we'll return the full list or implement the filtering logic here 
-                # if we want to be pure.
-                
-                # Let's return all and let the client filter for now to minimize risk 
-                # of breaking the complex UI loop, BUT this is where we'd add 
-                # server-side filtering logic in Phase 3.
-                
-                return entries
+                # Month/Type filters are applied in memory by the UI; the
+                # history view uses get_history_page() for server-side filters.
+                return fetch_rows(session, stmt, JournalEntryRow)
                 
         except Exception as e:
             logger.error(f"Failed to retrieve journal entries for {username}: {e}")
             raise DatabaseError("Failed to retrieve journal history", original_exception=e)
 
     @staticmethod
-    def get_recent_entries(username: str, days: int = 7) -> List[JournalEntry]:
+    def entries_query(owner: Dict[str, Any]) -> Any:
+        """Statement behind get_entries(); owner comes from owner_filter()."""
+        return select_rows(JournalEntryRow).filter_by(**owner).order_by(desc(JournalEntry.entry_date_epoch))
+
+    @staticmethod
+    def get_recent_entries(username: str, days: int = 7) -> List[JournalEntryRow]:
         """
-        Retrieves journal entries from the last N days.
+        Retrieves journal entries from the last N days (read models).
         """
         try:
             from datetime import timedelta
-            start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+            # entry_date is written in local time, so the cutoff is too
+            start_epoch, _ = day_bounds(datetime.now() - timedelta(days=days))
             
             with safe_db_context() as session:
-                session.expire_on_commit = False
-                entries = session.query(JournalEntry)\
-                    .filter(JournalEntry.username == username)\
-                    .filter(JournalEntry.entry_date >= start_date)\
-                    .order_by(desc(JournalEntry.entry_date))\
-                    .all()
-                return entries
+                stmt = JournalService.recent_entries_query(owner_filter(session, username), start_epoch)
+                return fetch_rows(session, stmt, JournalEntryRow)
         except Exception as e:
             logger.error(f"Failed to retrieve recent entries: {e}")
             return []
+
+    @staticmethod
+    def recent_entries_query(owner: Dict[str, Any], start_epoch: int) -> Any:
+        """Statement behind get_recent_entries()."""
+        return select_rows(JournalEntryRow).filter_by(**owner)\
+            .where(JournalEntry.entry_date_epoch >= start_epoch)\
+            .order_by(desc(JournalEntry.entry_date_epoch))
+
+    @staticmethod
+    def search(
+        username: str,
+        text_query: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        start_date: Optional[Any] = None,
+        end_date: Optional[Any] = None,
+        mood: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Search a user's journal in a single query.
+
+        Args:
+            username: The user's username
+            text_query: Free text; every word must appear in the entry (prefix match)
+            tags: Entries carrying any of these tags (exact match via journal_tags)
+            start_date: First day to include (date or 'YYYY-MM-DD')
+            end_date: Last day to include (date or 'YYYY-MM-DD')
+            mood: 'Positive', 'Neutral' or 'Negative' (see SENTIMENT_BANDS)
+            limit: Maximum number of hits
+
+        Returns:
+            Dicts with 'entry' (JournalEntry), 'snippet' (matched text with the
+            hits in [brackets], None without a text query) and 'rank' (bm25,
+            lower is better). Text searches are ordered by rank, others newest first.
+
+        Raises:
+            ValueError: If a date bound can't be parsed
+            DatabaseError: If the query fails
+        """
+        terms = _fts_terms(text_query) if text_query else None
+
+        try:
+            with safe_db_context() as session:
+                session.expire_on_commit = False
+                query = JournalService.search_query(
+                    session, owner_filter(session, username), text_query, tags,
+                    start_date=start_date, end_date=end_date, mood=mood,
+                    use_fts=bool(terms) and JournalService._fts_available(session)
+                )
+                return [
+                    {"entry": entry, "snippet": snip if terms else None, "rank": r}
+                    for entry, snip, r in query.limit(limit).all()
+                ]
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Journal search failed for {username}: {e}")
+            raise DatabaseError("Failed to search journal entries", original_exception=e)
+
+    @staticmethod
+    def search_query(
+        session: Any,
+        owner: Dict[str, Any],
+        text_query: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        start_date: Optional[Any] = None,
+        end_date: Optional[Any] = None,
+        mood: Optional[str] = None,
+        use_fts: bool = True
+    ) -> Any:
+        """
+        Unlimited query behind search(): (entry, snippet, rank) rows in result
+        order. Without use_fts, text matches fall back to substring tests.
+        """
+        terms = _fts_terms(text_query) if text_query else None
+        use_fts = use_fts and bool(terms)
+
+        if use_fts:
+            snippet: ColumnClause[str] = literal_column("snippet(journal_search, 0, '[', ']', '...', 12)")
+            query = session.query(JournalEntry, snippet, journal_search.c.rank)\
+                .filter_by(**owner)\
+                .join(journal_search, journal_search.c.rowid == JournalEntry.id)\
+                .filter(text("journal_search MATCH :match").bindparams(match=f"content : ({terms})"))
+        else:
+            query = session.query(JournalEntry, literal_column("NULL"), literal_column("NULL"))\
+                .filter_by(**owner)
+            # Without FTS5, fall back to substring tests
+            for token in _FTS_TOKEN.findall(text_query or ""):
+                query = query.filter(JournalEntry.content.ilike(f"%{token}%"))
+
+        query = JournalService._apply_filters(
+            query, owner, tags=normalize_tags(list(tags or [])),
+            start_date=start_date, end_date=end_date, mood=mood
+        )
+        if use_fts:
+            return query.order_by(journal_search.c.rank)
+        return query.order_by(desc(JournalEntry.entry_date_epoch))
+
+    @staticmethod
+    def get_history_page(
+        username: str,
+        cursor: Optional[Cursor] = None,
+        limit: int = HISTORY_PAGE_SIZE,
+        tags: Optional[Iterable[str]] = None,
+        start_date: Optional[Any] = None,
+        end_date: Optional[Any] = None,
+        mood: Optional[str] = None,
+        entry_type: Optional[str] = None
+    ) -> Page:
+        """
+        One page of a user's journal history, newest first.
+
+        Items are lightweight rows (id, entry_date, entry_date_epoch, content
+        cut to PREVIEW_CHARS, sentiment, daily metrics, tags) rather than full
+        entries; use get_entry() for the full text. Pass page.next_cursor back
+        as cursor to load more. Filters are the same as search(), plus
+        entry_type (see ENTRY_TYPES).
+        """
+        try:
+            with safe_db_context() as session:
+                query = JournalService.history_query(
+                    session, owner_filter(session, username), tags,
+                    start_date=start_date, end_date=end_date, mood=mood, entry_type=entry_type
+                )
+                return seek_page(query, JournalEntry.entry_date_epoch, JournalEntry.id, cursor, limit)
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to load journal history page for {username}: {e}")
+            raise DatabaseError("Failed to retrieve journal history", original_exception=e)
+
+    @staticmethod
+    def history_query(
+        session: Any,
+        owner: Dict[str, Any],
+        tags: Optional[Iterable[str]] = None,
+        start_date: Optional[Any] = None,
+        end_date: Optional[Any] = None,
+        mood: Optional[str] = None,
+        entry_type: Optional[str] = None
+    ) -> Any:
+        """Unpaged query behind get_history_page(), keyed on (entry_date_epoch, id)."""
+        query = session.query(
+            JournalEntry.id,
+            JournalEntry.entry_date,
+            JournalEntry.entry_date_epoch,
+            func.substr(JournalEntry.content, 1, PREVIEW_CHARS).label("content"),
+            JournalEntry.sentiment_score,
+            JournalEntry.sleep_hours,
+            JournalEntry.sleep_quality,
+            JournalEntry.energy_level,
+            JournalEntry.work_hours,
+            JournalEntry.screen_time_mins,
+            JournalEntry.stress_level,
+            JournalEntry.tags
+        ).filter_by(**owner)
+
+        query = JournalService._apply_filters(
+            query, owner, tags=normalize_tags(list(tags or [])),
+            start_date=start_date, end_date=end_date, mood=mood
+        )
+        if entry_type in ENTRY_TYPES:
+            query = query.filter(ENTRY_TYPES[entry_type]())
+        return query
+
+    @staticmethod
+    def get_entry(entry_id: int) -> Optional[JournalEntry]:
+        """Full journal entry by id (detached), or None."""
+        try:
+            with safe_db_context() as session:
+                session.expire_on_commit = False
+                return session.get(JournalEntry, entry_id)
+        except Exception as e:
+            logger.error(f"Failed to load journal entry {entry_id}: {e}")
+            return None
+
+    @staticmethod
+    def _apply_filters(
+        query: Any,
+        owner: Dict[str, Any],
+        tags: Optional[List[str]] = None,
+        start_date: Optional[Any] = None,
+        end_date: Optional[Any] = None,
+        mood: Optional[str] = None
+    ) -> Any:
+        """Tag, date range and mood filters shared by search() and get_history_page()."""
+        if tags:
+            query = query.filter(JournalEntry.id.in_(JournalService._tagged_entry_ids(owner, tags)))
+        if start_date:
+            query = query.filter(JournalEntry.entry_date_epoch >= day_bounds(start_date)[0])
+        if end_date:
+            query = query.filter(JournalEntry.entry_date_epoch < day_bounds(end_date)[1])
+        if mood in SENTIMENT_BANDS:
+            query = query.filter(SENTIMENT_BANDS[mood](func.coalesce(JournalEntry.sentiment_score, 0)))
+        return query
+
+    @staticmethod
+    def _fts_available(session: Any) -> bool:
+        return session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'journal_search'")
+        ).first() is not None
+
+    @staticmethod
+    def get_entries_by_tags(
+        username: str,
+        tags: Iterable[str],
+        match_all: bool = False,
+        limit: Optional[int] = None
+    ) -> List[JournalEntry]:
+        """
+        Entries tagged with any (default) or all of the given tags, newest first.
+        Tags match exactly after normalization ("stress" does not match "distress").
+        """
+        wanted = normalize_tags(list(tags))
+        if not wanted:
+            return []
+        try:
+            with safe_db_context() as session:
+                session.expire_on_commit = False
+                query = JournalService.entries_by_tags_query(
+                    session, owner_filter(session, username), wanted, match_all
+                )
+                if limit:
+                    query = query.limit(limit)
+                return query.all()
+        except Exception as e:
+            logger.error(f"Failed to retrieve tagged entries for {username}: {e}")
+            return []
+
+    @staticmethod
+    def entries_by_tags_query(session: Any, owner: Dict[str, Any], tags: List[str], match_all: bool = False) -> Any:
+        """Unlimited query behind get_entries_by_tags(); tags are already normalized."""
+        return session.query(JournalEntry)\
+            .filter(JournalEntry.id.in_(JournalService._tagged_entry_ids(owner, tags, match_all)))\
+            .order_by(desc(JournalEntry.entry_date_epoch))
+
+    @staticmethod
+    def get_tag_counts(username: str, limit: Optional[int] = 10) -> List[Tuple[str, int]]:
+        """A user's most used tags as (tag, entry count), most frequent first."""
+        try:
+            with safe_db_context() as session:
+                query = JournalService.tag_counts_query(session, owner_filter(session, username))
+                if limit:
+                    query = query.limit(limit)
+                return [(tag, count) for tag, count in query.all()]
+        except Exception as e:
+            logger.error(f"Failed to count tags for {username}: {e}")
+            return []
+
+    @staticmethod
+    def tag_counts_query(session: Any, owner: Dict[str, Any]) -> Any:
+        """Unlimited query behind get_tag_counts(), most frequent first."""
+        entries = func.count(JournalTag.entry_id)
+        return session.query(JournalTag.tag, entries).filter_by(**owner)\
+            .group_by(JournalTag.tag).order_by(desc(entries), JournalTag.tag)
+
+    @staticmethod
+    def _tagged_entry_ids(owner: Dict[str, Any], tags: List[str], match_all: bool = False) -> Any:
+        """Subquery of entry ids carrying any/all of the (normalized) tags."""
+        if not match_all:
+            return select(JournalTag.entry_id).filter_by(**owner).where(JournalTag.tag.in_(tags))
+
+        # One index seek per tag, each narrowing the previous set (no GROUP BY sort)
+        query = select(JournalTag.entry_id).filter_by(**owner).where(JournalTag.tag == tags[0])
+        for tag in tags[1:]:
+            query = query.where(JournalTag.entry_id.in_(
+                select(JournalTag.entry_id).filter_by(**owner).where(JournalTag.tag == tag)
+            ))
+        return query
@@ -2,6 +2,8 @@ import logging
 import json
 from typing import Optional, Dict, Any, List
 from datetime import datetime
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload
 from app.db import safe_db_context
 from app.models import (
     User, UserProfile, PersonalProfile, MedicalProfile, 
@@ -24,7 +26,6 @@ class ProfileService:
         Uses joinedload to ensure data is available after session close.
         """
         try:
-            from sqlalchemy.orm import joinedload
             with safe_db_context() as session:
                 session.expire_on_commit = False
                 user = session.query(User)\
@@ -50,107 +51,97 @@ class ProfileService:
             logger.error(f"Failed to get profile for {username}: {e}")
             return None
 
+    # Profile section -> (User relationship, model) written by save_profile_bundle()
+    SECTIONS = {
+        "personal": ("personal_profile", PersonalProfile),
+        "medical": ("medical_profile", MedicalProfile),
+        "strengths": ("strengths", UserStrengths),
+        "emotional_patterns": ("emotional_patterns", UserEmotionalPatterns),
+    }
+
     @staticmethod
-    def update_personal_profile(username: str, data: Dict[str, Any]) -> bool:
+    def _apply_changes(row: Any, data: Dict[str, Any]) -> List[str]:
+        """Set the data columns whose value differs on row; returns the changed names."""
+        columns = {attr.key for attr in inspect(type(row)).column_attrs} - {"id", "user_id", "last_updated"}
+        changed = []
+        for key, value in data.items():
+            if key in columns and getattr(row, key) != value:
+                setattr(row, key, value)
+                changed.append(key)
+        return changed
+
+    @staticmethod
+    def save_profile_bundle(
+        username: str,
+        personal: Optional[Dict[str, Any]] = None,
+        medical: Optional[Dict[str, Any]] = None,
+        strengths: Optional[Dict[str, Any]] = None,
+        emotional_patterns: Optional[Dict[str, Any]] = None
+    ) -> Optional[User]:
         """
-        Updates PersonalProfile for a user.
-        Data dict keys should match PersonalProfile attributes.
+        Upserts any of the four profile rows of a user in one transaction.
+
+        Each dict's keys should match the model's columns; unknown keys are
+        ignored. Only columns whose value changed are written (and only
+        changed rows get a new last_updated), so an unchanged section costs
+        no UPDATE.
+
+        Returns:
+            The user with all four profiles loaded (detached), or None if no
+            account exists
         """
+        sections = {
+            "personal": personal,
+            "medical": medical,
+            "strengths": strengths,
+            "emotional_patterns": emotional_patterns,
+        }
         try:
             with safe_db_context() as session:
-                user = session.query(User).filter_by(username=username).first()
+                session.expire_on_commit = False
+                user = session.query(User)\
+                    .options(*(joinedload(getattr(User, rel)) for rel, _ in ProfileService.SECTIONS.values()))\
+                    .filter_by(username=username)\
+                    .first()
                 if not user:
-                    return False
-                
-                profile = user.personal_profile
-                if not profile:
-                    profile = PersonalProfile(user_id=user.id)
-                    user.personal_profile = profile
-                
-                # Generic set attr
-                for key, value in data.items():
-                    if hasattr(profile, key):
-                        setattr(profile, key, value)
-                
-                profile.last_updated = datetime.utcnow().isoformat()
-                return True
+                    return None
+
+                now = datetime.utcnow().isoformat()
+                for name, data in sections.items():
+                    if data is None:
+                        continue
+                    relationship, model = ProfileService.SECTIONS[name]
+                    row = getattr(user, relationship)
+                    created = row is None
+                    if created:
+                        row = model(user_id=user.id)
+                        setattr(user, relationship, row)
+                    if ProfileService._apply_changes(row, data) or created:
+                        row.last_updated = now
+                return user
         except Exception as e:
-            logger.error(f"Failed to update personal profile: {e}")
-            raise DatabaseError("Failed to update personal profile", original_exception=e)
+            logger.error(f"Failed to save profile for {username}: {e}")
+            raise DatabaseError("Failed to save profile", original_exception=e)
+
+    @staticmethod
+    def update_personal_profile(username: str, data: Dict[str, Any]) -> bool:
+        """
+        Updates PersonalProfile for a user.
+        Data dict keys should match PersonalProfile attributes.
+        """
+        return ProfileService.save_profile_bundle(username, personal=data) is not None
 
     @staticmethod
     def update_medical_profile(username: str, data: Dict[str, Any]) -> bool:
         """Updates MedicalProfile for a user."""
-        try:
-            with safe_db_context() as session:
-                user = session.query(User).filter_by(username=username).first()
-                if not user:
-                    return False
-                
-                profile = user.medical_profile
-                if not profile:
-                    profile = MedicalProfile(user_id=user.id)
-                    user.medical_profile = profile
-                
-                for key, value in data.items():
-                    if hasattr(profile, key):
-                        setattr(profile, key, value)
-                
-                profile.last_updated = datetime.utcnow().isoformat()
-                return True
-        except Exception as e:
-            logger.error(f"Failed to update medical profile: {e}")
-            raise DatabaseError("Failed to update medical profile", original_exception=e)
+        return ProfileService.save_profile_bundle(username, medical=data) is not None
 
     @staticmethod
     def update_strengths(username: str, data: Dict[str, Any]) -> bool:
-        """Updates UserStrengths and EmotionalPatterns."""
-        try:
-            with safe_db_context() as session:
-                user = session.query(User).filter_by(username=username).first()
-                if not user:
-                    return False
-                
-                # 1. Strengths
-                strengths = user.strengths
-                if not strengths:
-                    strengths = UserStrengths(user_id=user.id)
-                    user.strengths = strengths
-                
-                # Map specific fields if needed or generic loop
-                # The UI passes specific keys usually.
-                for key, value in data.items():
-                    if hasattr(strengths, key):
-                        setattr(strengths, key, value)
-                    # Special check: Emotional Patterns might be mixed in `data` or separate?
-                    # The UI separated them. We can have a separate method or shared.
-                
-                strengths.last_updated = datetime.utcnow().isoformat()
-                return True
-        except Exception as e:
-            logger.error(f"Failed to update strengths: {e}")
-            raise DatabaseError("Failed to update strengths", original_exception=e)
+        """Updates UserStrengths."""
+        return ProfileService.save_profile_bundle(username, strengths=data) is not None
 
     @staticmethod
     def update_emotional_patterns(username: str, data: Dict[str, Any]) -> bool:
         """Updates UserEmotionalPatterns."""
-        try:
-            with safe_db_context() as session:
-                user = session.query(User).filter_by(username=username).first()
-                if not user:
-                    return False
-                
-                ep = user.emotional_patterns
-                if not ep:
-                    ep = UserEmotionalPatterns(user_id=user.id)
-                    user.emotional_patterns = ep
-                
-                for key, value in data.items():
-                    if hasattr(ep, key):
-                        setattr(ep, key, value)
-                
-                ep.last_updated = datetime.utcnow().isoformat()
-                return True
-        except Exception as e:
-            logger.error(f"Failed to update emotional patterns: {e}")
-            raise DatabaseError("Failed to update emotional patterns", original_exception=e)
+        return ProfileService.save_profile_bundle(username, emotional_patterns=data) is not None
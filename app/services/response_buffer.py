@@ -0,0 +1,337 @@
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+from app.db import safe_db_context
+from app.db_writer import get_write_queue
+from app.models import AttemptAnswers
+from app.config import DATA_DIR
+from app.services.answer_store import write_answers
+from app.utils.atomic import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# One spool file per buffer (process), next to a lock file the owner holds
+# while it runs; recover() only replays spools whose lock it can take.
+RESPONSE_SPOOL_DIR: str = os.path.join(DATA_DIR, "response_spool")
+
+# Flush thresholds: whichever is hit first triggers a write
+MAX_PENDING_PER_SESSION = 50
+MAX_PENDING_AGE_SECONDS = 60.0
+
+
+class ResponseBuffer:
+    """
+    Write-behind buffer for exam answers.
+
+    Answers are held in memory per exam session and merged into the
+    session's packed attempt_answers row in one transaction instead of one
+    commit per click. Every buffered
+    row is also appended to this buffer's own spool file so answers survive
+    a crash; recover() replays the spools of buffers whose process is gone.
+    Sessions past the age limit are written by flush_expired(), which the
+    app calls from a timer.
+    """
+
+    def __init__(
+        self,
+        spool_dir: Optional[str] = RESPONSE_SPOOL_DIR,
+        max_pending: int = MAX_PENDING_PER_SESSION,
+        max_age_seconds: float = MAX_PENDING_AGE_SECONDS
+    ) -> None:
+        self.spool_dir = spool_dir
+        self.spool_name = f"{os.getpid()}-{time.time_ns()}"
+        self._lock_file: Optional[Any] = None
+        self.max_pending = max_pending
+        self.max_age_seconds = max_age_seconds
+
+        self._lock = threading.RLock()
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._first_added: Dict[str, float] = {}
+        # Rows taken for a write that has not been confirmed yet
+        self._in_flight: Dict[int, Dict[str, Any]] = {}
+        # Time-based start keeps sequence numbers unique across restarts
+        self._seq = time.time_ns()
+
+    # ------------------------------------------------------------------
+    # Buffering
+    # ------------------------------------------------------------------
+
+    def add(
+        self,
+        session_key: str,
+        username: str,
+        question_id: int,
+        value: int,
+        age_group: str,
+        timestamp: Optional[str] = None,
+        latency_ms: int = 0
+    ) -> None:
+        """Buffer one answer; flushes the session if a threshold is reached."""
+        with self._lock:
+            self._seq += 1
+            row = {
+                "seq": self._seq,
+                "session_key": session_key,
+                "username": username,
+                "question_id": question_id,
+                "response_value": value,
+                "age_group": age_group,
+                "timestamp": timestamp or datetime.utcnow().isoformat(),
+                "latency_ms": latency_ms,
+            }
+            self._pending.setdefault(session_key, []).append(row)
+            self._first_added.setdefault(session_key, time.monotonic())
+            self._append_to_spool(row)
+
+            should_flush = self._threshold_reached(session_key)
+
+        if should_flush:
+            self.flush(session_key)
+
+    def pending(self, session_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return a copy of the buffered rows (for one session or all)."""
+        with self._lock:
+            if session_key is not None:
+                return list(self._pending.get(session_key, []))
+            return [row for rows in self._pending.values() for row in rows]
+
+    def take(self, session_key: str) -> List[Dict[str, Any]]:
+        """
+        Remove a session's rows from the buffer for an external write.
+        The caller must follow up with acknowledge() or restore().
+        """
+        with self._lock:
+            rows = self._pending.pop(session_key, [])
+            self._first_added.pop(session_key, None)
+            for row in rows:
+                self._in_flight[row["seq"]] = row
+            return rows
+
+    def acknowledge(self, rows: List[Dict[str, Any]]) -> None:
+        """Mark taken rows as durably written and drop them from the spool."""
+        if not rows:
+            return
+        with self._lock:
+            for row in rows:
+                self._in_flight.pop(row["seq"], None)
+            self._rewrite_spool()
+
+    def restore(self, session_key: str, rows: List[Dict[str, Any]]) -> None:
+        """Put taken rows back in front of the buffer after a failed write."""
+        if not rows:
+            return
+        with self._lock:
+            for row in rows:
+                self._in_flight.pop(row["seq"], None)
+            self._pending[session_key] = rows + self._pending.get(session_key, [])
+            self._first_added.setdefault(session_key, time.monotonic())
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def flush(self, session_key: str) -> int:
+        """Write one session's buffered rows in a single transaction."""
+        rows = self.take(session_key)
+        if not rows:
+            return 0
+        try:
+            # Group-committed with other threads' writes, retried while another process holds the lock
+            get_write_queue().write(lambda session: write_rows(session, rows))
+        except Exception as e:
+            logger.error(f"Failed to flush {len(rows)} buffered responses: {e}")
+            self.restore(session_key, rows)
+            return 0
+
+        self.acknowledge(rows)
+        logger.debug(f"Flushed {len(rows)} buffered responses for session {session_key}")
+        return len(rows)
+
+    def flush_expired(self) -> int:
+        """Flush every session whose oldest buffered row exceeded the age limit."""
+        with self._lock:
+            keys = [k for k in self._pending if self._threshold_reached(k)]
+        return sum(self.flush(k) for k in keys)
+
+    def flush_all(self) -> int:
+        """Flush every session (used on exam completion and shutdown)."""
+        with self._lock:
+            keys = list(self._pending.keys())
+        return sum(self.flush(k) for k in keys)
+
+    def recover(self) -> int:
+        """
+        Replay spools left by buffers whose process exited before flushing
+        (their lock is free). Spools of running processes are left alone.
+        Returns the number of recovered responses.
+        """
+        if not self.spool_dir or not os.path.isdir(self.spool_dir):
+            return 0
+
+        names = {os.path.splitext(f)[0] for f in os.listdir(self.spool_dir)
+                 if f.endswith((".jsonl", ".lock"))}
+        names.discard(self.spool_name)
+        return sum(self._recover_spool(name) for name in sorted(names))
+
+    def close(self) -> None:
+        """Release this buffer's spool lock (the spool stays for recovery if unflushed)."""
+        with self._lock:
+            if self._lock_file is None:
+                return
+            self._lock_file.close()
+            self._lock_file = None
+            if not os.path.exists(self._spool_file(self.spool_name, ".jsonl")):
+                _remove_quietly(self._spool_file(self.spool_name, ".lock"))
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _threshold_reached(self, session_key: str) -> bool:
+        rows = self._pending.get(session_key)
+        if not rows:
+            return False
+        if len(rows) >= self.max_pending:
+            return True
+        started = self._first_added.get(session_key)
+        return started is not None and (time.monotonic() - started) >= self.max_age_seconds
+
+    @property
+    def spool_path(self) -> Optional[str]:
+        """This buffer's spool file (None when spooling is disabled)."""
+        return self._spool_file(self.spool_name, ".jsonl") if self.spool_dir else None
+
+    def _spool_file(self, name: str, ext: str) -> str:
+        assert self.spool_dir is not None
+        return os.path.join(self.spool_dir, name + ext)
+
+    def _recover_spool(self, name: str) -> int:
+        path = self._spool_file(name, ".jsonl")
+        lock_path = self._spool_file(name, ".lock")
+        try:
+            lock_file = open(lock_path, "a+")
+        except OSError as e:
+            logger.warning(f"Could not open response spool lock {lock_path}: {e}")
+            return 0
+
+        try:
+            if not _try_lock(lock_file):
+                return 0  # Owner still running
+
+            rows: List[Dict[str, Any]] = []
+            if os.path.exists(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        for line in f:
+                            line = line.strip()
+                            if not line:
+                                continue
+                            try:
+                                rows.append(json.loads(line))
+                            except json.JSONDecodeError:
+                                # A torn final line from a crash mid-append
+                                logger.warning("Skipping corrupt line in response spool")
+                except OSError as e:
+                    logger.error(f"Failed to read response spool: {e}")
+                    return 0
+
+            if rows:
+                try:
+                    with safe_db_context() as session:
+                        write_rows(session, rows)
+                except Exception as e:
+                    logger.error(f"Failed to recover spooled responses: {e}")
+                    return 0
+                logger.info(f"Recovered {len(rows)} spooled responses")
+
+            _remove_quietly(path)
+        finally:
+            lock_file.close()
+        _remove_quietly(lock_path)
+        return len(rows)
+
+    def _claim_spool(self) -> bool:
+        """Create the spool directory and take this buffer's lock on first use."""
+        if self._lock_file is not None:
+            return True
+        assert self.spool_dir is not None
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            lock_file = open(self._spool_file(self.spool_name, ".lock"), "a+")
+        except OSError as e:
+            logger.warning(f"Could not create response spool: {e}")
+            return False
+        if not _try_lock(lock_file):
+            lock_file.close()
+            logger.warning("Response spool is locked by another buffer")
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _append_to_spool(self, row: Dict[str, Any]) -> None:
+        if not self.spool_dir or not self._claim_spool():
+            return
+        try:
+            with open(self._spool_file(self.spool_name, ".jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(row) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not append to response spool: {e}")
+
+    def _rewrite_spool(self) -> None:
+        """Compact the spool down to rows that are still unwritten."""
+        if not self.spool_dir:
+            return
+        path = self._spool_file(self.spool_name, ".jsonl")
+        remaining = self.pending() + list(self._in_flight.values())
+        try:
+            if not remaining:
+                if os.path.exists(path):
+                    os.remove(path)
+                return
+            with atomic_write(path, "w") as f:
+                for row in sorted(remaining, key=lambda r: r["seq"]):
+                    f.write(json.dumps(row) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not compact response spool: {e}")
+
+
+def _try_lock(lock_file: Any) -> bool:
+    """Take an exclusive, non-blocking lock on an open file; released when it is closed."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove {path}: {e}")
+
+
+def write_rows(session: Any, rows: List[Dict[str, Any]]) -> Dict[str, AttemptAnswers]:
+    """Merge buffered rows into their attempts' packed rows on the given session."""
+    return write_answers(session, rows)
+
+
+# Process-wide buffer shared by ExamSession instances
+response_buffer = ResponseBuffer()
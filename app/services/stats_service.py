@@ -0,0 +1,298 @@
+"""
+Materialized aggregates stored in the ``statistics_cache`` table.
+
+Score statistics are kept as one distribution row per scope (global and
+each detailed age group): count, sum, sum of squares and a histogram of
+total_score values. Mean, standard deviation, min/max and percentiles are
+derived from that row, so a score insert only has to bump a few counters
+in the same transaction (``on_score_insert``, registered on Score by
+app.models).
+
+Rows carry a ``valid_until`` TTL; an expired or missing row is recomputed
+from the scores table on the next read, and the new row is written back
+through the write queue rather than by the reading session. Deleting or
+editing scores invalidates the cached distributions instead of adjusting them.
+
+Read everything through ``get_stat()``::
+
+    get_stat("score.mean")
+    get_stat("score.p90", age_group="18-25")
+    get_stat("users.active")
+"""
+
+import json
+import math
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.config import get_env_var
+from app.db import dialect_insert, safe_db_context
+from app.db_writer import get_write_queue
+from app.models import Score, User, Question, StatisticsCache
+
+logger = logging.getLogger(__name__)
+
+# Cached rows older than this are recomputed on read (env: SOULSENSE_STATS_TTL_HOURS)
+STATS_TTL_HOURS: int = get_env_var("STATS_TTL_HOURS", 24, int)
+
+SCORE_STAT_PREFIX = "score."
+SCORE_STATS = ("count", "mean", "std", "min", "max", "p25", "p50", "p75", "p90")
+
+# Scalar aggregates without an incremental path: recomputed when expired
+SCALAR_AGGREGATES: Dict[str, Callable[[Session], float]] = {
+    "users.active": lambda s: s.query(func.count(func.distinct(Score.username))).scalar() or 0,
+    "users.registered": lambda s: s.query(func.count(User.id)).scalar() or 0,
+    "questions.active": lambda s: s.query(func.count(Question.id)).filter(Question.is_active == 1).scalar() or 0,
+}
+
+
+def _scope_name(age_group: Optional[str] = None) -> str:
+    return f"scores:age_group:{age_group}" if age_group else "scores:global"
+
+
+def _valid_until() -> str:
+    return (datetime.utcnow() + timedelta(hours=STATS_TTL_HOURS)).isoformat()
+
+
+def _is_fresh(valid_until: Optional[str]) -> bool:
+    if not valid_until:
+        return False
+    return valid_until > datetime.utcnow().isoformat()
+
+
+# ==================== DISTRIBUTION MATH ====================
+
+def _empty_distribution() -> Dict[str, Any]:
+    return {"count": 0, "sum": 0, "sum_sq": 0, "histogram": {}}
+
+
+def _percentile(histogram: Dict[str, int], count: int, pct: float) -> Optional[float]:
+    """Linear-interpolated percentile (same definition as numpy.percentile)."""
+    if not count:
+        return None
+    position = pct / 100.0 * (count - 1)
+    lower_index, upper_index = math.floor(position), math.ceil(position)
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+    seen = 0
+    for value, n in sorted(((float(v), n) for v, n in histogram.items()), key=lambda item: item[0]):
+        seen += n
+        if lower is None and seen > lower_index:
+            lower = value
+        if seen > upper_index:
+            upper = value
+            break
+    if lower is None or upper is None:
+        return None
+    return lower + (upper - lower) * (position - lower_index)
+
+
+def distribution_stat(dist: Dict[str, Any], stat: str) -> Optional[float]:
+    """Derive one of SCORE_STATS from a stored distribution."""
+    count = dist["count"]
+    if stat == "count":
+        return count
+    if not count:
+        return None
+    mean = dist["sum"] / count
+    if stat == "mean":
+        return mean
+    if stat == "std":
+        return math.sqrt(max(dist["sum_sq"] / count - mean * mean, 0.0))
+    values = [float(v) for v, n in dist["histogram"].items() if n]
+    if stat == "min":
+        return min(values)
+    if stat == "max":
+        return max(values)
+    if stat.startswith("p") and stat[1:].isdigit():
+        return _percentile(dist["histogram"], count, float(stat[1:]))
+    raise ValueError(f"Unknown score statistic: {stat}")
+
+
+# ==================== INCREMENTAL MAINTENANCE ====================
+
+def on_score_insert(mapper: Any, connection: Any, target: Any) -> None:
+    """Fold a new score into the cached distributions within the inserting transaction."""
+    if target.total_score is None:
+        return
+    table = StatisticsCache.__table__
+    scopes = [_scope_name()] + ([_scope_name(target.detailed_age_group)] if target.detailed_age_group else [])
+
+    for scope in scopes:
+        row = connection.execute(
+            select(table.c.stat_json, table.c.valid_until).where(table.c.stat_name == scope)
+        ).first()
+        # Missing or expired rows are rebuilt by the next read instead
+        if row is None or not _is_fresh(row.valid_until) or not row.stat_json:
+            continue
+        dist = json.loads(row.stat_json)
+        value = int(target.total_score)
+        dist["count"] += 1
+        dist["sum"] += value
+        dist["sum_sq"] += value * value
+        dist["histogram"][str(value)] = dist["histogram"].get(str(value), 0) + 1
+        connection.execute(
+            update(table).where(table.c.stat_name == scope).values(
+                stat_value=dist["sum"] / dist["count"],
+                stat_json=json.dumps(dist),
+                calculated_at=datetime.utcnow().isoformat(),
+            )
+        )
+
+
+def on_score_change(mapper: Any, connection: Any, target: Any) -> None:
+    """Deletes and edits can't be folded in cheaply; expire the distributions."""
+    table = StatisticsCache.__table__
+    connection.execute(
+        update(table).where(table.c.stat_name.like("scores:%")).values(valid_until=None)
+    )
+
+
+
+# ==================== SERVICE ====================
+
+class StatisticsService:
+    """
+    Service layer for cached aggregate statistics.
+    All reads go through get_stat(); stale rows are recomputed transparently.
+    """
+
+    @staticmethod
+    def get_stat(name: str, age_group: Optional[str] = None, default: Any = None) -> Any:
+        """
+        Return a named aggregate.
+
+        Args:
+            name: 'score.<count|mean|std|min|max|pNN>' or a key of SCALAR_AGGREGATES
+            age_group: Restrict score statistics to one detailed age group
+            default: Returned when the value is unavailable (no data / DB error)
+        """
+        if name.startswith(SCORE_STAT_PREFIX):
+            stat = name[len(SCORE_STAT_PREFIX):]
+            dist = StatisticsService.get_distribution(age_group)
+            if dist is None:
+                return default
+            value = distribution_stat(dist, stat)
+            return default if value is None else value
+
+        if name not in SCALAR_AGGREGATES:
+            raise ValueError(f"Unknown statistic: {name}")
+
+        try:
+            with safe_db_context() as session:
+                row = StatisticsService._cached(session, name)
+                if row is not None and _is_fresh(row.valid_until):
+                    return row.stat_value
+                value = float(SCALAR_AGGREGATES[name](session))
+        except Exception as e:
+            logger.error(f"Failed to compute statistic {name}: {e}")
+            return default
+        StatisticsService._store(name, value, None)
+        return value
+
+    @staticmethod
+    def get_distribution(age_group: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Cached score distribution for a scope, recomputed if missing or expired."""
+        scope = _scope_name(age_group)
+        try:
+            with safe_db_context() as session:
+                row = StatisticsService._cached(session, scope)
+                if row is not None and _is_fresh(row.valid_until) and row.stat_json:
+                    return json.loads(row.stat_json)
+                dist = StatisticsService._compute_distribution(session, age_group)
+        except Exception as e:
+            logger.error(f"Failed to load score distribution for {scope}: {e}")
+            return None
+        mean = dist["sum"] / dist["count"] if dist["count"] else None
+        StatisticsService._store(scope, mean, dist)
+        return dist
+
+    @staticmethod
+    def refresh() -> int:
+        """Recompute every aggregate (global, each age group, scalars). Returns rows written."""
+        StatisticsService.invalidate()
+        with safe_db_context() as session:
+            age_groups = [g for (g,) in session.query(Score.detailed_age_group).distinct() if g]
+
+        written = 0
+        for age_group in [None] + age_groups:
+            written += StatisticsService.get_distribution(age_group) is not None
+        for name in SCALAR_AGGREGATES:
+            written += StatisticsService.get_stat(name) is not None
+        return written
+
+    @staticmethod
+    def invalidate(name: Optional[str] = None) -> None:
+        """Expire one cached aggregate (or all of them) so the next read recomputes."""
+        with safe_db_context() as session:
+            query = session.query(StatisticsCache)
+            if name is not None:
+                query = query.filter_by(stat_name=name)
+            query.update({StatisticsCache.valid_until: None}, synchronize_session=False)
+
+    @staticmethod
+    def _compute_distribution(session: Session, age_group: Optional[str]) -> Dict[str, Any]:
+        query = session.query(Score.total_score, func.count(Score.id)).filter(Score.total_score.isnot(None))
+        if age_group:
+            query = query.filter(Score.detailed_age_group == age_group)
+
+        dist = _empty_distribution()
+        for value, n in query.group_by(Score.total_score).all():
+            value = int(value)
+            dist["count"] += n
+            dist["sum"] += value * n
+            dist["sum_sq"] += value * value * n
+            dist["histogram"][str(value)] = n
+        return dist
+
+    @staticmethod
+    def _cached(session: Session, name: str) -> Optional[Row]:
+        table = StatisticsCache.__table__
+        return session.execute(
+            select(table.c.stat_value, table.c.stat_json, table.c.valid_until).where(table.c.stat_name == name)
+        ).first()
+
+    @staticmethod
+    def _store(name: str, value: Optional[float], dist: Optional[Dict[str, Any]]) -> None:
+        """Upsert a recomputed aggregate through the write queue; readers never write."""
+        values = {
+            "stat_value": value,
+            "stat_json": json.dumps(dist) if dist is not None else None,
+            "calculated_at": datetime.utcnow().isoformat(),
+            "valid_until": _valid_until(),
+        }
+
+        def store(session: Session) -> None:
+            session.execute(
+                dialect_insert(session, StatisticsCache).values(stat_name=name, **values)
+                .on_conflict_do_update(index_elements=[StatisticsCache.stat_name], set_=values)
+            )
+
+        try:
+            get_write_queue().write(store)
+        except Exception as e:
+            # The value was still served; the next read recomputes it
+            logger.warning(f"Failed to cache statistic {name}: {e}")
+
+
+def get_stat(name: str, age_group: Optional[str] = None, default: Any = None) -> Any:
+    """Module-level shortcut for StatisticsService.get_stat."""
+    return StatisticsService.get_stat(name, age_group=age_group, default=default)
+
+
+def get_benchmarks() -> Optional[Dict[str, Any]]:
+    """Population benchmarks in the app/benchmarks.json shape, from live statistics."""
+    dist = StatisticsService.get_distribution()
+    if not dist or not dist["count"]:
+        return None
+    return {
+        "global_avg": distribution_stat(dist, "mean"),
+        "percentiles": {p: distribution_stat(dist, f"p{p}") for p in ("90", "75", "50", "25")},
+        "sample_size": dist["count"],
+        "last_updated": datetime.utcnow().strftime("%Y-%m-%d"),
+    }
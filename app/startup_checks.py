@@ -49,6 +49,8 @@ REQUIRED_TABLES: List[str] = [
     "users",
     "scores", 
     "responses",
+    "attempt_answers",
+    "change_log",
     "journal_entries",
     "user_settings",
 ]
@@ -9,7 +9,7 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
 # App imports
-from app.models import Score, JournalEntry
+from app.models import Score, JournalEntry, owner_filter
 from app.db import get_session
 
 class CorrelationTab:
@@ -62,8 +62,8 @@ class CorrelationTab:
                 widget.destroy()
             
             # Fetch data
-            scores_data = self.session.query(Score).filter(
-                Score.username == self.username
+            scores_data = self.session.query(Score).filter_by(
+                **owner_filter(self.session, self.username)
             ).order_by(Score.timestamp).all()
             
             if len(scores_data) < 2:
@@ -158,8 +158,8 @@ class CorrelationTab:
             self.create_visualizations(scores)
             
             # 7. Check journal correlation if available
-            journal_data = self.session.query(JournalEntry).filter(
-                JournalEntry.username == self.username
+            journal_data = self.session.query(JournalEntry).filter_by(
+                **owner_filter(self.session, self.username)
             ).all()
             
             if journal_data:
@@ -9,7 +9,8 @@ from matplotlib.figure import Figure
 import numpy as np
 
 from app.db import get_session, safe_db_context
-from app.models import JournalEntry
+from app.models import JournalEntry, owner_filter
+from app.utils.timestamps import day_bounds
 from app.i18n_manager import get_i18n
 
 class DailyHistoryView:
@@ -163,10 +164,13 @@ class DailyHistoryView:
         self.update_chart("sleep", "#8B5CF6") # Reset to sleep default
 
     def fetch_single_entry(self, date_str):
+        day_start, day_end = day_bounds(date_str)
         with safe_db_context() as session:
-            entry = session.query(JournalEntry).filter(
-                JournalEntry.username == self.username,
-                JournalEntry.entry_date.like(f"{date_str}%")
+            entry = session.query(JournalEntry).filter_by(
+                **owner_filter(session, self.username)
+            ).filter(
+                JournalEntry.entry_date_epoch >= day_start,
+                JournalEntry.entry_date_epoch < day_end
             ).first()
             if entry:
                 return {
@@ -185,29 +189,28 @@ class DailyHistoryView:
         self.history_data = {"dates": [], "sleep": [], "quality": [], "energy": [], "work": [], "mood": []}
         
         # Initialize 7 days with 0s to ensure graph structure
-        date_map = {}
         for i in range(7):
-            d = (start_date + timedelta(days=i)).strftime("%Y-%m-%d")
             date_label = (start_date + timedelta(days=i)).strftime("%a\n%d")
             self.history_data["dates"].append(date_label)
-            date_map[d] = i # Index map
             self.history_data["sleep"].append(0)
             self.history_data["quality"].append(0)
             self.history_data["energy"].append(0)
             self.history_data["work"].append(0)
             self.history_data["mood"].append(0)
 
+        range_start, _ = day_bounds(start_date)
+        _, range_end = day_bounds(end_date)
         with safe_db_context() as session:
-            entries = session.query(JournalEntry).filter(
-                JournalEntry.username == self.username,
-                JournalEntry.entry_date >= start_date.strftime("%Y-%m-%d"),
-                JournalEntry.entry_date <= end_date_str + " 23:59:59"
+            entries = session.query(JournalEntry).filter_by(
+                **owner_filter(session, self.username)
+            ).filter(
+                JournalEntry.entry_date_epoch >= range_start,
+                JournalEntry.entry_date_epoch < range_end
             ).all()
             
             for e in entries:
-                d_key = e.entry_date.split()[0]
-                if d_key in date_map:
-                    idx = date_map[d_key]
+                idx = (e.entry_date_epoch - range_start) // 86400
+                if 0 <= idx < 7:
                     self.history_data["sleep"][idx] = e.sleep_hours or 0
                     self.history_data["quality"][idx] = getattr(e, 'sleep_quality', 0) or 0
                     self.history_data["energy"][idx] = getattr(e, 'energy_level', 0) or 0
@@ -16,9 +16,11 @@ import numpy as np
 from typing import Optional, Dict, List, Any, Tuple
 
 from app.i18n_manager import get_i18n
-from app.models import Score, JournalEntry, SatisfactionRecord
-from app.db import get_connection, safe_db_context
+from app.db import safe_db_context
+from app.models import Score, JournalEntry, SatisfactionRecord, owner_key, owner_sql, resolve_user_id
+from app.db_replica import get_analytics_connection, analytics_session, read_scope
 from app.analysis.time_based_analysis import time_analyzer
+from app.services.stats_service import get_benchmarks
 
 # Import emotional profile clustering
 try:
@@ -35,9 +37,13 @@ except ImportError:
 
 
 class AnalyticsDashboard:
-    def __init__(self, parent_root: tk.Widget, username: str, colors: Optional[Dict[str, str]] = None, theme: str = "light") -> None:
+    def __init__(self, parent_root: tk.Widget, username: str, colors: Optional[Dict[str, str]] = None, theme: str = "light",
+                 user_id: Optional[int] = None) -> None:
         self.parent_root = parent_root
         self.username = username
+        # Resolved on first use when the caller does not know it
+        self.user_id = user_id
+        self._user_id_resolved = user_id is not None
         self.benchmarks = self.load_benchmarks()
         self.i18n = get_i18n()
         self.theme = theme
@@ -54,8 +60,24 @@ class AnalyticsDashboard:
                 "border": "#334155" if theme == "dark" else "#E2E8F0"
             }
 
+    def _owner_key(self) -> Dict[str, Any]:
+        """filter_by() arguments selecting this user's rows (see app.models.owner_key)"""
+        if not self._user_id_resolved:
+            with safe_db_context() as session:
+                self.user_id = resolve_user_id(session, self.username)
+            self._user_id_resolved = True
+        return owner_key(self.user_id, self.username)
+
+    def _owner_sql(self) -> Tuple[str, Tuple[Any, ...]]:
+        """Raw-SQL WHERE condition and parameters selecting this user's rows"""
+        self._owner_key()
+        return owner_sql(self.user_id, self.username)
+
     def load_benchmarks(self) -> Optional[Dict[str, Any]]:
-        """Load population benchmarks from JSON"""
+        """Population benchmarks from live score statistics, falling back to the bundled JSON"""
+        benchmarks = get_benchmarks()
+        if benchmarks:
+            return benchmarks
         try:
             with open("app/benchmarks.json", "r") as f:
                 return json.load(f)
@@ -134,53 +156,55 @@ class AnalyticsDashboard:
         notebook = ttk.Notebook(dashboard)
         notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=(10, 20))
         
-        # Correlation Analysis Tab
-        correlation_frame = ttk.Frame(notebook)
-        notebook.add(correlation_frame, text="🔗 Correlation")
-        self.show_correlation_analysis(correlation_frame)
-            
-        # EQ Trends
-        eq_frame = ttk.Frame(notebook)
-        notebook.add(eq_frame, text=self.i18n.get("dashboard.eq_trends_tab"))
-        self.show_eq_trends(eq_frame)
-        
-        # Time-Based Analysis
-        time_frame = ttk.Frame(notebook)
-        notebook.add(time_frame, text=self.i18n.get("dashboard.time_based_tab"))
-        self.show_time_based_analysis(time_frame)
-        
-        # Journal Analytics
-        journal_frame = ttk.Frame(notebook)
-        notebook.add(journal_frame, text=self.i18n.get("dashboard.journal_tab"))
-        self.show_journal_analytics(journal_frame)
-        
-        # Insights
-        insights_frame = ttk.Frame(notebook)
-        notebook.add(insights_frame, text=self.i18n.get("dashboard.insights_tab"))
-        self.show_insights(insights_frame)
+        # One session and snapshot for every tab's queries
+        with read_scope():
+            # Correlation Analysis Tab
+            correlation_frame = ttk.Frame(notebook)
+            notebook.add(correlation_frame, text="🔗 Correlation")
+            self.show_correlation_analysis(correlation_frame)
+            
+            # EQ Trends
+            eq_frame = ttk.Frame(notebook)
+            notebook.add(eq_frame, text=self.i18n.get("dashboard.eq_trends_tab"))
+            self.show_eq_trends(eq_frame)
+        
+            # Time-Based Analysis
+            time_frame = ttk.Frame(notebook)
+            notebook.add(time_frame, text=self.i18n.get("dashboard.time_based_tab"))
+            self.show_time_based_analysis(time_frame)
+        
+            # Journal Analytics
+            journal_frame = ttk.Frame(notebook)
+            notebook.add(journal_frame, text=self.i18n.get("dashboard.journal_tab"))
+            self.show_journal_analytics(journal_frame)
+        
+            # Insights
+            insights_frame = ttk.Frame(notebook)
+            notebook.add(insights_frame, text=self.i18n.get("dashboard.insights_tab"))
+            self.show_insights(insights_frame)
 
-        # Wellbeing Analytics (New Feature)
-        wellbeing_frame = ttk.Frame(notebook)
-        notebook.add(wellbeing_frame, text="🧘 Wellbeing")
-        self.show_wellbeing_analytics(wellbeing_frame)
-        
-        # Emotional Profile Clustering Tab
-        if CLUSTERING_AVAILABLE:
-            clustering_frame = ttk.Frame(notebook)
-            notebook.add(clustering_frame, text="🧬 Emotional Profile")
-            self.show_emotional_profile(clustering_frame)
-        
-        # Add Satisfaction Analytics Tab
-        satisfaction_frame = ttk.Frame(notebook)
-        notebook.add(satisfaction_frame, text="💼 Satisfaction")
-        self.show_satisfaction_analytics(satisfaction_frame)
+            # Wellbeing Analytics (New Feature)
+            wellbeing_frame = ttk.Frame(notebook)
+            notebook.add(wellbeing_frame, text="🧘 Wellbeing")
+            self.show_wellbeing_analytics(wellbeing_frame)
+        
+            # Emotional Profile Clustering Tab
+            if CLUSTERING_AVAILABLE:
+                clustering_frame = ttk.Frame(notebook)
+                notebook.add(clustering_frame, text="🧬 Emotional Profile")
+                self.show_emotional_profile(clustering_frame)
+        
+            # Add Satisfaction Analytics Tab
+            satisfaction_frame = ttk.Frame(notebook)
+            notebook.add(satisfaction_frame, text="💼 Satisfaction")
+            self.show_satisfaction_analytics(satisfaction_frame)
 
     def show_wellbeing_analytics(self, parent: tk.Widget) -> None:
         """Show comprehensive health and wellbeing analytics (PR #7)"""
         parent = self._create_scrollable_frame(parent)
         
         # Get data including new PR #6 fields
-        conn = get_connection()
+        conn = get_analytics_connection()
         try:
             # Check if columns exist first to avoid errors during dev
             cursor = conn.cursor()
@@ -191,13 +215,14 @@ class AnalyticsDashboard:
                 tk.Label(parent, text="Database schema update required (Missing v2 columns)", fg="red").pack()
                 return
 
-            query = """
+            owner, params = self._owner_sql()
+            query = f"""
                 SELECT entry_date, sleep_hours, energy_level, stress_level, screen_time_mins 
                 FROM journal_entries 
-                WHERE username = ? 
+                WHERE {owner} 
                 ORDER BY entry_date
             """
-            cursor.execute(query, (self.username,))
+            cursor.execute(query, params)
             data = cursor.fetchall()
         finally:
             conn.close()
@@ -284,9 +309,9 @@ class AnalyticsDashboard:
         parent = self._create_scrollable_frame(parent)
         # Fetch satisfaction data
         try:
-            with safe_db_context() as session:
-                records = session.query(SatisfactionRecord).filter(
-                    SatisfactionRecord.username == self.username
+            with analytics_session() as session:
+                records = session.query(SatisfactionRecord).filter_by(
+                    **self._owner_key()
                 ).order_by(SatisfactionRecord.timestamp.desc()).all()
                 
                 if not records:
@@ -440,7 +465,7 @@ class AnalyticsDashboard:
                 widget.destroy()
             
             # Get EQ scores
-            conn = get_connection()
+            conn = get_analytics_connection()
             cursor = conn.cursor()
             
             # First, check what columns exist in the scores table
@@ -448,20 +473,21 @@ class AnalyticsDashboard:
             columns = [col[1] for col in cursor.fetchall()]
             
             # Build query based on available columns
+            owner, params = self._owner_sql()
             if 'timestamp' in columns:
-                cursor.execute("""
+                cursor.execute(f"""
                     SELECT total_score, timestamp 
                     FROM scores 
-                    WHERE username = ? 
+                    WHERE {owner} 
                     ORDER BY timestamp
-                """, (self.username,))
+                """, params)
             else:
-                cursor.execute("""
+                cursor.execute(f"""
                     SELECT total_score, id 
                     FROM scores 
-                    WHERE username = ? 
+                    WHERE {owner} 
                     ORDER BY id
-                """, (self.username,))
+                """, params)
             
             data = cursor.fetchall()
             conn.close()
@@ -637,15 +663,16 @@ class AnalyticsDashboard:
         # Configure parent
         # parent.configure(style="TFrame")
         
-        conn = get_connection()
+        conn = get_analytics_connection()
         cursor = conn.cursor()
         try:
-            cursor.execute("""
+            owner, params = self._owner_sql()
+            cursor.execute(f"""
             SELECT total_score, timestamp, id, sentiment_score 
             FROM scores 
-            WHERE username = ? 
+            WHERE {owner} 
             ORDER BY id
-            """, (self.username,))
+            """, params)
             data = cursor.fetchall()
         except Exception as e:
             print(f"Error fetching EQ trends: {e}")
@@ -930,7 +957,7 @@ class AnalyticsDashboard:
     def show_journal_analytics(self, parent):
         """Show journal analytics"""
         parent = self._create_scrollable_frame(parent)
-        conn = get_connection() # Use centralized connection logic
+        conn = get_analytics_connection() # Replica when enabled, else main database
         cursor = conn.cursor()
         
         # Check if journal_entries table exists
@@ -941,12 +968,13 @@ class AnalyticsDashboard:
             return
         
         # Get journal data
-        cursor.execute("""
+        owner, params = self._owner_sql()
+        cursor.execute(f"""
             SELECT sentiment_score, emotional_patterns 
             FROM journal_entries 
-            WHERE username = ? 
+            WHERE {owner} 
             ORDER BY id
-        """, (self.username,))
+        """, params)
         rows = cursor.fetchall()
         conn.close()
         
@@ -1199,10 +1227,10 @@ class AnalyticsDashboard:
         journal_sentiments = []
 
         try:
-            with safe_db_context() as session:
+            with analytics_session() as session:
                 # EQ and Sentiment insights from SCORES table
                 eq_rows = session.query(Score.total_score, Score.sentiment_score)\
-                    .filter_by(username=self.username)\
+                    .filter_by(**self._owner_key())\
                     .order_by(Score.id)\
                     .all()
                 scores = [r[0] for r in eq_rows]
@@ -1210,7 +1238,7 @@ class AnalyticsDashboard:
                 
                 # Journal insights purely from Journal entries
                 j_rows = session.query(JournalEntry.sentiment_score)\
-                    .filter_by(username=self.username)\
+                    .filter_by(**self._owner_key())\
                     .all()
                 journal_sentiments = [r[0] for r in j_rows]
         except Exception as e:
@@ -1264,15 +1292,16 @@ class AnalyticsDashboard:
         """Show wellbeing analytics (Sleep vs Mood, Work vs Mood)"""
         parent = self._create_scrollable_frame(parent)
         # Fetch Data
-        conn = get_connection()
+        conn = get_analytics_connection()
         cursor = conn.cursor()
         try:
-            cursor.execute("""
+            owner, params = self._owner_sql()
+            cursor.execute(f"""
                 SELECT sentiment_score, sleep_hours, energy_level, work_hours 
                 FROM journal_entries 
-                WHERE username = ? AND sleep_hours IS NOT NULL
+                WHERE {owner} AND sleep_hours IS NOT NULL
                 ORDER BY entry_date ASC
-            """, (self.username,))
+            """, params)
             rows = cursor.fetchall()
         finally:
             conn.close()
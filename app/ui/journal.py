@@ -4,6 +4,7 @@ from typing import Optional, Any
 from tkinter import ttk, messagebox, scrolledtext
 from tkinter import ttk, messagebox, scrolledtext
 from datetime import datetime, timedelta
+import json
 import logging
 
 import nltk
@@ -12,7 +13,7 @@ from sqlalchemy import desc, text
 
 from app.i18n_manager import get_i18n
 from app.i18n_manager import get_i18n
-from app.models import JournalEntry, User
+from app.models import JournalEntry, User, normalize_tags, owner_filter
 from app.db import get_session
 from app.services.journal_service import JournalService
 from app.validation import validate_required, validate_length, validate_range, sanitize_text, RANGES
@@ -200,6 +201,12 @@ class JournalFeature:
                                   highlightbackground=colors.get("border", "#ccc"))
         self.tags_entry.pack(fill="x")
 
+        # Frequent tags (from the journal_tags index) as hints
+        self.tag_hint_label = tk.Label(tags_frame, text="", font=("Segoe UI", 9),
+                                      bg=colors["bg"], fg=colors["text_secondary"])
+        self.tag_hint_label.pack(anchor="w")
+        self._refresh_tag_hints()
+
         self.text_area = scrolledtext.ScrolledText(container, width=60, height=8,
                                                   font=("Segoe UI", 11),
                                                   bg=colors["surface"], fg=colors["text_primary"],
@@ -250,6 +257,20 @@ class JournalFeature:
         search_filters_frame = tk.Frame(self.search_frame, bg=colors["surface"])
         search_filters_frame.pack(fill="x", pady=(0, 10))
 
+        # Keyword filter (full-text search over entry content)
+        words_container = tk.Frame(search_filters_frame, bg=colors["surface"])
+        words_container.pack(side="left", padx=(0, 15))
+
+        tk.Label(words_container, text="🔎 Words:", font=("Segoe UI", 10, "bold"),
+                bg=colors["surface"], fg=colors["text_secondary"]).pack(side="left")
+
+        self.inline_words_var = tk.StringVar()
+        self.inline_words_entry = tk.Entry(words_container, textvariable=self.inline_words_var, font=("Segoe UI", 10),
+                                          bg=colors.get("input_bg", "#fff"), fg=colors.get("input_fg", "#000"),
+                                          relief="flat", highlightthickness=1,
+                                          highlightbackground=colors.get("border", "#ccc"), width=20)
+        self.inline_words_entry.pack(side="left", padx=5)
+
         # Tags filter
         tags_container = tk.Frame(search_filters_frame, bg=colors["surface"])
         tags_container.pack(side="left", padx=(0, 15))
@@ -333,6 +354,7 @@ class JournalFeature:
         self.results_canvas.bind("<Leave>", lambda e: self.results_canvas.unbind_all("<MouseWheel>"))
 
         # Bind filter changes to update results
+        self.inline_words_entry.bind("<KeyRelease>", lambda e: self.update_inline_results())
         self.inline_tags_entry.bind("<KeyRelease>", lambda e: self.update_inline_results())
         self.inline_from_date_entry.bind("<KeyRelease>", lambda e: self.update_inline_results())
         self.inline_to_date_entry.bind("<KeyRelease>", lambda e: self.update_inline_results())
@@ -341,6 +363,14 @@ class JournalFeature:
         # Initial render (empty)
         self.update_inline_results()
 
+    def _refresh_tag_hints(self):
+        """Show the user's most used tags under the tags field"""
+        if not getattr(self, 'username', None):
+            return
+        counts = JournalService.get_tag_counts(self.username, limit=8)
+        text = "Your tags: " + ", ".join(tag for tag, _ in counts) if counts else ""
+        self.tag_hint_label.config(text=text)
+
     def toggle_search_section(self):
         """Toggle the visibility of the search section"""
         if self.search_visible:
@@ -354,78 +384,62 @@ class JournalFeature:
 
     def clear_inline_filters(self):
         """Clear all inline search filters"""
+        self.inline_words_var.set("")
         self.inline_tags_var.set("")
         self.inline_from_date_var.set("")
         self.inline_to_date_var.set("")
         self.inline_mood_var.set("All Moods")
         self.update_inline_results()
 
+    @staticmethod
+    def _search_filters(words="", tags="", from_date="", to_date="", mood="All Moods"):
+        """
+        JournalService.search() arguments from the filter widgets.
+        Placeholder text and half-typed dates are ignored.
+        """
+        def parse_date(value):
+            try:
+                return datetime.strptime(value.strip(), "%Y-%m-%d").date()
+            except ValueError:
+                return None
+
+        tags = tags.strip().lower()
+        return {
+            "text_query": words.strip() or None,
+            "tags": [t.strip() for t in tags.split(',') if t.strip()]
+                    if tags and tags != "e.g., stress, gratitude" else None,
+            "start_date": parse_date(from_date),
+            "end_date": parse_date(to_date),
+            "mood": mood if mood != "All Moods" else None,
+        }
+
     def update_inline_results(self):
         """Update the inline search results based on current filters"""
         # Clear existing results
         for widget in self.results_scrollable_frame.winfo_children():
             widget.destroy()
 
-        # Get filter values
-        selected_tags = self.inline_tags_var.get().strip().lower()
-        from_date = self.inline_from_date_var.get().strip()
-        to_date = self.inline_to_date_var.get().strip()
-        selected_mood = self.inline_mood_var.get()
+        filters = self._search_filters(
+            words=self.inline_words_var.get(),
+            tags=self.inline_tags_var.get(),
+            from_date=self.inline_from_date_var.get(),
+            to_date=self.inline_to_date_var.get(),
+            mood=self.inline_mood_var.get()
+        )
 
-        session = get_session()
         try:
-            entries = session.query(JournalEntry)\
-                .filter_by(username=self.username)\
-                .order_by(desc(JournalEntry.entry_date))\
-                .all()
+            hits = JournalService.search(self.username, **filters)
+        except Exception as e:
+            logging.error(f"Journal search failed: {e}")
+            hits = []
 
-            filtered_count = 0
-            for entry in entries:
-                # Apply tags filter
-                if selected_tags and selected_tags != "e.g., stress, gratitude":
-                    entry_tags = (getattr(entry, 'tags', '') or '').lower()
-                    tag_list = [tag.strip() for tag in selected_tags.split(',') if tag.strip()]
-                    if not any(tag in entry_tags for tag in tag_list):
-                        continue
-
-                # Apply date range filter
-                if from_date and from_date != "YYYY-MM-DD":
-                    try:
-                        entry_date = datetime.strptime(str(entry.entry_date).split('.')[0], "%Y-%m-%d %H:%M:%S").date()
-                        from_date_obj = datetime.strptime(from_date, "%Y-%m-%d").date()
-                        if entry_date < from_date_obj:
-                            continue
-                    except (ValueError, AttributeError):
-                        pass
-
-                if to_date and to_date != "YYYY-MM-DD":
-                    try:
-                        entry_date = datetime.strptime(str(entry.entry_date).split('.')[0], "%Y-%m-%d %H:%M:%S").date()
-                        to_date_obj = datetime.strptime(to_date, "%Y-%m-%d").date()
-                        if entry_date > to_date_obj:
-                            continue
-                    except (ValueError, AttributeError):
-                        pass
-
-                # Apply mood filter
-                if selected_mood != "All Moods":
-                    sentiment_score = getattr(entry, 'sentiment_score', 0) or 0
-                    if selected_mood == "Positive" and sentiment_score <= 30:
-                        continue
-                    elif selected_mood == "Neutral" and (sentiment_score > 30 or sentiment_score < -30):
-                        continue
-                    elif selected_mood == "Negative" and sentiment_score >= -30:
-                        continue
-
-                filtered_count += 1
-                self._create_entry_card(self.results_scrollable_frame, entry)
-
-            if filtered_count == 0:
-                tk.Label(self.results_scrollable_frame, text="No entries found matching filters.",
-                        font=("Segoe UI", 12), bg=self.colors.get("surface", "#fff"),
-                        fg=self.colors.get("text_secondary", "#666")).pack(pady=20)
-        finally:
-            session.close()
+        for hit in hits:
+            self._create_entry_card(self.results_scrollable_frame, hit["entry"])
+
+        if not hits:
+            tk.Label(self.results_scrollable_frame, text="No entries found matching filters.",
+                    font=("Segoe UI", 12), bg=self.colors.get("surface", "#fff"),
+                    fg=self.colors.get("text_secondary", "#666")).pack(pady=20)
 
     def open_journal_window(self, username):
         """Standalone Window Mode (Deprecated but kept for compat)"""
@@ -578,6 +592,10 @@ class JournalFeature:
                     "screen_time_mins": self.screen_time_var.get()
                 }
                 
+                tags = normalize_tags(self.tags_entry.get()) if hasattr(self, 'tags_entry') else []
+                if tags:
+                    metrics["tags"] = json.dumps(tags)
+                
                 JournalService.create_entry(
                     username=self.username if hasattr(self, 'username') else (self.app.username if self.app and hasattr(self.app, 'username') else 'guest'),
                     content=content,
@@ -602,6 +620,9 @@ class JournalFeature:
             
             # 5. Clear Input
             self.text_area.delete("1.0", tk.END)
+            if hasattr(self, 'tags_entry'):
+                self.tags_entry.delete(0, tk.END)
+                self._refresh_tag_hints()
             # Reset word count
             if hasattr(self, 'word_count_label'):
                 self.word_count_label.config(text="0 words")
@@ -872,81 +893,48 @@ class JournalFeature:
             for widget in scrollable_frame.winfo_children():
                 widget.destroy()
 
-            # Get filter values
-            selected_tags = tags_var.get().strip().lower()
-            from_date = from_date_var.get().strip()
-            to_date = to_date_var.get().strip()
-            selected_mood = mood_var.get()
+            filters = self._search_filters(
+                tags=tags_var.get(),
+                from_date=from_date_var.get(),
+                to_date=to_date_var.get(),
+                mood=mood_var.get()
+            )
             selected_month = month_var.get()
             filter_type = type_var.get()
-            
-            # Using safe_db_context for read operations too
-            # Using JournalService for read operations
-            try:
-                entries = JournalService.get_entries(self.username)
-                print(f"DEBUG: View Past Entries found {len(entries)} records for {self.username}")
 
-                filtered_count = 0
-                for entry in entries:
-                    # Apply tags filter
-                    if selected_tags and selected_tags != "e.g., stress, gratitude":
-                        entry_tags = (getattr(entry, 'tags', '') or '').lower()
-                        tag_list = [tag.strip() for tag in selected_tags.split(',') if tag.strip()]
-                        if not any(tag in entry_tags for tag in tag_list):
-                            continue
-
-                    # Apply date range filter
-                    if from_date and from_date != "YYYY-MM-DD":
-                        try:
-                            entry_date = datetime.strptime(str(entry.entry_date).split('.')[0], "%Y-%m-%d %H:%M:%S").date()
-                            from_date_obj = datetime.strptime(from_date, "%Y-%m-%d").date()
-                            if entry_date < from_date_obj:
-                                continue
-                        except (ValueError, AttributeError):
-                            pass
-
-                    if to_date and to_date != "YYYY-MM-DD":
-                        try:
-                            entry_date = datetime.strptime(str(entry.entry_date).split('.')[0], "%Y-%m-%d %H:%M:%S").date()
-                            to_date_obj = datetime.strptime(to_date, "%Y-%m-%d").date()
-                            if entry_date > to_date_obj:
-                                continue
-                        except (ValueError, AttributeError):
-                            pass
-
-                    # Apply mood filter
-                    if selected_mood != "All Moods":
-                        sentiment_score = getattr(entry, 'sentiment_score', 0) or 0
-                        if selected_mood == "Positive" and sentiment_score <= 30:
-                            continue
-                        elif selected_mood == "Neutral" and (sentiment_score > 30 or sentiment_score < -30):
-                            continue
-                        elif selected_mood == "Negative" and sentiment_score >= -30:
-                            continue
-
-                    # Apply month filter
-                    if selected_month != "All Months":
-                        try:
-                            entry_month = datetime.strptime(str(entry.entry_date).split('.')[0], "%Y-%m-%d %H:%M:%S").strftime("%B %Y")
-                            if entry_month != selected_month:
-                                continue
-                        except:
-                            pass
-
-                    # Apply type filter
-                    if filter_type == "High Stress" and (entry.stress_level or 0) <= 7:
-                        continue
-                    if filter_type == "Great Days" and (entry.energy_level or 0) <= 7:
-                        continue
-                    if filter_type == "Bad Sleep" and (entry.sleep_hours or 7) >= 6:
-                        continue
-
-                    filtered_count += 1
-                    self._create_entry_card(scrollable_frame, entry)
-                    if filtered_count == 0:
-                        tk.Label(scrollable_frame, text="No entries found matching filters.", 
-                                font=("Segoe UI", 12), bg=self.colors.get("bg", "#f0f0f0"), 
-                                fg=self.colors.get("text_secondary", "#666")).pack(pady=20)
+            # Month filter narrows the date range
+            if selected_month != "All Months":
+                month_start = datetime.strptime(selected_month, "%B %Y").date()
+                next_month = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+                month_end = next_month - timedelta(days=1)
+                filters["start_date"] = max(filter(None, [filters["start_date"], month_start]))
+                filters["end_date"] = min(filter(None, [filters["end_date"], month_end]))
+
+            del filters["text_query"]
+            filters["entry_type"] = filter_type if filter_type != "All Entries" else None
+            load_page(filters)
+
+        def load_page(filters, cursor=None):
+            """Append one page of entry cards, then a "Load more" button if there are older ones"""
+            try:
+                page = JournalService.get_history_page(self.username, cursor=cursor, **filters)
+
+                for row in page.items:
+                    self._create_entry_card(scrollable_frame, row)
+
+                if cursor is None and not page.items:
+                    tk.Label(scrollable_frame, text="No entries found matching filters.", 
+                            font=("Segoe UI", 12), bg=self.colors.get("bg", "#f0f0f0"), 
+                            fg=self.colors.get("text_secondary", "#666")).pack(pady=20)
+                elif page.has_more:
+                    def load_more():
+                        more_btn.destroy()
+                        load_page(filters, page.next_cursor)
+
+                    more_btn = tk.Button(scrollable_frame, text="Load more", command=load_more,
+                                         font=("Segoe UI", 10), bg=self.colors.get("primary", "#8B5CF6"),
+                                         fg="white", relief="flat", padx=12, pady=4)
+                    more_btn.pack(pady=10)
             except Exception as e:
                 logging.error(f"Failed to render entries: {e}")
                 tk.Label(scrollable_frame, text="Could not load entries.", 
@@ -990,7 +978,7 @@ class JournalFeature:
         session = get_session()
         try:
             entries = session.query(JournalEntry)\
-                .filter_by(username=self.username)\
+                .filter_by(**owner_filter(session, self.username))\
                 .order_by(JournalEntry.entry_date)\
                 .all()
 
@@ -1098,7 +1086,9 @@ class JournalFeature:
         def open_day_detail(e=None):
             try:
                 from app.ui.day_detail import DayDetailPopup
-                DayDetailPopup(card, entry, self.colors, self.i18n)
+                # History pages hold preview rows; the popup needs the whole entry
+                full_entry = entry if isinstance(entry, JournalEntry) else JournalService.get_entry(entry.id)
+                DayDetailPopup(card, full_entry, self.colors, self.i18n)
             except Exception as err:
                 logging.error(f"Failed to open Day Detail: {err}")
         
@@ -1200,7 +1190,8 @@ class JournalFeature:
             from app.ui.dashboard import AnalyticsDashboard
             colors = getattr(self.app, 'colors', self.colors)
             theme = self.app.settings.get("theme", "light") if self.app else "light"
-            dashboard = AnalyticsDashboard(self.journal_window, self.username, colors=colors, theme=theme)
+            dashboard = AnalyticsDashboard(self.journal_window, self.username, colors=colors, theme=theme,
+                                           user_id=getattr(self.app, 'current_user_id', None))
             dashboard.render_dashboard()
         except ImportError as e:
             logging.error(f"Failed to import AnalyticsDashboard: {e}")
@@ -4,8 +4,11 @@ from tkinter import ttk, messagebox, simpledialog
 import logging
 import json
 from datetime import datetime
+from sqlalchemy.orm import joinedload
+
 from app.db import get_session
-from app.models import User
+from app.db_replica import read_scope
+from app.models import User, owner_key
 from app.services.profile_service import ProfileService
 # from app.ui.styles import ApplyTheme # Not needed
 from app.ui.sidebar import SidebarNav
@@ -533,66 +536,67 @@ class UserProfileView:
         
         try:
             from app.models import Score, JournalEntry, MedicalProfile
-            session = get_session()
-            user = session.query(User).filter_by(username=self.app.username).first()
+            # One read-only snapshot for all the overview queries
+            with read_scope(main=True) as session:
+                user = session.query(User).options(
+                    joinedload(User.personal_profile), joinedload(User.medical_profile)
+                ).filter_by(username=self.app.username).first()
             
-            if user:
-                # Member since
-                if user.created_at:
-                    try:
-                        created = datetime.fromisoformat(user.created_at.replace('Z', '+00:00'))
-                        data["member_since"] = created.strftime("%b %Y")
-                    except:
-                        data["member_since"] = "--"
-                
-                # Personal Profile data
-                if user.personal_profile:
-                    pp = user.personal_profile
-                    data["email"] = pp.email or "Not set"
-                    data["phone"] = pp.phone or "Not set"
-                    data["address"] = pp.address or "Not set"
-                    data["occupation"] = pp.occupation
-                    data["gender"] = pp.gender or "--"
-                    data["avatar_path"] = pp.avatar_path  # Profile photo path
-                    if pp.date_of_birth:
-                        data["dob"] = pp.date_of_birth
+                if user:
+                    # Member since
+                    if user.created_at:
                         try:
-                            dob = datetime.strptime(pp.date_of_birth, "%Y-%m-%d")
-                            age = (datetime.now() - dob).days // 365
-                            data["age"] = f"{age}y"
+                            created = datetime.fromisoformat(user.created_at.replace('Z', '+00:00'))
+                            data["member_since"] = created.strftime("%b %Y")
                         except:
-                            data["age"] = "--"
+                            data["member_since"] = "--"
+                
+                    # Personal Profile data
+                    if user.personal_profile:
+                        pp = user.personal_profile
+                        data["email"] = pp.email or "Not set"
+                        data["phone"] = pp.phone or "Not set"
+                        data["address"] = pp.address or "Not set"
+                        data["occupation"] = pp.occupation
+                        data["gender"] = pp.gender or "--"
+                        data["avatar_path"] = pp.avatar_path  # Profile photo path
+                        if pp.date_of_birth:
+                            data["dob"] = pp.date_of_birth
+                            try:
+                                dob = datetime.strptime(pp.date_of_birth, "%Y-%m-%d")
+                                age = (datetime.now() - dob).days // 365
+                                data["age"] = f"{age}y"
+                            except:
+                                data["age"] = "--"
                     
-                    # Issue #260: Load Life Perspective (POV)
-                    data["life_pov"] = pp.life_pov or ""
+                        # Issue #260: Load Life Perspective (POV)
+                        data["life_pov"] = pp.life_pov or ""
                 
-                # Medical Profile data
-                if user.medical_profile:
-                    mp = user.medical_profile
-                    data["blood_type"] = mp.blood_type
-                    data["allergies"] = mp.allergies
-                    data["conditions"] = mp.medical_conditions
+                    # Medical Profile data
+                    if user.medical_profile:
+                        mp = user.medical_profile
+                        data["blood_type"] = mp.blood_type
+                        data["allergies"] = mp.allergies
+                        data["conditions"] = mp.medical_conditions
                 
-                # Recent scores
-                # Use username for filtering to be robust against missing user_id in historical data
-                scores = session.query(Score).filter_by(username=self.app.username).order_by(Score.timestamp.desc()).limit(5).all()
-                data["recent_scores"] = [{"score": s.total_score, "date": s.timestamp[:10] if s.timestamp else "--"} for s in scores]
-                if scores:
-                    data["last_eq"] = str(scores[0].total_score)
-                    if scores[0].sentiment_score:
-                        data["sentiment"] = f"{scores[0].sentiment_score:.1f}"
+                    # Recent scores (keyed on the account; rows from before it existed are claimed on signup)
+                    owner = owner_key(user.id, self.app.username)
+                    scores = session.query(Score).filter_by(**owner).order_by(Score.timestamp.desc()).limit(5).all()
+                    data["recent_scores"] = [{"score": s.total_score, "date": s.timestamp[:10] if s.timestamp else "--"} for s in scores]
+                    if scores:
+                        data["last_eq"] = str(scores[0].total_score)
+                        if scores[0].sentiment_score:
+                            data["sentiment"] = f"{scores[0].sentiment_score:.1f}"
                 
-                # Tests count
-                data["tests_count"] = str(session.query(Score).filter_by(username=self.app.username).count())
+                    # Tests count
+                    data["tests_count"] = str(session.query(Score).filter_by(**owner).count())
                 
-                # Recent journals
-                journals = session.query(JournalEntry).filter_by(username=self.app.username).order_by(JournalEntry.entry_date.desc()).limit(3).all()
-                data["recent_journals"] = [{"date": j.entry_date[:10] if j.entry_date else "--", "content": (j.content or "")[:100]} for j in journals]
+                    # Recent journals
+                    journals = session.query(JournalEntry).filter_by(**owner).order_by(JournalEntry.entry_date.desc()).limit(3).all()
+                    data["recent_journals"] = [{"date": j.entry_date[:10] if j.entry_date else "--", "content": (j.content or "")[:100]} for j in journals]
                 
-                # Journals count
-                data["journals_count"] = str(session.query(JournalEntry).filter_by(username=self.app.username).count())
-            
-            session.close()
+                    # Journals count
+                    data["journals_count"] = str(session.query(JournalEntry).filter_by(**owner).count())
         except Exception as e:
             logging.error(f"Error loading overview data: {e}")
         
@@ -1443,7 +1447,7 @@ class UserProfileView:
         
         tk.Label(
             inner, 
-            text="Download a complete copy of your personal data, including your profile, medical history, life events, and preferences.",
+            text="Download a complete copy of your personal data, including your profile, medical history, exam results, assessments and journal.",
             font=self.styles.get_font("sm"), 
             bg=self.colors.get("card_bg"), 
             fg="gray",
@@ -1455,60 +1459,30 @@ class UserProfileView:
         btn_frame = tk.Frame(inner, bg=self.colors.get("card_bg"))
         btn_frame.pack(anchor="w")
         
-        def do_export_json():
+        def do_export(fmt):
             loading = None
             try:
                 from app.utils.file_validation import validate_file_path, sanitize_filename, ValidationError
+                from app.services.export_service import ExportService
                 from tkinter import filedialog
-                import json
                 
-                # 1. Prepare Data
-                user = ProfileService.get_user_profile(self.app.username)
-                if not user:
+                # 1. Check the user exists
+                if not ProfileService.get_user_profile(self.app.username):
                     messagebox.showerror("Error", "User not found.")
                     return
-                
-                export_data = {
-                    "username": user.username,
-                    "exported_at": datetime.now().isoformat(),
-                    "profile": {},
-                    "medical": {},
-                    "strengths": {},
-                    "emotional_patterns": {}
-                }
-                
-                if user.personal_profile:
-                    p = user.personal_profile
-                    export_data["profile"] = {
-                        "bio": p.bio, "occupation": p.occupation, "email": p.email,
-                        "life_events": json.loads(p.life_events) if p.life_events else []
-                    }
-                    
-                if user.medical_profile:
-                    m = user.medical_profile
-                    export_data["medical"] = {
-                        "allergies": m.allergies, "medications": m.medications,
-                        "conditions": m.medical_conditions, "blood_type": m.blood_type
-                    }
-                    
-                if user.strengths:
-                    s = user.strengths
-                    export_data["strengths"] = {
-                        "top": json.loads(s.top_strengths) if s.top_strengths else [],
-                        "goals": s.goals
-                    }
 
                 # 2. Sanitize Filename
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 safe_username = sanitize_filename(self.app.username)
-                default_name = f"SoulSense_Export_{safe_username}_{timestamp}.json"
+                default_name = f"SoulSense_Export_{safe_username}_{timestamp}.{fmt}"
+                file_types = {"json": ("JSON Data", "*.json"), "zip": ("ZIP Archive", "*.zip")}
                 
                 # 3. Ask for Save Location
                 filename = filedialog.asksaveasfilename(
                     title="Export Data",
                     initialfile=default_name,
-                    defaultextension=".json",
-                    filetypes=[("JSON Data", "*.json")]
+                    defaultextension=f".{fmt}",
+                    filetypes=[file_types[fmt]]
                 )
                 
                 if not filename:
@@ -1516,7 +1490,7 @@ class UserProfileView:
 
                 # 4. Validate Path
                 try:
-                    filename = validate_file_path(filename, allowed_extensions=[".json"])
+                    filename = validate_file_path(filename, allowed_extensions=[f".{fmt}"])
                 except ValidationError as ve:
                     messagebox.showerror("Security Error", str(ve))
                     return
@@ -1524,12 +1498,13 @@ class UserProfileView:
                 # Show loading overlay during file write
                 loading = show_loading(self.window, "Exporting your data...")
                 self.window.update()  # Force UI update
+
+                def on_progress(dataset, rows):
+                    loading.update_message(f"Exporting {dataset}... ({rows} rows)")
+                    self.window.update_idletasks()
                 
-                # 5. Write File
-                from app.utils.atomic import atomic_write
-                
-                with atomic_write(filename, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=2, ensure_ascii=False)
+                # 5. Stream the data to the file
+                ExportService.export_user_data(self.app.username, filename, fmt=fmt, progress=on_progress)
                 
                 hide_loading(loading)
                 loading = None
@@ -1544,7 +1519,7 @@ class UserProfileView:
         tk.Button(
             btn_frame,
             text="📄 Export as JSON",
-            command=do_export_json,
+            command=lambda: do_export("json"),
             font=self.styles.get_font("md", "bold"),
             bg=self.colors.get("primary"),
             fg="white",
@@ -1553,6 +1528,18 @@ class UserProfileView:
             cursor="hand2"
         ).pack(side="left")
 
+        tk.Button(
+            btn_frame,
+            text="🗜️ Export as ZIP (CSV)",
+            command=lambda: do_export("zip"),
+            font=self.styles.get_font("md", "bold"),
+            bg=self.colors.get("primary"),
+            fg="white",
+            relief="flat",
+            padx=20, pady=10,
+            cursor="hand2"
+        ).pack(side="left", padx=(10, 0))
+
     def _render_settings_view(self, parent):
         """Render embedded settings view"""
         # Header
@@ -2133,13 +2120,12 @@ class UserProfileView:
                 "preferred_support": self.support_style_var.get()
             }
 
-            # Update Strengths (Service handles user lookup)
-            s_success = ProfileService.update_strengths(self.app.username, strengths_data)
-            
-            # Update Emotional Patterns
-            e_success = ProfileService.update_emotional_patterns(self.app.username, emotional_data)
+            # Both sections in one transaction (Service handles user lookup)
+            saved = ProfileService.save_profile_bundle(
+                self.app.username, strengths=strengths_data, emotional_patterns=emotional_data
+            )
 
-            if s_success and e_success:
+            if saved is not None:
                 messagebox.showinfo("Success", "Preferences saved successfully!")
             else:
                  messagebox.showerror("Error", "Failed to save some preferences.")
@@ -4,8 +4,9 @@ import logging
 from datetime import datetime
 import random
 from app.db import get_connection, get_session
-from app.models import Score
+from app.models import Score, owner_key
 from app.constants import BENCHMARK_DATA
+from app.services.exam_service import ExamService
 try:
     from app.services.pdf_generator import generate_pdf_report
 except ImportError:
@@ -15,6 +16,11 @@ from app.models import AssessmentResult
 from typing import Any, Dict, List, Optional, Tuple
 from app.ui.components.loading_overlay import show_loading, hide_loading
 
+# Score cards per "Load more" page in the history view
+HISTORY_PAGE_SIZE = 20
+# Bars drawn in the comparison chart (most recent tests)
+COMPARISON_TEST_LIMIT = 10
+
 class ResultsManager:
     def __init__(self, app: Any) -> None:
         self.app = app
@@ -27,8 +33,8 @@ class ResultsManager:
             # Get latest score ID
             session = get_session()
             try:
-                latest_score = session.query(Score).filter(
-                    Score.username == self.app.username
+                latest_score = session.query(Score).filter_by(
+                    **owner_key(self.app.current_user_id, self.app.username)
                 ).order_by(Score.id.desc()).first()
                 
                 eq_score_id = latest_score.id if latest_score else None
@@ -1106,17 +1112,9 @@ class ResultsManager:
         conn = get_connection()
         cursor = conn.cursor()
 
-        # Get history data
-        cursor.execute(
-            """
-            SELECT id, total_score, age, timestamp 
-            FROM scores 
-            WHERE username = ? 
-            ORDER BY timestamp DESC
-            """,
-            (username,)
-        )
-        history = cursor.fetchall()
+        # First page only; older tests are fetched on "Load more"
+        first_page = ExamService.get_score_history_page(username, limit=HISTORY_PAGE_SIZE)
+        summary = ExamService.get_score_summary(username)
         
         # Header with back button
         header_frame = tk.Frame(self.app.root, bg=colors.get("bg", "#0F172A"))
@@ -1139,7 +1137,7 @@ class ResultsManager:
             fg=colors.get("text_primary", "#F8FAFC")
         ).pack(side="left", padx=50)
         
-        if not history:
+        if not first_page.items:
             tk.Label(
                 self.app.root,
                 text="No test history found.",
@@ -1186,84 +1184,107 @@ class ResultsManager:
         tk.Label(scrollable_frame, text="Standard EQ Assessments", font=("Arial", 14, "bold"), 
                  bg=colors.get("bg", "#0F172A"), fg=colors.get("text_primary", "#F8FAFC")).pack(anchor="w", padx=20, pady=(10, 5))
 
-        # Display each test result
-        for idx, (test_id, score, age, timestamp) in enumerate(history):
-            # Calculate percentage (stateless approximation based on current settings)
-            # Ideally max_score should be stored in DB, but falling back to settings for now
-            question_count = self.app.settings.get("question_count", 10)
-            max_score = question_count * 4
-            percentage = (score / max_score) * 100 if max_score > 0 else 0
-            
-            test_frame = tk.Frame(scrollable_frame, bg=colors.get("surface", "#1E293B"), relief="groove", borderwidth=2)
-            test_frame.pack(fill="x", padx=20, pady=5)
-            
-            # Format date
-            try:
-                date_str = datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M")
-            except:
-                date_str = str(timestamp)
-            
-            # Test info
-            info_frame = tk.Frame(test_frame, bg=colors.get("surface", "#1E293B"))
-            info_frame.pack(fill="x", padx=10, pady=5)
+        tests_frame = tk.Frame(scrollable_frame, bg=colors.get("bg", "#0F172A"))
+        tests_frame.pack(fill="x")
+        more_frame = tk.Frame(scrollable_frame, bg=colors.get("bg", "#0F172A"))
+        more_frame.pack(fill="x")
+        shown = [0]
+
+        def render_page(page):
+            """Append one page of test cards and offer the next page if there is one"""
+            for widget in more_frame.winfo_children():
+                widget.destroy()
+
+            for test_id, score, age, timestamp, _epoch, _sentiment in page.items:
+                idx = shown[0]
+                shown[0] += 1
+                # Calculate percentage (stateless approximation based on current settings)
+                # Ideally max_score should be stored in DB, but falling back to settings for now
+                question_count = self.app.settings.get("question_count", 10)
+                max_score = question_count * 4
+                percentage = (score / max_score) * 100 if max_score > 0 else 0
+            
+                test_frame = tk.Frame(tests_frame, bg=colors.get("surface", "#1E293B"), relief="groove", borderwidth=2)
+                test_frame.pack(fill="x", padx=20, pady=5)
+            
+                # Format date
+                try:
+                    date_str = datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M")
+                except:
+                    date_str = str(timestamp)
             
-            tk.Label(
-                info_frame,
-                text=f"Test #{test_id}",
-                font=("Arial", 11, "bold"),
-                anchor="w",
-                bg=colors.get("surface", "#1E293B"),
-                fg=colors.get("text_primary", "#F8FAFC")
-            ).pack(side="left", padx=5)
+                # Test info
+                info_frame = tk.Frame(test_frame, bg=colors.get("surface", "#1E293B"))
+                info_frame.pack(fill="x", padx=10, pady=5)
             
-            tk.Label(
-                info_frame,
-                text=f"Score: {score}/{max_score} ({percentage:.1f}%)",
-                font=("Arial", 10),
-                anchor="w",
-                bg=colors.get("surface", "#1E293B"),
-                fg=colors.get("text_primary", "#F8FAFC")
-            ).pack(side="left", padx=20)
+                tk.Label(
+                    info_frame,
+                    text=f"Test #{test_id}",
+                    font=("Arial", 11, "bold"),
+                    anchor="w",
+                    bg=colors.get("surface", "#1E293B"),
+                    fg=colors.get("text_primary", "#F8FAFC")
+                ).pack(side="left", padx=5)
             
-            if age:
                 tk.Label(
                     info_frame,
-                    text=f"Age: {age}",
+                    text=f"Score: {score}/{max_score} ({percentage:.1f}%)",
                     font=("Arial", 10),
                     anchor="w",
                     bg=colors.get("surface", "#1E293B"),
                     fg=colors.get("text_primary", "#F8FAFC")
                 ).pack(side="left", padx=20)
             
-            tk.Label(
-                info_frame,
-                text=date_str,
-                font=("Arial", 9),
-                anchor="w",
-                bg=colors.get("surface", "#1E293B"),
-                fg=colors.get("text_secondary", "#94A3B8")
-            ).pack(side="right", padx=5)
-            
-            # Progress bar visualization
-            progress_frame = tk.Frame(test_frame, bg=colors.get("surface", "#1E293B"))
-            progress_frame.pack(fill="x", padx=10, pady=2)
-            
-            # Progress bar using tkinter canvas
-            bar_canvas = tk.Canvas(progress_frame, height=20, bg=colors.get("bg", "#0F172A"), highlightthickness=0)
-            bar_canvas.pack(fill="x")
-            
-            # Draw progress bar
-            bar_width = 300
-            fill_width = (percentage / 100) * bar_width
-            
-            # Background
-            bar_canvas.create_rectangle(0, 0, bar_width, 20, fill="#cccccc", outline="")
-            # Fill (green for current/latest test, blue for others)
-            fill_color = "#4CAF50" if idx == 0 else "#2196F3"
-            bar_canvas.create_rectangle(0, 0, fill_width, 20, fill=fill_color, outline="")
-            # Percentage text
-            text_color = "white"
-            bar_canvas.create_text(bar_width/2, 10, text=f"{percentage:.1f}%", fill=text_color)
+                if age:
+                    tk.Label(
+                        info_frame,
+                        text=f"Age: {age}",
+                        font=("Arial", 10),
+                        anchor="w",
+                        bg=colors.get("surface", "#1E293B"),
+                        fg=colors.get("text_primary", "#F8FAFC")
+                    ).pack(side="left", padx=20)
+            
+                tk.Label(
+                    info_frame,
+                    text=date_str,
+                    font=("Arial", 9),
+                    anchor="w",
+                    bg=colors.get("surface", "#1E293B"),
+                    fg=colors.get("text_secondary", "#94A3B8")
+                ).pack(side="right", padx=5)
+            
+                # Progress bar visualization
+                progress_frame = tk.Frame(test_frame, bg=colors.get("surface", "#1E293B"))
+                progress_frame.pack(fill="x", padx=10, pady=2)
+            
+                # Progress bar using tkinter canvas
+                bar_canvas = tk.Canvas(progress_frame, height=20, bg=colors.get("bg", "#0F172A"), highlightthickness=0)
+                bar_canvas.pack(fill="x")
+            
+                # Draw progress bar
+                bar_width = 300
+                fill_width = (percentage / 100) * bar_width
+            
+                # Background
+                bar_canvas.create_rectangle(0, 0, bar_width, 20, fill="#cccccc", outline="")
+                # Fill (green for current/latest test, blue for others)
+                fill_color = "#4CAF50" if idx == 0 else "#2196F3"
+                bar_canvas.create_rectangle(0, 0, fill_width, 20, fill=fill_color, outline="")
+                # Percentage text
+                text_color = "white"
+                bar_canvas.create_text(bar_width/2, 10, text=f"{percentage:.1f}%", fill=text_color)
+
+            if page.has_more:
+                tk.Button(
+                    more_frame,
+                    text="Load more",
+                    command=lambda: render_page(ExamService.get_score_history_page(
+                        username, cursor=page.next_cursor, limit=HISTORY_PAGE_SIZE)),
+                    font=("Arial", 10)
+                ).pack(pady=5)
+
+        render_page(first_page)
         
         # --- SECTION: DEEP DIVE ASSESSMENTS ---
         if deep_dives:
@@ -1311,7 +1332,7 @@ class ResultsManager:
         button_frame = tk.Frame(self.app.root, bg=colors.get("bg", "#0F172A"))
         button_frame.pack(pady=20)
         
-        if len(history) >= 2:
+        if summary["count"] >= 2:
             tk.Button(
                 button_frame,
                 text="Compare All Tests",
@@ -1332,22 +1353,13 @@ class ResultsManager:
         
         colors = self.app.colors
         
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Get all test data for the current user
-        cursor.execute(
-            """
-            SELECT id, total_score, timestamp 
-            FROM scores 
-            WHERE username = ? 
-            ORDER BY timestamp ASC
-            """,
-            (self.app.username,)
-        )
-        all_tests = cursor.fetchall()
+        # Whole-history figures come from SQL aggregates; only the most recent
+        # tests are loaded for the charts
+        summary = ExamService.get_score_summary(self.app.username)
+        recent = ExamService.get_score_history_page(self.app.username, limit=COMPARISON_TEST_LIMIT)
+        all_tests = list(reversed(recent.items))
         
-        if len(all_tests) < 2:
+        if summary["count"] < 2 or len(all_tests) < 2:
             messagebox.showinfo("No Comparison", "You need at least 2 tests to compare.")
             self.app.create_welcome_screen()
             return
@@ -1375,14 +1387,15 @@ class ResultsManager:
         
         tk.Label(
             self.app.root,
-            text=f"Showing {len(all_tests)} tests over time",
+            text=f"Showing your last {len(all_tests)} of {summary['count']} tests",
             font=("Arial", 12),
             bg=colors.get("bg", "#0F172A"),
             fg=colors.get("text_primary", "#F8FAFC")
         ).pack(pady=5)
         
         # Prepare data for visualization
-        test_numbers = list(range(1, len(all_tests) + 1))
+        first_shown = summary["count"] - len(all_tests) + 1
+        test_numbers = list(range(first_shown, summary["count"] + 1))
         scores = [test[1] for test in all_tests]
         # Use settings for consistency
         question_count = self.app.settings.get("question_count", 10)
@@ -1468,22 +1481,25 @@ class ResultsManager:
             fg=colors.get("text_primary", "#F8FAFC")
         ).pack(pady=10)
         
-        # Calculate statistics
-        first_score = scores[0]
-        last_score = scores[-1]
-        best_score = max(scores)
-        worst_score = min(scores)
-        avg_score = sum(scores) / len(scores)
+        # Calculate statistics over the whole history
+        def pct(value):
+            return (value / max_score) * 100 if max_score > 0 else 0
+
+        first_score = summary["first"]
+        last_score = summary["latest"]
+        best_score = summary["best"]
+        worst_score = summary["worst"]
+        avg_score = summary["average"]
         improvement = last_score - first_score
         improvement_percent = ((last_score - first_score) / first_score * 100) if first_score > 0 else 0
         
         # Display statistics
         stats_text = f"""
-        First Test: {first_score} ({percentages[0]:.1f}%)
-        Latest Test: {last_score} ({percentages[-1]:.1f}%)
-        Best Score: {best_score} ({max(percentages):.1f}%)
-        Worst Score: {worst_score} ({min(percentages):.1f}%)
-        Average: {avg_score:.1f} ({(sum(percentages)/len(percentages)):.1f}%)
+        First Test: {first_score} ({pct(first_score):.1f}%)
+        Latest Test: {last_score} ({pct(last_score):.1f}%)
+        Best Score: {best_score} ({pct(best_score):.1f}%)
+        Worst Score: {worst_score} ({pct(worst_score):.1f}%)
+        Average: {avg_score:.1f} ({pct(avg_score):.1f}%)
         """
         
         stats_label = tk.Label(
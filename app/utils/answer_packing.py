@@ -0,0 +1,85 @@
+import sys
+from array import array
+from typing import Iterable, List, Sequence, Tuple
+
+# One exam attempt's answers are stored as three parallel little-endian arrays
+QUESTION_ID_TYPECODE = "H"   # uint16
+VALUE_TYPECODE = "B"         # uint8
+LATENCY_TYPECODE = "I"       # uint32, milliseconds
+
+# (question_id, response_value, latency_ms)
+Answer = Tuple[int, int, int]
+
+
+def pack(typecode: str, values: Iterable[int]) -> bytes:
+    """Pack integers into a little-endian array of the given typecode."""
+    try:
+        packed = array(typecode, values)
+    except OverflowError as e:
+        raise ValueError(f"Value out of range for packed '{typecode}' array: {e}")
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack(typecode: str, data: bytes) -> List[int]:
+    """Inverse of pack()."""
+    values = array(typecode)
+    values.frombytes(data or b"")
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist()
+
+
+def pack_answers(answers: Sequence[Answer]) -> Tuple[bytes, bytes, bytes]:
+    """(question_ids, response_values, latencies_ms) blobs for a list of answers."""
+    return (
+        pack(QUESTION_ID_TYPECODE, (a[0] for a in answers)),
+        pack(VALUE_TYPECODE, (a[1] for a in answers)),
+        pack(LATENCY_TYPECODE, (min(max(int(a[2] or 0), 0), 0xFFFFFFFF) for a in answers)),
+    )
+
+
+def unpack_answers(question_ids: bytes, values: bytes, latencies: bytes) -> List[Answer]:
+    """Answers in stored order from the three blobs."""
+    return list(zip(
+        unpack(QUESTION_ID_TYPECODE, question_ids),
+        unpack(VALUE_TYPECODE, values),
+        unpack(LATENCY_TYPECODE, latencies),
+    ))
+
+
+def merge_answers(existing: Sequence[Answer], new: Iterable[Answer]) -> List[Answer]:
+    """
+    Apply new answers over existing ones: a re-answered question keeps its
+    position and takes the latest value and latency, new questions append.
+    """
+    merged = list(existing)
+    position = {answer[0]: i for i, answer in enumerate(merged)}
+    for answer in new:
+        if answer[0] in position:
+            merged[position[answer[0]]] = answer
+        else:
+            position[answer[0]] = len(merged)
+            merged.append(answer)
+    return merged
+
+
+# Every byte value, in order: instr(_BYTE_VALUES, <1-byte blob>) - 1 is that byte as an integer
+_BYTE_VALUES = "X'" + "".join(f"{i:02X}" for i in range(256)) + "'"
+
+
+def sql_unpack(column: str, position: str, typecode: str) -> str:
+    """
+    SQLite expression decoding element ``position`` of a packed array column.
+
+    Plain SQL (no extension functions), so views over packed columns work
+    from any sqlite3 connection.
+    """
+    width = array(typecode).itemsize
+    parts = [
+        f"(instr({_BYTE_VALUES}, substr({column}, {position} * {width} + {offset + 1}, 1)) - 1)"
+        + (f" * {256 ** offset}" if offset else "")
+        for offset in range(width)
+    ]
+    return "(" + " + ".join(parts) + ")"
@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import ColumnElement, literal, tuple_
+
+# (sort value, id) of the last row on a page; pass it back to get the next page
+Cursor = Tuple[Any, int]
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated query."""
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[Cursor] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def seek_query(query: Any, sort_column: ColumnElement[Any], id_column: ColumnElement[Any],
+               cursor: Optional[Cursor] = None, limit: int = 20) -> Any:
+    """
+    The statement seek_page() runs: rows after the cursor, newest first,
+    with one row beyond limit to tell whether another page follows.
+    """
+    query = query.filter(sort_column.isnot(None))
+    if cursor is not None:
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(*map(literal, cursor)))
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def seek_page(query: Any, sort_column: ColumnElement[Any], id_column: ColumnElement[Any],
+              cursor: Optional[Cursor] = None, limit: int = 20) -> Page:
+    """
+    Newest-first page of an ORM query using keyset (seek) pagination.
+
+    Rows are ordered by (sort_column DESC, id_column DESC) and each page
+    starts strictly after the cursor, so with an index on (owner, sort_column)
+    every page is an index seek no matter how deep the history goes (unlike
+    OFFSET, which walks all skipped rows). Both columns must be selected by
+    the query; rows with a NULL sort value are excluded.
+    """
+    sort_key, id_key = sort_column.key, id_column.key
+    assert sort_key and id_key, "keyset columns must be named columns"
+    rows = seek_query(query, sort_column, id_column, cursor, limit).all()
+    if len(rows) <= limit:
+        return Page(items=rows)
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(items=rows, next_cursor=(getattr(last, sort_key), getattr(last, id_key)))
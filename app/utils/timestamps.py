@@ -0,0 +1,47 @@
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Any, Optional, Tuple
+
+
+def to_epoch(value: Any) -> Optional[int]:
+    """
+    Convert a stored timestamp to integer seconds since the Unix epoch.
+
+    Accepts datetimes and the string formats used in the database
+    ('2024-01-15T10:30:00.123456', '2024-01-15 10:30:00', '2024-01-15').
+    Naive values are treated as UTC, matching SQLite's strftime('%s', ...)
+    so rows written by the app agree with rows backfilled by migration.
+    Returns None for empty or unparseable values.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, date):
+        dt = datetime(value.year, value.month, value.day)
+    else:
+        text = str(value).strip()
+        if not text:
+            return None
+        try:
+            dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    if dt.tzinfo is not None:
+        return calendar.timegm(dt.utctimetuple())
+    return calendar.timegm(dt.timetuple())
+
+
+def from_epoch(value: int) -> datetime:
+    """Naive UTC datetime for an epoch value (inverse of to_epoch)."""
+    return datetime(1970, 1, 1) + timedelta(seconds=value)
+
+
+def day_bounds(day: Any) -> Tuple[int, int]:
+    """Half-open [start, end) epoch range covering one calendar day."""
+    start = to_epoch(day if isinstance(day, (date, datetime)) else str(day)[:10])
+    if start is None:
+        raise ValueError(f"Invalid date: {day!r}")
+    start -= start % 86400
+    return start, start + 86400
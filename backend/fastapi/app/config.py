@@ -52,6 +52,16 @@ class Settings(BaseSettings):
             )
         return f"sqlite:///{SQLITE_DB_PATH}"
 
+    @property
+    def async_database_url(self) -> str:
+        """Same database as database_url, addressed through an asyncio driver."""
+        if self.database_type == "postgresql":
+            return (
+                f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:"
+                f"{self.db_port}/{self.db_name}"
+            )
+        return f"sqlite+aiosqlite:///{SQLITE_DB_PATH}"
+
 
 _settings: Settings | None = None
 
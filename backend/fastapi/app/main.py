@@ -1,12 +1,53 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .config import get_settings
+from .config import get_settings, SQLITE_DB_PATH
 from .routers import health, auth
+from .services.db_service import dispose_engine
+
+from app.db_maintenance import MaintenanceScheduler
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# How often the background task checks for due database maintenance
+MAINTENANCE_TICK_SECONDS = 60
+
+
+async def _maintenance_loop(scheduler: MaintenanceScheduler) -> None:
+    """Run due maintenance off the event loop until cancelled."""
+    while True:
+        await asyncio.to_thread(scheduler.tick)
+        await asyncio.sleep(MAINTENANCE_TICK_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.settings = settings
+
+    maintenance = None
+    if settings.database_type == "sqlite":
+        app.state.maintenance = MaintenanceScheduler(str(SQLITE_DB_PATH))
+        maintenance = asyncio.create_task(_maintenance_loop(app.state.maintenance))
+
+    yield
+
+    if maintenance is not None:
+        maintenance.cancel()
+        with suppress(asyncio.CancelledError):
+            await maintenance
+        try:
+            await asyncio.to_thread(app.state.maintenance.run, ["checkpoint"])
+        except Exception as e:
+            logger.error(f"Shutdown checkpoint failed: {e}")
+    await dispose_engine()
+
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="SoulSense FastAPI")
+    app = FastAPI(title="SoulSense FastAPI", lifespan=lifespan)
 
     # CORS middleware
     app.add_middleware(
@@ -20,10 +61,6 @@ def create_app() -> FastAPI:
     app.include_router(health.router)
     app.include_router(auth.router, prefix="/auth", tags=["authentication"])
 
-    @app.on_event("startup")
-    async def startup_event():
-        app.state.settings = settings
-
     return app
 
 
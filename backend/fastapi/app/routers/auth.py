@@ -1,12 +1,15 @@
 from datetime import datetime, timedelta
 from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import get_settings
 from ..models.schemas import UserCreate, Token, UserResponse
-from app.db import get_session
+from ..services.db_service import get_db
 from app.models import User
 from app.auth import AuthManager
 
@@ -17,15 +20,17 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 auth_manager = AuthManager()
 
 
-def authenticate_user(username: str, password: str):
-    session = get_session()
-    try:
-        user = session.query(User).filter(User.username == username).first()
-        if user and auth_manager.verify_password(password, user.password_hash):
-            return user
-        return None
-    finally:
-        session.close()
+async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
+
+
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = await get_user_by_username(db, username)
+    # bcrypt is CPU-bound; keep it off the event loop
+    if user and await run_in_threadpool(auth_manager.verify_password, password, user.password_hash):
+        return user
+    return None
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
@@ -36,7 +41,10 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -50,36 +58,39 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
     except JWTError:
         raise credentials_exception
 
-    session = get_session()
-    try:
-        user = session.query(User).filter(User.username == username).first()
-        if user is None:
-            raise credentials_exception
-        return user
-    finally:
-        session.close()
+    user = await get_user_by_username(db, username)
+    if user is None:
+        raise credentials_exception
+    return user
 
 
 @router.post("/register", response_model=UserResponse)
-async def register(user: UserCreate):
-    session = get_session()
-    try:
-        if session.query(User).filter(User.username == user.username).first():
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
-
-        success, message = auth_manager.register_user(user.username, user.password)
-        if not success:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=message)
-
-        db_user = session.query(User).filter(User.username == user.username).first()
-        return UserResponse(id=db_user.id, username=db_user.username, created_at=db_user.created_at)
-    finally:
-        session.close()
+async def register(user: UserCreate, db: Annotated[AsyncSession, Depends(get_db)]):
+    # Same rules as the desktop app's registration
+    error = auth_manager.validate_registration(user.username, user.password)
+    if error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    if await get_user_by_username(db, user.username):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
+
+    password_hash = await run_in_threadpool(auth_manager.hash_password, user.password)
+    db_user = User(
+        username=user.username,
+        password_hash=password_hash,
+        created_at=datetime.utcnow().isoformat(),
+    )
+    db.add(db_user)
+    await db.flush()  # Assigns the primary key; commit happens in get_db
+    return UserResponse(id=db_user.id, username=db_user.username, created_at=db_user.created_at)
 
 
 @router.post("/login", response_model=Token)
-async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
-    user = authenticate_user(form_data.username, form_data.password)
+async def login(
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -92,4 +103,4 @@ async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
 
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(current_user: Annotated[User, Depends(get_current_user)]):
-    return UserResponse(id=current_user.id, username=current_user.username, created_at=current_user.created_at)
\ No newline at end of file
+    return UserResponse(id=current_user.id, username=current_user.username, created_at=current_user.created_at)
@@ -0,0 +1,58 @@
+"""
+Async database access for the FastAPI backend.
+
+Endpoints receive an AsyncSession through ``Depends(get_db)`` so queries
+run on the event loop via aiosqlite (or asyncpg) instead of blocking it
+with the synchronous session from ``app.db``. The ORM models are the same
+ones defined in ``app/models.py``.
+"""
+from typing import Any, AsyncGenerator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from ..config import get_settings
+from app.db import apply_sqlite_pragmas
+
+settings = get_settings()
+
+engine: AsyncEngine = create_async_engine(
+    settings.async_database_url,
+    echo=False,
+    pool_pre_ping=True,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        """Apply the server tuning profile to every pooled aiosqlite connection."""
+        apply_sqlite_pragmas(dbapi_connection, "server")
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Request-scoped session dependency.
+
+    Commits when the endpoint returns normally, rolls back if it raises,
+    and always returns the connection to the pool.
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def dispose_engine() -> None:
+    """Close pooled connections (called on application shutdown)."""
+    await engine.dispose()
@@ -0,0 +1,46 @@
+"""backfill_orphaned_user_ids
+
+Revision ID: 2b7d5e9a3c61
+Revises: c8e2b6f4a1d7
+Create Date: 2026-10-17 09:32:51.604127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7d5e9a3c61'
+down_revision: Union[str, Sequence[str], None] = 'c8e2b6f4a1d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same tables as app.models.USER_OWNED_MODELS; rows written before their
+# account existed still have a NULL user_id
+USER_OWNED_TABLES = ['scores', 'responses', 'attempt_answers', 'journal_entries', 'journal_tags',
+                     'satisfaction_records']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'users' not in tables:
+        return
+
+    for table in USER_OWNED_TABLES:
+        if table not in tables:
+            continue
+        op.execute(
+            f"UPDATE {table} SET user_id = "
+            f"(SELECT users.id FROM users WHERE users.username = {table}.username) "
+            f"WHERE user_id IS NULL AND username IN (SELECT username FROM users)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Backfilled user_id values are left in place
+    pass
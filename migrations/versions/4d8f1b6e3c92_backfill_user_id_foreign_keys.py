@@ -0,0 +1,74 @@
+"""backfill_user_id_foreign_keys
+
+Revision ID: 4d8f1b6e3c92
+Revises: 9b4e2c7d1a6f
+Create Date: 2026-10-16 11:47:05.218834
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8f1b6e3c92'
+down_revision: Union[str, Sequence[str], None] = '9b4e2c7d1a6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables stamped with a username whose user_id should point at users.id
+USER_OWNED_TABLES = ['scores', 'responses', 'journal_entries', 'satisfaction_records']
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_journal_entries_user_id', 'journal_entries', ['user_id']),
+    ('idx_journal_user_epoch', 'journal_entries', ['user_id', 'entry_date_epoch']),
+    ('idx_response_user_epoch', 'responses', ['user_id', 'timestamp_epoch']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'journal_entries' in tables:
+        columns = {c['name'] for c in inspector.get_columns('journal_entries')}
+        if 'user_id' not in columns:
+            # SQLite cannot ALTER in a constraint; the FK is declared on the model
+            op.add_column('journal_entries', sa.Column('user_id', sa.Integer(), nullable=True))
+
+    if 'users' in tables:
+        for table in USER_OWNED_TABLES:
+            if table not in tables:
+                continue
+            op.execute(
+                f"UPDATE {table} SET user_id = "
+                f"(SELECT users.id FROM users WHERE users.username = {table}.username) "
+                f"WHERE user_id IS NULL AND username IS NOT NULL"
+            )
+
+    for name, table, columns in INDEXES:
+        if table not in tables:
+            continue
+        if name not in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    for name, table, _ in INDEXES:
+        if table in tables and name in {ix['name'] for ix in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+
+    # Backfilled user_id values on the other tables are left in place
+    if 'journal_entries' in tables:
+        with op.batch_alter_table('journal_entries') as batch_op:
+            batch_op.drop_column('user_id')
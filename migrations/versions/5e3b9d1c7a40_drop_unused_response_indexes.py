@@ -0,0 +1,38 @@
+"""drop_unused_response_indexes
+
+Revision ID: 5e3b9d1c7a40
+Revises: 9c4e1a7d3f28
+Create Date: 2026-10-18 10:21:47.603815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e3b9d1c7a40'
+down_revision: Union[str, Sequence[str], None] = '9c4e1a7d3f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# No query reads responses through these (see app/db_audit.py); each is written on every insert
+UNUSED_INDEXES = [
+    ('idx_response_user_epoch', ['user_id', 'timestamp_epoch']),
+    ('idx_response_attempt', ['attempt_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    indexes = {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('responses')}
+    for name, _ in UNUSED_INDEXES:
+        if name in indexes:
+            op.drop_index(name, table_name='responses')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, columns in UNUSED_INDEXES:
+        op.create_index(name, 'responses', columns, unique=False)
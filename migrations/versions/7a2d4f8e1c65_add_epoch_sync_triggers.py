@@ -0,0 +1,80 @@
+"""add_epoch_sync_triggers
+
+Revision ID: 7a2d4f8e1c65
+Revises: 5e3b9d1c7a40
+Create Date: 2026-10-18 11:05:12.847390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2d4f8e1c65'
+down_revision: Union[str, Sequence[str], None] = '5e3b9d1c7a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same tables and trigger bodies as app.models.EPOCH_COLUMNS / epoch_sync_ddl
+EPOCH_COLUMNS = (
+    ('scores', 'timestamp', 'timestamp_epoch'),
+    ('responses', 'timestamp', 'timestamp_epoch'),
+    ('attempt_answers', 'timestamp', 'timestamp_epoch'),
+    ('journal_entries', 'entry_date', 'entry_date_epoch'),
+    ('satisfaction_records', 'timestamp', 'timestamp_epoch'),
+    ('assessment_results', 'timestamp', 'timestamp_epoch'),
+)
+# Same as app.models.CHANGE_LOG_TABLES / change_log_ddl
+CHANGE_LOG_TABLES = ('scores', 'responses', 'attempt_answers', 'journal_entries', 'satisfaction_records',
+                     'assessment_results')
+CHANGE_LOG_EVENTS = (('ai', 'INSERT', 'I', 'new'), ('au', 'UPDATE', 'U', 'new'), ('ad', 'DELETE', 'D', 'old'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    logged = [t for t in CHANGE_LOG_TABLES if t in tables] if 'change_log' in tables else []
+
+    # Filling the mirrors is not a change consumers need to see
+    for table_name in logged:
+        for suffix, _, _, _ in CHANGE_LOG_EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS change_log_{table_name}_{suffix}")
+
+    for table_name, source, mirror in EPOCH_COLUMNS:
+        if table_name not in tables:
+            continue
+        # Rows written by raw SQL or Core updates since the epoch columns were added
+        op.execute(f"""
+            UPDATE {table_name} SET {mirror} = CAST(strftime('%s', {source}) AS INTEGER)
+            WHERE {mirror} IS NULL AND {source} IS NOT NULL
+        """)
+        value = f"CAST(strftime('%s', new.{source}) AS INTEGER)"
+        for suffix, event_name, when in (
+            ('ai', 'INSERT', f"new.{mirror} IS NULL AND new.{source} IS NOT NULL"),
+            ('au', f'UPDATE OF {source}', f"new.{source} IS NOT old.{source} AND new.{mirror} IS old.{mirror}"),
+        ):
+            op.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS epoch_sync_{table_name}_{suffix} AFTER {event_name} ON {table_name}
+                WHEN {when} BEGIN
+                    UPDATE {table_name} SET {mirror} = {value} WHERE rowid = new.rowid;
+                END
+            """)
+
+    # Recreated after the epoch triggers so they fire first (SQLite runs the newest trigger first)
+    for table_name in logged:
+        for suffix, event_name, change, row in CHANGE_LOG_EVENTS:
+            op.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS change_log_{table_name}_{suffix} AFTER {event_name} ON {table_name} BEGIN
+                    INSERT INTO change_log (table_name, op, row_id, user_id, ts)
+                    VALUES ('{table_name}', '{change}', {row}.id, {row}.user_id, CAST(strftime('%s', 'now') AS INTEGER));
+                END
+            """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name, _, _ in EPOCH_COLUMNS:
+        for suffix in ('ai', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS epoch_sync_{table_name}_{suffix}")
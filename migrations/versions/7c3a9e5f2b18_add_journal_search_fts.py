@@ -0,0 +1,69 @@
+"""add_journal_search_fts
+
+Revision ID: 7c3a9e5f2b18
+Revises: 4d8f1b6e3c92
+Create Date: 2026-10-16 14:02:41.663090
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3a9e5f2b18'
+down_revision: Union[str, Sequence[str], None] = '4d8f1b6e3c92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# External-content FTS5 index over journal_entries (content, tags)
+CREATE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS journal_search
+    USING fts5(content, tags, content='journal_entries', content_rowid='id', tokenize='porter unicode61')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_search_ai AFTER INSERT ON journal_entries BEGIN
+        INSERT INTO journal_search(rowid, content, tags) VALUES (new.id, new.content, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_search_ad AFTER DELETE ON journal_entries BEGIN
+        INSERT INTO journal_search(journal_search, rowid, content, tags) VALUES ('delete', old.id, old.content, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS journal_search_au AFTER UPDATE OF content, tags ON journal_entries BEGIN
+        INSERT INTO journal_search(journal_search, rowid, content, tags) VALUES ('delete', old.id, old.content, old.tags);
+        INSERT INTO journal_search(rowid, content, tags) VALUES (new.id, new.content, new.tags);
+    END
+    """,
+]
+
+TRIGGERS = ['journal_search_ai', 'journal_search_ad', 'journal_search_au']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'journal_entries' not in inspector.get_table_names():
+        return
+
+    # The model has carried tags since 28f7f5014a54, but that revision never added the column
+    if 'tags' not in {c['name'] for c in inspector.get_columns('journal_entries')}:
+        op.add_column('journal_entries', sa.Column('tags', sa.Text(), nullable=True))
+
+    for statement in CREATE_STATEMENTS:
+        op.execute(statement)
+    # Index entries written before the triggers existed
+    op.execute("INSERT INTO journal_search(journal_search) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS journal_search")
@@ -0,0 +1,82 @@
+"""add_epoch_timestamp_columns
+
+Revision ID: 9b4e2c7d1a6f
+Revises: 28f7f5014a54
+Create Date: 2026-10-16 09:12:44.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e2c7d1a6f'
+down_revision: Union[str, Sequence[str], None] = '28f7f5014a54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> (string timestamp column, epoch column, [(index name, leading column)])
+EPOCH_COLUMNS = {
+    'scores': ('timestamp', 'timestamp_epoch', [
+        ('idx_score_username_epoch', 'username'),
+        ('idx_score_user_epoch', 'user_id'),
+    ]),
+    'responses': ('timestamp', 'timestamp_epoch', [
+        ('idx_response_username_epoch', 'username'),
+    ]),
+    'journal_entries': ('entry_date', 'entry_date_epoch', [
+        ('idx_journal_username_epoch', 'username'),
+    ]),
+    'satisfaction_records': ('timestamp', 'timestamp_epoch', [
+        ('idx_satisfaction_user_epoch', 'user_id'),
+    ]),
+    'assessment_results': ('timestamp', 'timestamp_epoch', [
+        ('idx_assessment_user_epoch', 'user_id'),
+    ]),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    for table, (source, epoch, indexes) in EPOCH_COLUMNS.items():
+        if table not in tables:
+            continue
+
+        columns = {c['name'] for c in inspector.get_columns(table)}
+        if epoch not in columns:
+            op.add_column(table, sa.Column(epoch, sa.Integer(), nullable=True))
+
+        # strftime('%s') treats naive ISO strings as UTC, same as app.utils.timestamps.to_epoch
+        op.execute(
+            f"UPDATE {table} SET {epoch} = CAST(strftime('%s', {source}) AS INTEGER) "
+            f"WHERE {epoch} IS NULL AND {source} IS NOT NULL"
+        )
+
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        for name, leading in indexes:
+            if name not in existing:
+                op.create_index(name, table, [leading, epoch], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = inspector.get_table_names()
+
+    for table, (_, epoch, indexes) in EPOCH_COLUMNS.items():
+        if table not in tables:
+            continue
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        for name, _ in indexes:
+            if name in existing:
+                op.drop_index(name, table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column(epoch)
@@ -0,0 +1,34 @@
+"""replace_response_attempt_index
+
+Revision ID: 9c4e1a7d3f28
+Revises: 2b7d5e9a3c61
+Create Date: 2026-10-17 14:08:36.219473
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e1a7d3f28'
+down_revision: Union[str, Sequence[str], None] = '2b7d5e9a3c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    indexes = {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('responses')}
+    # Nothing writes through the (attempt_id, question_id) upsert; keep a plain index for attempt joins
+    if 'uq_response_attempt_question' in indexes:
+        op.drop_index('uq_response_attempt_question', table_name='responses')
+    if 'idx_response_attempt' not in indexes:
+        op.create_index('idx_response_attempt', 'responses', ['attempt_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_response_attempt', table_name='responses')
+    op.create_index('uq_response_attempt_question', 'responses', ['attempt_id', 'question_id'], unique=True)
@@ -0,0 +1,78 @@
+"""add_journal_tags_table
+
+Revision ID: a5d2f8c4e7b3
+Revises: 7c3a9e5f2b18
+Create Date: 2026-10-16 15:21:09.408172
+
+"""
+import json
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d2f8c4e7b3'
+down_revision: Union[str, Sequence[str], None] = '7c3a9e5f2b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize_tags(value) -> List[str]:
+    """Same rules as app.models.normalize_tags (JSON list or comma-separated)."""
+    if not value:
+        return []
+    try:
+        items = json.loads(value)
+    except ValueError:
+        items = value.split(',')
+    if isinstance(items, str):
+        items = [items]
+    return list(dict.fromkeys(str(t).strip().lower() for t in items if str(t).strip()))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    tables = sa.inspect(bind).get_table_names()
+    if 'journal_tags' in tables:
+        return
+
+    op.create_table('journal_tags',
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('tag', sa.String(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('username', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['entry_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('entry_id', 'tag')
+    )
+
+    # Backfill from the JSON tags column of existing entries
+    rows = []
+    if 'journal_entries' in tables:
+        entries = bind.execute(sa.text(
+            "SELECT id, tags, user_id, username FROM journal_entries WHERE tags IS NOT NULL AND tags != ''"
+        )).fetchall()
+        for entry_id, tags, user_id, username in entries:
+            rows.extend(
+                {'entry_id': entry_id, 'tag': tag, 'user_id': user_id, 'username': username}
+                for tag in _normalize_tags(tags)
+            )
+    if rows:
+        op.bulk_insert(sa.table('journal_tags',
+            sa.column('entry_id', sa.Integer), sa.column('tag', sa.String),
+            sa.column('user_id', sa.Integer), sa.column('username', sa.String)
+        ), rows)
+
+    op.create_index('idx_journal_tags_tag_entry', 'journal_tags', ['tag', 'entry_id'], unique=False)
+    op.create_index('idx_journal_tags_user_tag', 'journal_tags', ['user_id', 'tag', 'entry_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if 'journal_tags' in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_index('idx_journal_tags_user_tag', table_name='journal_tags')
+        op.drop_index('idx_journal_tags_tag_entry', table_name='journal_tags')
+        op.drop_table('journal_tags')
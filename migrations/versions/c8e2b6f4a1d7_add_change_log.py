@@ -0,0 +1,70 @@
+"""add_change_log
+
+Revision ID: c8e2b6f4a1d7
+Revises: f1a7c3d9e2b5
+Create Date: 2026-10-17 00:14:09.285731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2b6f4a1d7'
+down_revision: Union[str, Sequence[str], None] = 'f1a7c3d9e2b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same tables and trigger bodies as app.models.CHANGE_LOG_TABLES / change_log_ddl
+CHANGE_LOG_TABLES = ('scores', 'responses', 'attempt_answers', 'journal_entries', 'satisfaction_records',
+                     'assessment_results')
+TRIGGER_EVENTS = (('ai', 'INSERT', 'I', 'new'), ('au', 'UPDATE', 'U', 'new'), ('ad', 'DELETE', 'D', 'old'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'change_log' not in tables:
+        op.create_table('change_log',
+        sa.Column('seq', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('op', sa.String(length=1), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('ts', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('seq'),
+        sqlite_autoincrement=True
+        )
+    if 'change_consumers' not in tables:
+        op.create_table('change_consumers',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('last_seq', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+        )
+
+    for table_name in CHANGE_LOG_TABLES:
+        if table_name not in tables:
+            continue
+        for suffix, event_name, change, row in TRIGGER_EVENTS:
+            op.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS change_log_{table_name}_{suffix} AFTER {event_name} ON {table_name} BEGIN
+                    INSERT INTO change_log (table_name, op, row_id, user_id, ts)
+                    VALUES ('{table_name}', '{change}', {row}.id, {row}.user_id, CAST(strftime('%s', 'now') AS INTEGER));
+                END
+            """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in CHANGE_LOG_TABLES:
+        for suffix, _, _, _ in TRIGGER_EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS change_log_{table_name}_{suffix}")
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'change_consumers' in tables:
+        op.drop_table('change_consumers')
+    if 'change_log' in tables:
+        op.drop_table('change_log')
@@ -0,0 +1,104 @@
+"""add_attempt_answers
+
+Revision ID: e4c8a2f6b1d9
+Revises: a5d2f8c4e7b3
+Create Date: 2026-10-16 21:34:52.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c8a2f6b1d9'
+down_revision: Union[str, Sequence[str], None] = 'a5d2f8c4e7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MAX_ANSWERS_PER_ATTEMPT = 1024
+
+# Every byte value, in order: instr(BYTE_VALUES, <1-byte blob>) - 1 is that byte as an integer
+BYTE_VALUES = "X'" + "".join(f"{i:02X}" for i in range(256)) + "'"
+
+
+def unpack(column: str, width: int) -> str:
+    """Decode element p.pos of a little-endian packed array column of ``width``-byte items."""
+    return "(" + " + ".join(
+        f"(instr({BYTE_VALUES}, substr({column}, p.pos * {width} + {offset + 1}, 1)) - 1)"
+        + (f" * {256 ** offset}" if offset else "")
+        for offset in range(width)
+    ) + ")"
+
+
+# answer_rows as of this revision (responses has no attempt_id yet); frozen here so
+# later model changes cannot alter the migration
+ANSWER_ROWS_SQL = f"""
+    SELECT id, username, question_id, response_value, age_group, detailed_age_group,
+           timestamp, timestamp_epoch, user_id, NULL AS attempt_id, NULL AS latency_ms
+    FROM responses
+    UNION ALL
+    SELECT -(a.id * {MAX_ANSWERS_PER_ATTEMPT} + p.pos + 1), a.username,
+           {unpack('a.question_ids', 2)},
+           {unpack('a.response_values', 1)},
+           a.age_group, a.detailed_age_group, a.timestamp, a.timestamp_epoch, a.user_id, a.id,
+           {unpack('a.latencies_ms', 4)}
+    FROM attempt_answers a JOIN answer_positions p ON p.pos < a.answer_count
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    tables = sa.inspect(bind).get_table_names()
+
+    if 'attempt_answers' not in tables:
+        op.create_table('attempt_answers',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('session_key', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('username', sa.String(), nullable=True),
+        sa.Column('score_id', sa.Integer(), nullable=True),
+        sa.Column('age_group', sa.String(), nullable=True),
+        sa.Column('detailed_age_group', sa.String(), nullable=True),
+        sa.Column('timestamp', sa.String(), nullable=True),
+        sa.Column('timestamp_epoch', sa.Integer(), nullable=True),
+        sa.Column('answer_count', sa.Integer(), nullable=False),
+        sa.Column('question_ids', sa.LargeBinary(), nullable=False),
+        sa.Column('response_values', sa.LargeBinary(), nullable=False),
+        sa.Column('latencies_ms', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['score_id'], ['scores.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('session_key')
+        )
+        op.create_index('idx_attempt_answers_user_epoch', 'attempt_answers', ['user_id', 'timestamp_epoch'], unique=False)
+        op.create_index('idx_attempt_answers_username_epoch', 'attempt_answers', ['username', 'timestamp_epoch'], unique=False)
+
+    if 'answer_positions' not in tables:
+        op.create_table('answer_positions',
+        sa.Column('pos', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('pos')
+        )
+    op.execute(f"""
+        WITH RECURSIVE n(pos) AS (SELECT 0 UNION ALL SELECT pos + 1 FROM n WHERE pos < {MAX_ANSWERS_PER_ATTEMPT - 1})
+        INSERT OR IGNORE INTO answer_positions (pos) SELECT pos FROM n
+    """)
+
+    # Compatibility view over both stores.
+    # Existing responses rows stay readable through it; scripts/migrate_attempt_answers.py packs them.
+    op.execute("DROP VIEW IF EXISTS answer_rows")
+    op.execute(f"CREATE VIEW answer_rows AS {ANSWER_ROWS_SQL}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP VIEW IF EXISTS answer_rows")
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'answer_positions' in tables:
+        op.drop_table('answer_positions')
+    if 'attempt_answers' in tables:
+        op.drop_index('idx_attempt_answers_username_epoch', table_name='attempt_answers')
+        op.drop_index('idx_attempt_answers_user_epoch', table_name='attempt_answers')
+        op.drop_table('attempt_answers')
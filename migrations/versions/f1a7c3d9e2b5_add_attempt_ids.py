@@ -0,0 +1,84 @@
+"""add_attempt_ids
+
+Revision ID: f1a7c3d9e2b5
+Revises: e4c8a2f6b1d9
+Create Date: 2026-10-16 23:02:17.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3d9e2b5'
+down_revision: Union[str, Sequence[str], None] = 'e4c8a2f6b1d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Every byte value, in order: instr(BYTE_VALUES, <1-byte blob>) - 1 is that byte as an integer
+BYTE_VALUES = "X'" + "".join(f"{i:02X}" for i in range(256)) + "'"
+
+
+def unpack(column: str, width: int) -> str:
+    """Decode element p.pos of a little-endian packed array column of ``width``-byte items."""
+    return "(" + " + ".join(
+        f"(instr({BYTE_VALUES}, substr({column}, p.pos * {width} + {offset + 1}, 1)) - 1)"
+        + (f" * {256 ** offset}" if offset else "")
+        for offset in range(width)
+    ) + ")"
+
+
+# answer_rows as of this revision; frozen here so later model changes cannot alter the migration
+ANSWER_ROWS_SQL = f"""
+    SELECT id, username, question_id, response_value, age_group, detailed_age_group,
+           timestamp, timestamp_epoch, user_id, attempt_id, NULL AS latency_ms
+    FROM responses
+    UNION ALL
+    SELECT -(a.id * 1024 + p.pos + 1), a.username,
+           {unpack('a.question_ids', 2)},
+           {unpack('a.response_values', 1)},
+           a.age_group, a.detailed_age_group, a.timestamp, a.timestamp_epoch, a.user_id, a.session_key,
+           {unpack('a.latencies_ms', 4)}
+    FROM attempt_answers a JOIN answer_positions p ON p.pos < a.answer_count
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+
+    if 'attempt_id' not in {c['name'] for c in inspector.get_columns('scores')}:
+        op.add_column('scores', sa.Column('attempt_id', sa.String(), nullable=True))
+    if 'idx_score_attempt' not in {i['name'] for i in inspector.get_indexes('scores')}:
+        # Scores already linked from a packed attempt take its key
+        op.execute("""
+            UPDATE scores SET attempt_id = (
+                SELECT MIN(a.session_key) FROM attempt_answers a WHERE a.score_id = scores.id
+            )
+            WHERE attempt_id IS NULL
+        """)
+        op.create_index('idx_score_attempt', 'scores', ['attempt_id'], unique=True)
+
+    if 'attempt_id' not in {c['name'] for c in inspector.get_columns('responses')}:
+        op.add_column('responses', sa.Column('attempt_id', sa.String(), nullable=True))
+    if 'uq_response_attempt_question' not in {i['name'] for i in inspector.get_indexes('responses')}:
+        op.create_index('uq_response_attempt_question', 'responses', ['attempt_id', 'question_id'], unique=True)
+
+    # Compatibility view, same definition the app recreates on startup.
+    # Existing responses rows stay readable through it; scripts/migrate_attempt_answers.py packs them.
+    op.execute("DROP VIEW IF EXISTS answer_rows")
+    op.execute(f"CREATE VIEW answer_rows AS {ANSWER_ROWS_SQL}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP VIEW IF EXISTS answer_rows")
+    op.drop_index('uq_response_attempt_question', table_name='responses')
+    op.drop_index('idx_score_attempt', table_name='scores')
+    with op.batch_alter_table('responses') as batch_op:
+        batch_op.drop_column('attempt_id')
+    with op.batch_alter_table('scores') as batch_op:
+        batch_op.drop_column('attempt_id')
@@ -1024,16 +1024,15 @@ class AdminInterface:
             # Connect to REAL user database (soulsense.db) not questions DB
             # Note: Admin tool usually manages questions, but analytics needs USER scores.
             # We'll need to connect to the main app DB path.
-            from app.config import DB_PATH
-            conn = sqlite3.connect(DB_PATH)
+            from app.db_replica import get_analytics_connection
+            conn = get_analytics_connection()
             
-            # --- Summary Stats ---
+            # --- Summary Stats (materialized in statistics_cache) ---
+            from app.services.stats_service import get_stat
+            total_exams = int(get_stat("score.count", default=0))
+            avg_score = get_stat("score.mean")
+            active_users = int(get_stat("users.active", default=0))
             cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*), AVG(total_score) FROM scores")
-            total_exams, avg_score = cursor.fetchone()
-            
-            cursor.execute("SELECT COUNT(DISTINCT username) FROM scores")
-            active_users = cursor.fetchone()[0]
             
             summary_frame = tk.Frame(parent_frame, bg="#f0f0f0", bd=1, relief="solid")
             summary_frame.pack(fill=tk.X, pady=10)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Cold-storage archival for SOUL_SENSE_EXAM
+
+Moves responses and journal entries older than their retention window
+(app/db_archive.py) from the main database into data/archive/archive_<year>.db.
+Safe to run repeatedly, e.g. from cron.
+
+Usage:
+    python scripts/archive_rows.py [--list]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db_archive import (
+    ARCHIVE_TABLES, archive_old_rows, list_archives
+)
+from app.exceptions import DatabaseError
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Archive old history rows for SOUL_SENSE_EXAM")
+    parser.add_argument('--list', action='store_true', help='List archive files and exit')
+
+    args = parser.parse_args()
+
+    if args.list:
+        for year, path in list_archives():
+            print(f"{year}: {path}")
+        return
+
+    try:
+        moved = archive_old_rows()
+    except DatabaseError as e:
+        print(f"Archival failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for table_name, count in moved.items():
+        print(f"{table_name}: {count} rows archived (retention {ARCHIVE_TABLES[table_name][1]} days)")
+
+
+if __name__ == "__main__":
+    main()
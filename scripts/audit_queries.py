@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Query plan audit for SOUL_SENSE_EXAM
+
+Runs EXPLAIN QUERY PLAN over the service query registry in app/db_audit.py,
+suggests indexes for full scans / temp B-trees and lists unused indexes.
+
+Usage:
+    python scripts/audit_queries.py [--verbose] [--format json]
+    python scripts/audit_queries.py --profile data/sql_profile.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db_audit import run_audit, format_audit
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Query plan auditor and index advisor for SOUL_SENSE_EXAM")
+    parser.add_argument(
+        '--profile',
+        help='Also audit SELECTs captured by the sql_profiling flag (path to sql_profile.json)'
+    )
+    parser.add_argument('--verbose', action='store_true', help='Print the plan for every query')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format (default: text)')
+
+    args = parser.parse_args()
+
+    profile = None
+    if args.profile:
+        try:
+            with open(args.profile, "r", encoding="utf-8") as f:
+                profile = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Could not read profile {args.profile}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    report = run_audit(profile=profile)
+
+    if args.format == 'json':
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_audit(report, verbose=args.verbose))
+
+    # Non-zero exit when a registered query needs attention (usable in CI)
+    sys.exit(1 if report["flagged"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Database maintenance for SOUL_SENSE_EXAM
+
+Runs PRAGMA optimize / ANALYZE, a TRUNCATE WAL checkpoint and an incremental
+vacuum (app/db_maintenance.py) and reports page counts and fragmentation.
+
+Usage:
+    python scripts/db_maintenance.py [--tasks optimize checkpoint vacuum] [--format json]
+    python scripts/db_maintenance.py --stats
+    python scripts/db_maintenance.py --enable-incremental-vacuum
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db import get_connection
+from app.db_maintenance import (
+    MAINTENANCE_TASKS, MaintenanceScheduler, database_stats, enable_incremental_vacuum, format_report
+)
+from app.exceptions import DatabaseError
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Database maintenance for SOUL_SENSE_EXAM")
+    parser.add_argument('--db', help='Path to the SQLite database (default: configured database)')
+    parser.add_argument('--tasks', nargs='+', choices=MAINTENANCE_TASKS, help='Tasks to run (default: all)')
+    parser.add_argument('--stats', action='store_true', help='Only report page counts and fragmentation')
+    parser.add_argument(
+        '--enable-incremental-vacuum',
+        action='store_true',
+        help='Switch an existing database to auto_vacuum=INCREMENTAL (runs a full VACUUM)'
+    )
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format (default: text)')
+
+    args = parser.parse_args()
+
+    try:
+        if args.stats or args.enable_incremental_vacuum:
+            conn = get_connection(args.db)
+            try:
+                if args.enable_incremental_vacuum and not enable_incremental_vacuum(conn):
+                    print("auto_vacuum is already INCREMENTAL", file=sys.stderr)
+                stats = database_stats(conn)
+            finally:
+                conn.close()
+            if args.format == 'json':
+                print(json.dumps(stats, indent=2))
+            else:
+                for key, value in stats.items():
+                    print(f"{key}: {value}")
+            return
+
+        report = MaintenanceScheduler(args.db).run(args.tasks)
+    except DatabaseError as e:
+        print(f"Maintenance failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.format == 'json':
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
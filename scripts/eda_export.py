@@ -32,6 +32,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.utils import compute_age_group, compute_detailed_age_group
 from app.models import ensure_scores_schema, ensure_responses_schema
+from app.db_archive import history_views
 
 # Configure logging
 logging.basicConfig(
@@ -48,14 +49,17 @@ logger = logging.getLogger(__name__)
 class EDAExporter:
     """Export emotional health data for Exploratory Data Analysis."""
     
-    def __init__(self, db_path: str = "soulsense_db"):
+    def __init__(self, db_path: str = "soulsense_db", include_archive: bool = True):
         """
         Initialize the EDA exporter.
         
         Args:
             db_path: Path to the SQLite database file
+            include_archive: Also export responses moved to the archive files
         """
         self.db_path = db_path
+        self.include_archive = include_archive
+        self.responses_source = "answer_rows"
         self.conn = None
         self.cursor = None
         
@@ -69,6 +73,10 @@ class EDAExporter:
         ensure_scores_schema(self.cursor)
         ensure_responses_schema(self.cursor)
         self.conn.commit()
+
+        # Read responses through main + archive files
+        if self.include_archive:
+            self.responses_source = history_views(self.conn).get("answer_rows", self.responses_source)
         
         return self
         
@@ -138,6 +146,9 @@ class EDAExporter:
         
         Returns enriched data combining scores, responses, and demographic info
         with both legacy and detailed age groups for backward compatibility.
+        Each score is joined to the answers of its own attempt (one row per
+        answer); scores recorded without an attempt id get a single row with
+        no answer columns.
         
         Returns:
             List of dictionaries containing the complete dataset
@@ -168,7 +179,7 @@ class EDAExporter:
             r.age_group as legacy_age_group,
             r.timestamp
         FROM scores s
-        LEFT JOIN responses r ON s.username = r.username
+        LEFT JOIN {self.responses_source} r ON r.attempt_id = s.attempt_id
         ORDER BY s.id, r.question_id
         """
         
@@ -422,6 +433,11 @@ Examples:
         action='store_true',
         help='Do not include aggregate statistics in export'
     )
+    parser.add_argument(
+        '--no-archive',
+        action='store_true',
+        help='Export only responses still in the main database'
+    )
     
     args = parser.parse_args()
     
@@ -429,7 +445,7 @@ Examples:
     os.makedirs('logs', exist_ok=True)
     
     try:
-        with EDAExporter(args.db) as exporter:
+        with EDAExporter(args.db, include_archive=not args.no_archive) as exporter:
             
             if args.show_schema:
                 exporter.print_schema_info()
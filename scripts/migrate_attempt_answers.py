@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Migration script to pack legacy responses rows into attempt_answers.
+
+Each user's responses are split into exam attempts and stored as one packed
+row per attempt (see app/services/answer_store.py). Migrated responses rows
+are deleted; readers see the same answers through the answer_rows view.
+Safe to re-run: only rows still in responses are migrated.
+
+Usage:
+    python scripts/migrate_attempt_answers.py [--gap-seconds 3600]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db import check_db_state, get_session
+from app.services.answer_store import ATTEMPT_GAP_SECONDS, migrate_legacy_responses
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Pack legacy responses into attempt_answers")
+    parser.add_argument(
+        '--gap-seconds',
+        type=int,
+        default=ATTEMPT_GAP_SECONDS,
+        help=f'Idle time that starts a new attempt (default: {ATTEMPT_GAP_SECONDS})'
+    )
+    args = parser.parse_args()
+
+    # Creates attempt_answers and the answer_rows view on older databases
+    check_db_state()
+
+    session = get_session()
+    try:
+        migrated = migrate_legacy_responses(session, gap_seconds=args.gap_seconds)
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Migration failed: {e}")
+        sys.exit(1)
+    finally:
+        session.close()
+
+    logger.info(f"✅ Migrated {migrated} responses rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+View SQL profiles recorded by app.db_profiler.
+
+Usage:
+    python scripts/sql_profile.py [--file data/sql_profile.json] [--top 20]
+    python scripts/sql_profile.py --sort count
+    python scripts/sql_profile.py --n-plus-one --format json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db_profiler import SQL_PROFILE_PATH, format_report
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="SQL profile viewer for SOUL_SENSE_EXAM",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Record a profile by running the app with the sql_profiling flag:
+  SOULSENSE_FF_SQL_PROFILING=true python -m app.main
+The profile is written to data/sql_profile.json on shutdown.
+        """
+    )
+    parser.add_argument('--file', default=SQL_PROFILE_PATH, help='Profile JSON to read')
+    parser.add_argument('--top', type=int, default=20, help='Number of statements to show (default: 20)')
+    parser.add_argument(
+        '--sort',
+        choices=['total_ms', 'mean_ms', 'max_ms', 'count', 'rows'],
+        default='total_ms',
+        help='Sort statements by this column (default: total_ms)'
+    )
+    parser.add_argument('--n-plus-one', action='store_true', help='Only show N+1 suspects')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format (default: text)')
+
+    args = parser.parse_args()
+
+    try:
+        with open(args.file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Could not read profile {args.file}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    data["statements"] = sorted(data.get("statements", []), key=lambda s: s[args.sort], reverse=True)
+    if args.n_plus_one:
+        data["statements"] = list(data.get("n_plus_one", []))
+
+    if args.format == 'json':
+        data["statements"] = data["statements"][:args.top]
+        print(json.dumps(data, indent=2))
+    else:
+        print(format_report(data, top=args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -102,6 +102,8 @@ def temp_db(monkeypatch):
     # Clear application caches (memory + disk)
     from app.questions import clear_all_caches
     clear_all_caches()
+    from app.db import invalidate_user_settings
+    invalidate_user_settings()
 
     # Provide session to test
     session = TestSessionLocal()
@@ -112,6 +114,29 @@ def temp_db(monkeypatch):
     test_engine.dispose()
 
 
+@pytest.fixture(autouse=True)
+def isolated_response_spool(tmp_path, monkeypatch):
+    """
+    Point the shared response buffer at a per-test spool file so exam tests
+    never write crash-recovery spools into the real data directory.
+    """
+    from app.services.response_buffer import response_buffer
+    monkeypatch.setattr(response_buffer, "spool_dir", str(tmp_path / "response_spool"))
+    monkeypatch.setattr(response_buffer, "_lock_file", None)
+    monkeypatch.setattr(response_buffer, "_pending", {})
+    monkeypatch.setattr(response_buffer, "_first_added", {})
+    monkeypatch.setattr(response_buffer, "_in_flight", {})
+    yield response_buffer
+    response_buffer.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_export_manifests(tmp_path, monkeypatch):
+    """Keep export manifests written by tests out of the real data directory."""
+    from app.services import export_service
+    monkeypatch.setattr(export_service, "EXPORT_MANIFEST_DIR", str(tmp_path / "export_manifests"))
+
+
 # --- UI MOCKING FIXTURES ---
 
 @pytest.fixture(scope="session", autouse=True)
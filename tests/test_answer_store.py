@@ -0,0 +1,100 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.ml.bias_checker import SimpleBiasChecker
+from app.models import AnswerRow, AttemptAnswers, Base, Response, Score, User
+from app.services.answer_store import link_score, migrate_legacy_responses, write_answers
+from app.utils.answer_packing import pack_answers, unpack_answers
+
+
+def _row(key, question_id, value, latency_ms=0, seq=0):
+    return {"seq": seq, "session_key": key, "username": "packer", "question_id": question_id,
+            "response_value": value, "age_group": "adult", "timestamp": "2024-01-15T10:30:00",
+            "latency_ms": latency_ms}
+
+
+def test_pack_round_trip():
+    answers = [(1, 4, 1500), (65535, 1, 0), (12, 3, 90000)]
+    assert unpack_answers(*pack_answers(answers)) == answers
+
+
+def test_attempt_is_one_row_and_reanswers_replace(temp_db):
+    temp_db.add(User(username="packer", password_hash="x"))
+    temp_db.commit()
+
+    write_answers(temp_db, [_row("k1", 1, 2, 800, 1), _row("k1", 2, 3, 900, 2)])
+    temp_db.commit()
+    # Later flush of the same attempt: question 1 answered again after going back
+    write_answers(temp_db, [_row("k1", 1, 4, 300, 3), _row("k1", 3, 1, 700, 4)])
+    temp_db.commit()
+
+    attempt = temp_db.query(AttemptAnswers).one()
+    assert attempt.answers == [(1, 4, 300), (2, 3, 900), (3, 1, 700)]
+    assert attempt.user_id is not None and attempt.timestamp_epoch == 1705314600
+
+    rows = temp_db.query(AnswerRow).order_by(AnswerRow.question_id).all()
+    assert [(r.question_id, r.response_value, r.latency_ms) for r in rows] == [(1, 4, 300), (2, 3, 900), (3, 1, 700)]
+    assert {r.attempt_id for r in rows} == {"k1"}
+    assert temp_db.query(Response).count() == 0
+
+
+def test_migrate_legacy_responses(temp_db):
+    stamps = ["2024-01-15T10:00:00", "2024-01-15T10:00:05", "2024-01-15T10:00:12",  # attempt 1
+              "2024-01-15T10:00:20",                                                # repeats q1
+              "2024-02-01T09:00:00"]                                                # after a gap
+    for question_id, stamp in zip([1, 2, 3, 1, 2], stamps):
+        temp_db.add(Response(username="packer", question_id=question_id, response_value=2, timestamp=stamp))
+    temp_db.add(Score(username="packer", total_score=6, timestamp="2024-01-15T10:00:15"))
+    temp_db.commit()
+
+    assert migrate_legacy_responses(temp_db) == 5
+    assert temp_db.query(Response).count() == 0
+
+    attempts = temp_db.query(AttemptAnswers).order_by(AttemptAnswers.timestamp_epoch).all()
+    assert [a.answer_count for a in attempts] == [3, 1, 1]
+    assert attempts[0].answers == [(1, 2, 0), (2, 2, 5000), (3, 2, 7000)]
+    assert attempts[0].score_id is not None and attempts[2].score_id is None
+    assert temp_db.query(Score).one().attempt_id == attempts[0].session_key
+    assert temp_db.query(AnswerRow).filter_by(username="packer").count() == 5
+
+
+def test_answers_join_their_own_attempt(temp_db):
+    temp_db.add(User(username="packer", password_hash="x"))
+    temp_db.commit()
+    scores = []
+    for key, value in (("k1", 1), ("k2", 4)):
+        attempts = write_answers(temp_db, [_row(key, 1, value), _row(key, 2, value)])
+        score = Score(username="packer", total_score=value * 2)
+        temp_db.add(score)
+        link_score(temp_db, key, score, attempts)
+        scores.append(score)
+    temp_db.commit()
+
+    rows = (temp_db.query(Score.id, AnswerRow.response_value)
+            .join(AnswerRow, AnswerRow.attempt_id == Score.attempt_id).all())
+    # Two answers per score, not every answer of the user for every score
+    assert sorted(rows) == [(scores[0].id, 1), (scores[0].id, 1), (scores[1].id, 4), (scores[1].id, 4)]
+
+
+def test_question_fairness_counts_each_attempt_once(tmp_path):
+    path = str(tmp_path / "bias.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        # y1 answers three times in one day; joining on username + date would count each answer 3x
+        attempts = [("y1", 20, 1), ("y1", 20, 1), ("y1", 20, 1), ("y2", 22, 4),
+                    ("o1", 50, 3), ("o2", 55, 3), ("o3", 60, 3)]
+        for i, (username, age, value) in enumerate(attempts):
+            key = f"k{i}"
+            rows = write_answers(session, [dict(_row(key, 1, value), username=username)])
+            score = Score(username=username, age=age, total_score=value, timestamp="2024-01-15T10:30:00")
+            session.add(score)
+            link_score(session, key, score, rows)
+        session.commit()
+    engine.dispose()
+
+    result = SimpleBiasChecker(db_path=path).check_question_fairness()
+    assert result["status"] == "ok"
+    assert result["biased_questions"] == [
+        {"question_id": 1, "younger_avg": 1.75, "older_avg": 3.0, "difference": 1.25}
+    ]
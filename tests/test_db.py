@@ -11,7 +11,6 @@ def test_db_session(temp_db):
     assert result.scalar() == 1
     session.close()
 
-@pytest.mark.xfail(reason="JournalEntry model lacks user_id FK, cascade delete doesn't work for journal entries")
 def test_delete_user_data(temp_db, monkeypatch):
     """Test complete user data deletion including database records and local files."""
     import shutil
@@ -99,3 +98,200 @@ def test_delete_user_data(temp_db, monkeypatch):
     shutil.rmtree(temp_data_dir, ignore_errors=True)
     shutil.rmtree(temp_exports_dir, ignore_errors=True)
     shutil.rmtree(temp_avatars_dir, ignore_errors=True)
+
+
+def test_apply_sqlite_pragmas_bulk_load_profile(tmp_path):
+    """Profiles are applied to raw connections and reported back."""
+    from app.db import get_connection, get_connection_settings
+
+    db_file = str(tmp_path / "tuned.db")
+    conn = get_connection(db_file, profile="bulk_load")
+    try:
+        cur = conn.cursor()
+        cur.execute("PRAGMA journal_mode")
+        assert cur.fetchone()[0].lower() == "wal"
+        cur.execute("PRAGMA synchronous")
+        assert cur.fetchone()[0] == 0  # OFF
+        cur.execute("PRAGMA cache_size")
+        assert cur.fetchone()[0] == -64000
+
+        report = get_connection_settings(conn)
+        assert report["profile"] == "bulk_load"
+        assert report["cache_size"] == -64000
+    finally:
+        conn.close()
+
+
+def test_pooled_connection_passes_attributes_through(tmp_path, monkeypatch):
+    """row_factory set on a pooled connection reaches sqlite3 and is reset on close."""
+    import sqlite3
+    from sqlalchemy import create_engine
+    from app import db
+
+    path = str(tmp_path / "pooled.db")
+    eng = create_engine(f"sqlite:///{path}")
+    monkeypatch.setattr(db, "engine", eng)
+    monkeypatch.setattr(db, "DB_PATH", path)
+
+    conn = db.get_connection()
+    assert isinstance(conn, db.PooledConnection)
+    conn.row_factory = sqlite3.Row
+    assert conn.execute("SELECT 1 AS one").fetchone()["one"] == 1
+    conn.close()
+
+    conn = db.get_connection()
+    assert conn.row_factory is None
+    conn.close()
+    eng.dispose()
+
+
+
+def test_pooled_connection_context_manager_commits_or_rolls_back(tmp_path, monkeypatch):
+    """``with get_connection() as conn`` behaves like a sqlite3.Connection."""
+    import sqlite3
+    from sqlalchemy import create_engine
+    from app import db
+
+    path = str(tmp_path / "pooled.db")
+    eng = create_engine(f"sqlite:///{path}")
+    monkeypatch.setattr(db, "engine", eng)
+    monkeypatch.setattr(db, "DB_PATH", path)
+
+    conn = db.get_connection()
+    with conn as c:
+        assert c is conn
+        c.execute("CREATE TABLE t (x INTEGER)")
+        c.execute("INSERT INTO t VALUES (1)")
+    with pytest.raises(RuntimeError):
+        with conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+            raise RuntimeError("boom")
+    # Still open after the block, as with sqlite3
+    assert conn.execute("SELECT x FROM t").fetchall() == [(1,)]
+    conn.close()
+
+    other = sqlite3.connect(path)
+    assert other.execute("SELECT x FROM t").fetchall() == [(1,)]
+    other.close()
+    eng.dispose()
+
+def test_unknown_profile_raises():
+    from app.db import get_profile
+    from app.exceptions import ConfigurationError
+
+    with pytest.raises(ConfigurationError):
+        get_profile("turbo")
+
+
+def test_engine_connections_are_tuned(tmp_path):
+    """The connect event tunes every pooled connection, not just create_all."""
+    from sqlalchemy import create_engine, event
+    from app.db import _on_engine_connect
+
+    eng = create_engine(f"sqlite:///{tmp_path / 'pooled.db'}")
+    event.listen(eng, "connect", _on_engine_connect)
+    with eng.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    eng.dispose()
+
+
+def test_delete_user_rows_is_set_based(temp_db):
+    """Every owned table is cleared, including rows only tagged by username."""
+    from app.db import delete_user_rows
+    from app.models import AttemptAnswers, JournalTag
+
+    user = User(username="heavy", password_hash="x")
+    other = User(username="other", password_hash="x")
+    temp_db.add_all([user, other])
+    temp_db.commit()
+
+    score = Score(username="heavy", total_score=10, user_id=user.id)
+    entry = JournalEntry(username="heavy", content="entry", user_id=user.id)
+    temp_db.add_all([score, entry, PersonalProfile(user_id=user.id), UserSettings(user_id=user.id),
+                     Score(username="heavy", total_score=5),  # legacy row without user_id
+                     Score(username="other", total_score=7, user_id=other.id)])
+    temp_db.flush()
+    attempt = AttemptAnswers(session_key="k", username="heavy", user_id=user.id, score_id=score.id)
+    attempt.set_answers([(1, 3, 0)])
+    temp_db.add_all([attempt, JournalTag(entry_id=entry.id, tag="calm", user_id=user.id, username="heavy")])
+    temp_db.commit()
+
+    deleted = delete_user_rows(temp_db, user.id, "heavy")
+    temp_db.commit()
+
+    assert deleted["scores"] == 2 and deleted["users"] == 1 and deleted["attempt_answers"] == 1
+    assert temp_db.query(Score).filter_by(username="heavy").count() == 0
+    assert temp_db.query(JournalTag).count() == 0
+    assert temp_db.query(User).filter_by(username="other").count() == 1
+    assert temp_db.query(Score).filter_by(username="other").count() == 1
+
+
+def test_export_manifest(tmp_path, monkeypatch):
+    from app.services import export_service
+
+    monkeypatch.setattr(export_service, "EXPORT_MANIFEST_DIR", str(tmp_path / "manifests"))
+    assert export_service.exported_files(7) is None
+
+    export_service.record_export(7, str(tmp_path / "a.json"))
+    export_service.record_export(7, str(tmp_path / "a.json"))
+    export_service.record_export(7, str(tmp_path / "b.zip"))
+    assert export_service.exported_files(7) == [str(tmp_path / "a.json"), str(tmp_path / "b.zip")]
+
+    export_service.forget_exports(7)
+    assert export_service.exported_files(7) is None
+
+
+def test_user_settings_cache_is_write_through(temp_db, monkeypatch):
+    from app import db
+
+    user = User(username="settings_user", password_hash="hash")
+    temp_db.add(user)
+    temp_db.commit()
+
+    assert db.get_user_settings(user.id)["theme"] == "light"  # default row created
+    assert db.update_user_settings(user.id, theme="dark", question_count=20, bogus=1)
+
+    # Served from the cache: no session is opened
+    session_factory = db.SessionLocal
+    monkeypatch.setattr(db, "SessionLocal", lambda: pytest.fail("settings read hit the database"))
+    settings = db.get_user_settings(user.id)
+    assert (settings["theme"], settings["question_count"]) == ("dark", 20)
+    monkeypatch.setattr(db, "SessionLocal", session_factory)
+
+    row = temp_db.query(UserSettings).filter_by(user_id=user.id).one()
+    assert (row.theme, row.question_count) == ("dark", 20)
+
+    # ORM writes elsewhere invalidate the cached copy
+    row.language = "fr"
+    temp_db.commit()
+    assert db.get_user_settings(user.id)["language"] == "fr"
+
+
+def test_user_settings_read_racing_a_write_is_not_cached(temp_db, monkeypatch):
+    from app import db
+
+    user = User(username="race_user", password_hash="hash")
+    temp_db.add(user)
+    temp_db.commit()
+    db.get_user_settings(user.id)
+    db.invalidate_user_settings(user.id)
+
+    # A write commits after the read loaded its row but before the read caches it
+    session_factory = db.SessionLocal
+
+    def reader_session():
+        session = session_factory()
+        real_execute = session.execute
+
+        def execute(*args, **kwargs):
+            result = real_execute(*args, **kwargs)
+            monkeypatch.setattr(db, "SessionLocal", session_factory)
+            db.update_user_settings(user.id, theme="dark")
+            return result
+        session.execute = execute
+        return session
+
+    monkeypatch.setattr(db, "SessionLocal", reader_session)
+    assert db.get_user_settings(user.id)["theme"] == "light"  # read before the write
+    assert db.get_user_settings(user.id)["theme"] == "dark"   # but not cached over it
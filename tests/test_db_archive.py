@@ -0,0 +1,148 @@
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+import app.db as db
+import app.db_archive as db_archive
+from app.analysis.time_based_analysis import TimeBasedAnalyzer
+from app.exceptions import DatabaseError
+from app.models import AssessmentResult, JournalEntry, JournalTag, Response, User
+from app.services.export_service import ExportService
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _attached_archives():
+    conn = db.engine.raw_connection()
+    try:
+        return [row[1] for row in conn.execute("PRAGMA database_list") if row[1].startswith("archive_")]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_archive, "ARCHIVE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def history(temp_db):
+    user = User(username="veteran", password_hash="x")
+    temp_db.add(user)
+    temp_db.commit()
+    for stamp in ["2022-03-01T10:00:00", "2023-08-01T10:00:00", "2025-05-01T10:00:00"]:
+        temp_db.add(Response(username="veteran", question_id=1, response_value=3, timestamp=stamp))
+    temp_db.add(JournalEntry(username="veteran", content="old", entry_date="2021-01-05 09:00:00", tags='["calm"]'))
+    linked = JournalEntry(username="veteran", content="linked", entry_date="2021-02-05 09:00:00")
+    temp_db.add(linked)
+    temp_db.add(JournalEntry(username="veteran", content="recent", entry_date="2025-05-20 09:00:00"))
+    temp_db.commit()
+    temp_db.add(AssessmentResult(user_id=user.id, assessment_type="career_clarity", total_score=50,
+                                 details="{}", journal_entry_id=linked.id))
+    temp_db.commit()
+    return temp_db
+
+
+def test_old_rows_move_to_yearly_archives(history, archive_dir):
+    moved = db_archive.archive_old_rows(now=NOW)
+
+    assert moved == {"responses": 2, "attempt_answers": 0, "journal_entries": 1}
+    assert [year for year, _ in db_archive.list_archives()] == [2023, 2022, 2021]
+    assert history.query(Response).count() == 1
+    assert sorted(e.content for e in history.query(JournalEntry)) == ["linked", "recent"]
+    assert history.query(JournalTag).count() == 0
+
+    archived = sqlite3.connect(str(archive_dir / "archive_2022.db"))
+    assert archived.execute("SELECT username, response_value FROM responses").fetchall() == [("veteran", 3)]
+
+    # The pooled connection goes back without the archives attached
+    assert _attached_archives() == []
+
+    # Nothing left to move
+    assert db_archive.archive_old_rows(now=NOW) == {"responses": 0, "attempt_answers": 0, "journal_entries": 0}
+
+
+def test_years_beyond_the_attach_limit_share_the_oldest_file(history, archive_dir, monkeypatch):
+    monkeypatch.setattr(db_archive, "MAX_ATTACHED_ARCHIVES", 2)
+    moved = db_archive.archive_old_rows(now=NOW)
+
+    assert moved == {"responses": 2, "attempt_answers": 0, "journal_entries": 1}
+    # 2021 goes into the oldest kept file instead of a third one
+    assert [year for year, _ in db_archive.list_archives()] == [2023, 2022]
+    archived = sqlite3.connect(str(archive_dir / "archive_2022.db"))
+    assert archived.execute("SELECT content FROM journal_entries").fetchall() == [("old",)]
+    archived.close()
+
+    timeline = TimeBasedAnalyzer().get_user_timeline("veteran")
+    assert len(timeline["responses"]) == 3 and len(timeline["journal_entries"]) == 3
+    assert _attached_archives() == []
+
+
+def test_existing_archives_are_merged_under_the_limit(history, archive_dir, monkeypatch):
+    db_archive.archive_old_rows(now=NOW)
+    assert len(db_archive.list_archives()) == 3
+
+    monkeypatch.setattr(db_archive, "MAX_ATTACHED_ARCHIVES", 2)
+    conn = db.engine.raw_connection()
+    try:
+        # Readers refuse a partial history rather than silently dropping years
+        with pytest.raises(DatabaseError):
+            db_archive.attach_archives(conn)
+    finally:
+        conn.close()
+
+    assert db_archive.archive_old_rows(now=NOW) == {"responses": 0, "attempt_answers": 0, "journal_entries": 0}
+    assert [year for year, _ in db_archive.list_archives()] == [2023, 2022]
+    assert ExportService.count_rows("veteran", ["responses", "journal"]) == {"responses": 3, "journal": 3}
+    assert _attached_archives() == []
+
+
+def test_history_readers_union_archives(history, archive_dir):
+    db_archive.archive_old_rows(now=NOW)
+
+    timeline = TimeBasedAnalyzer().get_user_timeline("veteran")
+    assert len(timeline["responses"]) == 3
+    assert [r["timestamp"][:4] for r in timeline["responses"]] == ["2022", "2023", "2025"]
+    assert len(timeline["journal_entries"]) == 3
+    assert len(TimeBasedAnalyzer().get_user_timeline("veteran", include_archive=False)["responses"]) == 1
+
+    assert ExportService.count_rows("veteran", ["responses", "journal"]) == {"responses": 3, "journal": 3}
+    assert ExportService.count_rows("veteran", ["responses"], include_archive=False) == {"responses": 1}
+    assert _attached_archives() == []
+
+
+def test_read_scope_detaches_archives(history, archive_dir):
+    from app.db_replica import read_scope
+
+    db_archive.archive_old_rows(now=NOW)
+    with read_scope() as scope:
+        attached = [row[1] for row in scope.connection().exec_driver_sql("PRAGMA database_list")]
+        assert "archive_2022" in attached
+    assert _attached_archives() == []
+
+
+def test_history_view_reads_older_archive_schema(history, archive_dir):
+    db_archive.archive_old_rows(now=NOW)
+    conn = db.engine.raw_connection()
+    try:
+        archived = sqlite3.connect(str(archive_dir / "archive_2022.db"))
+        archived.execute("ALTER TABLE responses DROP COLUMN detailed_age_group")
+        archived.commit()
+        archived.close()
+
+        view = db_archive.history_views(conn)["responses"]
+        rows = conn.execute(f"SELECT timestamp, detailed_age_group FROM {view} ORDER BY timestamp").fetchall()
+        assert len(rows) == 3 and rows[0][1] is None
+    finally:
+        conn.close()
+
+
+def test_purge_user_rows_clears_archives(history, archive_dir):
+    db_archive.archive_old_rows(now=NOW)
+    user = history.query(User).filter_by(username="veteran").one()
+
+    assert db_archive.purge_user_rows(user.id, "veteran") == 3
+    timeline = TimeBasedAnalyzer().get_user_timeline("veteran")
+    assert len(timeline["responses"]) == 1
@@ -0,0 +1,84 @@
+import sqlite3
+
+from app.db_audit import audit_statement, find_unused_indexes, run_audit, suggest_index
+
+
+def test_registry_queries_explain_cleanly(temp_db):
+    report = run_audit(temp_db.get_bind())
+
+    assert report["queries"]
+    assert [q["name"] for q in report["queries"] if q["error"]] == []
+    # Service queries rewritten onto (user_id, epoch) indexes must stay index searches
+    by_name = {q["name"]: q for q in report["queries"]}
+    for name in ("exam.recent_scores", "exam.recent_scores.guest", "journal.recent_entries",
+                 "journal.recent_entries.guest", "answer_store.attempts"):
+        assert not by_name[name]["full_scans"] and not by_name[name]["temp_btrees"], by_name[name]["plan"]
+    # answer_rows: both arms seek on user_id; only the user's own rows are sorted
+    responses = by_name["analysis.user_responses"]
+    assert not responses["full_scans"], responses["plan"]
+    assert any(d.startswith("SEARCH responses USING INDEX") for d in responses["plan"]), responses["plan"]
+    assert any(d.startswith("SEARCH a USING INDEX idx_attempt_answers_user_epoch") for d in responses["plan"])
+
+
+
+def test_registry_covers_owner_epoch_indexes(temp_db):
+    report = run_audit(temp_db.get_bind())
+
+    # Guests (no account) are keyed on username; those queries use the username indexes
+    unused = {ix["index"] for ix in report["unused_indexes"]}
+    for name in ("idx_score_user_epoch", "idx_score_username_epoch", "idx_journal_user_epoch",
+                 "idx_journal_username_epoch", "idx_attempt_answers_user_epoch",
+                 "idx_attempt_answers_username_epoch", "idx_response_username_epoch"):
+        assert name not in unused, name
+
+
+def test_suggest_index_orders_equality_then_range():
+    sql = ("SELECT scores.total_score FROM scores WHERE scores.user_id = 1 "
+           "AND scores.timestamp_epoch >= 0 ORDER BY scores.timestamp_epoch DESC")
+    assert suggest_index(sql) == (
+        "CREATE INDEX idx_scores_user_id_timestamp_epoch_total_score "
+        "ON scores(user_id, timestamp_epoch, total_score)"
+    )
+    # Free-form TEXT columns are not copied into a covering index
+    assert suggest_index(
+        "SELECT notes FROM t WHERE owner = ? ORDER BY id", {"notes": "TEXT"}
+    ) == "CREATE INDEX idx_t_owner_id ON t(owner, id)"
+
+
+def test_flags_scans_and_unused_indexes():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, owner TEXT, kind TEXT, created INTEGER)")
+    conn.execute("CREATE INDEX ix_items_owner ON items(owner)")
+    conn.execute("CREATE INDEX ix_items_owner_created ON items(owner, created)")
+    conn.execute("CREATE INDEX ix_items_kind ON items(kind)")
+
+    scan = audit_statement(conn, "by_created", "test", "SELECT id FROM items WHERE created > ? ORDER BY created", (0,))
+    assert scan.full_scans == ["items"]
+    assert scan.suggestion == "CREATE INDEX idx_items_created ON items(created)"
+
+    used = audit_statement(conn, "by_owner", "test", "SELECT id FROM items WHERE owner = ? AND created > ?", ("a", 0))
+    assert used.indexes_used == ["ix_items_owner_created"]
+
+    unused = {ix["index"]: ix for ix in find_unused_indexes(conn, [scan, used])}
+    assert set(unused) == {"ix_items_owner", "ix_items_kind"}
+    assert unused["ix_items_owner"]["redundant_with"] == "ix_items_owner_created"
+
+
+def test_view_statements_suggest_indexes_on_base_tables():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE rows_a (id INTEGER PRIMARY KEY, owner INTEGER, created INTEGER, value INTEGER)")
+    conn.execute("CREATE TABLE rows_b (id INTEGER PRIMARY KEY, owner INTEGER, created INTEGER, packed BLOB)")
+    conn.execute("CREATE INDEX ix_rows_b_created ON rows_b(created)")
+    conn.execute("CREATE VIEW all_rows AS SELECT id, owner, created, value FROM rows_a "
+                 "UNION ALL SELECT b.id, b.owner, b.created, length(b.packed) FROM rows_b b")
+
+    audit = audit_statement(conn, "by_owner", "test",
+                            "SELECT value FROM all_rows WHERE owner = ? ORDER BY created", (1,))
+    assert set(audit.full_scans) == {"rows_a", "b"}
+    # Never an index on the view itself; value only exists in rows_a
+    assert audit.suggestion == (
+        "CREATE INDEX idx_rows_a_owner_created_value ON rows_a(owner, created, value); "
+        "CREATE INDEX idx_rows_b_owner_created ON rows_b(owner, created)"
+    )
+    # Indexes on the base tables of an audited view are checked for use
+    assert [ix["index"] for ix in find_unused_indexes(conn, [audit])] == ["ix_rows_b_created"]
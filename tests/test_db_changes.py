@@ -0,0 +1,62 @@
+import pytest
+
+import app.db as db
+from app.db_changes import acknowledge, head, prune_change_log, read_changes, register_consumer
+from app.models import JournalEntry, Score, User
+
+
+@pytest.fixture
+def user(temp_db):
+    user = User(username="tracked", password_hash="x")
+    temp_db.add(user)
+    temp_db.commit()
+    return user
+
+
+def test_writes_are_logged_in_order(temp_db, user):
+    register_consumer("rollup")
+    score = Score(username="tracked", total_score=10)
+    temp_db.add(score)
+    temp_db.commit()
+    score.total_score = 12
+    temp_db.commit()
+    temp_db.delete(score)
+    temp_db.commit()
+    temp_db.add(JournalEntry(username="tracked", content="hello"))
+    temp_db.commit()
+
+    changes = read_changes("rollup")
+    assert [(c.table, c.op) for c in changes] == [
+        ("scores", "I"), ("scores", "U"), ("scores", "D"), ("journal_entries", "I")
+    ]
+    assert {c.user_id for c in changes} == {user.id}
+    assert [c.op for c in read_changes("rollup", tables=["scores"])] == ["I", "U", "D"]
+
+
+def test_cursor_is_durable_and_prune_waits_for_all_consumers(temp_db, user):
+    register_consumer("fast")
+    register_consumer("slow")
+    for total in (1, 2, 3):
+        temp_db.add(Score(username="tracked", total_score=total))
+    temp_db.commit()
+
+    changes = read_changes("fast", limit=2)
+    acknowledge("fast", changes[-1].seq)
+    assert [c.seq for c in read_changes("fast")] == [head()]
+    acknowledge("fast", changes[0].seq)  # never moves back
+    assert len(read_changes("fast")) == 1
+
+    conn = db.engine.raw_connection()
+    try:
+        assert prune_change_log(conn)["pruned"] == 0  # "slow" has read nothing
+        acknowledge("slow", head())
+        assert prune_change_log(conn) == {"pruned": 2, "remaining": 1}
+    finally:
+        conn.close()
+
+    # Consumers registered later start at the head, which survives pruning
+    assert register_consumer("late") == head() == changes[0].seq + 2
+    assert read_changes("late") == []
+
+    with pytest.raises(ValueError):
+        read_changes("missing")
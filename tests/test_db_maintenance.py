@@ -0,0 +1,78 @@
+import sqlite3
+
+import pytest
+
+from app.db_maintenance import (
+    MaintenanceScheduler, checkpoint_wal, database_stats, enable_incremental_vacuum,
+    incremental_vacuum, optimize
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "maint.db")
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.execute("CREATE INDEX idx_notes_body ON notes (body)")
+    conn.executemany("INSERT INTO notes (body) VALUES (?)", [("x" * 500,) for _ in range(2000)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_vacuum_reclaims_deleted_pages(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM notes")
+    conn.commit()
+
+    stats = database_stats(conn)
+    assert stats["auto_vacuum"] == "INCREMENTAL"
+    assert stats["freelist_count"] > 0 and stats["fragmentation"] > 0.5
+
+    result = incremental_vacuum(conn, pages=stats["freelist_count"])
+    assert result["freed_pages"] == stats["freelist_count"]
+    assert database_stats(conn)["freelist_count"] == 0
+    conn.close()
+
+
+def test_optimize_and_checkpoint(db_path):
+    conn = sqlite3.connect(db_path)
+    assert optimize(conn) == {"analyzed": True}
+    assert optimize(conn) == {"analyzed": False}
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+    assert database_stats(conn)["wal_bytes"] > 0
+    assert checkpoint_wal(conn)["busy"] == 0
+    assert database_stats(conn)["wal_bytes"] == 0
+    conn.close()
+
+
+def test_enable_incremental_vacuum_converts_existing_db(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "legacy.db"))
+    conn.execute("CREATE TABLE t (x)")
+    conn.commit()
+    assert database_stats(conn)["auto_vacuum"] == "NONE"
+    assert incremental_vacuum(conn)["freed_pages"] == 0
+
+    assert enable_incremental_vacuum(conn) is True
+    assert database_stats(conn)["auto_vacuum"] == "INCREMENTAL"
+    assert enable_incremental_vacuum(conn) is False
+    conn.close()
+
+
+def test_scheduler_runs_due_tasks(db_path):
+    scheduler = MaintenanceScheduler(db_path, intervals={"optimize": 3600, "checkpoint": 3600, "vacuum": 3600,
+                                                         "prune_changes": 3600})
+
+    report = scheduler.tick()
+    assert set(report["tasks"]) == {"optimize", "checkpoint", "vacuum", "prune_changes"}
+    assert report["tasks"]["prune_changes"]["skipped"] == "no change_log table"
+    assert scheduler.due() == []
+    assert scheduler.tick() is None
+
+    scheduler.request("vacuum")
+    assert scheduler.due() == ["vacuum"]
+    with pytest.raises(ValueError):
+        scheduler.run(["defrag"])
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.db_profiler import SQLProfiler, normalize_statement, format_report
+from app.ml.clustering import EmotionalFeatureExtractor
+from app.models import Score
+
+
+@pytest.fixture
+def profiler(temp_db):
+    profiler = SQLProfiler(n_plus_one_threshold=5)
+    profiler.attach(temp_db.get_bind())
+    yield profiler
+    profiler.detach()
+
+
+def test_normalize_statement():
+    sql = "SELECT * FROM scores\n  WHERE username = 'bob' AND id IN (?, ?, ?) LIMIT 10"
+    assert normalize_statement(sql) == "SELECT * FROM scores WHERE username = ? AND id IN (?...) LIMIT ?"
+
+
+def test_records_statement_and_call_site(temp_db, profiler):
+    for _ in range(3):
+        temp_db.execute(text("SELECT 1"))
+
+    stats = profiler.statements()
+    assert len(stats) == 1
+    assert stats[0].count == 3
+    assert sum(stats[0].histogram) == 3
+    assert "test_db_profiler.py" in stats[0].call_site
+    assert "test_records_statement_and_call_site" in stats[0].call_site
+
+
+def test_counts_rows_read_and_written(temp_db, profiler):
+    for i in range(3):
+        temp_db.add(Score(username="rows", total_score=i))
+    temp_db.commit()
+    profiler.reset()
+
+    temp_db.execute(text("SELECT * FROM scores WHERE username = 'rows'")).fetchall()
+    temp_db.execute(text("SELECT * FROM scores WHERE username = 'rows'")).fetchone()
+    temp_db.execute(text("UPDATE scores SET total_score = 0 WHERE username = 'rows'"))
+
+    reads = [s.rows for s in profiler.statements() if s.statement.startswith("SELECT")]
+    writes = [s.rows for s in profiler.statements() if s.statement.startswith("UPDATE")]
+    assert sorted(reads) == [1, 3] and writes == [3]
+
+
+def test_flags_per_user_query_loop(temp_db, profiler):
+    for i in range(8):
+        temp_db.add(Score(username=f"user_{i}", total_score=20 + i))
+    temp_db.commit()
+    profiler.reset()
+
+    EmotionalFeatureExtractor().extract_all_users_features()
+
+    # Scores and responses are each queried once per user
+    looped = [
+        s for s in profiler.n_plus_one_suspects()
+        if "extract_user_features" in s.call_site and "extract_all_users_features" in (s.caller or "")
+    ]
+    assert len(looped) == 2
+    assert all(s.max_burst == 8 for s in looped)
+
+
+def test_dump_and_report(temp_db, profiler, tmp_path):
+    temp_db.execute(text("SELECT 1"))
+    path = profiler.dump(str(tmp_path / "profile.json"))
+
+    with open(path) as f:
+        data = json.load(f)
+    assert data["statements"][0]["count"] == 1
+    assert "SELECT ?" in format_report(data)
@@ -0,0 +1,165 @@
+import sqlite3
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Score
+from app.db_replica import (
+    AnalyticsReplica,
+    analytics_session,
+    get_analytics_connection,
+    disable_analytics_replica,
+    enable_analytics_replica,
+    read_scope,
+)
+
+
+@pytest.fixture
+def source_db(tmp_path):
+    path = str(tmp_path / "source.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO scores (username, total_score) VALUES ('a', 30)"))
+    engine.dispose()
+    return path
+
+
+def _insert_score(path, username, score):
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO scores (username, total_score) VALUES (?, ?)", (username, score))
+    conn.commit()
+    conn.close()
+
+
+def test_replica_serves_snapshot(source_db):
+    replica = AnalyticsReplica(source_path=source_db, refresh_interval=3600)
+    replica.refresh(force=True)
+
+    with replica.session() as session:
+        assert session.query(Score).count() == 1
+
+    # Writes to the source are not visible until the replica refreshes
+    _insert_score(source_db, "b", 40)
+    conn = replica.get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 1
+    conn.close()  # no-op on the shared snapshot
+
+    assert replica.refresh() is True
+    with replica.session() as session:
+        assert session.query(Score).count() == 2
+    replica.close()
+
+
+def test_refresh_skipped_when_source_unchanged(source_db):
+    replica = AnalyticsReplica(source_path=source_db)
+    replica.refresh(force=True)
+    assert replica.refresh() is False
+    assert replica.refresh_count == 1
+    replica.close()
+
+
+def test_refresh_after_n_writes(source_db):
+    replica = AnalyticsReplica(source_path=source_db, refresh_interval=3600, refresh_after_writes=2)
+    replica.refresh(force=True)
+
+    _insert_score(source_db, "b", 40)
+    replica.note_write()
+    with replica.session() as session:
+        assert session.query(Score).count() == 1
+
+    replica.note_write()
+    with replica.session() as session:
+        assert session.query(Score).count() == 2
+    replica.close()
+
+
+def test_write_count_alone_does_not_recopy(source_db):
+    replica = AnalyticsReplica(source_path=source_db, refresh_interval=3600, refresh_after_writes=2)
+    replica.refresh(force=True)
+
+    replica.note_write(5)
+    with replica.session() as session:
+        assert session.query(Score).count() == 1
+    assert replica.refresh_count == 1
+    replica.close()
+
+
+def test_only_commits_that_flushed_changes_count_as_writes(source_db, monkeypatch):
+    engine = create_engine(f"sqlite:///{source_db}")
+    SessionLocal = sessionmaker(bind=engine)
+    monkeypatch.setattr("app.db.SessionLocal", SessionLocal)
+    replica = enable_analytics_replica(source_path=source_db, refresh_interval=3600)
+    try:
+        session = SessionLocal()
+        session.query(Score).all()
+        session.commit()  # read-only, as safe_db_context does
+        assert replica._writes_since_refresh == 0
+
+        session.add(Score(username="b", total_score=40))
+        session.commit()
+        assert replica._writes_since_refresh == 1
+
+        session.add(Score(username="c", total_score=50))
+        session.flush()
+        session.rollback()
+        session.commit()
+        assert replica._writes_since_refresh == 1
+        session.close()
+    finally:
+        disable_analytics_replica()
+        engine.dispose()
+
+
+def test_replica_is_read_only(source_db):
+    replica = AnalyticsReplica(source_path=source_db)
+    conn = replica.get_connection()
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM scores")
+    replica.close()
+
+
+def test_routing_falls_back_to_main_db(temp_db):
+    disable_analytics_replica()
+    temp_db.add(Score(username="main", total_score=10))
+    temp_db.commit()
+
+    with analytics_session() as session:
+        assert session.query(Score).filter_by(username="main").count() == 1
+
+    conn = get_analytics_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM scores")
+        assert cur.fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+def test_read_scope_shares_one_snapshot(source_db, monkeypatch):
+    disable_analytics_replica()
+    engine = create_engine(f"sqlite:///{source_db}")
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    monkeypatch.setattr("app.db.SessionLocal", sessionmaker(bind=engine))
+
+    with read_scope() as scope:
+        with analytics_session() as session:
+            assert session is scope
+            assert session.query(Score).count() == 1
+
+        # A commit from another connection is not visible inside the scope
+        _insert_score(source_db, "b", 40)
+        conn = get_analytics_connection()
+        assert conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 1
+        conn.close()  # no-op on the scope's connection
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM scores")
+
+        with read_scope() as nested:
+            assert nested is scope
+
+    with analytics_session() as session:
+        assert session.query(Score).count() == 2
+        session.execute(text("DELETE FROM scores WHERE username = 'b'"))
+    engine.dispose()
@@ -0,0 +1,99 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.db_writer as db_writer
+from app.db_writer import WriteQueue, is_lock_error, lock_metrics, run_write
+from app.exceptions import DatabaseError
+from app.models import Base, JournalEntry
+
+
+@pytest.fixture
+def file_db(tmp_path, monkeypatch):
+    """Writers on other threads need a shared file, not a per-thread in-memory database."""
+    path = str(tmp_path / "writer.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    # create_all applied the app profile (busy_timeout=5000) to its pooled connection;
+    # start over so every connection fails fast and only run_write's retries wait
+    engine.dispose()
+    event.listen(engine, "connect", lambda dbapi_conn, record: dbapi_conn.execute("PRAGMA busy_timeout = 0"))
+    monkeypatch.setattr("app.db.SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(db_writer, "RETRY_BASE_DELAY", 0.01)
+    db_writer._metrics.reset()
+    yield path
+    engine.dispose()
+
+
+def _add_entry(content):
+    def work(session):
+        session.add(JournalEntry(username="writer", content=content))
+        return content
+    return work
+
+
+def test_lock_errors_are_recognised_when_wrapped():
+    locked = sqlite3.OperationalError("database is locked")
+    assert is_lock_error(DatabaseError("A database error occurred.", original_exception=locked))
+    assert not is_lock_error(sqlite3.OperationalError("no such table: scores"))
+
+
+def test_write_retries_until_other_process_releases_lock(file_db):
+    # The timer thread commits, so the connection must not be tied to this thread
+    other = sqlite3.connect(file_db, isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.2, other.execute, args=("COMMIT",)).start()
+
+    assert run_write(_add_entry("late"), attempts=20) == "late"
+    metrics = lock_metrics()
+    assert metrics["retries"] >= 1 and metrics["gave_up"] == 0
+    other.close()
+
+
+def test_write_gives_up_with_database_error(file_db):
+    other = sqlite3.connect(file_db, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(DatabaseError):
+            run_write(_add_entry("never"), attempts=2)
+        assert lock_metrics()["gave_up"] == 1
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+
+def test_queued_writes_are_group_committed(file_db):
+    queue = WriteQueue()
+    results = {}
+
+    def boom(session):
+        raise ValueError("bad row")
+
+    def submit(name, work):
+        try:
+            results[name] = queue.write(work)
+        except ValueError as e:
+            results[name] = e
+
+    # Hold the writer lock so every thread queues up behind it
+    with queue._writer:
+        threads = [threading.Thread(target=submit, args=(f"w{i}", _add_entry(f"w{i}"))) for i in range(3)]
+        threads.append(threading.Thread(target=submit, args=("bad", boom)))
+        for t in threads:
+            t.start()
+        while len(queue._pending) < 4:
+            time.sleep(0.01)
+    for t in threads:
+        t.join()
+
+    assert [results[f"w{i}"] for i in range(3)] == ["w0", "w1", "w2"]
+    assert isinstance(results["bad"], ValueError)
+    assert lock_metrics()["largest_batch"] == 4
+
+    conn = sqlite3.connect(file_db)
+    assert conn.execute("SELECT COUNT(*) FROM journal_entries").fetchone()[0] == 3
+    conn.close()
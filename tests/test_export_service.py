@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import os
+import zipfile
+
+import pytest
+
+from app.exceptions import ExportError
+from app.models import JournalEntry, PersonalProfile, Score, User
+from app.services.export_service import ExportService
+
+
+@pytest.fixture
+def history(temp_db):
+    user = User(username="exporter", password_hash="x")
+    temp_db.add(user)
+    temp_db.commit()
+    temp_db.add(PersonalProfile(user_id=user.id, bio="Likes hiking"))
+    for i in range(7):
+        temp_db.add(Score(username="exporter", user_id=user.id, total_score=20 + i,
+                          timestamp=f"2024-02-0{i + 1}T10:00:00"))
+    temp_db.add(JournalEntry(username="exporter", content='Said "no", then\nslept', tags='["calm"]'))
+    temp_db.add(Score(username="someone_else", total_score=99))
+    temp_db.commit()
+    return temp_db
+
+
+def test_json_export_streams_all_datasets(history, tmp_path):
+    progress = []
+    path = str(tmp_path / "export.json")
+
+    counts = ExportService.export_user_data("exporter", path, chunk_size=3,
+                                            progress=lambda name, rows: progress.append((name, rows)))
+
+    data = json.load(open(path, encoding="utf-8"))
+    assert counts == {"profile": 1, "scores": 7, "responses": 0, "journal": 1, "assessments": 0}
+    assert data["username"] == "exporter"
+    assert [s["total_score"] for s in data["datasets"]["scores"]] == list(range(20, 27))
+    assert data["datasets"]["profile"][0]["bio"] == "Likes hiking"
+    assert data["datasets"]["responses"] == []
+    # One callback per chunk of 3 rows
+    assert [p for p in progress if p[0] == "scores"] == [("scores", 3), ("scores", 6), ("scores", 7)]
+    assert ExportService.count_rows("exporter") == counts
+
+
+def test_csv_jsonl_and_zip(history, tmp_path):
+    csv_path = str(tmp_path / "scores.csv")
+    ExportService.export_user_data("exporter", csv_path, datasets=["scores"])
+    rows = list(csv.DictReader(open(csv_path, encoding="utf-8", newline="")))
+    assert len(rows) == 7 and rows[0]["total_score"] == "20"
+
+    jsonl_path = str(tmp_path / "all.jsonl")
+    ExportService.export_user_data("exporter", jsonl_path, datasets=["journal", "scores"])
+    lines = [json.loads(line) for line in open(jsonl_path, encoding="utf-8")]
+    assert lines[0]["dataset"] == "journal" and lines[0]["content"] == 'Said "no", then\nslept'
+    assert len(lines) == 8
+
+    zip_path = str(tmp_path / "all.zip")
+    ExportService.export_user_data("exporter", zip_path)
+    with zipfile.ZipFile(zip_path) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        journal = list(csv.DictReader(io.StringIO(archive.read("journal.csv").decode("utf-8"))))
+        responses = archive.read("responses.csv").decode("utf-8")
+    assert manifest["row_counts"]["scores"] == 7
+    assert journal[0]["content"] == 'Said "no", then\nslept'
+    assert responses.startswith("id,timestamp,question_id")
+
+
+def test_bad_requests_leave_no_file(history, tmp_path):
+    with pytest.raises(ExportError):
+        ExportService.export_user_data("exporter", str(tmp_path / "data.xml"))
+    with pytest.raises(ExportError):
+        ExportService.export_user_data("exporter", str(tmp_path / "data.csv"))
+    with pytest.raises(ExportError):
+        ExportService.export_user_data("exporter", str(tmp_path / "data.json"), datasets=["passwords"])
+    assert os.listdir(tmp_path) == []
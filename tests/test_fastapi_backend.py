@@ -0,0 +1,123 @@
+import asyncio
+import importlib
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("multipart")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base, User
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend" / "fastapi" / "app"
+
+
+def _backend(module: str):
+    """Import a backend module; the package is loaded as soulsense_backend so it does not shadow app."""
+    if "soulsense_backend" not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            "soulsense_backend", BACKEND_DIR / "__init__.py", submodule_search_locations=[str(BACKEND_DIR)]
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules["soulsense_backend"] = package
+        spec.loader.exec_module(package)
+    return importlib.import_module(f"soulsense_backend.{module}")
+
+
+class FakeScheduler:
+    def __init__(self, db_path):
+        self.ticks = 0
+        self.runs = []
+
+    def tick(self):
+        self.ticks += 1
+
+    def run(self, names):
+        self.runs.append(names)
+
+
+@pytest.fixture
+def backend_db(tmp_path, monkeypatch):
+    """Point the backend's session factory at a fresh database file."""
+    path = tmp_path / "backend.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    db_service = _backend("services.db_service")
+    monkeypatch.setattr(db_service, "AsyncSessionLocal",
+                        async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False))
+    yield path
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def client(backend_db, monkeypatch):
+    main = _backend("main")
+    monkeypatch.setattr(main, "MaintenanceScheduler", FakeScheduler)
+    with TestClient(main.create_app()) as test_client:
+        yield test_client
+
+
+def test_register_uses_shared_validation(client, backend_db):
+    response = client.post("/auth/register", json={"username": "ab", "password": "secret"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username must be at least 3 characters"
+
+    response = client.post("/auth/register", json={"username": "backend_user", "password": "abc"})
+    assert response.json()["detail"] == "Password must be at least 4 characters"
+
+    response = client.post("/auth/register", json={"username": "backend_user", "password": "secret"})
+    assert response.status_code == 200 and response.json()["id"]
+
+    response = client.post("/auth/register", json={"username": "backend_user", "password": "secret"})
+    assert response.json()["detail"] == "Username already registered"
+
+
+def test_lifespan_runs_maintenance_and_checkpoints_on_shutdown(backend_db, monkeypatch):
+    main = _backend("main")
+    scheduler = FakeScheduler(None)
+    monkeypatch.setattr(main, "MaintenanceScheduler", lambda db_path: scheduler)
+    monkeypatch.setattr(main, "MAINTENANCE_TICK_SECONDS", 0.01)
+
+    with TestClient(main.create_app()):
+        deadline = time.monotonic() + 5
+        while scheduler.ticks == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert scheduler.ticks >= 1
+        assert scheduler.runs == []
+
+    assert scheduler.runs == [["checkpoint"]]
+
+
+def test_get_db_commits_on_success_and_rolls_back_on_error(backend_db):
+    db_service = _backend("services.db_service")
+
+    async def add_user(username, fail):
+        dependency = db_service.get_db()
+        session = await dependency.__anext__()
+        session.add(User(username=username, password_hash="x"))
+        await session.flush()
+        if fail:
+            with pytest.raises(RuntimeError):
+                await dependency.athrow(RuntimeError("endpoint failed"))
+        else:
+            with pytest.raises(StopAsyncIteration):
+                await dependency.__anext__()
+
+    async def usernames():
+        async with db_service.AsyncSessionLocal() as session:
+            return (await session.execute(select(User.username))).scalars().all()
+
+    asyncio.run(add_user("kept", fail=False))
+    asyncio.run(add_user("dropped", fail=True))
+    assert asyncio.run(usernames()) == ["kept"]
@@ -0,0 +1,53 @@
+from app.models import JournalEntry, Score, User
+from app.services.exam_service import ExamService
+from app.services.journal_service import PREVIEW_CHARS, JournalService
+
+
+def _all_pages(fetch):
+    items, cursor = [], None
+    while True:
+        page = fetch(cursor)
+        items.extend(page.items)
+        if not page.has_more:
+            return items
+        cursor = page.next_cursor
+
+
+def test_journal_pages_cover_history_once(temp_db):
+    # Several entries share a timestamp, so the id tie-breaker decides page edges
+    for i in range(7):
+        temp_db.add(JournalEntry(username="pager", content=f"entry {i}",
+                                 entry_date=f"2024-06-0{1 + i // 3} 09:00:00", stress_level=i + 2))
+    temp_db.add(JournalEntry(username="pager", content="x" * 500, entry_date="2024-06-05 09:00:00"))
+    temp_db.add(JournalEntry(username="other", content="not mine", entry_date="2024-06-09 09:00:00"))
+    temp_db.commit()
+
+    rows = _all_pages(lambda c: JournalService.get_history_page("pager", cursor=c, limit=3))
+
+    ids = [r.id for r in rows]
+    assert len(ids) == len(set(ids)) == 8
+    assert [(r.entry_date_epoch, r.id) for r in rows] == sorted(
+        ((r.entry_date_epoch, r.id) for r in rows), reverse=True)
+    assert len(rows[0].content) == PREVIEW_CHARS
+    assert len(JournalService.get_entry(rows[0].id).content) == 500
+
+    stressed = JournalService.get_history_page("pager", entry_type="High Stress")
+    assert sorted(r.content for r in stressed.items) == ["entry 6"]
+
+
+def test_score_pages_and_summary(temp_db):
+    temp_db.add(User(username="scorer", password_hash="x"))
+    temp_db.commit()
+    for i, total in enumerate([20, 35, 28, 31, 40]):
+        temp_db.add(Score(username="scorer", total_score=total, age=30,
+                          timestamp=f"2024-01-0{i + 1}T10:00:00"))
+    temp_db.commit()
+
+    first = ExamService.get_score_history_page("scorer", limit=2)
+    assert [r.total_score for r in first.items] == [40, 31]
+    rows = _all_pages(lambda c: ExamService.get_score_history_page("scorer", cursor=c, limit=2))
+    assert [r.total_score for r in rows] == [40, 31, 28, 35, 20]
+
+    summary = ExamService.get_score_summary("scorer")
+    assert summary == {"count": 5, "first": 20, "latest": 40, "best": 40, "worst": 20, "average": 30.8}
+    assert ExamService.get_score_summary("nobody") == {"count": 0}
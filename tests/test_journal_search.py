@@ -0,0 +1,61 @@
+import pytest
+
+from app.models import JournalEntry
+from app.services.journal_service import JournalService
+
+
+@pytest.fixture
+def journal(temp_db):
+    rows = [
+        ("2024-03-01 09:00:00", "Stressful deadline at work, could not focus", 60.0, '["stress", "work"]'),
+        ("2024-03-05 21:00:00", "Dinner with friends, felt grateful and calm", 70.0, '["gratitude"]'),
+        ("2024-03-10 22:00:00", "Work again. Deadline moved, worked late", -50.0, '["work"]'),
+        ("2024-03-12 08:00:00", "Quiet morning walk", 0.0, None),
+    ]
+    for entry_date, content, sentiment, tags in rows:
+        temp_db.add(JournalEntry(username="writer", entry_date=entry_date, content=content,
+                                 sentiment_score=sentiment, tags=tags))
+    temp_db.add(JournalEntry(username="someone_else", entry_date="2024-03-02 10:00:00",
+                             content="My own deadline", sentiment_score=0.0))
+    temp_db.commit()
+    return temp_db
+
+
+def _contents(hits):
+    return [h["entry"].content for h in hits]
+
+
+def test_text_search_is_ranked_and_scoped(journal):
+    hits = JournalService.search("writer", text_query="deadline work")
+
+    assert len(hits) == 2
+    assert all("[" in h["snippet"] for h in hits)
+    assert hits[0]["rank"] <= hits[1]["rank"]
+    # Stemming and prefix matching: "worked" matches "work"
+    assert _contents(JournalService.search("writer", text_query="worked")) != []
+
+
+def test_filters_combine_in_sql(journal):
+    assert _contents(JournalService.search("writer", tags=["gratitude", "stress"])) == [
+        "Dinner with friends, felt grateful and calm",
+        "Stressful deadline at work, could not focus",
+    ]
+    assert _contents(JournalService.search(
+        "writer", text_query="deadline", start_date="2024-03-02", end_date="2024-03-10"
+    )) == ["Work again. Deadline moved, worked late"]
+    assert _contents(JournalService.search("writer", mood="Neutral")) == ["Quiet morning walk"]
+    assert _contents(JournalService.search("writer", tags=["work"], mood="Positive")) == [
+        "Stressful deadline at work, could not focus"
+    ]
+
+
+def test_index_follows_edits_and_deletes(journal):
+    entry = journal.query(JournalEntry).filter_by(content="Quiet morning walk").one()
+    entry.content = "Quiet morning swim"
+    journal.commit()
+    assert _contents(JournalService.search("writer", text_query="swim")) == ["Quiet morning swim"]
+    assert JournalService.search("writer", text_query="walk") == []
+
+    journal.delete(entry)
+    journal.commit()
+    assert JournalService.search("writer", text_query="swim") == []
@@ -0,0 +1,53 @@
+from app.models import JournalEntry, JournalTag, User, normalize_tags
+from app.services.journal_service import JournalService
+
+
+def _entry(session, content, tags, username="tagger"):
+    entry = JournalEntry(username=username, content=content, tags=tags, entry_date="2024-05-01 10:00:00")
+    session.add(entry)
+    session.commit()
+    return entry
+
+
+def test_normalize_tags():
+    assert normalize_tags('["Stress", " work ", "stress"]') == ["stress", "work"]
+    assert normalize_tags("gratitude, Family") == ["gratitude", "family"]
+    assert normalize_tags(None) == []
+
+
+def test_tag_rows_follow_entry_writes(temp_db):
+    temp_db.add(User(username="tagger", password_hash="x"))
+    temp_db.commit()
+    entry = _entry(temp_db, "a", '["Stress", "work"]')
+
+    rows = temp_db.query(JournalTag).order_by(JournalTag.tag).all()
+    assert [(r.entry_id, r.tag) for r in rows] == [(entry.id, "stress"), (entry.id, "work")]
+    assert all(r.user_id is not None for r in rows)
+
+    entry.tags = '["calm"]'
+    temp_db.commit()
+    assert [r.tag for r in temp_db.query(JournalTag).all()] == ["calm"]
+
+    # Edits that leave tags alone don't touch the index
+    entry.content = "edited"
+    temp_db.commit()
+    assert [r.tag for r in temp_db.query(JournalTag).all()] == ["calm"]
+
+
+def test_any_all_and_counts(temp_db):
+    _entry(temp_db, "deadline", '["stress", "work"]')
+    _entry(temp_db, "argument", '["distress"]')
+    _entry(temp_db, "overtime", '["work"]')
+    _entry(temp_db, "not mine", '["stress"]', username="other")
+
+    def contents(entries):
+        return sorted(e.content for e in entries)
+
+    # Exact tags: "stress" does not match "distress"
+    assert contents(JournalService.get_entries_by_tags("tagger", ["stress"])) == ["deadline"]
+    assert contents(JournalService.get_entries_by_tags("tagger", ["stress", "work"])) == ["deadline", "overtime"]
+    assert contents(JournalService.get_entries_by_tags("tagger", ["STRESS", "work"], match_all=True)) == ["deadline"]
+    assert contents(h["entry"] for h in JournalService.search("tagger", tags=["stress"])) == ["deadline"]
+
+    assert JournalService.get_tag_counts("tagger") == [("work", 2), ("distress", 1), ("stress", 1)]
+    assert JournalService.get_tag_counts("tagger", limit=1) == [("work", 2)]
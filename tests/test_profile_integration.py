@@ -60,3 +60,40 @@ def test_invalid_profile_data(temp_db):
     
     assert med.blood_type is None
     # Ensure it doesn't crash
+
+def test_save_profile_bundle_single_transaction(temp_db):
+    from sqlalchemy import event
+    from app.db import engine
+    from app.services.profile_service import ProfileService
+
+    user = User(username="bundle_user", password_hash="hash")
+    temp_db.add(user)
+    temp_db.commit()
+
+    saved = ProfileService.save_profile_bundle(
+        "bundle_user",
+        personal={"occupation": "Dev", "not_a_column": 1},
+        medical={"blood_type": "A+"},
+        strengths={"goals": "Ship it"},
+        emotional_patterns={"coping_strategies": "Walks"},
+    )
+    assert saved.personal_profile.occupation == "Dev"
+    assert saved.emotional_patterns.coping_strategies == "Walks"
+    stamp = saved.medical_profile.last_updated
+
+    # Unchanged sections issue no UPDATE and keep their last_updated
+    statements = []
+    listener = lambda conn, cursor, sql, *args: statements.append(sql)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        saved = ProfileService.save_profile_bundle(
+            "bundle_user", personal={"occupation": "Lead"}, medical={"blood_type": "A+"}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    updates = [sql for sql in statements if sql.startswith("UPDATE")]
+    assert len(updates) == 1 and "personal_profiles" in updates[0]
+    assert saved.personal_profile.occupation == "Lead"
+    assert saved.medical_profile.last_updated == stamp
+    assert ProfileService.save_profile_bundle("nobody", personal={"bio": "x"}) is None
@@ -119,3 +119,38 @@ def test_get_question_count_optimized():
     assert get_question_count(age=15) == 2
     assert get_question_count(age=35) == 1
     assert get_question_count(age=99) == 0
+
+@pytest.fixture
+def background_tasks(monkeypatch):
+    """Start from an empty question list and record background work instead of starting threads"""
+    import app.questions
+    monkeypatch.setattr(app.questions, "_ALL_QUESTIONS", [])
+    app.questions._ACCESS_COUNTS.clear()
+    scheduled = []
+    monkeypatch.setattr(app.questions, "safe_thread_run", lambda func, *args, **kwargs: scheduled.append(func))
+    yield scheduled
+    app.questions._ACCESS_COUNTS.clear()
+
+def test_active_questions_reads_do_not_write(temp_db, background_tasks):
+    """Reads are served from memory; access counts reach question_cache only on flush"""
+    import app.questions
+    from app.models import Question, QuestionCache, get_active_questions_optimized
+    from app.questions import flush_access_stats
+
+    for qid in (1, 2, 3):
+        temp_db.add(Question(id=qid, question_text=f"Q{qid}"))
+        temp_db.flush()
+        temp_db.add(QuestionCache(question_id=qid, question_text=f"Q{qid}", access_count=0))
+    temp_db.commit()
+
+    # Empty memory: warm start from the question_cache snapshot, question_bank reloads in the background
+    assert get_active_questions_optimized(limit=2) == [(1, "Q1"), (2, "Q2")]
+    assert app.questions.initialize_questions in background_tasks
+    with pytest.warns(DeprecationWarning):
+        assert get_active_questions_optimized(temp_db, limit=2, offset=1) == [(2, "Q2"), (3, "Q3")]
+    assert [c.access_count for c in temp_db.query(QuestionCache).order_by(QuestionCache.question_id)] == [0, 0, 0]
+
+    assert flush_access_stats() == 3
+    temp_db.expire_all()
+    assert [c.access_count for c in temp_db.query(QuestionCache).order_by(QuestionCache.question_id)] == [1, 2, 1]
+    assert flush_access_stats() == 0
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect
+
+from app.models import AssessmentResult, JournalEntry, User
+from app.read_models import SOURCES, AssessmentResultRow, JournalEntryRow
+from app.services.exam_service import ExamService
+from app.services.journal_service import JournalService
+
+
+def test_read_models_cover_every_column():
+    for row_type, model in SOURCES.items():
+        assert list(row_type._fields) == [c.key for c in inspect(model).column_attrs]
+
+
+def test_journal_reads_return_read_models(temp_db):
+    temp_db.add(JournalEntry(username="reader", content="hello", stress_level=4))
+    temp_db.commit()
+
+    entries = JournalService.get_entries("reader")
+    assert isinstance(entries[0], JournalEntryRow)
+    assert (entries[0].content, entries[0].stress_level) == ("hello", 4)
+    assert not hasattr(entries[0], "__dict__")
+
+
+def test_assessment_results_return_read_models(temp_db):
+    user = User(username="assessed", password_hash="x")
+    temp_db.add(user)
+    temp_db.commit()
+    temp_db.add_all([
+        AssessmentResult(user_id=user.id, assessment_type="strengths", total_score=70, details="{}",
+                         timestamp=datetime.utcnow().isoformat()),
+        AssessmentResult(user_id=user.id, assessment_type="career_clarity", total_score=40, details="{}",
+                         timestamp=(datetime.utcnow() - timedelta(hours=1)).isoformat()),
+    ])
+    temp_db.commit()
+
+    results = ExamService.get_assessment_results(user.id, minutes_lookback=15)
+    assert [(r.assessment_type, r.total_score) for r in results] == [("strengths", 70)]
+    assert isinstance(results[0], AssessmentResultRow)
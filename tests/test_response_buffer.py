@@ -0,0 +1,111 @@
+import os
+import json
+import pytest
+from app.models import AnswerRow, AttemptAnswers, Score, User
+from app.services.exam_service import ExamSession
+from app.services.response_buffer import ResponseBuffer
+
+
+@pytest.fixture
+def questions():
+    return [
+        (1, "Question 1", "Tip 1", 10, 100),
+        (2, "Question 2", "Tip 2", 10, 100),
+        (3, "Question 3", "Tip 3", 10, 100),
+    ]
+
+
+def test_answers_are_buffered_not_committed(temp_db, questions, isolated_response_spool):
+    session = ExamSession("buffer_user", 25, "adult", questions)
+    session.start_exam()
+    session.submit_answer(2)
+    session.submit_answer(3)
+
+    assert temp_db.query(AnswerRow).count() == 0
+    assert len(isolated_response_spool.pending(session.session_key)) == 2
+
+
+def test_finish_exam_writes_responses_with_score(temp_db, questions, isolated_response_spool):
+    temp_db.add(User(username="buffer_user", password_hash="x"))
+    temp_db.commit()
+
+    session = ExamSession("buffer_user", 25, "adult", questions)
+    session.start_exam()
+    for value in (2, 3, 4):
+        session.submit_answer(value)
+
+    assert session.finish_exam() is True
+
+    temp_db.expire_all()
+    assert temp_db.query(Score).filter_by(username="buffer_user").count() == 1
+    values = [r.response_value for r in temp_db.query(AnswerRow).order_by(AnswerRow.question_id)]
+    assert values == [2, 3, 4]
+    # One packed row for the attempt, linked to its score
+    attempt = temp_db.query(AttemptAnswers).one()
+    assert attempt.answer_count == 3 and attempt.score.username == "buffer_user"
+    assert isolated_response_spool.pending() == []
+
+
+def test_size_threshold_triggers_flush(temp_db, tmp_path):
+    buf = ResponseBuffer(spool_dir=str(tmp_path), max_pending=2)
+    buf.add("k1", "u", 1, 2, "adult")
+    assert temp_db.query(AnswerRow).count() == 0
+
+    buf.add("k1", "u", 2, 3, "adult")
+    temp_db.expire_all()
+    assert temp_db.query(AnswerRow).count() == 2
+    assert buf.pending("k1") == []
+    # Spool is compacted away once everything is written
+    assert not os.path.exists(buf.spool_path)
+    buf.close()
+
+
+def test_recover_replays_spool(temp_db, tmp_path):
+    crashed = ResponseBuffer(spool_dir=str(tmp_path))
+    crashed.add("k1", "u", 1, 4, "adult")
+    crashed.add("k1", "u", 2, 1, "adult")
+    # Simulate a torn write at the end of the file
+    with open(crashed.spool_path, "a") as f:
+        f.write('{"seq": 99, "user')
+
+    fresh = ResponseBuffer(spool_dir=str(tmp_path))
+    # The owner still holds its spool: nothing is replayed twice
+    assert fresh.recover() == 0
+
+    crashed.close()  # as when its process exits
+    assert fresh.recover() == 2
+
+    temp_db.expire_all()
+    assert temp_db.query(AnswerRow).count() == 2
+    assert os.listdir(tmp_path) == []
+
+
+def test_flush_expired_writes_idle_sessions(temp_db, tmp_path):
+    buf = ResponseBuffer(spool_dir=str(tmp_path), max_age_seconds=60)
+    buf.add("idle", "u", 1, 2, "adult")
+    buf.add("fresh", "u", 1, 3, "adult")
+    assert buf.flush_expired() == 0
+
+    buf._first_added["idle"] -= 120  # no answer for two minutes
+    assert buf.flush_expired() == 1
+    assert buf.pending("idle") == [] and len(buf.pending("fresh")) == 1
+    temp_db.expire_all()
+    assert temp_db.query(AnswerRow).count() == 1
+    buf.close()
+
+
+def test_failed_flush_keeps_rows(temp_db, tmp_path, monkeypatch):
+    buf = ResponseBuffer(spool_dir=str(tmp_path))
+    buf.add("k1", "u", 1, 2, "adult")
+
+    def boom(session, rows):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr("app.services.response_buffer.write_rows", boom)
+    assert buf.flush("k1") == 0
+    assert len(buf.pending("k1")) == 1
+
+    with open(buf.spool_path) as f:
+        lines = f.read().splitlines()
+    assert json.loads(lines[0])["question_id"] == 1
+    buf.close()
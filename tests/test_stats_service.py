@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from app.models import Score, StatisticsCache
+from app.services.stats_service import StatisticsService, get_stat, get_benchmarks
+
+
+def _add_scores(session, values, age_group="18-25"):
+    for i, value in enumerate(values):
+        session.add(Score(username=f"stats_{age_group}_{i}", total_score=value, detailed_age_group=age_group))
+    session.commit()
+
+
+def test_stats_match_direct_computation(temp_db):
+    values = [12, 20, 20, 25, 31, 33, 38]
+    _add_scores(temp_db, values)
+
+    assert get_stat("score.count") == len(values)
+    assert get_stat("score.mean") == pytest.approx(np.mean(values))
+    assert get_stat("score.std") == pytest.approx(np.std(values))
+    assert get_stat("score.min") == 12 and get_stat("score.max") == 38
+    for pct in (25, 50, 75, 90):
+        assert get_stat(f"score.p{pct}") == pytest.approx(np.percentile(values, pct))
+    assert get_stat("users.active") == len(values)
+
+
+def test_insert_updates_cached_rows_incrementally(temp_db):
+    _add_scores(temp_db, [10, 20], age_group="18-25")
+    _add_scores(temp_db, [30], age_group="26-35")
+    assert get_stat("score.mean") == pytest.approx(20)
+    assert get_stat("score.mean", age_group="18-25") == pytest.approx(15)
+    calculated = temp_db.query(StatisticsCache).filter_by(stat_name="scores:global").one().calculated_at
+
+    temp_db.add(Score(username="late", total_score=40, detailed_age_group="18-25"))
+    temp_db.commit()
+    temp_db.expire_all()
+
+    # Folded in by the insert listener, not recomputed from the scores table
+    row = temp_db.query(StatisticsCache).filter_by(stat_name="scores:global").one()
+    assert row.calculated_at >= calculated and row.valid_until
+    assert get_stat("score.count") == 4
+    assert get_stat("score.mean") == pytest.approx(25)
+    assert get_stat("score.p50", age_group="18-25") == pytest.approx(20)
+    assert get_stat("score.count", age_group="26-35") == 1
+
+
+def test_delete_invalidates_and_refresh_rebuilds(temp_db):
+    _add_scores(temp_db, [10, 20, 30])
+    assert get_stat("score.max") == 30
+
+    temp_db.delete(temp_db.query(Score).filter_by(total_score=30).one())
+    temp_db.commit()
+    temp_db.expire_all()
+
+    assert temp_db.query(StatisticsCache).filter_by(stat_name="scores:global").one().valid_until is None
+    assert get_stat("score.max") == 20
+
+    assert StatisticsService.refresh() >= 2
+    assert get_benchmarks()["sample_size"] == 2
+
+
+def test_unknown_and_empty_stats(temp_db):
+    assert get_stat("score.mean", default="n/a") == "n/a"
+    assert get_stat("score.count") == 0
+    assert get_benchmarks() is None
+    with pytest.raises(ValueError):
+        get_stat("no.such.stat")
+
+
+def test_reads_write_the_cache_only_through_the_write_queue(temp_db, monkeypatch):
+    _add_scores(temp_db, [10, 20])
+
+    class LockedQueue:
+        def write(self, work):
+            raise RuntimeError("database is locked")
+
+    monkeypatch.setattr("app.services.stats_service.get_write_queue", lambda: LockedQueue())
+    # The computed value is served even though caching it failed
+    assert get_stat("score.mean") == pytest.approx(15)
+    assert get_stat("users.active") == 2
+    assert temp_db.query(StatisticsCache).count() == 0
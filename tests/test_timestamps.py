@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, text, update
+
+from app.models import Score, JournalEntry, AnswerRow
+from app.services.journal_service import JournalService
+from app.services.response_buffer import write_rows
+from app.utils.timestamps import to_epoch, from_epoch, day_bounds
+
+
+def test_to_epoch_formats():
+    expected = 1705314600  # 2024-01-15 10:30:00 UTC
+    assert to_epoch("2024-01-15T10:30:00.123456") == expected
+    assert to_epoch("2024-01-15 10:30:00") == expected
+    assert to_epoch(datetime(2024, 1, 15, 10, 30)) == expected
+    assert to_epoch(datetime(2024, 1, 15, 12, 30, tzinfo=timezone(timedelta(hours=2)))) == expected
+    assert to_epoch("not a date") is None
+    assert to_epoch(None) is None
+    assert from_epoch(expected) == datetime(2024, 1, 15, 10, 30)
+
+
+def test_day_bounds():
+    start, end = day_bounds("2024-01-15")
+    assert end - start == 86400
+    assert start <= to_epoch("2024-01-15 23:59:59") < end
+    assert day_bounds(datetime(2024, 1, 15, 18, 0)) == (start, end)
+
+
+def test_orm_writes_fill_epoch_columns(temp_db):
+    score = Score(username="epoch_user", total_score=30, timestamp="2024-01-15T10:30:00")
+    defaulted = Score(username="epoch_user", total_score=31)
+    temp_db.add_all([score, defaulted])
+    temp_db.commit()
+
+    assert score.timestamp_epoch == 1705314600
+    # Default timestamp is resolved before insert so both columns agree
+    assert defaulted.timestamp_epoch == to_epoch(defaulted.timestamp)
+
+    score.timestamp = "2024-01-16T10:30:00"
+    temp_db.commit()
+    assert score.timestamp_epoch == 1705314600 + 86400
+
+
+
+def test_raw_and_core_writes_fill_epoch_columns(temp_db):
+    """Triggers keep the mirrors in sync for writes that skip the ORM hooks."""
+    temp_db.execute(text(
+        "INSERT INTO responses (username, question_id, response_value, timestamp) "
+        "VALUES ('epoch_user', 1, 3, '2024-01-15T10:30:00.123456')"
+    ))
+    score = Score(username="epoch_user", total_score=30, timestamp="2024-01-15T10:30:00")
+    temp_db.add(score)
+    temp_db.flush()
+    temp_db.execute(update(Score.__table__).where(Score.id == score.id).values(timestamp="2024-01-16T10:30:00"))
+    temp_db.commit()
+
+    assert temp_db.execute(text("SELECT timestamp_epoch FROM responses")).scalar() == 1705314600
+    assert temp_db.execute(select(Score.timestamp_epoch)).scalar() == 1705314600 + 86400
+    # The change log sees the insert before the mirror update it causes
+    assert [op for (op,) in temp_db.execute(
+        text("SELECT op FROM change_log WHERE table_name = 'responses' ORDER BY seq")
+    )] == ["I", "U"]
+
+def test_buffered_response_rows_get_epoch(temp_db):
+    write_rows(temp_db, [{
+        "session_key": "k1", "username": "epoch_user", "question_id": 1, "response_value": 3,
+        "age_group": "adult", "timestamp": "2024-01-15T10:30:00",
+    }])
+    temp_db.commit()
+
+    row = temp_db.query(AnswerRow).filter_by(username="epoch_user").one()
+    assert row.timestamp_epoch == 1705314600
+
+
+def test_recent_entries_use_epoch_range(temp_db):
+    now = datetime.now()
+    for days_ago in (1, 3, 30):
+        temp_db.add(JournalEntry(
+            username="epoch_user",
+            content=f"{days_ago} days ago",
+            entry_date=(now - timedelta(days=days_ago)).strftime("%Y-%m-%d %H:%M:%S"),
+        ))
+    temp_db.commit()
+
+    entries = JournalService.get_recent_entries("epoch_user", days=7)
+    assert [e.content for e in entries] == ["1 days ago", "3 days ago"]
@@ -0,0 +1,83 @@
+from app.models import User, Score, JournalEntry, AnswerRow, owner_filter, owner_sql, resolve_user_id
+from app.services.exam_service import ExamService
+from app.services.journal_service import JournalService
+from app.services.response_buffer import write_rows
+
+
+def _make_user(session, username="fk_user"):
+    user = User(username=username, password_hash="hash")
+    session.add(user)
+    session.commit()
+    return user
+
+
+def test_orm_inserts_resolve_user_id(temp_db):
+    user = _make_user(temp_db)
+
+    entry = JournalService.create_entry("fk_user", "hello", 0.5, "[]")
+    assert entry.user_id == user.id
+
+    temp_db.add(Score(username="fk_user", total_score=20))
+    temp_db.commit()
+    assert temp_db.query(Score).one().user_id == user.id
+
+
+def test_buffered_responses_resolve_user_id(temp_db):
+    user = _make_user(temp_db)
+    rows = [
+        {"session_key": name, "username": name, "question_id": 1, "response_value": 3,
+         "age_group": "adult", "timestamp": "2024-01-15T10:30:00"}
+        for name in ("fk_user", "no_account")
+    ]
+    write_rows(temp_db, rows)
+    temp_db.commit()
+
+    by_name = {r.username: r.user_id for r in temp_db.query(AnswerRow).all()}
+    assert by_name == {"fk_user": user.id, "no_account": None}
+
+
+def test_history_follows_renamed_account(temp_db):
+    user = _make_user(temp_db)
+    for value in (10, 20):
+        temp_db.add(Score(username="fk_user", total_score=value))
+    temp_db.commit()
+
+    user.username = "renamed_user"
+    temp_db.commit()
+
+    assert sorted(ExamService.get_recent_scores("renamed_user")) == [10, 20]
+
+
+def test_owner_filter_falls_back_to_username(temp_db):
+    user = _make_user(temp_db)
+    assert owner_filter(temp_db, "fk_user") == {"user_id": user.id}
+    assert owner_filter(temp_db, "no_account") == {"username": "no_account"}
+
+    temp_db.add(JournalEntry(username="no_account", content="anon"))
+    temp_db.commit()
+    assert [e.content for e in JournalService.get_entries("no_account")] == ["anon"]
+
+
+def test_new_account_claims_rows_written_before_it(temp_db):
+    temp_db.add(Score(username="late_signup", total_score=30))
+    temp_db.add(JournalEntry(username="late_signup", content="before signup", tags="work"))
+    temp_db.commit()
+
+    user = _make_user(temp_db, "late_signup")
+    assert [s.user_id for s in temp_db.query(Score)] == [user.id]
+    assert [e.content for e in JournalService.get_entries("late_signup")] == ["before signup"]
+    # Tag lookups key on user_id too
+    assert JournalService.get_tag_counts("late_signup") == [("work", 1)]
+    assert [e.content for e in JournalService.get_entries_by_tags("late_signup", ["work"])] == ["before signup"]
+
+
+def test_user_id_resolved_once_per_session(temp_db):
+    user = _make_user(temp_db)
+    assert resolve_user_id(temp_db, "fk_user") == user.id
+    assert temp_db.info["user_ids"] == {"fk_user": user.id}
+    # Misses are not remembered: the account may be created later
+    assert resolve_user_id(temp_db, "no_account") is None
+    assert "no_account" not in temp_db.info["user_ids"]
+
+    assert owner_sql(user.id, "fk_user") == ("user_id = ?", (user.id,))
+    assert owner_sql(None, "no_account") == ("username = ?", ("no_account",))